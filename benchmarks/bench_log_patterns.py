@@ -0,0 +1,123 @@
+"""
+Micro-benchmark du dispatch des patterns d'autofocus de processAcquisitionLog.
+
+Compare, sur un log synthétique d'un million de lignes, l'ancien dispatch
+(re.search avec les patterns bruts sur chaque ligne) au registre de patterns
+précompilés avec pré-filtre littéral, puis mesure analyzeLogFile de bout en bout.
+
+Usage : python benchmarks/bench_log_patterns.py [nombre_de_lignes]
+"""
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from zymosoft_assistant.scripts.processAcquisitionLog import (
+    AUTOFOCUS_LITERAL, DONE_LOOPS_PATTERN, TIMEOUT_LOOPS_PATTERN, MOVE_PATTERN, MAX_RETRY_PATTERN,
+    STILL_NOT_PATTERN, AUTOFOCUS_OFF_DONE_PATTERN, extractWellName, analyzeLogFile
+)
+
+LEGACY_WELL_PATTERN = r'Going to well\s+"([^"]+)"'
+LEGACY_PATTERNS = [pattern.regex.pattern for pattern in (
+    DONE_LOOPS_PATTERN, TIMEOUT_LOOPS_PATTERN, AUTOFOCUS_OFF_DONE_PATTERN, STILL_NOT_PATTERN,
+    MAX_RETRY_PATTERN, MOVE_PATTERN
+)]
+REGISTRY_PATTERNS = [
+    DONE_LOOPS_PATTERN, TIMEOUT_LOOPS_PATTERN, AUTOFOCUS_OFF_DONE_PATTERN, STILL_NOT_PATTERN,
+    MAX_RETRY_PATTERN, MOVE_PATTERN
+]
+
+
+def generateSyntheticLog(path: str, line_count: int, seed: int = 0) -> None:
+    """
+    Écrit un log synthétique proche d'un log ZymoCubeCtrl avec traces série :
+    une majorité de lignes série/moteur et quelques lignes d'autofocus par puits.
+    """
+    rng = random.Random(seed)
+    noise = [
+        "[SERIAL][OUT] G1 X{0} Y{1}",
+        "[SERIAL][IN] ok {0}",
+        "MOTOR 2 STEP {0} TO POINT {1}",
+        "Seeking position {0}",
+        "Camera frame {0} exposure {1} ms",
+    ]
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("[01/03/2025 08:00:00] Starting acquisition of plate\n")
+        file.write("[01/03/2025 08:00:05] Reference wells A1 A12 H12 re-aligned.\n")
+        written = 2
+        well_index = 0
+        while written < line_count - 1:
+            if rng.random() < 0.02:
+                well = f"{'ABCDEFGH'[well_index // 12 % 8]}{well_index % 12 + 1}"
+                well_index += 1
+                file.write(f'[01/03/2025 08:10:00] Going to well "{well}"\n')
+                file.write(f"[01/03/2025 08:10:01] [AUTOFOCUS][FOCUS] Adjusting position, move: {rng.randint(0, 9)}\n")
+                file.write(f"[01/03/2025 08:10:02] [AUTOFOCUS][FOCUS] Done after {rng.randint(1, 9)} loop(s)\n")
+                written += 3
+            else:
+                template = rng.choice(noise)
+                file.write(f"[01/03/2025 08:10:00] {template.format(rng.randint(0, 9999), rng.randint(0, 9999))}\n")
+                written += 1
+        file.write("[01/03/2025 10:00:00] Stopping acquisition\n")
+
+
+def legacyDispatch(line: str):
+    match = re.search(LEGACY_WELL_PATTERN, line)
+    if match:
+        return match.group(1)
+    for pattern in LEGACY_PATTERNS:
+        match = re.search(pattern, line)
+        if match:
+            return match
+    return None
+
+
+def registryDispatch(line: str):
+    well_name = extractWellName(line)
+    if well_name:
+        return well_name
+    if AUTOFOCUS_LITERAL not in line:
+        return None
+    for pattern in REGISTRY_PATTERNS:
+        match = pattern.search(line)
+        if match:
+            return match
+    return None
+
+
+def measure(dispatch, lines) -> float:
+    start = time.perf_counter()
+    for line in lines:
+        dispatch(line)
+    return time.perf_counter() - start
+
+
+def main():
+    line_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    fd, path = tempfile.mkstemp(suffix=".log")
+    os.close(fd)
+    try:
+        generateSyntheticLog(path, line_count)
+        with open(path, "r", encoding="utf-8") as file:
+            lines = file.readlines()
+
+        legacy = measure(legacyDispatch, lines)
+        registry = measure(registryDispatch, lines)
+        print(f"Lignes : {len(lines)}")
+        print(f"re.search brut          : {len(lines) / legacy:>12,.0f} lignes/s")
+        print(f"registre + pré-filtre   : {len(lines) / registry:>12,.0f} lignes/s  (x{legacy / registry:.1f})")
+
+        start = time.perf_counter()
+        analyzeLogFile(path)
+        elapsed = time.perf_counter() - start
+        print(f"analyzeLogFile complet  : {len(lines) / elapsed:>12,.0f} lignes/s")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
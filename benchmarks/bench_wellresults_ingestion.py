@@ -0,0 +1,95 @@
+"""
+Benchmark de la lecture d'un fichier WellResults.xlsx.
+
+Compare, sur un classeur synthétique de 20 areas, la lecture de toutes les feuilles
+par pd.read_excel (conversion cellule par cellule puis TextParser) à readWellResultsSheets
+(openpyxl en lecture seule, valeurs seulement, remplissage direct de tableaux NumPy) :
+temps de lecture et pic mémoire mesuré par tracemalloc.
+
+Usage : python benchmarks/bench_wellresults_ingestion.py [nombre_d_areas] [répétitions]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import openpyxl
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from zymosoft_assistant.scripts.getDatasFromWellResults import readWellResultsSheets
+
+ROWS = "ABCDEFGH"
+
+
+def generateSyntheticWellResults(path: str, area_count: int, seed: int = 0) -> None:
+    """
+    Écrit un classeur proche d'un WellResults.xlsx ZymoSoft : une feuille par area avec
+    les tableaux WellBlankResult, WellCalibrationResult, WellSampleResult et WellSampleDetailResult.
+    """
+    rng = random.Random(seed)
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    for area in range(area_count):
+        sheet = workbook.create_sheet(f"Area {area + 1}")
+        sheet.append(["Plate Reference", f"GPA-{area:02d}"])
+        sheet.append([])
+        sheet.append(["WellBlankResult"])
+        sheet.append(["Well", "Trouble", "Zymunit", "Exclusion", "Exclusion comment"])
+        for index in range(16):
+            sheet.append([f"{ROWS[index % 8]}{index // 8 + 1}", "", rng.uniform(0.5, 2.0), rng.random() < 0.1, ""])
+        sheet.append([])
+        sheet.append(["WellCalibrationResult"])
+        sheet.append(["Activity", "Zymunit", "Mean", "Std"])
+        for activity in (0.5, 1, 2, 5, 10, 20, 50, 100):
+            sheet.append([activity, rng.uniform(1, 100), rng.uniform(1, 100), rng.uniform(0.1, 5)])
+        sheet.append([])
+        sheet.append(["WellSampleResult"])
+        sheet.append(["Sample", "Activity", "Zymunit", "CV"])
+        for index in range(48):
+            sheet.append([f"S{index + 1}", rng.uniform(0, 100), rng.uniform(0, 100), rng.uniform(0, 20)])
+        sheet.append([])
+        sheet.append(["WellSampleDetailResult"])
+        sheet.append(["Well", "Sample", "Zymunit", "Activity", "Exclusion"])
+        for index in range(192):
+            sheet.append([f"{ROWS[index % 8]}{index // 8 + 1}", f"S{index // 4 + 1}",
+                          rng.uniform(0, 100), rng.uniform(0, 100), rng.random() < 0.05])
+    workbook.save(path)
+
+
+def measure(read, path: str, repeat: int):
+    """Retourne le meilleur temps de lecture et le pic mémoire (Mo) d'une lecture."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        read(path)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    read(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / 1024 / 1024
+
+
+def main():
+    area_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        generateSyntheticWellResults(path, area_count)
+        pandas_time, pandas_peak = measure(lambda file: pd.read_excel(file, sheet_name=None), path, repeat)
+        fast_time, fast_peak = measure(readWellResultsSheets, path, repeat)
+        print(f"Areas : {area_count} ({os.path.getsize(path) / 1024:.0f} Ko)")
+        print(f"pd.read_excel           : {pandas_time * 1000:>8.0f} ms  pic {pandas_peak:>6.1f} Mo")
+        print(f"readWellResultsSheets   : {fast_time * 1000:>8.0f} ms  pic {fast_peak:>6.1f} Mo"
+              f"  (x{pandas_time / fast_time:.1f})")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+from zymosoft_assistant.scripts.home_made_tools_v3 import PLAQUE_96, PlateGeometry
+from zymosoft_assistant.scripts.Routine_VALIDATION_ZC_18022025 import (
+    statistiques_repeta, ecrire_data_raw, differences_plaques, noyau_comparaison, ecrire_data_comparative,
+    specs_comparaison, spec_colormap, compare_enzymo_2_ref_onglets, compare_enzymo_2_ref
+)
+from zymosoft_assistant.scripts.getDatasFromWellResults import readEnzymoSections
+from zymosoft_assistant.scripts import Routine_VALIDATION_ZC_18022025
+from zymosoft_assistant.scripts.figureSpecs import FigureQueue, FigureSpec, publishFigures
+
+
+class TestRepeta(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+
+    def test_statistiques(self):
+        data_all_iteration = np.zeros((2,) + PLAQUE_96.shape + (3,))
+        data_all_iteration[0, 1, 6] = [9.0, 10.0, 11.0]
+        data_all_iteration[1, 1, 6] = [4.0, np.nan, 6.0]
+        mean, std, CV = statistiques_repeta(data_all_iteration)
+
+        self.assertEqual((2, 8, 12), mean.shape)
+        self.assertAlmostEqual(10.0, mean[0, 1, 6])
+        self.assertAlmostEqual(np.std([9.0, 10.0, 11.0]), std[0, 1, 6])
+        self.assertAlmostEqual(np.std([9.0, 10.0, 11.0]) * 10, CV[0, 1, 6])
+        # les nan sont ignorés, un puits vide donne un CV nan
+        self.assertAlmostEqual(5.0, mean[1, 1, 6])
+        self.assertAlmostEqual(20.0, CV[1, 1, 6])
+        self.assertTrue(np.isnan(CV[0, 0, 0]))
+
+    def test_data_raw(self):
+        geometrie = PlateGeometry(2, 3)
+        data_all_iteration = np.arange(2 * 6 * 2, dtype=float).reshape((2,) + geometrie.shape + (2,))
+        data_all_iteration[1, 0, 0, 1] = np.nan
+        path = os.path.join(self.folder, "data_raw.csv")
+        ecrire_data_raw(path, geometrie, ["V_it0", "D_it0", "V_it1", "D_it1"], data_all_iteration)
+
+        # format historique, octet par octet : chaque ligne se termine par ';'
+        with open(path, 'rb') as file:
+            lignes = file.read().split(os.linesep.encode())
+        self.assertEqual(b'well;V_it0;D_it0;V_it1;D_it1;', lignes[0])
+        self.assertEqual(b'A1;0.0;12.0;1.0;nan;', lignes[1])
+        self.assertEqual(b'B3;10.0;22.0;11.0;23.0;', lignes[6])
+        self.assertEqual(b'', lignes[7])
+        df = pd.read_csv(path, sep=';', index_col=0, usecols=range(5))
+        self.assertEqual(["A1", "A2", "A3", "B1", "B2", "B3"], df.index.tolist())
+        self.assertEqual([0.0, 12.0, 1.0], df.loc["A1"].tolist()[:3])
+        self.assertTrue(np.isnan(df.loc["A1", "D_it1"]))
+        self.assertEqual([10.0, 22.0, 11.0, 23.0], df.loc["B3"].tolist())
+
+
+class TestComparaison(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.reference = np.arange(1, 97, dtype=float).reshape(PLAQUE_96.shape) * 10
+
+    def test_differences(self):
+        instrument = self.reference * 1.1
+        instrument[0, 0] = 5.0
+        reference = self.reference.copy()
+        reference[0, 0] = 0.0
+        difference, difference_relative, ratio = differences_plaques(instrument, reference)
+        self.assertAlmostEqual(5.0, difference[0, 0])
+        self.assertTrue(np.isnan(difference_relative[0, 0]))
+        self.assertTrue(np.isnan(ratio[0, 0]))
+        self.assertAlmostEqual(10.0, difference_relative[1, 6])
+        self.assertAlmostEqual(1.1, ratio[1, 6])
+
+    def test_noyau(self):
+        instrument = self.reference * 2 + 5
+        instrument[2, 3] *= 1.5 # outlier exclu du fit et loin du fit
+        reference = self.reference.copy()
+        reference[7, 11] = 0.0 # pas de référence
+        comparaison = noyau_comparaison(instrument, reference, tolerance_relative_fit=5, tolerance=200)
+
+        self.assertEqual((96,), comparaison['vecteur_instrument_1'].shape)
+        self.assertEqual(27, np.flatnonzero(~comparaison['mask_proches'])[0])
+        self.assertEqual([27, 95], np.flatnonzero(comparaison['mask_eloignes']).tolist())
+        self.assertEqual([95], np.flatnonzero(comparaison['mask_nan']).tolist())
+        self.assertEqual(1, comparaison['nb_puits_trop_loins'])
+        self.assertAlmostEqual(2.0, comparaison['slope_fit'])
+        self.assertAlmostEqual(5.0, comparaison['intercept_fit'])
+        self.assertAlmostEqual(1.0, comparaison['r_value_fit'])
+        # le puits sans référence est loin du fit (fit en 5), l'outlier aussi
+        self.assertEqual([27, 95], np.flatnonzero(comparaison['mask_eloignes_fit']).tolist())
+        self.assertEqual(2, comparaison['nb_puits_loin_fit'])
+        self.assertAlmostEqual(np.nanmean(comparaison['Matrix_difference_relative']), comparaison['difference_relative_mean'])
+
+    def test_noyau_sans_puits_proche(self):
+        comparaison = noyau_comparaison(self.reference * 3, self.reference, tolerance_relative_fit=5)
+        # tous les puits sont exclus par le filtre grossier : fit sur tous les puits
+        self.assertFalse(comparaison['mask_proches'].any())
+        self.assertEqual(96, comparaison['nb_puits_trop_loins'])
+        self.assertAlmostEqual(3.0, comparaison['slope_fit'])
+        self.assertEqual(0, comparaison['nb_puits_loin_fit'])
+
+    def test_specs_comparaison(self):
+        comparaison = noyau_comparaison(self.reference * 2, self.reference, tolerance_relative_fit=5, tolerance=200)
+        specs = specs_comparaison(comparaison, self.folder, 'validation_comparison', 'acquisition', 'ZC', 'REF',
+                                  'volumes', 'V issu stat µm^3  ', 'volumes', 5)
+        self.assertEqual(['validation_comparison volumes par puits.jpg', 'validation_comparison volumes par puits_FIT.jpg',
+                          'validation_comparison volumes par puits_fit.jpg'], [os.path.basename(spec.path).split('\\')[-1] for spec in specs])
+        self.assertEqual(('legend', (), {}), specs[0].layers[-1])
+
+        # mises en file, les figures ne sont dessinées qu'à la demande
+        figure_queue = FigureQueue()
+        publishFigures(specs, figure_queue)
+        self.assertEqual(3, len(figure_queue.pending()))
+        self.assertFalse(os.listdir(self.folder))
+
+    def test_spec_colormap(self):
+        geometrie = PlateGeometry(16, 24)
+        matrice = np.arange(geometrie.nb_puits, dtype=float).reshape(geometrie.shape)
+        matrice[0, 0] = np.nan
+        spec = spec_colormap(os.path.join(self.folder, 'colormap.jpg'), matrice, 'colormap', 'jet', 0, 0, geometrie)
+        textes = [args for method, args, kwargs in spec.layers if method == 'text']
+        self.assertEqual(geometrie.nb_puits, len(textes))
+        self.assertEqual((0, 0, 'nan'), textes[0])
+        self.assertEqual((23, 15, '383.0'), textes[-1])
+
+    def test_data_comparative(self):
+        path = os.path.join(self.folder, "data_comparative.csv")
+        ecrire_data_comparative(path, PLAQUE_96, [('V_instrument_1', self.reference), ('V_instrument_2', self.reference / 2)])
+        with open(path) as file:
+            lignes = file.read().splitlines()
+        # format historique : chaque ligne se termine par ';'
+        self.assertEqual('weel;V_instrument_1;V_instrument_2;', lignes[0])
+        self.assertEqual('A1;10.0;5.0;', lignes[1])
+        df = pd.read_csv(path, sep=';', index_col=0, usecols=[0, 1, 2])
+        self.assertEqual('weel', df.index.name)
+        self.assertEqual([120.0, 60.0], df.loc['A12'].tolist())
+        self.assertEqual(960.0, df.loc['H12', 'V_instrument_1'])
+
+
+class TestCompareEnzymoOnglets(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+
+    def compareOnglet(self, *args, sections_instrument_1=None, sections_instrument_2=None, figure_queue=None):
+        # remplace compare_enzymo_2_ref : un onglet en erreur, une figure par onglet
+        onglet = args[3]
+        publishFigures([FigureSpec(os.path.join(self.folder, onglet + '.png'))], figure_queue)
+        if onglet == 'Zone 2':
+            raise ValueError("onglet illisible")
+        return [onglet, 'R', sections_instrument_1], [onglet, 'V', sections_instrument_2]
+
+    def test_onglets_comme_en_sequentiel(self):
+        onglets = ['Zone 1', 'Zone 2', 'Zone 3']
+        sections_1 = {'Zone 1': 's1', 'Zone 2': 's2', 'Zone 3': 's3'}
+        figure_queue = FigureQueue()
+        with patch.object(Routine_VALIDATION_ZC_18022025, 'compare_enzymo_2_ref', side_effect=self.compareOnglet):
+            resultats = compare_enzymo_2_ref_onglets(self.folder, 'REF', 'acq_1', onglets, self.folder, 'ZC', 'acq_2',
+                                                     self.folder, sections_instrument_1=sections_1,
+                                                     figure_queue=figure_queue)
+
+        # résultats dans l'ordre des onglets, l'onglet en erreur n'empêche pas les suivants
+        self.assertEqual(onglets, [onglet for onglet, data, erreur in resultats])
+        self.assertEqual((['Zone 1', 'R', 's1'], ['Zone 1', 'V', None]), resultats[0][1])
+        self.assertIsNone(resultats[1][1])
+        self.assertIsInstance(resultats[1][2], ValueError)
+        self.assertEqual((['Zone 3', 'R', 's3'], ['Zone 3', 'V', None]), resultats[2][1])
+        self.assertIsNone(resultats[2][2])
+        # les figures de tous les onglets, même en erreur, sont mises en file
+        self.assertEqual(3, len(figure_queue.pending()))
+
+    def test_figures_dessinees_par_onglet_sans_file(self):
+        onglets = ['Zone 1', 'Zone 2', 'Zone 3']
+        with patch.object(Routine_VALIDATION_ZC_18022025, 'compare_enzymo_2_ref', side_effect=self.compareOnglet), \
+                patch.object(Routine_VALIDATION_ZC_18022025, 'renderFigures') as mock_render:
+            resultats = compare_enzymo_2_ref_onglets(self.folder, 'REF', 'acq_1', onglets, self.folder, 'ZC', 'acq_2',
+                                                     self.folder)
+
+        # chaque onglet dessine ses propres figures, même en erreur
+        self.assertEqual(3, mock_render.call_count)
+        self.assertEqual([[os.path.join(self.folder, onglet + '.png')] for onglet in onglets],
+                         [[spec.path for spec in call.args[0]] for call in mock_render.call_args_list])
+        self.assertIsInstance(resultats[1][2], ValueError)
+
+
+def enzymoSheet(first_sheet, decalage):
+    """
+    Lignes d'un onglet WellResults complet (fit linéaire, tampons, gamme, échantillons) pour compare_enzymo_2_ref ;
+    decalage modifie les Z.U. pour distinguer les deux machines.
+    """
+    vide = [None] * 5
+
+    def section(titre, lignes, entete=("Well", "Name", "Zymunit", "Activity", "Exclusion")):
+        return [vide, [titre, None, None, None, None], list(entete)] + lignes
+
+    lignes = [["Plate Reference", "GPA", None, None, None], ["Operator", "x", None, None, None], vide] if first_sheet else []
+    lignes += [["Date", "01/01/2025", None, None, None], ["Fit", "Linear", None, None, None],
+               ["a", -20.0, None, None, None], ["b", 100.0 + decalage, None, None, None]]
+    lignes += section("WellBlankResult", [["A1", None, 2.0 + decalage, "False", None], ["A2", None, 3.0, "False", None],
+                                          ["A3", None, 9.0, "True", None]])
+    lignes += section("WellCalibrationResult", [[0.5, 1.0, 2.0, None, None]])
+    gamme = []
+    for index, activite in enumerate([1.0, 2.0, 3.0, 4.0]):
+        for replica in range(2):
+            gamme.append([f"B{2 * index + replica + 1}", None, 100.0 - 20 * activite + replica + decalage, activite, "False"])
+    lignes += section("WellGammeResult", gamme)
+    lignes += section("WellSampleResult", [["S1", None, 2.5 + decalage, None, 4.0], ["S2", None, 1.2, None, 6.0]],
+                      ("Sample", "Name", "Activity", "Unit", "RSD"))
+    lignes += section("WellOtherResult", [["x", 1.0, None, None, None]])
+    lignes += section("WellSampleDetailResult", [["C1", None, 3.0, 1.0, "False"], ["C2", None, 4.0, 2.0, "False"]])
+    return lignes
+
+
+class TestCompareEnzymoSections(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        for acquisition, decalage in (("acq_1", 0.0), ("acq_2", 1.5)):
+            os.mkdir(os.path.join(self.folder, acquisition))
+            workbook = openpyxl.Workbook()
+            workbook.remove(workbook.active)
+            for index in range(2):
+                sheet = workbook.create_sheet(f"Area {index + 1}")
+                sheet.append(["Results", "h1", "h2", "h3", "h4"])
+                for ligne in enzymoSheet(index == 0, decalage):
+                    sheet.append(ligne)
+            workbook.save(os.path.join(self.folder, acquisition, "WellResults.xlsx"))
+
+    def test_sections_lues_une_fois_comme_par_onglet(self):
+        sections_1 = readEnzymoSections(os.path.join(self.folder, "acq_1", "WellResults.xlsx"))
+        sections_2 = readEnzymoSections(os.path.join(self.folder, "acq_2", "WellResults.xlsx"))
+        for onglet in ("Area 1", "Area 2"):
+            args = (self.folder, 'REF', 'acq_1', onglet, self.folder, 'ZC', 'acq_2', self.folder)
+            # sans sections, compare_enzymo_2_ref relit son onglet avec readWellResultsSheets
+            par_onglet = compare_enzymo_2_ref(*args, figure_queue=FigureQueue())
+            pre_lues = compare_enzymo_2_ref(*args, sections_instrument_1=sections_1[onglet],
+                                            sections_instrument_2=sections_2[onglet], figure_queue=FigureQueue())
+            np.testing.assert_equal(par_onglet, pre_lues)
+            self.assertEqual(['acq_2', 'ZC', onglet], pre_lues[1][:3])
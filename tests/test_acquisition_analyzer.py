@@ -0,0 +1,122 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from zymosoft_assistant.core import acquisition_analyzer
+from zymosoft_assistant.core.acquisition_analyzer import AcquisitionAnalyzer, GRAPH_PREVIEW_DPI, GRAPH_RENDER_WORKERS
+
+
+def writeCsv(path, lines):
+    """
+    Écrit un fichier CSV (séparateur ';', virgule décimale) à partir de ses lignes.
+    """
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write('\n'.join(lines) + '\n')
+
+
+class TestLoadAcquisitionData(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.analyzer = AcquisitionAnalyzer(output_dir=os.path.join(self.folder, "graphs"))
+
+    def test_index(self):
+        writeCsv(os.path.join(self.folder, "a_log.csv"), ["Date;Message;Volume;Epaisseur", "x;y;1;2"])
+        writeCsv(os.path.join(self.folder, "b_config.csv"), ["Nom;Valeur", "a;1"])
+        writeCsv(os.path.join(self.folder, "c_data.csv"), ["Puits;Volume;Epaisseur", "A1;1,5;2,5"])
+        writeCsv(os.path.join(self.folder, "d.csv"), ["\ufeffEpaisseur;\"Volume\"", "1;2"])
+
+        data_files = self.analyzer._index_data_files(self.folder)
+        # les fichiers sans les colonnes requises et les logs sont ignorés, les noms de données passent en premier
+        self.assertEqual(["c_data.csv", "d.csv"], [os.path.basename(path) for path in data_files])
+
+    def test_load_plusieurs_fichiers(self):
+        writeCsv(os.path.join(self.folder, "data_1.csv"), ["Puits;Volume;Epaisseur;Commentaire", "A1;1,5;2,5;ok", "A2;3;4;"])
+        writeCsv(os.path.join(self.folder, "data_2.csv"), ["Epaisseur;Volume", "6,5;5"])
+        writeCsv(os.path.join(self.folder, "config.csv"), ["Nom;Valeur", "a;1"])
+
+        data = self.analyzer._load_acquisition_data(self.folder)
+        self.assertEqual(["Volume", "Epaisseur"], list(data.columns))
+        self.assertEqual([1.5, 3.0, 5.0], data["Volume"].tolist())
+        self.assertEqual([2.5, 4.0, 6.5], data["Epaisseur"].tolist())
+        self.assertEqual('float64', str(data["Volume"].dtype))
+
+    def test_load_ignore_exports(self):
+        writeCsv(os.path.join(self.folder, "data.csv"), ["Volume;Epaisseur", "1;2"])
+        writeCsv(os.path.join(self.folder, "acquisition_kpi.csv"), ["Volume;Epaisseur", "100;200"])
+        writeCsv(os.path.join(self.folder, "acquisition_log.csv"), ["Volume;Epaisseur", "300;400"])
+        writeCsv(os.path.join(self.folder, "mesures.csv"), ["Volume;Epaisseur", "500;600"])
+
+        # seul le groupe le mieux classé est chargé, les exports KPI et logs jamais
+        data = self.analyzer._load_acquisition_data(self.folder)
+        self.assertEqual([1.0], data["Volume"].tolist())
+        self.assertEqual([2.0], data["Epaisseur"].tolist())
+
+    def test_load_sans_fichier_de_donnees(self):
+        writeCsv(os.path.join(self.folder, "config.csv"), ["Nom;Valeur", "a;1"])
+        self.assertIsNone(self.analyzer._load_acquisition_data(self.folder))
+
+
+class TestGenerateGraphs(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.analyzer = AcquisitionAnalyzer(output_dir=self.folder)
+        epaisseur = np.arange(1, 11, dtype=float)
+        self.data = pd.DataFrame({"Volume": 2 * epaisseur + 1, "Epaisseur": epaisseur})
+        self.specs = []
+
+    def renderSpecs(self, specs, workers=1, figure_cache=None):
+        # remplace renderFigures : garde les FigureSpec sans les dessiner
+        self.specs.extend(specs)
+        return [spec.path for spec in specs]
+
+    def regressionLabel(self):
+        return [kwargs['label'] for method, args, kwargs in self.specs[0].layers if method == 'plot'][0]
+
+    def test_reprise_des_statistiques(self):
+        statistics = {"slope": 3.0, "intercept": 4.0, "r2": 0.5, "outliers_count": 0, "outliers_percentage": 0.0}
+        with patch.object(acquisition_analyzer, 'renderFigures', side_effect=self.renderSpecs), \
+                patch.object(np, 'polyfit', wraps=np.polyfit) as polyfit:
+            graph_paths = self.analyzer.generate_graphs(self.data, statistics=statistics)
+        self.assertEqual(3, len(graph_paths))
+        self.assertEqual('Régression: y = 3.0000x + 4.0000', self.regressionLabel())
+        # seule la régression inverse est calculée
+        self.assertEqual(1, polyfit.call_count)
+
+    def test_statistiques_invalides(self):
+        # résultat par défaut de calculate_statistics en cas d'échec : la régression est recalculée
+        for statistics in (None, self.analyzer.calculate_statistics(None), {"slope": np.nan, "intercept": 1, "r2": 1}):
+            self.specs = []
+            with patch.object(acquisition_analyzer, 'renderFigures', side_effect=self.renderSpecs):
+                self.analyzer.generate_graphs(self.data, statistics=statistics)
+            self.assertEqual('Régression: y = 2.0000x + 1.0000', self.regressionLabel())
+
+    def test_rendu_en_une_fois(self):
+        with patch.object(acquisition_analyzer, 'renderFigures', side_effect=self.renderSpecs) as mock_render:
+            graph_paths = self.analyzer.generate_graphs(self.data)
+        mock_render.assert_called_once()
+        self.assertEqual(GRAPH_RENDER_WORKERS, mock_render.call_args.kwargs['workers'])
+        self.assertEqual([os.path.join(self.folder, name) for name in
+                          ('volume_vs_thickness.png', 'thickness_vs_volume.png', 'residuals_distribution.png')],
+                         graph_paths)
+
+    def test_seuls_les_graphiques_ecrits_sont_retournes(self):
+        # renderFigures ne retourne que les graphiques écrits ; une erreur avant le rendu n'en écrit aucun
+        with patch.object(acquisition_analyzer, 'renderFigures', return_value=[os.path.join(self.folder, 'a.png')]):
+            self.assertEqual([os.path.join(self.folder, 'a.png')], self.analyzer.generate_graphs(self.data))
+        with patch.object(acquisition_analyzer, 'renderFigures') as mock_render, \
+                patch.object(AcquisitionAnalyzer, '_add_r2_box', side_effect=RuntimeError("erreur")):
+            self.assertEqual([], self.analyzer.generate_graphs(self.data))
+        mock_render.assert_not_called()
+
+    def test_resolution(self):
+        with patch.object(acquisition_analyzer, 'renderFigures', side_effect=self.renderSpecs):
+            self.analyzer.generate_graphs(self.data)
+            AcquisitionAnalyzer(output_dir=self.folder, preview_dpi=72).generate_graphs(self.data)
+        self.assertEqual([GRAPH_PREVIEW_DPI] * 3 + [72] * 3, [spec.dpi for spec in self.specs])
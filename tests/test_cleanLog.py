@@ -0,0 +1,62 @@
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from zymosoft_assistant.scripts.cleanLog import clean_log_file, find_last_acquisition_offset
+
+LOG = (
+    "[01/03/2025 08:00:00] Starting acquisition of plate 1\n"
+    "[01/03/2025 08:00:01] [SERIAL][OUT] G1 X10\n"
+    "[01/03/2025 08:00:02] [SERIAL][IN] ok\n"
+    "[01/03/2025 08:00:03] Stopping acquisition\n"
+    "[02/03/2025 09:00:00] Starting acquisition of plate 2\n"
+    "[02/03/2025 09:00:01] MOTOR 2 STEP 40 TO POINT 3\n"
+    '[02/03/2025 09:00:02] Going to well "B2"\n'
+    "[02/03/2025 09:00:03] Stopping acquisition\n"
+)
+
+
+class TestCleanLog(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.input_file = os.path.join(self.folder, "ZymoCubeCtrl.log")
+        with open(self.input_file, "wb") as file:
+            file.write(LOG.replace("\n", "\r\n").encode("utf-8"))
+
+    def _clean(self, output_name, **kwargs):
+        with patch("builtins.print"):
+            return clean_log_file(self.input_file, os.path.join(self.folder, output_name), **kwargs)
+
+    def test_removes_serial_lines(self):
+        output_file = self._clean("cleaned.log")
+        with open(output_file, encoding="utf-8") as file:
+            lines = file.read().splitlines()
+        self.assertEqual(5, len(lines))
+        self.assertFalse(any("SERIAL" in line or "MOTOR" in line for line in lines))
+
+    def test_keep_last_acquisition(self):
+        output_file = self._clean("cleaned_last.log", keep_last_acquisition_only=True)
+        with open(output_file, encoding="utf-8") as file:
+            lines = file.read().splitlines()
+        self.assertEqual("[02/03/2025 09:00:00] Starting acquisition of plate 2", lines[0])
+        self.assertEqual(3, len(lines))
+
+    def test_reverse_scan_across_small_blocks(self):
+        expected = LOG.replace("\n", "\r\n").index("[02/03/2025 09:00:00] Starting")
+        for block_size in (1, 5, 64):
+            self.assertEqual(expected, find_last_acquisition_offset(self.input_file, block_size=block_size))
+
+    def test_no_acquisition(self):
+        with open(self.input_file, "w", encoding="utf-8") as file:
+            file.write("System ready\n")
+        self.assertIsNone(find_last_acquisition_offset(self.input_file))
+
+    def test_gzip_output_from_extension(self):
+        plain_file = self._clean("cleaned.log")
+        gzip_file = self._clean("cleaned.log.gz")
+        with gzip.open(gzip_file, "rb") as compressed, open(plain_file, "rb") as plain:
+            self.assertEqual(plain.read(), compressed.read())
@@ -0,0 +1,130 @@
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from zymosoft_assistant.scripts import figureSpecs
+from zymosoft_assistant.scripts.figureSpecs import FigureSpec, FigureQueue, FigureCache, renderFigure, renderFigures, \
+    publishFigures
+
+
+def plotSpec(path):
+    """
+    FigureSpec d'une courbe avec titre, labels et légende.
+    """
+    spec = FigureSpec(path, figsize=(4, 3))
+    spec.add('figure.suptitle', 'titre')
+    spec.add('plot', np.arange(5), np.arange(5) ** 2, 'o', color='blue', label='data')
+    spec.add('errorbar', np.arange(5), np.arange(5), yerr=np.ones(5), fmt='none', capsize=6)
+    spec.add('xaxis.set_ticks_position', 'top')
+    spec.add('set_xlabel', 'x')
+    spec.add('legend')
+    return spec
+
+
+class TestFigureSpecs(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+
+    def test_render(self):
+        path = os.path.join(self.folder, "courbe.png")
+        spec = plotSpec(path)
+        self.assertEqual(path, renderFigure(pickle.loads(pickle.dumps(spec))))
+        self.assertGreater(os.path.getsize(path), 0)
+
+    def test_render_colormap(self):
+        path = os.path.join(self.folder, "colormap.jpg")
+        spec = FigureSpec(path, figsize=(4, 3), colorbar=True, constrained_layout=True)
+        spec.add('imshow', np.arange(96, dtype=float).reshape(8, 12), cmap='jet')
+        renderFigure(spec)
+        self.assertTrue(os.path.exists(path))
+
+    def test_render_error(self):
+        spec = FigureSpec(os.path.join(self.folder, "erreur.png")).add('methode_inconnue')
+        ok = plotSpec(os.path.join(self.folder, "ok.png"))
+        # une figure en erreur n'empêche pas les autres d'être dessinées
+        with self.assertLogs('zymosoft_assistant.scripts.figureSpecs', level='ERROR'):
+            self.assertEqual([ok.path], renderFigures([spec, ok]))
+        self.assertFalse(os.path.exists(spec.path))
+
+    def test_queue(self):
+        sous_dossier = os.path.join(self.folder, "validation_comparison")
+        os.mkdir(sous_dossier)
+        specs = [plotSpec(os.path.join(self.folder, "a.png")), plotSpec(os.path.join(sous_dossier, "b.png")),
+                 plotSpec(os.path.join(self.folder + "_autre", "c.png"))]
+        figure_queue = FigureQueue()
+        self.assertEqual([], publishFigures(specs, figure_queue))
+
+        # rien n'est dessiné tant que les figures ne sont pas demandées
+        self.assertFalse(os.path.exists(specs[0].path))
+        self.assertEqual(3, len(figure_queue.pending()))
+        self.assertEqual([specs[1]], figure_queue.pending(sous_dossier))
+        self.assertEqual(2, len(figure_queue.pending(self.folder)))
+
+        self.assertTrue(figure_queue.render(specs[1].path))
+        self.assertFalse(figure_queue.render(specs[1].path))
+        self.assertTrue(os.path.exists(specs[1].path))
+
+        self.assertEqual([specs[0].path], figure_queue.renderAll(self.folder))
+        self.assertEqual([specs[2]], figure_queue.pending())
+
+    def test_publish_sans_file(self):
+        spec = plotSpec(os.path.join(self.folder, "direct.png"))
+        self.assertEqual([spec.path], publishFigures([spec]))
+        self.assertTrue(os.path.exists(spec.path))
+
+
+class TestFigureCache(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.figure_cache = FigureCache(os.path.join(self.folder, "figure_cache"))
+
+    def test_fingerprint(self):
+        spec = plotSpec(os.path.join(self.folder, "a.png"))
+        # le chemin ne compte pas, les données, les paramètres et le format si
+        self.assertEqual(spec.fingerprint(), plotSpec(os.path.join(self.folder, "b.png")).fingerprint())
+        self.assertNotEqual(spec.fingerprint(), plotSpec(os.path.join(self.folder, "a.jpg")).fingerprint())
+        self.assertNotEqual(spec.fingerprint(), plotSpec(os.path.join(self.folder, "a.png")).add('legend').fingerprint())
+        autre = plotSpec(os.path.join(self.folder, "a.png"))
+        autre.layers[1][1][1][2] = 5.0
+        self.assertNotEqual(spec.fingerprint(), autre.fingerprint())
+        self.assertNotEqual(spec.fingerprint(), FigureSpec(spec.path, figsize=(4, 3), dpi=50).fingerprint())
+
+    def test_render_depuis_cache(self):
+        spec = plotSpec(os.path.join(self.folder, "courbe.png"))
+        self.assertEqual([spec.path], renderFigures([spec], figure_cache=self.figure_cache))
+        self.assertEqual(1, len(os.listdir(self.figure_cache.cache_dir)))
+        with open(spec.path, 'rb') as file:
+            image = file.read()
+
+        # même figure ailleurs : recopiée depuis le cache, sans rendu
+        copie = plotSpec(os.path.join(self.folder, "copie.png"))
+        with patch.object(figureSpecs, 'renderFigure') as render:
+            self.assertEqual([copie.path], renderFigures([copie], figure_cache=self.figure_cache))
+            render.assert_not_called()
+        with open(copie.path, 'rb') as file:
+            self.assertEqual(image, file.read())
+
+        # figure modifiée : redessinée
+        modifiee = plotSpec(os.path.join(self.folder, "copie.png")).add('set_ylabel', 'y')
+        with patch.object(figureSpecs, 'renderFigure', wraps=figureSpecs.renderFigure) as render:
+            renderFigures([modifiee], figure_cache=self.figure_cache)
+            render.assert_called_once()
+        self.assertEqual(2, len(os.listdir(self.figure_cache.cache_dir)))
+
+    def test_queue_avec_cache(self):
+        spec = plotSpec(os.path.join(self.folder, "a.png"))
+        renderFigures([spec], figure_cache=self.figure_cache)
+        os.remove(spec.path)
+        figure_queue = FigureQueue()
+        figure_queue.add([plotSpec(spec.path)])
+        with patch.object(figureSpecs, 'renderFigure') as render:
+            self.assertEqual([spec.path], figure_queue.renderAll(self.folder, figure_cache=self.figure_cache))
+            render.assert_not_called()
+        self.assertTrue(os.path.exists(spec.path))
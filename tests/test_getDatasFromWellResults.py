@@ -0,0 +1,259 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import openpyxl
+import pandas as pd
+
+from zymosoft_assistant.scripts import getDatasFromWellResults
+from zymosoft_assistant.scripts.getDatasFromWellResults import (
+    WellResultsWorkbook, readWellResultsSheets, indexSections, getDataForAreaInWellResultFile, getBlankDataForAreaInWellResultFile, calculateLODLOQ,
+    processWellResults, calculateLODLOQComparison, compareWellResults, compareLODLOQ, parseEnzymoSections,
+    readEnzymoSections, calculate_tolerance, calculate_tolerances, withinTolerance
+)
+
+
+def writeWellResults(path, areas):
+    """
+    Écrit un fichier WellResults.xlsx avec une feuille par area.
+
+    :param path: Chemin du fichier à écrire.
+    :param areas: Liste de tuples (blancs, calibration) : liste de (zymunit, exclusion) et liste de (activité, écart type).
+    """
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    for index, (blanks, calibration) in enumerate(areas):
+        sheet = workbook.create_sheet(f"Area {index + 1}")
+        sheet.append(["Plate Reference", "GPA-01"])
+        sheet.append([])
+        sheet.append(["WellBlankResult"])
+        sheet.append(["Well", "Trouble", "Zymunit", "Exclusion", "Exclusion comment"])
+        for row, (zymunit, exclusion) in enumerate(blanks):
+            sheet.append([f"A{row + 1}", "", zymunit, exclusion, ""])
+        sheet.append([])
+        sheet.append(["WellCalibrationResult"])
+        sheet.append(["Activity", "Zymunit", "Mean", "Std"])
+        for activity, std in calibration:
+            sheet.append([activity, 1.0, 2.0, std])
+        sheet.append([])
+    workbook.save(path)
+
+
+class TestWellResultsWorkbook(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.acquisition_folder = os.path.join(self.folder, "acquisition")
+        self.reference_folder = os.path.join(self.folder, "reference")
+        os.makedirs(self.acquisition_folder)
+        os.makedirs(self.reference_folder)
+        self.acquisition_file = os.path.join(self.acquisition_folder, "WellResults.xlsx")
+        writeWellResults(self.acquisition_file, [
+            ([(1.0, False), ("2,0", "FALSE"), (9.0, True)], [(0.5, 1.5), ("1,0", 2.5), ("n/a", 1.0)]),
+            ([(1.0, False), (1.0, False)], [(0.5, 7.0), (1.0, 6.0)]),
+        ])
+        writeWellResults(os.path.join(self.reference_folder, "WellResults.xlsx"), [
+            ([(1.0, False), (1.0, False)], [(0.5, 1.0), (1.0, 3.0)]),
+            ([(1.0, False)], [(0.5, 1.0), (1.0, 5.0)]),
+        ])
+
+    def test_sections(self):
+        workbook = WellResultsWorkbook(self.acquisition_file)
+        self.assertEqual(2, workbook.number_of_areas)
+        self.assertEqual({'activity': [0.5, 1.0], 'values': [1.5, 2.5]}, workbook.calibrationData(0))
+        self.assertEqual([1.0, 2.0], workbook.blankValues(0))
+        self.assertEqual(["Well", "Trouble", "Zymunit", "Exclusion"], list(workbook.section(0, 'Blank').columns[:4]))
+        with self.assertRaises(ValueError):
+            workbook.calibrationData(2)
+
+    def test_index_sections_in_one_scan(self):
+        sheet = pd.DataFrame([
+            ["WellBlankResult", None, None, None],
+            ["Well", "Trouble", "Zymunit", "Exclusion"],
+            ["A1", None, "1,5", False],
+            [None, None, None, None],
+            ["WellCalibrationResult", None, None, None],
+            ["Activity", "Zymunit", "Mean", "Std"],
+            [0.5, 1.0, 2.0, 0.1],
+            [1.0, 1.0, 2.0, 0.2],
+        ])
+        found, errors = indexSections(sheet, "Area 1")
+        self.assertEqual(["Blank", "Calibration"], sorted(found))
+        self.assertEqual(1, len(found["Blank"]))
+        self.assertEqual(["Activity", "Zymunit", "Mean", "Std"], list(found["Calibration"].columns))
+        self.assertEqual([0.5, 1.0], found["Calibration"]["Activity"].tolist())
+        self.assertEqual("Section WellSampleResult non trouvée dans Area 1", errors["Samples"])
+
+        workbook = WellResultsWorkbook(self.acquisition_file)
+        with self.assertRaisesRegex(ValueError, "WellSampleResult"):
+            workbook.section(0, "Samples")
+        self.assertEqual(["Blank", "Calibration"], sorted(workbook.sections(0)))
+
+    def test_index_areas_in_process_pool(self):
+        sequential = WellResultsWorkbook(self.acquisition_file)
+        sequential.indexAreas()
+        pooled = WellResultsWorkbook(self.acquisition_file)
+        pooled.indexAreas(workers=2)
+        for area_index in range(2):
+            self.assertEqual(sorted(sequential.sections(area_index)), sorted(pooled.sections(area_index)))
+            pd.testing.assert_frame_equal(sequential.section(area_index, "Blank"), pooled.section(area_index, "Blank"))
+        self.assertEqual(sequential.calibrationData(1), pooled.calibrationData(1))
+
+    def test_legacy_functions_accept_workbook(self):
+        workbook = WellResultsWorkbook(self.acquisition_file)
+        for area_index in range(2):
+            self.assertEqual(getDataForAreaInWellResultFile(self.acquisition_file, area_index),
+                             getDataForAreaInWellResultFile(workbook, area_index))
+            self.assertEqual(getBlankDataForAreaInWellResultFile(self.acquisition_file, area_index),
+                             getBlankDataForAreaInWellResultFile(workbook, area_index))
+        self.assertAlmostEqual(1.5 + 3 * 0.5, calculateLODLOQ(workbook, 0)['lod'])
+
+    def test_comparisons_read_each_file_once(self):
+        with patch.object(getDatasFromWellResults, "readWellResultsSheets",
+                          wraps=readWellResultsSheets) as mock_read, patch("builtins.print"):
+            well_results = processWellResults(self.acquisition_folder, self.reference_folder)
+            lod_loq = calculateLODLOQComparison(self.acquisition_folder, self.reference_folder)
+        self.assertEqual(4, mock_read.call_count)
+
+        self.assertEqual([0.5, 1.0, 0.5, 1.0], well_results['activité'].tolist())
+        self.assertEqual([True, True, False, True], well_results['valid'].tolist())
+        self.assertEqual([3.0, 'ERROR'], lod_loq['LOD_Acq'].tolist())
+
+        acquisition = WellResultsWorkbook(self.acquisition_file)
+        reference = WellResultsWorkbook(os.path.join(self.reference_folder, "WellResults.xlsx"))
+        with patch("builtins.print"):
+            pd.testing.assert_frame_equal(well_results, compareWellResults(acquisition, reference))
+            pd.testing.assert_frame_equal(lod_loq, compareLODLOQ(acquisition, reference))
+
+    def test_read_sheets_matches_read_excel(self):
+        expected = pd.read_excel(self.acquisition_file, sheet_name=None)
+        sheets = readWellResultsSheets(self.acquisition_file)
+        self.assertEqual(list(expected), list(sheets))
+        for name, frame in expected.items():
+            # mêmes valeurs et mêmes types, y compris les 0/1 et booléens mêlés de la colonne D
+            pd.testing.assert_frame_equal(frame, sheets[name])
+            for expected_value, value in zip(frame.values.ravel(), sheets[name].values.ravel()):
+                self.assertIs(type(expected_value), type(value))
+
+    def test_booleens_et_entiers_comme_read_excel(self):
+        # écarts types de calibration à 0 et 1.0 et exclusions booléennes dans la colonne D mixte
+        writeWellResults(self.acquisition_file, [
+            ([(1.0, False), (2.0, False), (5.0, True)], [(0.5, 0), (1.0, 1.0), (2.0, 0.0)]),
+            ([(0.0, False), (1.0, "False")], [(0.5, 1), (1.0, False)]),
+        ])
+        writeWellResults(os.path.join(self.reference_folder, "WellResults.xlsx"), [
+            ([(1.0, False), (1.0, True)], [(0.5, 1.0), (1.0, 0), (2.0, 1)]),
+            ([(1.0, False), (0.0, False)], [(0.5, 0.0), (1.0, 1.0)]),
+        ])
+
+        def readExcel(file_path):
+            return pd.read_excel(file_path, sheet_name=None)
+
+        with patch("builtins.print"):
+            well_results = processWellResults(self.acquisition_folder, self.reference_folder)
+            lod_loq = calculateLODLOQComparison(self.acquisition_folder, self.reference_folder)
+            with patch.object(getDatasFromWellResults, "readWellResultsSheets", side_effect=readExcel):
+                expected_well_results = processWellResults(self.acquisition_folder, self.reference_folder)
+                expected_lod_loq = calculateLODLOQComparison(self.acquisition_folder, self.reference_folder)
+        pd.testing.assert_frame_equal(expected_well_results, well_results)
+        pd.testing.assert_frame_equal(expected_lod_loq, lod_loq)
+
+    def test_read_sheets_falls_back_to_pandas(self):
+        expected = {"Area 1": pd.DataFrame()}
+        with patch("openpyxl.load_workbook", side_effect=OSError("format non pris en charge")), \
+                patch("pandas.read_excel", return_value=expected) as mock_read_excel:
+            self.assertIs(expected, readWellResultsSheets(self.acquisition_file))
+        mock_read_excel.assert_called_once_with(self.acquisition_file, sheet_name=None)
+
+
+class TestTolerances(unittest.TestCase):
+    def test_piecewise_linear_curve(self):
+        references = [-1.0, 0.0, 2.5, 5.0, 7.5, 10.0, 12.0, float("nan")]
+        expected = [5.0, 5.0, 4.0, 3.0, 2.5, 2.0, 2.0, 2.0]
+        self.assertEqual(expected, calculate_tolerances(references).tolist())
+        self.assertEqual(expected, [calculate_tolerance(reference) for reference in references])
+
+    def test_within_tolerance(self):
+        self.assertEqual([True, True, False, False],
+                         withinTolerance([-10.0, 2.0, 2.5, float("nan")], calculate_tolerances([20.0] * 4)).tolist())
+
+
+def enzymoRows(first_sheet, extra_empty_rows=0):
+    """
+    Lignes d'un onglet WellResults pour compare_enzymo_2_ref (sans la ligne d'en-tête), sur 3 colonnes.
+    extra_empty_rows ajoute des lignes vides supplémentaires entre les sections.
+    """
+    empty = [None, None, None]
+
+    def section(title, rows, header=("Well", "Zymunit", "Exclusion")):
+        return [empty] * (1 + extra_empty_rows) + [[title, None, None], list(header)] + rows
+
+    rows = [["Plate Reference", "GPA", None], ["Date", "01/01/2025", None], empty] if first_sheet else []
+    rows += [["Fit", "Linear", None], ["a", 1.5, None]]
+    rows += section("WellBlankResult", [["A1", 1.0, "False"], ["A2", 2.0, "True"]])
+    rows += section("WellCalibrationResult", [[0.5, 1.0, 2.0]], ("Activity", "Zymunit", "SD"))
+    rows += section("WellGammeResult", [["B1", 10.0, "False"]])
+    rows += section("WellSampleResult", [["S1", 5.0, 0.1]], ("Sample", "Activity", "RSD"))
+    rows += section("WellOtherResult", [["x", 1.0, None]])
+    rows += section("WellSampleDetailResult", [["C1", 3.0, "False"], ["C2", 4.0, "False"]])
+    return rows
+
+
+class TestEnzymoSections(unittest.TestCase):
+    def test_sections_of_first_and_following_sheets(self):
+        for first_sheet in (True, False):
+            sections = parseEnzymoSections(pd.DataFrame(enzymoRows(first_sheet)), "Area 1")
+            self.assertEqual([["Fit", "Linear", None], ["a", 1.5, None]], sections.entete.values.tolist())
+            self.assertEqual([["A1", 1.0, "False"], ["A2", 2.0, "True"]], sections.blank.values.tolist())
+            self.assertEqual([["B1", 10.0, "False"]], sections.gamme.values.tolist())
+            self.assertEqual(["S1", 5.0, 0.1], sections.sample.values[0].tolist())
+            self.assertEqual(["C1", "C2"], sections.sample_detail.iloc[:, 0].tolist())
+
+    def test_numeric_columns_are_float(self):
+        sections = parseEnzymoSections(pd.DataFrame(enzymoRows(False)), "Area 1")
+        self.assertEqual(["object", "float64", "object"], [str(dtype) for dtype in sections.blank.dtypes])
+        self.assertEqual(["object", "float64", "float64"], [str(dtype) for dtype in sections.sample.dtypes])
+
+    def test_sections_found_by_markers(self):
+        # Des lignes vides supplémentaires entre les sections ne décalent pas le découpage
+        for first_sheet in (True, False):
+            expected = parseEnzymoSections(pd.DataFrame(enzymoRows(first_sheet)), "Area 1")
+            sections = parseEnzymoSections(pd.DataFrame(enzymoRows(first_sheet, extra_empty_rows=2)), "Area 1")
+            for name in ("entete", "blank", "gamme", "sample", "sample_detail"):
+                pd.testing.assert_frame_equal(getattr(expected, name), getattr(sections, name))
+
+    def test_csv_separator_rows(self):
+        # Lignes vides des anciens exports CSV remplacées par le séparateur ';;;;;;;;;'
+        rows = [[getDatasFromWellResults.ENZYMO_CSV_SEPARATOR, None, None] if row == [None, None, None] else row
+                for row in enzymoRows(False)]
+        sections = parseEnzymoSections(pd.DataFrame(rows), "Area 1")
+        self.assertEqual([["B1", 10.0, "False"]], sections.gamme.values.tolist())
+        self.assertEqual(["C1", "C2"], sections.sample_detail.iloc[:, 0].tolist())
+
+    def test_unrecognised_sheet(self):
+        with self.assertRaisesRegex(ValueError, "Structure de l'onglet Area 2 non reconnue"):
+            parseEnzymoSections(pd.DataFrame(enzymoRows(False)[:10]), "Area 2")
+
+    def test_read_workbook_once(self):
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder)
+        path = os.path.join(folder, "WellResults.xlsx")
+        workbook = openpyxl.Workbook()
+        workbook.remove(workbook.active)
+        for index, rows in enumerate((enzymoRows(True), enzymoRows(False), [["Fit", "Linear"]])):
+            sheet = workbook.create_sheet(f"Area {index + 1}")
+            sheet.append(["Results", "h1", "h2"])
+            for row in rows:
+                sheet.append(row)
+        workbook.save(path)
+
+        with patch.object(getDatasFromWellResults, "readWellResultsSheets",
+                          wraps=readWellResultsSheets) as mock_read, \
+                self.assertLogs(getDatasFromWellResults.logger, "WARNING"):
+            sections = readEnzymoSections(path)
+        self.assertEqual(1, mock_read.call_count)
+        self.assertEqual(["Area 1", "Area 2", "Area 3"], list(sections))
+        self.assertIsNone(sections["Area 3"])
+        self.assertEqual(["C1", "C2"], sections["Area 2"].sample_detail.iloc[:, 0].tolist())
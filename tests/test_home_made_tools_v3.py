@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from zymosoft_assistant.scripts.home_made_tools_v3 import (
+    PLAQUE_96, PLAQUE_384, PLAQUE_1536, PlateGeometry, PlaqueSynthese, import_data_from_csv_synthese_zymintern,
+    import_data_from_csv_synthese_zymintern_nanofilm
+)
+from test_referenceStore import SYNTHESE_COLUMNS, writeSynthese
+
+NANOFILM_COLUMNS = [
+    "Position_plaque", "thickness_after_statiscal_filter", "thickness_std_after_statiscal_filter", "455_intensity",
+    "730_intensity", "number_of_area_BEFORE_statiscal_filter", "number_of_area_after_statiscal_filter", "x", "y", "z"
+]
+
+
+class TestSynthesePlate(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.path = os.path.join(self.folder, "synthese_interferometric_data.csv")
+
+    def test_positions(self):
+        j_letter, j_col = PLAQUE_96.indices(["A1", "B7", "H12"])
+        self.assertEqual([0, 1, 7], j_letter.tolist())
+        self.assertEqual([0, 6, 11], j_col.tolist())
+        self.assertEqual([0, 18, 95], PLAQUE_96.index(["A1", "B7", "H12"]).tolist())
+        self.assertEqual([-1], PLAQUE_96.indices(["a3"])[0].tolist())
+
+    def test_geometries(self):
+        self.assertEqual(["A", "P"], [PLAQUE_384.lettres[0], PLAQUE_384.lettres[-1]])
+        self.assertEqual(["Z", "AA", "AF"], [PLAQUE_1536.lettres[25], PLAQUE_1536.lettres[26], PLAQUE_1536.lettres[-1]])
+        self.assertEqual([26 * 48 + 47, 1535], PLAQUE_1536.index(["AA48", "AF48"]).tolist())
+        noms = PLAQUE_384.noms_puits()
+        self.assertEqual(384, len(noms))
+        self.assertEqual(PLAQUE_384.index(noms).tolist(), list(range(384)))
+        self.assertEqual(PLAQUE_96, PlateGeometry(8, 12))
+        self.assertEqual((16, 24, 3), PLAQUE_384.zeros(3).shape)
+
+    def test_import_zymintern(self):
+        writeSynthese(self.path)
+        plaque = import_data_from_csv_synthese_zymintern(self.path)
+        self.assertIsInstance(plaque, PlaqueSynthese)
+        self.assertEqual((8, 8, 12), plaque.data.shape)
+
+        volume, volume_std, diametre, diametre_std, N_dot_detected, N_dot_keep, N_cycle, porcent_dot_keep = plaque
+        self.assertEqual(10.0 + 18, volume[1, 6])
+        self.assertIs(plaque['volume'].base, volume.base)
+        self.assertEqual(plaque.puits('B7')['volume'], volume[1, 6])
+        self.assertAlmostEqual(90.0, porcent_dot_keep[0, 0])
+        self.assertAlmostEqual(82.0, plaque.puits('A9')['porcent_dot_keep'])
+
+    def test_import_384(self):
+        rows = [[nom, float(index), 0.5, 40.0, 1.0, 100, 50, 3.0, 0, 0, 0]
+                for index, nom in enumerate(PLAQUE_384.noms_puits())]
+        pd.DataFrame(rows, columns=SYNTHESE_COLUMNS).to_csv(self.path, sep=';', index=False)
+        plaque = import_data_from_csv_synthese_zymintern(self.path)
+        self.assertEqual(PLAQUE_384, plaque.geometrie)
+        self.assertEqual((8, 16, 24), plaque.data.shape)
+        self.assertEqual(24.0 * 15 + 23, plaque.puits('P24')['volume'])
+        self.assertEqual(list(range(384)), plaque['volume'].ravel().tolist())
+
+    def test_missing_wells_and_empty_counts(self):
+        rows = [[f"{'ABCDEFGH'[index // 12]}{index % 12 + 1}", 1.0, 2.0, 3.0, 4.0, 0, 0, 1, 0, 0]
+                for index in range(96)]
+        rows[5][0] = "A1"
+        pd.DataFrame(rows, columns=NANOFILM_COLUMNS).to_csv(self.path, sep=';', index=False)
+        plaque = import_data_from_csv_synthese_zymintern_nanofilm(self.path)
+        # A6 absent du fichier : reste à 0, les puits lus sans zone donnent nan
+        self.assertEqual(0.0, plaque['thickness'][0, 5])
+        self.assertEqual(0.0, plaque['pourcentage_zones_gardees'][0, 5])
+        self.assertTrue(np.isnan(plaque['pourcentage_zones_gardees'][0, 0]))
+
+        pd.DataFrame(rows[:90], columns=NANOFILM_COLUMNS).to_csv(self.path, sep=';', index=False)
+        with self.assertRaisesRegex(ValueError, "90 puits au lieu de 96"):
+            import_data_from_csv_synthese_zymintern_nanofilm(self.path)
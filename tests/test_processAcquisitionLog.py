@@ -1,7 +1,65 @@
+import os
+import shutil
+import tempfile
 import unittest
-from unittest.mock import patch, mock_open
+from unittest.mock import patch
 
-from zymosoft_assistant.scripts.processAcquisitionLog import findLastAcquisition
+import pandas as pd
+
+from zymosoft_assistant.scripts import processAcquisitionLog
+from zymosoft_assistant.scripts.processAcquisitionLog import (
+    findLastAcquisition, findLastAcquisitionOffset, calculateAcquisitionDuration, analyzeLogFile,
+    LogStreamAnalyzer, LOG_PATTERNS, extractWellName, LogIndex, countNumberOfDriftFix, identifyAcquisitionType,
+    LogTailer, analyzeAllAcquisitions, generateAcquisitionsReport, findLogFiles, generateBatchLogReport,
+    extractLogEvents, loadLogEvents
+)
+
+PRIOR_LOG = (
+    "[01/03/2025 08:00:00] Starting acquisition of plate 1\n"
+    "[01/03/2025 08:00:05] Reference wells A1 A12 H12 re-aligned.\n"
+    '[01/03/2025 08:00:10] Going to well "B2"\n'
+    "[01/03/2025 08:00:11] [AUTOFOCUS][FOCUS] Done after 9 loop(s)\n"
+    "[01/03/2025 08:30:00] Stopping acquisition\n"
+    "[02/03/2025 09:00:00] Starting acquisition of plate 2\n"
+    '[02/03/2025 09:00:02] Going to well "A1"\n'
+    "[02/03/2025 09:00:03] [AUTOFOCUS][FOCUS] Done after 7 loop(s)\n"
+    "[02/03/2025 09:00:05] Reference wells A1 A12 H12 re-aligned.\n"
+    '[02/03/2025 09:00:10] Going to well "B2"\n'
+    "[02/03/2025 09:00:11] [AUTOFOCUS][FOCUS] Done after 2 loop(s)\n"
+    "[02/03/2025 09:00:12] DRIFT FIX: dx=1\n"
+    "[02/03/2025 09:00:13] [AUTOFOCUS][FOCUS] Time out after 5 loop(s)\n"
+    '[02/03/2025 09:00:20] Going to well "B3"\n'
+    "[02/03/2025 09:00:21] [AUTOFOCUS][FOCUS] Done after 4 loop(s)\n"
+    "[02/03/2025 09:45:00] Stopping acquisition\n"
+)
+
+CUSTOM_FOCUS_LOG = (
+    "[01/03/2025 08:00:00] Starting acquisition of plate\n"
+    "[01/03/2025 08:00:01] Starting auto-position of wells: A1 A12 H12\n"
+    '[01/03/2025 08:00:02] Going to well "A1"\n'
+    "[01/03/2025 08:00:03] [AUTOFOCUS][FOCUS] Adjusting position, move: 12\n"
+    "[01/03/2025 08:00:04] [AUTOFOCUS][OFF] Done\n"
+    "[01/03/2025 08:00:05] Reference wells A1 A12 H12 re-aligned.\n"
+    '[01/03/2025 08:00:10] Going to well "B2"\n'
+    "[01/03/2025 08:00:11] [AUTOFOCUS][FOCUS] Adjusting position, move: 3\n"
+    "[01/03/2025 08:00:12] [AUTOFOCUS][FOCUS] Adjusting position, move: 1\n"
+    "[01/03/2025 08:00:13] [AUTOFOCUS][OFF] Done\n"
+    '[01/03/2025 08:00:20] Going to well "B3"\n'
+    "[01/03/2025 08:00:21] [AUTOFOCUS][FOCUS] Adjusting position, move: 6\n"
+    "[01/03/2025 08:00:22] [AUTOFOCUS][FOCUS] Still not focused\n"
+    "[01/03/2025 08:10:00] Stopping acquisition\n"
+)
+
+
+def writeLog(test_case, content):
+    """
+    Écrit un log temporaire (UTF-8, fins de ligne conservées), supprimé à la fin du test.
+    """
+    fd, path = tempfile.mkstemp(suffix=".log")
+    with os.fdopen(fd, "wb") as file:
+        file.write(content.encode("utf-8"))
+    test_case.addCleanup(os.remove, path)
+    return path
 
 
 class TestFindLastAcquisition(unittest.TestCase):
@@ -11,15 +69,13 @@ class TestFindLastAcquisition(unittest.TestCase):
             "Starting acquisition at time 12:00\n"
             "Reference wells A1 A12 H12 re-aligned."
         )
-        with patch("builtins.open", mock_open(read_data=log_data)):
-            line, line_number = findLastAcquisition("dummy_path.log")
+        line, line_number = findLastAcquisition(writeLog(self, log_data))
         self.assertEqual("Starting acquisition at time 12:00", line)
         self.assertEqual(1, line_number)
 
     def test_find_last_acquisition_no_matches(self):
         log_data = "Initializing system...\nSystem ready.\nNo acquisition found."
-        with patch("builtins.open", mock_open(read_data=log_data)):
-            line, line_number = findLastAcquisition("dummy_path.log")
+        line, line_number = findLastAcquisition(writeLog(self, log_data))
         self.assertIsNone(line)
         self.assertIsNone(line_number)
 
@@ -28,8 +84,7 @@ class TestFindLastAcquisition(unittest.TestCase):
             "Reference wells A1 A12 H12 re-aligned.\n"
             "Initializing done.\nSystem ready."
         )
-        with patch("builtins.open", mock_open(read_data=log_data)):
-            line, line_number = findLastAcquisition("dummy_path.log")
+        line, line_number = findLastAcquisition(writeLog(self, log_data))
         self.assertIsNone(line)
         self.assertIsNone(line_number)
 
@@ -40,8 +95,7 @@ class TestFindLastAcquisition(unittest.TestCase):
             "Starting acquisition at time 14:30\n"
             "System shutdown."
         )
-        with patch("builtins.open", mock_open(read_data=log_data)):
-            line, line_number = findLastAcquisition("dummy_path.log")
+        line, line_number = findLastAcquisition(writeLog(self, log_data))
         self.assertEqual("Starting acquisition at time 14:30", line)
         self.assertEqual(2, line_number)
 
@@ -51,9 +105,323 @@ class TestFindLastAcquisition(unittest.TestCase):
                 findLastAcquisition("dummy_path.log")
             self.assertIn("Erreur lors de la recherche de la dernière acquisition", str(context.exception))
 
+    def test_find_last_acquisition_crlf(self):
+        line, line_number = findLastAcquisition(writeLog(self, PRIOR_LOG.replace("\n", "\r\n")))
+        self.assertEqual("[02/03/2025 09:00:00] Starting acquisition of plate 2", line)
+        self.assertEqual(5, line_number)
+
     def test_find_last_acquisition_empty_file(self):
         log_data = ""
-        with patch("builtins.open", mock_open(read_data=log_data)):
-            line, line_number = findLastAcquisition("dummy_path.log")
+        line, line_number = findLastAcquisition(writeLog(self, log_data))
         self.assertIsNone(line)
         self.assertIsNone(line_number)
+
+
+class TestAnalyzeLogFile(unittest.TestCase):
+    def test_analyze_prior_log_uses_last_acquisition(self):
+        results = analyzeLogFile(writeLog(self, PRIOR_LOG))
+        self.assertEqual("prior", results["acquisition_type"])
+        self.assertEqual("[02/03/2025 09:00:00] Starting acquisition of plate 2", results["last_acquisition"])
+        self.assertEqual([2, 4], results["values"])
+        self.assertEqual(3, results["total_measurements"])
+        self.assertEqual(1, results["timeout_measurements"])
+        self.assertEqual(2, results["total_wells"])
+        self.assertEqual(1, results["cycles_detected"])
+        self.assertEqual(1, results["drift_fix_count"])
+        self.assertTrue(results["acquisition_duration"]["success"])
+        self.assertEqual(45.0, results["acquisition_duration"]["duration_minutes"])
+
+    def test_analyze_custom_focus_log_ignores_alignment(self):
+        results = analyzeLogFile(writeLog(self, CUSTOM_FOCUS_LOG))
+        self.assertEqual("custom_focus", results["acquisition_type"])
+        self.assertEqual([3, 6], results["values"])
+        self.assertEqual(1, results["done_measurements"])
+        self.assertEqual(1, results["timeout_measurements"])
+        self.assertNotIn("A1", results["wells_data"])
+        self.assertNotIn("cycles_detected", results)
+
+    def test_stream_analyzer_results_can_be_read_while_feeding(self):
+        analyzer = LogStreamAnalyzer()
+        lines = CUSTOM_FOCUS_LOG.splitlines(keepends=True)
+        for line in lines[:9]:
+            analyzer.feed(line)
+        self.assertEqual([3], analyzer.results()["values"])
+        for line in lines[9:]:
+            analyzer.feed(line)
+        self.assertEqual(analyzeLogFile(writeLog(self, CUSTOM_FOCUS_LOG)), analyzer.results())
+
+    def test_analyze_missing_file(self):
+        with self.assertRaises(ValueError) as context:
+            analyzeLogFile("missing_file.log")
+        self.assertIn("Erreur lors de l'analyse du fichier de log", str(context.exception))
+
+
+class TestFindLastAcquisitionOffset(unittest.TestCase):
+    def test_offset_across_small_blocks(self):
+        path = writeLog(self, PRIOR_LOG)
+        line, offset = findLastAcquisitionOffset(path, block_size=7)
+        self.assertEqual("[02/03/2025 09:00:00] Starting acquisition of plate 2", line)
+        self.assertEqual(PRIOR_LOG.index("[02/03/2025 09:00:00] Starting"), offset)
+
+    def test_offset_with_crlf_line_endings(self):
+        path = writeLog(self, PRIOR_LOG.replace("\n", "\r\n"))
+        line, offset = findLastAcquisitionOffset(path, block_size=16)
+        self.assertEqual("[02/03/2025 09:00:00] Starting acquisition of plate 2", line)
+
+    def test_offset_no_acquisition(self):
+        path = writeLog(self, "Initializing system...\nSystem ready.\n")
+        self.assertEqual((None, None), findLastAcquisitionOffset(path))
+
+    def test_duration_line_numbers(self):
+        duration = calculateAcquisitionDuration(writeLog(self, PRIOR_LOG))
+        self.assertTrue(duration["success"])
+        self.assertEqual(5, duration["start_line"])
+        self.assertEqual(15, duration["end_line"])
+        self.assertEqual(2700, duration["duration_seconds"])
+
+
+class TestLogPatterns(unittest.TestCase):
+    SAMPLES = {
+        "done_loops": "[AUTOFOCUS][FOCUS]  Done after 3 loop(s)",
+        "timeout_loops": "[AUTOFOCUS][FOCUS] Time out after 12 loop(s)",
+        "move": "[AUTOFOCUS][FOCUS] Adjusting Z, move: 4",
+        "max_retry": "[AUTOFOCUS][FOCUS] Focus not reached after 5 moves. Trying alternate commands",
+        "still_not": "[AUTOFOCUS][FOCUS] Still not focused",
+        "autofocus_off_done": "[AUTOFOCUS][OFF] Done",
+        "auto_position_start": "Starting auto-position of wells: A1 A12 H12",
+        "reference_aligned": "Reference wells A1 A12 H12 re-aligned.",
+        "well_name": 'Going to well "B7"',
+        "timestamp": "[02/03/2025 09:00:00] Stopping acquisition",
+    }
+
+    def test_every_pattern_matches_its_sample(self):
+        self.assertEqual(set(LOG_PATTERNS), set(self.SAMPLES))
+        for name, pattern in LOG_PATTERNS.items():
+            self.assertIsNotNone(pattern.search(self.SAMPLES[name]), name)
+
+    def test_literal_prefilter_rejects_unrelated_lines(self):
+        for pattern in LOG_PATTERNS.values():
+            self.assertIsNone(pattern.search("[SERIAL][IN] MOTOR STEP 42"))
+
+    def test_extract_well_name_does_not_print(self):
+        with patch("builtins.print") as mock_print:
+            self.assertEqual("B7", extractWellName('Going to well "B7"'))
+        mock_print.assert_not_called()
+
+
+class TestLogIndex(unittest.TestCase):
+    def test_marker_offsets_and_line_numbers(self):
+        with LogIndex(writeLog(self, PRIOR_LOG)) as index:
+            self.assertEqual(2, len(index.acquisitions))
+            self.assertEqual([0, 5], [index.lineNumber(offset) for offset in index.acquisitions])
+            self.assertEqual([11], [index.lineNumber(offset) for offset in index.offsets("drift_fix")])
+            self.assertEqual("[02/03/2025 09:45:00] Stopping acquisition", index.line(index.offsets("stopping")[-1]))
+            self.assertEqual(16, index.lineCount())
+
+    def test_analyze_last_acquisition_matches_analyze_log_file(self):
+        path = writeLog(self, PRIOR_LOG.replace("\n", "\r\n"))
+        with LogIndex(path) as index:
+            self.assertEqual(analyzeLogFile(path), index.analyzeAcquisition())
+
+    def test_analyze_previous_acquisition(self):
+        with LogIndex(writeLog(self, PRIOR_LOG)) as index:
+            results = index.analyzeAcquisition(0)
+        self.assertEqual("[01/03/2025 08:00:00] Starting acquisition of plate 1", results["last_acquisition"])
+        self.assertEqual([9], results["values"])
+        self.assertEqual(0, results["drift_fix_count"])
+        self.assertEqual(30.0, results["acquisition_duration"]["duration_minutes"])
+
+    def test_offsets_after_loop_search(self):
+        with LogIndex(writeLog(self, PRIOR_LOG)) as index:
+            self.assertTrue(index.containsLoop())
+            self.assertEqual(2, len(index.acquisitions))
+
+    def test_unknown_acquisition(self):
+        with LogIndex(writeLog(self, PRIOR_LOG)) as index:
+            with self.assertRaises(ValueError):
+                index.analyzeAcquisition(2)
+
+    def test_empty_file(self):
+        path = writeLog(self, "")
+        with LogIndex(path) as index:
+            self.assertEqual([], index.acquisitions)
+            self.assertEqual(0, index.lineCount())
+        self.assertEqual("custom_focus", identifyAcquisitionType(path))
+        self.assertEqual(0, countNumberOfDriftFix(path))
+
+
+class TestLogEventTable(unittest.TestCase):
+    def test_typed_columns(self):
+        table = extractLogEvents(writeLog(self, PRIOR_LOG))
+        events = table.events
+        self.assertEqual(16, table.line_count)
+        self.assertEqual("int64", str(events["line_number"].dtype))
+        self.assertEqual("category", str(events["event"].dtype))
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(events["timestamp"]))
+        done = events[events["event"] == "done_loops"]
+        self.assertEqual([9, 7, 2, 4], done["loops"].astype(int).tolist())
+        self.assertEqual(PRIOR_LOG.index("[02/03/2025 09:00:21]"), done["offset"].iloc[-1])
+        self.assertEqual([0, 5], table.acquisitionLineNumbers().tolist())
+
+    def test_analysis_matches_line_parsers(self):
+        for content in (PRIOR_LOG, CUSTOM_FOCUS_LOG, PRIOR_LOG.replace("\n", "\r\n")):
+            path = writeLog(self, content)
+            table = extractLogEvents(path)
+            self.assertEqual(analyzeLogFile(path), table.analyze())
+            self.assertEqual(analyzeAllAcquisitions(path),
+                             [table.analyze(i) for i in range(len(table.acquisitionLineNumbers()))])
+
+    def test_measurement_before_first_well_raises(self):
+        path = writeLog(self, "Starting acquisition\nReference wells A1 A12 H12 re-aligned.\n"
+                               "[AUTOFOCUS][FOCUS] Done after 2 loop(s)\n")
+        with self.assertRaises(ValueError):
+            extractLogEvents(path).analyze()
+
+    def test_well_statistics(self):
+        statistics = extractLogEvents(writeLog(self, PRIOR_LOG)).wellStatistics()
+        self.assertEqual(["B2", "B3"], statistics["Puits"].tolist())
+        self.assertEqual([1, 0], statistics["Mesures 'Timeout'"].tolist())
+        self.assertEqual([2.0, 4.0], statistics["Nombre moyen de loops/moves"].tolist())
+
+
+class TestLogEventCache(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.cache_dir = os.path.join(self.folder, "cache")
+        self.path = os.path.join(self.folder, "ZymoCubeCtrl.log")
+
+    def _write(self, content, mode="wb"):
+        with open(self.path, mode) as file:
+            file.write(content.encode("utf-8"))
+
+    def test_cache_hit_does_not_reparse(self):
+        self._write(PRIOR_LOG)
+        expected = loadLogEvents(self.path, self.cache_dir).analyze()
+        self.assertEqual(1, len(os.listdir(self.cache_dir)))
+        with patch.object(processAcquisitionLog, "extractLogEvents") as mock_extract:
+            self.assertEqual(expected, loadLogEvents(self.path, self.cache_dir).analyze())
+        mock_extract.assert_not_called()
+
+    def test_appended_log_parses_only_the_tail(self):
+        split = PRIOR_LOG.index("Done after 2") + 4
+        self._write(PRIOR_LOG[:split])
+        loadLogEvents(self.path, self.cache_dir)
+        self._write(PRIOR_LOG[split:], mode="ab")
+
+        with patch.object(processAcquisitionLog, "extractLogEvents",
+                          wraps=processAcquisitionLog.extractLogEvents) as mock_extract:
+            table = loadLogEvents(self.path, self.cache_dir)
+        # La ligne coupée est relue depuis son début
+        self.assertEqual(PRIOR_LOG.index("[02/03/2025 09:00:11]"), mock_extract.call_args.args[1])
+        self.assertEqual(analyzeLogFile(self.path), table.analyze())
+        self.assertTrue(table.events.equals(extractLogEvents(self.path).events))
+
+    def test_rewritten_log_is_parsed_again(self):
+        self._write(PRIOR_LOG)
+        loadLogEvents(self.path, self.cache_dir)
+        self._write(PRIOR_LOG.replace("Done after 9", "Done after 8"))
+        os.utime(self.path, ns=(0, 0))
+        self.assertEqual([8], loadLogEvents(self.path, self.cache_dir).analyze(0)["values"])
+
+
+class TestLogTailer(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".log")
+        os.close(fd)
+        self.addCleanup(os.remove, self.path)
+
+    def _append(self, content):
+        with open(self.path, "ab") as file:
+            file.write(content.encode("utf-8"))
+
+    def test_incremental_polls_match_full_analysis(self):
+        tailer = LogTailer(self.path)
+        self.assertIsNone(tailer.poll())
+
+        split = PRIOR_LOG.index("Done after 2") + 4
+        self._append(PRIOR_LOG[:split])
+        progress = tailer.poll()
+        self.assertEqual("prior", progress["acquisition_type"])
+        self.assertEqual([], progress["values"])
+        self.assertEqual(10, progress["lines_read"])
+
+        self._append(PRIOR_LOG[split:])
+        progress = tailer.poll()
+        self.assertEqual(len(PRIOR_LOG.encode("utf-8")), progress["bytes_read"])
+        self.assertIsNone(tailer.poll())
+
+        expected = analyzeLogFile(self.path)
+        for key, value in expected.items():
+            self.assertEqual(value, progress[key], key)
+
+    def test_truncated_file_restarts(self):
+        tailer = LogTailer(self.path)
+        self._append(PRIOR_LOG)
+        tailer.poll()
+
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write(CUSTOM_FOCUS_LOG)
+        progress = tailer.poll()
+        self.assertEqual("custom_focus", progress["acquisition_type"])
+        self.assertEqual([3, 6], progress["values"])
+
+
+class TestAnalyzeAllAcquisitions(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, "ZymoCubeCtrl.log")
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write("System ready\n" + PRIOR_LOG)
+        self.addCleanup(os.rmdir, self.folder)
+        self.addCleanup(os.remove, self.path)
+
+    def test_one_result_per_acquisition(self):
+        results = analyzeAllAcquisitions(self.path)
+        self.assertEqual(2, len(results))
+        self.assertEqual([9], results[0]["values"])
+        self.assertEqual(30.0, results[0]["acquisition_duration"]["duration_minutes"])
+        self.assertEqual(1, results[0]["acquisition_duration"]["start_line"])
+        self.assertEqual(analyzeLogFile(self.path), results[1])
+
+    def test_process_pool_matches_sequential(self):
+        self.assertEqual(analyzeAllAcquisitions(self.path), analyzeAllAcquisitions(self.path, workers=2))
+
+    def test_acquisitions_report(self):
+        report = generateAcquisitionsReport(self.folder)
+        self.assertEqual([1, 2], report["Acquisition"].tolist())
+        self.assertEqual([9.0, 3.0], report["Nombre moyen de loops/moves"].tolist())
+
+
+class TestBatchLogReport(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        for folder, content in (("install_1", PRIOR_LOG), ("install_2/Diag/Temp", CUSTOM_FOCUS_LOG),
+                                ("install_3", "Starting acquisition\nReference wells A1 A12 H12 re-aligned.\n"
+                                              "[AUTOFOCUS][FOCUS] Done after 2 loop(s)\n")):
+            os.makedirs(os.path.join(self.root, folder))
+            with open(os.path.join(self.root, folder, "ZymoCubeCtrl.log"), "w", encoding="utf-8") as file:
+                file.write(content)
+        os.makedirs(os.path.join(self.root, "empty"))
+
+    def test_find_log_files(self):
+        log_files = findLogFiles(self.root)
+        self.assertEqual(3, len(log_files))
+        self.assertTrue(all(path.endswith("ZymoCubeCtrl.log") for path in log_files))
+
+    def test_batch_report_with_csv_and_progress(self):
+        output_csv = os.path.join(self.root, "batch.csv")
+        progress = []
+        report = generateBatchLogReport(self.root, workers=2, output_csv=output_csv,
+                                        progress_callback=lambda done, total, path: progress.append((done, total)))
+
+        self.assertEqual([(1, 3), (2, 3), (3, 3)], progress)
+        self.assertEqual(["prior", "custom_focus"], report["Type d'acquisition"].tolist()[:2])
+        self.assertTrue(pd.isna(report["Type d'acquisition"].iloc[2]))
+        self.assertIn("Erreur lors de l'analyse", report["Erreur"].iloc[2])
+        self.assertEqual(3, len(pd.read_csv(output_csv)))
+
+    def test_batch_report_without_pool(self):
+        report = generateBatchLogReport(self.root, workers=1)
+        self.assertEqual([3.0, 4.5], report["Nombre moyen de loops/moves"].tolist()[:2])
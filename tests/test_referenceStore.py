@@ -0,0 +1,112 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from zymosoft_assistant.scripts import referenceStore
+from zymosoft_assistant.scripts.getDatasFromWellResults import (
+    WellResultsWorkbook, processWellResults, calculateLODLOQComparison
+)
+from zymosoft_assistant.scripts.home_made_tools_v3 import import_data_from_csv_synthese_zymintern
+from zymosoft_assistant.scripts.referenceStore import ReferenceStore, StoredWellResults
+from test_getDatasFromWellResults import writeWellResults
+
+SYNTHESE_COLUMNS = [
+    "Position_plaque", "volume_after_statiscal_filter", "volume_std_after_statiscal_filter",
+    "diameter_mean_after_statiscal_filter", "diameter_std_after_statiscal_filter",
+    "number_of_dot_BEFORE_statiscal_filter", "number_of_dot_after_statiscal_filter",
+    "Ncycles_mean_after_statiscal_filter", "x", "y", "z"
+]
+
+
+def writeSynthese(path, offset=0.0):
+    """
+    Écrit un fichier synthese_interferometric_data.csv de 96 puits.
+    """
+    rows = []
+    for index in range(96):
+        well = f"{'ABCDEFGH'[index // 12]}{index % 12 + 1}"
+        rows.append([well, 10.0 + index + offset, 0.5, 40.0, 1.0, 100, 90 - index % 10, 3.0, 0, 0, 0])
+    pd.DataFrame(rows, columns=SYNTHESE_COLUMNS).to_csv(path, sep=';', index=False)
+
+
+class TestReferenceStore(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.store = ReferenceStore(os.path.join(self.folder, "store"))
+        self.acquisition_folder = os.path.join(self.folder, "acquisition")
+        self.reference_folder = os.path.join(self.folder, "reference")
+        os.makedirs(self.acquisition_folder)
+        os.makedirs(self.reference_folder)
+        writeWellResults(os.path.join(self.acquisition_folder, "WellResults.xlsx"), [
+            ([(1.0, False), ("2,0", "FALSE"), (9.0, True)], [(0.5, 1.5), ("1,0", 2.5), ("n/a", 1.0)]),
+            ([(1.0, False), (1.0, False)], [(0.5, 7.0), (1.0, 6.0)]),
+        ])
+        self.reference_file = os.path.join(self.reference_folder, "WellResults.xlsx")
+        writeWellResults(self.reference_file, [
+            ([(1.0, False), (1.0, False)], [(0.5, 1.0), (1.0, 3.0)]),
+            ([(1.0, False)], [(0.5, 1.0), (1.0, 5.0)]),
+        ])
+
+    def test_stored_well_results_match_workbook(self):
+        for _ in range(2):
+            stored = self.store.wellResults(self.reference_file)
+            workbook = WellResultsWorkbook(self.reference_file)
+            self.assertIsInstance(stored, StoredWellResults)
+            self.assertEqual(workbook.number_of_areas, stored.number_of_areas)
+            for area_index in range(2):
+                self.assertEqual(workbook.calibrationData(area_index), stored.calibrationData(area_index))
+                self.assertEqual(workbook.blankValues(area_index), stored.blankValues(area_index))
+            self.assertEqual(workbook.lodLoq(0), stored.lodLoq(0))
+            # Une seule valeur de blanc dans l'area 2 : même erreur qu'avec le classeur
+            with self.assertRaisesRegex(ValueError, "Nombre insuffisant de blancs pour l'area 2"):
+                stored.lodLoq(1)
+            with self.assertRaisesRegex(ValueError, "hors limites"):
+                stored.calibrationData(2)
+
+        with patch("builtins.print"):
+            pd.testing.assert_frame_equal(
+                processWellResults(self.acquisition_folder, self.reference_folder),
+                processWellResults(self.acquisition_folder, self.reference_folder, reference_store=self.store))
+            pd.testing.assert_frame_equal(
+                calculateLODLOQComparison(self.acquisition_folder, self.reference_folder),
+                calculateLODLOQComparison(self.acquisition_folder, self.reference_folder, reference_store=self.store))
+
+    def test_reference_read_once_per_content(self):
+        with patch.object(referenceStore, "WellResultsWorkbook", wraps=WellResultsWorkbook) as mock_workbook:
+            self.store.wellResults(self.reference_file)
+            self.store.wellResults(self.reference_file)
+            self.assertEqual(1, mock_workbook.call_count)
+
+            writeWellResults(self.reference_file, [([(1.0, False), (3.0, False)], [(0.5, 2.0)])])
+            stored = self.store.wellResults(self.reference_file)
+            self.assertEqual(2, mock_workbook.call_count)
+        self.assertEqual(1, stored.number_of_areas)
+        self.assertEqual([1.0, 3.0], stored.blankValues(0))
+
+    def test_unreadable_entry_is_recomputed(self):
+        self.store.wellResults(self.reference_file)
+        entry_name, = os.listdir(self.store.store_dir)
+        with open(os.path.join(self.store.store_dir, entry_name), 'wb') as file:
+            file.write(b"corrompu")
+        with self.assertLogs(referenceStore.logger, "WARNING"):
+            stored = self.store.wellResults(self.reference_file)
+        self.assertEqual([1.0], stored.blankValues(1))
+
+    def test_synthese_data(self):
+        path = os.path.join(self.reference_folder, "synthese_interferometric_data.csv")
+        writeSynthese(path)
+        expected = import_data_from_csv_synthese_zymintern(path)
+        for _ in range(2):
+            matrices = self.store.syntheseData(path)
+            self.assertEqual(8, len(matrices))
+            for expected_matrix, matrix in zip(expected, matrices):
+                np.testing.assert_array_equal(expected_matrix, matrix)
+
+        writeSynthese(path, offset=1.0)
+        self.assertEqual(11.0, self.store.syntheseData(path)['volume'][0, 0])
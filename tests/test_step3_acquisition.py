@@ -0,0 +1,34 @@
+# tests/test_step3_acquisition.py
+
+import os
+import unittest
+from unittest.mock import MagicMock
+
+from zymosoft_assistant.gui.step3_acquisition import PendingFiguresRenderer
+
+
+class TestPendingFiguresRenderer(unittest.TestCase):
+    def setUp(self):
+        self.validation_dir = os.path.normpath(os.path.join("acquisition", "validation_results"))
+        self.figure_queue = MagicMock()
+        self.renderer = PendingFiguresRenderer(self.figure_queue)
+        self.rendered = []
+        self.renderer.figures_rendered.connect(self.rendered.append)
+
+    def test_rien_en_attente(self):
+        self.figure_queue.pending.return_value = []
+        self.assertFalse(self.renderer.request(self.validation_dir))
+        self.figure_queue.renderAll.assert_not_called()
+        self.assertEqual([], self.rendered)
+
+    def test_rendu_en_arriere_plan(self):
+        self.figure_queue.pending.return_value = ["figure"]
+        self.assertTrue(self.renderer.request(self.validation_dir + os.sep))
+        self.renderer.wait(self.validation_dir)
+
+        # rendu dans le thread, puis figures restantes dessinées par wait pour le rapport
+        self.assertEqual(2, self.figure_queue.renderAll.call_count)
+        args, kwargs = self.figure_queue.renderAll.call_args_list[0]
+        self.assertEqual((self.validation_dir,), args)
+        self.assertEqual(os.cpu_count() or 1, kwargs['workers'])
+        self.assertEqual([self.validation_dir], self.rendered)
@@ -11,29 +11,45 @@ import json
 import csv
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 from typing import Dict, Any, List, Tuple, Optional
 from pathlib import Path
 
+from zymosoft_assistant.scripts.figureSpecs import FigureSpec, FigureCache, renderFigures, FIGURE_CACHE_DIRNAME
+
 logger = logging.getLogger(__name__)
 
+# Résolution des graphiques d'analyse, affichés à l'écran uniquement (ils ne sont pas repris dans les rapports)
+GRAPH_PREVIEW_DPI = 100
+# Nombre de processus pour dessiner les graphiques d'analyse : un par graphique
+GRAPH_RENDER_WORKERS = 3
+
+# Colonnes des fichiers de données d'acquisition utilisées par l'analyse, et leur type
+REQUIRED_DATA_COLUMNS = ["Volume", "Epaisseur"]
+REQUIRED_DATA_DTYPES = {"Volume": float, "Epaisseur": float}
+# Indices dans le nom d'un fichier CSV pour classer les fichiers de données candidats
+DATA_FILE_NAME_HINTS = ("data", "donnees", "result", "volume", "epaisseur")
+DATA_FILE_NAME_EXCLUDED_HINTS = ("log", "kpi", "comparative", "report", "rapport")
+
 class AcquisitionAnalyzer:
     """
     Classe responsable de l'analyse des résultats d'acquisition
     et de la génération de graphiques
     """
 
-    def __init__(self, output_dir: str = None):
+    def __init__(self, output_dir: str = None, preview_dpi: int = GRAPH_PREVIEW_DPI):
         """
         Initialise l'analyseur d'acquisition
 
         Args:
             output_dir: Répertoire de sortie pour les graphiques générés
                        (par défaut: dossier temporaire)
+            preview_dpi: Résolution des graphiques affichés à l'écran
+                         (une valeur plus basse accélère l'affichage)
         """
         self.output_dir = output_dir
         if not self.output_dir:
             self.output_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "temp")
+        self.preview_dpi = preview_dpi
 
         # Création du dossier de sortie s'il n'existe pas
         os.makedirs(self.output_dir, exist_ok=True)
@@ -79,7 +95,7 @@ class AcquisitionAnalyzer:
 
         # Chargement des données
         data = self._load_acquisition_data(results_folder)
-        if not data:
+        if data is None:
             results["valid"] = False
             results["errors"].append("Impossible de charger les données d'acquisition")
             return results
@@ -90,8 +106,10 @@ class AcquisitionAnalyzer:
         statistics = self.calculate_statistics(data)
         results["statistics"] = statistics
 
-        # Génération des graphiques
-        graph_paths = self.generate_graphs(data)
+        # Génération des graphiques à la résolution d'affichage, à partir de la régression déjà calculée
+        # (repris du cache si les données n'ont pas changé)
+        figure_cache = FigureCache(os.path.join(results_folder, FIGURE_CACHE_DIRNAME))
+        graph_paths = self.generate_graphs(data, statistics=statistics, figure_cache=figure_cache)
         results["graphs"] = graph_paths
 
         return results
@@ -160,7 +178,10 @@ class AcquisitionAnalyzer:
 
     def _load_acquisition_data(self, results_folder: str) -> Optional[pd.DataFrame]:
         """
-        Charge les données d'acquisition à partir du dossier de résultats
+        Charge les données d'acquisition à partir du dossier de résultats. Les fichiers CSV
+        contenant les colonnes requises sont trouvés par _index_data_files sans être lus en
+        entier ; seules ces colonnes sont chargées, et seuls les fichiers du groupe le mieux
+        classé (les fichiers d'une même acquisition) sont mis bout à bout.
 
         Args:
             results_folder: Chemin vers le dossier de résultats
@@ -168,35 +189,85 @@ class AcquisitionAnalyzer:
         Returns:
             DataFrame pandas contenant les données ou None en cas d'erreur
         """
-        # Recherche des fichiers CSV dans le dossier
-        csv_files = list(Path(results_folder).glob("*.csv"))
-
-        if not csv_files:
-            logger.error(f"Aucun fichier CSV trouvé dans {results_folder}")
+        data_files = self._index_data_files(results_folder)
+        if not data_files:
+            logger.error(f"Aucun fichier CSV avec les colonnes {REQUIRED_DATA_COLUMNS} trouvé dans {results_folder}")
             return None
 
-        # Utilisation du premier fichier CSV trouvé
-        # Dans une implémentation réelle, il faudrait une logique plus sophistiquée
-        # pour identifier le bon fichier de données
-        data_file = str(csv_files[0])
-        logger.info(f"Chargement des données depuis {data_file}")
+        # Seuls les fichiers de même score que le mieux classé sont chargés : un autre export
+        # contenant les mêmes colonnes ne doit pas être mélangé aux données de l'acquisition
+        best_score = self._rank_data_file_name(os.path.basename(data_files[0]))
+        data_files = [data_file for data_file in data_files
+                      if self._rank_data_file_name(os.path.basename(data_file)) == best_score]
 
-        try:
-            # Lecture du fichier CSV
-            df = pd.read_csv(data_file, sep=';', decimal=',')
+        frames = []
+        for data_file in data_files:
+            logger.info(f"Chargement des données depuis {data_file}")
+            try:
+                # Lecture des seules colonnes requises, directement en flottants
+                frames.append(pd.read_csv(data_file, sep=';', decimal=',', usecols=REQUIRED_DATA_COLUMNS,
+                                          dtype=REQUIRED_DATA_DTYPES))
+            except Exception as e:
+                logger.error(f"Erreur lors du chargement du fichier CSV {data_file}: {str(e)}")
+
+        if not frames:
+            return None
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames, ignore_index=True)
+
+    def _index_data_files(self, results_folder: str) -> List[str]:
+        """
+        Index des fichiers de données d'un dossier de résultats : les fichiers CSV sont classés
+        d'après leur nom (les logs, KPI, rapports et fichiers comparatifs sont écartés), puis seule
+        leur ligne d'en-tête est lue pour garder ceux qui contiennent les colonnes requises
 
-            # Vérification des colonnes minimales requises
-            required_columns = ["Volume", "Epaisseur"]
-            missing_columns = [col for col in required_columns if col not in df.columns]
+        Args:
+            results_folder: Chemin vers le dossier de résultats
 
+        Returns:
+            Chemins des fichiers de données, du plus probable au moins probable
+        """
+        csv_files = sorted((path for path in Path(results_folder).glob("*.csv")
+                            if self._rank_data_file_name(path.name) >= 0),
+                           key=lambda path: (-self._rank_data_file_name(path.name), path.name.lower()))
+
+        data_files = []
+        for csv_file in csv_files:
+            header = self._read_csv_header(str(csv_file))
+            missing_columns = [col for col in REQUIRED_DATA_COLUMNS if col not in header]
             if missing_columns:
-                logger.error(f"Colonnes manquantes dans le fichier CSV: {missing_columns}")
-                return None
+                logger.debug(f"Fichier {csv_file} ignoré, colonnes manquantes: {missing_columns}")
+                continue
+            data_files.append(str(csv_file))
+        return data_files
 
-            return df
-        except Exception as e:
-            logger.error(f"Erreur lors du chargement du fichier CSV: {str(e)}")
-            return None
+    @staticmethod
+    def _rank_data_file_name(file_name: str) -> int:
+        """
+        Score d'un nom de fichier CSV : plus il est élevé, plus le fichier a de chances
+        de contenir les données d'acquisition
+        """
+        name = file_name.lower()
+        score = sum(1 for hint in DATA_FILE_NAME_HINTS if hint in name)
+        score -= sum(2 for hint in DATA_FILE_NAME_EXCLUDED_HINTS if hint in name)
+        return score
+
+    @staticmethod
+    def _read_csv_header(csv_file: str) -> List[str]:
+        """
+        Lit uniquement la ligne d'en-tête d'un fichier CSV (séparateur ';')
+
+        Returns:
+            Noms des colonnes, ou liste vide si le fichier est illisible
+        """
+        try:
+            with open(csv_file, 'r', encoding='utf-8-sig', errors='replace') as f:
+                header_line = f.readline()
+        except OSError as e:
+            logger.warning(f"Impossible de lire l'en-tête de {csv_file}: {str(e)}")
+            return []
+        return [column.strip().strip('"') for column in header_line.rstrip('\r\n').split(';')]
 
     def calculate_statistics(self, data: pd.DataFrame) -> Dict[str, float]:
         """
@@ -280,12 +351,19 @@ class AcquisitionAnalyzer:
                 "outliers_percentage": 0.0
             }
 
-    def generate_graphs(self, data: pd.DataFrame) -> List[str]:
+    def generate_graphs(self, data: pd.DataFrame, statistics: Optional[Dict[str, float]] = None,
+                        figure_cache: Optional[FigureCache] = None, workers: int = GRAPH_RENDER_WORKERS) -> List[str]:
         """
         Génère des graphiques à partir des données d'acquisition
 
         Args:
             data: DataFrame pandas contenant les données d'acquisition
+            statistics: Statistiques retournées par calculate_statistics pour ces données ;
+                        la régression et le R² ne sont pas recalculés (recalculés ici si absentes
+                        ou invalides)
+            figure_cache: Cache des images (optionnel) ; un graphique dont les données et les
+                          paramètres n'ont pas changé est repris du cache sans être redessiné
+            workers: Nombre de processus pour dessiner les graphiques (1 pour les dessiner dans ce processus)
 
         Returns:
             Liste des chemins vers les graphiques générés
@@ -294,15 +372,7 @@ class AcquisitionAnalyzer:
             logger.error("Impossible de générer des graphiques: données manquantes ou vides")
             return []
 
-        graph_paths = []
-
         try:
-            # Configuration du style des graphiques
-            plt.style.use('seaborn-v0_8-whitegrid')
-
-            # 1. Graphique Volume en fonction de l'Épaisseur
-            fig1, ax1 = plt.subplots(figsize=(10, 6))
-
             # Données pour la régression linéaire
             x = data["Epaisseur"].values
             y = data["Volume"].values
@@ -312,110 +382,114 @@ class AcquisitionAnalyzer:
             x = x[mask]
             y = y[mask]
 
-            # Calcul de la régression linéaire
-            slope, intercept = np.polyfit(x, y, 1)
-
-            # Tracé des points
-            ax1.scatter(x, y, color='#009967', alpha=0.7, label='Mesures')
-
-            # Tracé de la droite de régression
-            x_line = np.linspace(min(x), max(x), 100)
-            y_line = slope * x_line + intercept
-            ax1.plot(x_line, y_line, color='#007d54', linestyle='-', linewidth=2,
-                    label=f'Régression: y = {slope:.4f}x + {intercept:.4f}')
-
-            # Calcul du R²
-            y_pred = slope * x + intercept
-            ss_tot = np.sum((y - np.mean(y)) ** 2)
-            ss_res = np.sum((y - y_pred) ** 2)
-            r2 = 1 - (ss_res / ss_tot)
-
-            # Ajout du R² au graphique
-            ax1.text(0.05, 0.95, f'R² = {r2:.4f}', transform=ax1.transAxes,
-                    fontsize=12, verticalalignment='top', bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
-
-            # Configuration du graphique
-            ax1.set_title('Volume en fonction de l\'Épaisseur', fontsize=14)
-            ax1.set_xlabel('Épaisseur (µm)', fontsize=12)
-            ax1.set_ylabel('Volume (nL)', fontsize=12)
-            ax1.grid(True, linestyle='--', alpha=0.7)
-            ax1.legend(loc='lower right')
-
-            # Sauvegarde du graphique
-            volume_vs_thickness_path = os.path.join(self.output_dir, 'volume_vs_thickness.png')
-            fig1.savefig(volume_vs_thickness_path, dpi=300, bbox_inches='tight')
-            plt.close(fig1)
-
-            graph_paths.append(volume_vs_thickness_path)
-            logger.info(f"Graphique généré: {volume_vs_thickness_path}")
-
-            # 2. Graphique Épaisseur en fonction du Volume
-            fig2, ax2 = plt.subplots(figsize=(10, 6))
-
-            # Tracé des points
-            ax2.scatter(y, x, color='#17a2b8', alpha=0.7, label='Mesures')
+            if len(x) < 2:
+                logger.warning("Pas assez de données pour générer les graphiques")
+                return []
+
+            # Régression linéaire et R² calculés par calculate_statistics, recalculés si ces
+            # statistiques manquent ou sont le résultat par défaut d'un échec du calcul
+            if self._has_regression(statistics):
+                slope, intercept, r2 = statistics["slope"], statistics["intercept"], statistics["r2"]
+                y_pred = slope * x + intercept
+            else:
+                slope, intercept = np.polyfit(x, y, 1)
+                y_pred = slope * x + intercept
+                ss_tot = np.sum((y - np.mean(y)) ** 2)
+                ss_res = np.sum((y - y_pred) ** 2)
+                r2 = 1 - (ss_res / ss_tot)
 
             # Calcul de la régression linéaire (inverse)
             slope_inv, intercept_inv = np.polyfit(y, x, 1)
 
-            # Tracé de la droite de régression
-            y_line = np.linspace(min(y), max(y), 100)
-            x_line = slope_inv * y_line + intercept_inv
-            ax2.plot(y_line, x_line, color='#0c7b8a', linestyle='-', linewidth=2,
-                    label=f'Régression: y = {slope_inv:.4f}x + {intercept_inv:.4f}')
-
             # Calcul du R² (inverse)
             x_pred = slope_inv * y + intercept_inv
             ss_tot_inv = np.sum((x - np.mean(x)) ** 2)
             ss_res_inv = np.sum((x - x_pred) ** 2)
             r2_inv = 1 - (ss_res_inv / ss_tot_inv)
 
-            # Ajout du R² au graphique
-            ax2.text(0.05, 0.95, f'R² = {r2_inv:.4f}', transform=ax2.transAxes,
-                    fontsize=12, verticalalignment='top', bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
-
-            # Configuration du graphique
-            ax2.set_title('Épaisseur en fonction du Volume', fontsize=14)
-            ax2.set_xlabel('Volume (nL)', fontsize=12)
-            ax2.set_ylabel('Épaisseur (µm)', fontsize=12)
-            ax2.grid(True, linestyle='--', alpha=0.7)
-            ax2.legend(loc='lower right')
-
-            # Sauvegarde du graphique
-            thickness_vs_volume_path = os.path.join(self.output_dir, 'thickness_vs_volume.png')
-            fig2.savefig(thickness_vs_volume_path, dpi=300, bbox_inches='tight')
-            plt.close(fig2)
-
-            graph_paths.append(thickness_vs_volume_path)
-            logger.info(f"Graphique généré: {thickness_vs_volume_path}")
-
-            # 3. Graphique de distribution des résidus
-            fig3, ax3 = plt.subplots(figsize=(10, 6))
-
             # Calcul des résidus
             residuals = y - y_pred
 
-            # Tracé de l'histogramme des résidus
-            ax3.hist(residuals, bins=20, color='#ffc107', alpha=0.7, edgecolor='black')
+            # 1. Graphique Volume en fonction de l'Épaisseur
+            volume_vs_thickness = self._graph_spec('volume_vs_thickness.png')
+            volume_vs_thickness.add('scatter', x, y, color='#009967', alpha=0.7, label='Mesures')
+            x_line = np.linspace(min(x), max(x), 100)
+            volume_vs_thickness.add('plot', x_line, slope * x_line + intercept, color='#007d54', linestyle='-',
+                                    linewidth=2, label=f'Régression: y = {slope:.4f}x + {intercept:.4f}')
+            self._add_r2_box(volume_vs_thickness, r2)
+            volume_vs_thickness.add('set_title', 'Volume en fonction de l\'Épaisseur', fontsize=14)
+            volume_vs_thickness.add('set_xlabel', 'Épaisseur (µm)', fontsize=12)
+            volume_vs_thickness.add('set_ylabel', 'Volume (nL)', fontsize=12)
+            volume_vs_thickness.add('grid', True, linestyle='--', alpha=0.7)
+            volume_vs_thickness.add('legend', loc='lower right')
 
-            # Ajout d'une ligne verticale à zéro
-            ax3.axvline(x=0, color='#dc3545', linestyle='--', linewidth=2)
+            # 2. Graphique Épaisseur en fonction du Volume
+            thickness_vs_volume = self._graph_spec('thickness_vs_volume.png')
+            thickness_vs_volume.add('scatter', y, x, color='#17a2b8', alpha=0.7, label='Mesures')
+            y_line = np.linspace(min(y), max(y), 100)
+            thickness_vs_volume.add('plot', y_line, slope_inv * y_line + intercept_inv, color='#0c7b8a', linestyle='-',
+                                    linewidth=2, label=f'Régression: y = {slope_inv:.4f}x + {intercept_inv:.4f}')
+            self._add_r2_box(thickness_vs_volume, r2_inv)
+            thickness_vs_volume.add('set_title', 'Épaisseur en fonction du Volume', fontsize=14)
+            thickness_vs_volume.add('set_xlabel', 'Volume (nL)', fontsize=12)
+            thickness_vs_volume.add('set_ylabel', 'Épaisseur (µm)', fontsize=12)
+            thickness_vs_volume.add('grid', True, linestyle='--', alpha=0.7)
+            thickness_vs_volume.add('legend', loc='lower right')
 
-            # Configuration du graphique
-            ax3.set_title('Distribution des Résidus', fontsize=14)
-            ax3.set_xlabel('Résidu (Volume observé - Volume prédit)', fontsize=12)
-            ax3.set_ylabel('Fréquence', fontsize=12)
-            ax3.grid(True, linestyle='--', alpha=0.7)
+            # 3. Graphique de distribution des résidus
+            residuals_distribution = self._graph_spec('residuals_distribution.png')
+            residuals_distribution.add('hist', residuals, bins=20, color='#ffc107', alpha=0.7, edgecolor='black')
+            # Ajout d'une ligne verticale à zéro
+            residuals_distribution.add('axvline', x=0, color='#dc3545', linestyle='--', linewidth=2)
+            residuals_distribution.add('set_title', 'Distribution des Résidus', fontsize=14)
+            residuals_distribution.add('set_xlabel', 'Résidu (Volume observé - Volume prédit)', fontsize=12)
+            residuals_distribution.add('set_ylabel', 'Fréquence', fontsize=12)
+            residuals_distribution.add('grid', True, linestyle='--', alpha=0.7)
 
-            # Sauvegarde du graphique
-            residuals_path = os.path.join(self.output_dir, 'residuals_distribution.png')
-            fig3.savefig(residuals_path, dpi=300, bbox_inches='tight')
-            plt.close(fig3)
+            # Les trois graphiques sont dessinés en même temps ; un graphique en erreur est journalisé
+            # par renderFigures sans empêcher les autres d'être écrits
+            graph_paths = renderFigures([volume_vs_thickness, thickness_vs_volume, residuals_distribution],
+                                        workers=workers, figure_cache=figure_cache)
 
-            graph_paths.append(residuals_path)
-            logger.info(f"Graphique généré: {residuals_path}")
+            for graph_path in graph_paths:
+                logger.info(f"Graphique généré: {graph_path}")
 
             return graph_paths
         except Exception as e:
             logger.error(f"Erreur lors de la génération des graphiques: {str(e)}")
-            return graph_paths
+            return []
+
+    @staticmethod
+    def _has_regression(statistics: Optional[Dict[str, float]]) -> bool:
+        """
+        Indique si des statistiques contiennent une régression utilisable : valeurs présentes et
+        finies, et différentes du résultat nul retourné par calculate_statistics en cas d'échec
+        """
+        if not statistics:
+            return False
+        try:
+            values = [float(statistics[key]) for key in ("slope", "intercept", "r2")]
+        except (KeyError, TypeError, ValueError):
+            return False
+        return all(np.isfinite(values)) and any(values)
+
+    def _graph_spec(self, file_name: str) -> FigureSpec:
+        """
+        Crée la description d'un graphique d'analyse dans le dossier de sortie, à la résolution d'affichage
+
+        Args:
+            file_name: Nom du fichier image
+
+        Returns:
+            FigureSpec au style des graphiques d'analyse
+        """
+        return FigureSpec(os.path.join(self.output_dir, file_name), figsize=(10, 6), dpi=self.preview_dpi,
+                          style='seaborn-v0_8-whitegrid', bbox_inches='tight')
+
+    @staticmethod
+    def _add_r2_box(spec: FigureSpec, r2: float):
+        """
+        Ajoute le R² dans un encadré en haut à gauche du graphique
+        """
+        spec.add('annotate', f'R² = {r2:.4f}', xy=(0.05, 0.95), xycoords='axes fraction',
+                 fontsize=12, verticalalignment='top', bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
@@ -24,15 +24,19 @@ from PyQt5.QtWidgets import (QLabel, QLineEdit, QVBoxLayout, QHBoxLayout,
                              QCheckBox, QRadioButton, QGroupBox, QTextEdit,
                              QTreeWidget, QTreeWidgetItem, QButtonGroup, QDialog,
                              QSplitter, QSizePolicy, QSpacerItem, QGridLayout)
-from PyQt5.QtCore import Qt, pyqtSignal, QVariant, pyqtSlot
+from PyQt5.QtCore import Qt, pyqtSignal, QVariant, pyqtSlot, QObject
 from PyQt5.QtGui import QPixmap, QFont
 
-from zymosoft_assistant.utils.constants import COLOR_SCHEME, PLATE_TYPES, ACQUISITION_MODES, VALIDATION_CRITERIA
+from zymosoft_assistant.utils.constants import COLOR_SCHEME, PLATE_TYPES, ACQUISITION_MODES, VALIDATION_CRITERIA, \
+    LOG_CACHE_DIR, REFERENCE_STORE_DIR
 from zymosoft_assistant.core.acquisition_analyzer import AcquisitionAnalyzer
 from zymosoft_assistant.core.report_generator import ReportGenerator
-from zymosoft_assistant.scripts.Routine_VALIDATION_ZC_18022025 import compare_enzymo_2_ref, comparaison_ZC_to_ref_v1, \
-    comparaison_ZC_to_ref_v1_nanofilm
-from zymosoft_assistant.scripts.getDatasFromWellResults import processWellResults, calculateLODLOQComparison
+from zymosoft_assistant.scripts.Routine_VALIDATION_ZC_18022025 import compare_enzymo_2_ref_onglets, \
+    comparaison_ZC_to_ref_v1, comparaison_ZC_to_ref_v1_nanofilm
+from zymosoft_assistant.scripts.getDatasFromWellResults import loadWellResultsWorkbooks, compareWellResults, \
+    compareLODLOQ, readEnzymoSections
+from zymosoft_assistant.scripts.referenceStore import ReferenceStore
+from zymosoft_assistant.scripts.figureSpecs import FigureQueue, FigureCache, FIGURE_CACHE_DIRNAME
 from zymosoft_assistant.core.file_validator import FileValidator
 from .step_frame import StepFrame
 
@@ -374,13 +378,80 @@ class VerticalTabWidget(QWidget):
             self.update_tab_style(self.tab_buttons[index], status, index == self.current_index)
 
 
+class PendingFiguresRenderer(QObject):
+    """
+    Dessine les figures de validation mises en file pendant l'analyse (FigureQueue) dans un thread, réparties
+    entre les processus d'un pool, pour ne pas bloquer l'interface ; figures_rendered(dossier) est émis à la fin
+    du rendu d'un dossier pour rafraîchir l'affichage. Les figures inchangées depuis une analyse précédente sont
+    reprises du cache à côté de validation_results.
+    """
+    figures_rendered = pyqtSignal(str)
+
+    def __init__(self, figure_queue):
+        """
+        :param figure_queue: File des figures décrites par les routines de validation
+        """
+        super().__init__()
+        self.figure_queue = figure_queue
+        self._threads = {}
+        self._lock = threading.Lock()
+
+    def request(self, validation_dir):
+        """
+        Lance en arrière-plan le rendu des figures en attente dans ce dossier
+
+        :param validation_dir: Dossier validation_results d'une acquisition
+        :return: True si des figures de ce dossier sont en cours de rendu
+        """
+        validation_dir = os.path.normpath(validation_dir)
+        with self._lock:
+            thread = self._threads.get(validation_dir)
+            if thread is not None and thread.is_alive():
+                return True
+            if not self.figure_queue.pending(validation_dir):
+                return False
+            thread = threading.Thread(target=self._render_task, args=(validation_dir,), daemon=True)
+            self._threads[validation_dir] = thread
+            thread.start()
+            return True
+
+    def wait(self, validation_dir):
+        """
+        Attend la fin du rendu en cours dans ce dossier et dessine les figures restantes, pour un rapport
+
+        :param validation_dir: Dossier validation_results d'une acquisition
+        """
+        validation_dir = os.path.normpath(validation_dir)
+        with self._lock:
+            thread = self._threads.get(validation_dir)
+        if thread is not None:
+            thread.join()
+        self._render(validation_dir)
+
+    def _render_task(self, validation_dir):
+        self._render(validation_dir)
+        self.figures_rendered.emit(validation_dir)
+
+    def _render(self, validation_dir):
+        try:
+            figure_cache = FigureCache(os.path.join(os.path.dirname(validation_dir), FIGURE_CACHE_DIRNAME))
+            self.figure_queue.renderAll(validation_dir, workers=os.cpu_count() or 1, figure_cache=figure_cache)
+        except Exception as e:
+            logger.error(f"Erreur lors du rendu des figures de validation: {str(e)}", exc_info=True)
+
+
 class AcquisitionDetailsDialog(QDialog):
     """
     A dialog to show the detailed results of a past acquisition.
     """
-    def __init__(self, acquisition_data, parent=None):
+    def __init__(self, acquisition_data, parent=None, figure_renderer=None):
         super().__init__(parent)
         self.acquisition_data = acquisition_data
+        # Draws the validation figures still queued for this acquisition; images are reloaded once drawn
+        self.figure_renderer = figure_renderer
+        if self.figure_renderer:
+            self.figure_renderer.figures_rendered.connect(self._on_figures_rendered)
+            self.finished.connect(lambda: self.figure_renderer.figures_rendered.disconnect(self._on_figures_rendered))
         self.setWindowTitle(f"Détails de l'Acquisition #{acquisition_data['id']}")
         self.setMinimumSize(1000, 700)
 
@@ -620,19 +691,32 @@ class AcquisitionDetailsDialog(QDialog):
                 self.log_analysis_table.setItem(row, 0, QTableWidgetItem(str(key)))
                 self.log_analysis_table.setItem(row, 1, QTableWidgetItem(str(value)))
 
+    def _validation_dir(self):
+        return os.path.join(self.acquisition_data['results_folder'], "validation_results")
+
+    def _on_figures_rendered(self, validation_dir):
+        if validation_dir == os.path.normpath(self._validation_dir()):
+            self._display_graphs()
+
     def _display_graphs(self):
         analysis = self.acquisition_data.get('analysis', {})
-        graph_paths = analysis.get("graphs", [])
+        graph_paths = list(analysis.get("graphs", []))
+        self.graph_images = []
+        self.graph_titles = []
 
         # Also look for graphs in the validation_results subfolder
-        validation_dir = os.path.join(self.acquisition_data['results_folder'], "validation_results")
+        validation_dir = self._validation_dir()
         if os.path.exists(validation_dir):
             for file in os.listdir(validation_dir):
                 if file.lower().endswith(('.png', '.jpg', '.jpeg')):
                     graph_paths.append(os.path.join(validation_dir, file))
 
+        # Figures still queued are drawn in the background, then this view is refreshed
+        rendering = bool(self.figure_renderer) and self.figure_renderer.request(validation_dir)
+
         if not graph_paths:
-            self.graphs_widget.setText("Aucune image disponible")
+            self.graphs_widget.setText("Génération des graphiques en cours..." if rendering
+                                       else "Aucune image disponible")
             return
 
         for path in graph_paths:
@@ -673,6 +757,9 @@ class AcquisitionDetailsDialog(QDialog):
 
     def _generate_report(self):
         try:
+            if self.figure_renderer:
+                self.figure_renderer.wait(self._validation_dir())
+
             report_generator = ReportGenerator()
 
             # Prepare data for the report, including the validation status
@@ -748,6 +835,16 @@ class Step3Acquisition(StepFrame):
 
         # Variables pour l'analyse des logs
         self.log_analysis_results = None
+        self.log_file_path = None
+
+        # Fichiers WellResults lus pour l'analyse en cours
+        self._well_results_workbooks = None
+        # Données des références déjà analysées
+        self.reference_store = ReferenceStore(REFERENCE_STORE_DIR)
+        # Figures des comparaisons, dessinées en arrière-plan seulement quand elles sont affichées
+        # ou mises dans un rapport
+        self.figure_queue = FigureQueue()
+        self.figure_renderer = PendingFiguresRenderer(self.figure_queue)
 
         # Objets pour l'analyse
         self.analyzer = None
@@ -759,6 +856,7 @@ class Step3Acquisition(StepFrame):
         self.progress_updated.connect(self._update_progress)
         self.analysis_completed.connect(self._display_analysis_results)
         self.analysis_error.connect(self._handle_analysis_error)
+        self.figure_renderer.figures_rendered.connect(self._on_figures_rendered)
 
         logger.info("Étape 3 initialisée")
 
@@ -1548,6 +1646,8 @@ class Step3Acquisition(StepFrame):
         reference_machine = "REFERENCE ZYMOPTIQ"
 
         # Perform various validation comparisons
+        # (les fichiers WellResults sont lus une seule fois pour les deux comparaisons)
+        self._well_results_workbooks = None
         self._perform_well_results_comparison(reference_folder, validation_output_dir, validation_results)
         self._perform_lod_loq_comparison(reference_folder, validation_output_dir, validation_results)
 
@@ -1570,6 +1670,15 @@ class Step3Acquisition(StepFrame):
         self.analysis_results = analysis_results
         self.analysis_completed.emit()
 
+    def _get_well_results_workbooks(self, reference_folder):
+        """
+        Return the WellResults workbooks (acquisition, reference), read on first use
+        """
+        if self._well_results_workbooks is None:
+            self._well_results_workbooks = loadWellResultsWorkbooks(self.results_folder_var, reference_folder,
+                                                                    self.reference_store)
+        return self._well_results_workbooks
+
     def _perform_well_results_comparison(self, reference_folder, validation_output_dir, validation_results):
         """
         Perform WellResults comparison
@@ -1578,7 +1687,7 @@ class Step3Acquisition(StepFrame):
             self.progress_updated.emit(40, "Comparaison des résultats WellResults...")
             try:
                 # Exécuter la comparaison WellResults
-                well_results_comparison = processWellResults(self.results_folder_var, reference_folder)
+                well_results_comparison = compareWellResults(*self._get_well_results_workbooks(reference_folder))
 
                 # Sauvegarder les résultats dans le dossier de validation
                 csv_path = os.path.join(validation_output_dir, "comparaison_resultats_puits.csv")
@@ -1601,7 +1710,7 @@ class Step3Acquisition(StepFrame):
             self.progress_updated.emit(60, "Comparaison des LOD et LOQ...")
             try:
                 # Exécuter la comparaison LOD/LOQ
-                lod_loq_comparison = calculateLODLOQComparison(self.results_folder_var, reference_folder)
+                lod_loq_comparison = compareLODLOQ(*self._get_well_results_workbooks(reference_folder))
 
                 # Sauvegarder les résultats dans le dossier de validation
                 csv_path = os.path.join(validation_output_dir, "comparaison_LOD_LOQ.csv")
@@ -1635,13 +1744,14 @@ class Step3Acquisition(StepFrame):
                 # Utiliser la fonction pour nanofilm
                 name_dossier, slope, intercept, r_value, nb_puits_loin_fit, diff_mean, diff_cv, vect1, vect2 = comparaison_ZC_to_ref_v1_nanofilm(
                     "SC", results_folder_norm, machine_to_validate, reference_folder_norm, reference_machine,
-                    validation_output_dir_norm, "validation_comparison", 5
+                    validation_output_dir_norm, "validation_comparison", 5, figure_queue=self.figure_queue
                 )
             else:
                 # Utiliser la fonction pour microdepot
                 name_dossier, slope, intercept, r_value, nb_puits_loin_fit, diff_mean, diff_cv, diam_diff_mean, diam_diff_cv, vect1, vect2 = comparaison_ZC_to_ref_v1(
                     "GP", results_folder_norm, machine_to_validate, reference_folder_norm, reference_machine,
-                    validation_output_dir_norm, "validation_comparison", 5
+                    validation_output_dir_norm, "validation_comparison", 5, reference_store=self.reference_store,
+                    figure_queue=self.figure_queue
                 )
 
             validation_results["comparison"] = {
@@ -1665,6 +1775,20 @@ class Step3Acquisition(StepFrame):
             logger.error(f"Erreur lors de la comparaison aux références: {str(e)}", exc_info=True)
             validation_results["comparison_error"] = str(e)
 
+    def _read_enzymo_sections(self, excel_path):
+        """
+        Lit les sections de tous les onglets d'un fichier WellResults
+
+        :param excel_path: Chemin vers le fichier WellResults
+        :return: Dictionnaire onglet -> EnzymoSections, vide si le fichier n'a pas pu être lu
+        """
+        try:
+            return readEnzymoSections(excel_path)
+        except Exception as e:
+            logger.error(f"Erreur lors de la lecture de {excel_path}, les onglets seront lus un par un: {str(e)}",
+                         exc_info=True)
+            return {}
+
     def _perform_enzymo_comparison(self, results_folder, reference_folder, validation_output_dir,
                                    validation_results, machine_to_validate, reference_machine):
         """
@@ -1700,44 +1824,55 @@ class Step3Acquisition(StepFrame):
                 all_results = []
 
                 if os.path.exists(excel_path):
-                    excel_file = pandas.ExcelFile(excel_path)
-                    sheet_names = excel_file.sheet_names
+                    # Lire une seule fois chaque fichier WellResults, découpé en sections pour tous les onglets ;
+                    # si la lecture d'un fichier échoue, chaque onglet est relu par compare_enzymo_2_ref et
+                    # l'erreur est signalée onglet par onglet
+                    validation_excel_path = os.path.normpath(os.path.join(results_parent_folder,
+                                                                          acquisition_name_instrument_2,
+                                                                          'WellResults.xlsx'))
+                    reference_sections = self._read_enzymo_sections(excel_path)
+                    validation_sections = self._read_enzymo_sections(validation_excel_path) \
+                        if os.path.exists(validation_excel_path) else {}
+                    sheet_names = list(reference_sections) if reference_sections \
+                        else pandas.ExcelFile(excel_path).sheet_names
 
                     # Paramètres pour les pourcentages de dégradation (utilisés dans l'en-tête CSV)
                     # La fonction compare_enzymo_2_ref utilise des pourcentages fixes: 30%, 50%, 70%
                     deg_percentages = [30, 50, 70]
 
-                    # Itérer sur tous les onglets
-                    for sheet_name in sheet_names:
-                        try:
-                            # Normaliser les chemins
-                            reference_parent_folder_norm = os.path.normpath(reference_parent_folder)
-                            results_parent_folder_norm = os.path.normpath(results_parent_folder)
-                            comparison_dir_norm = os.path.normpath(comparison_dir)
+                    # Comparer les onglets en parallèle, un processus par onglet dans la limite des cœurs ;
+                    # les figures restent en file pour être dessinées à l'affichage ou pour le rapport,
+                    # et les résultats restent dans l'ordre des onglets
+                    comparisons = compare_enzymo_2_ref_onglets(
+                        os.path.normpath(reference_parent_folder), reference_machine,
+                        acquisition_name_instrument_1, sheet_names,
+                        os.path.normpath(results_parent_folder), machine_to_validate,
+                        acquisition_name_instrument_2,
+                        os.path.normpath(comparison_dir),
+                        sections_instrument_1=reference_sections,
+                        sections_instrument_2=validation_sections,
+                        workers=min(len(sheet_names), os.cpu_count() or 1),
+                        figure_queue=self.figure_queue
+                    )
 
-                            try:
-                                ref_data, validation_data = compare_enzymo_2_ref(
-                                    reference_parent_folder_norm, reference_machine,
-                                    acquisition_name_instrument_1, sheet_name,
-                                    results_parent_folder_norm, machine_to_validate,
-                                    acquisition_name_instrument_2,
-                                    comparison_dir_norm
-                                )
-                            except FileNotFoundError as fnf_error:
-                                logger.error(f"Fichier non trouvé lors de la comparaison enzymatique: {str(fnf_error)}",
-                                             exc_info=True)
-                                # Continuer avec le prochain onglet
-                                continue
-
-                            all_results.append(ref_data)
-                            all_results.append(validation_data)
-
-                            print(
-                                f"Onglet {sheet_name} - Référence: {ref_data}, Validation: {validation_data}")
-                        except Exception as e:
+                    for sheet_name, comparison, error in comparisons:
+                        if isinstance(error, FileNotFoundError):
+                            logger.error(f"Fichier non trouvé lors de la comparaison enzymatique: {str(error)}",
+                                         exc_info=error)
+                            # Continuer avec le prochain onglet
+                            continue
+                        if error is not None:
                             logger.error(
-                                f"Erreur lors de la comparaison pour l'onglet {sheet_name}: {str(e)}",
-                                exc_info=True)
+                                f"Erreur lors de la comparaison pour l'onglet {sheet_name}: {str(error)}",
+                                exc_info=error)
+                            continue
+
+                        ref_data, validation_data = comparison
+                        all_results.append(ref_data)
+                        all_results.append(validation_data)
+
+                        print(
+                            f"Onglet {sheet_name} - Référence: {ref_data}, Validation: {validation_data}")
 
                     # Créer le fichier CSV de résultats
                     if all_results:
@@ -1883,7 +2018,7 @@ class Step3Acquisition(StepFrame):
         """
         self.progress_updated.emit(85, "Analyse des logs d'acquisition...")
         try:
-            from zymosoft_assistant.scripts.processAcquisitionLog import getLogFile, analyzeLogFile
+            from zymosoft_assistant.scripts.processAcquisitionLog import getLogFile, loadLogEvents
 
             step2_data = self.main_window.session_data.get("step2_checks", {})
             zymosoft_path = step2_data.get("zymosoft_path")
@@ -1891,8 +2026,9 @@ class Step3Acquisition(StepFrame):
                 default_log_path = os.path.join(zymosoft_path, '..', 'Diag', 'Temp')
                 log_file_path = getLogFile(default_log_path)
 
-            # Analyse du fichier de log
-            log_analysis = analyzeLogFile(log_file_path)
+            # Analyse du fichier de log (table d'événements mise en cache, seule la fin ajoutée est relue)
+            log_analysis = loadLogEvents(log_file_path, LOG_CACHE_DIR).analyze()
+            self.log_file_path = log_file_path
 
             # Stocker les résultats d'analyse des logs
             self.log_analysis_results = log_analysis
@@ -2446,6 +2582,14 @@ class Step3Acquisition(StepFrame):
                 else:
                     self.stats_table.setItem(row, 2, QTableWidgetItem(""))
 
+    def _on_figures_rendered(self, validation_dir):
+        """
+        Recharge les images quand les figures de validation de l'acquisition affichée ont été dessinées
+        """
+        if self.analysis_results and self.results_folder_var and \
+                validation_dir == os.path.normpath(os.path.join(self.results_folder_var, "validation_results")):
+            self._display_graphs()
+
     def _display_graphs(self):
         """
         Affiche les graphiques générés par l'analyse
@@ -2460,12 +2604,17 @@ class Step3Acquisition(StepFrame):
             self.graph_titles = []
 
             # Récupérer les chemins des graphiques générés par l'analyse
-            graph_paths = self.analysis_results.get("graphs", [])
+            graph_paths = list(self.analysis_results.get("graphs", []))
 
             # Ajouter les images de validation si elles existent
             validation_dir = ""
+            rendering = False
             if self.results_folder_var:
                 validation_dir = os.path.join(self.results_folder_var, "validation_results")
+                # Les figures encore en file sont dessinées en arrière-plan quand la page des résultats
+                # est affichée ; les images sont rechargées à la fin du rendu (_on_figures_rendered)
+                if self.notebook and self.notebook.currentIndex() == 2:
+                    rendering = self.figure_renderer.request(validation_dir)
                 if os.path.exists(validation_dir):
                     for file in os.listdir(validation_dir):
                         if file.lower().endswith(('.png', '.jpg', '.jpeg')):
@@ -2480,7 +2629,8 @@ class Step3Acquisition(StepFrame):
                                     graph_paths.append(os.path.join(subdir_path, file))
 
             if not graph_paths:
-                self.graphs_widget.setText("Aucune image disponible")
+                self.graphs_widget.setText("Génération des graphiques en cours..." if rendering
+                                           else "Aucune image disponible")
                 self.graphs_widget.setStyleSheet(
                     f"color: {COLOR_SCHEME['text_secondary']}; background-color: {COLOR_SCHEME['background']};")
                 if self.image_title_label:
@@ -2797,7 +2947,8 @@ class Step3Acquisition(StepFrame):
             acquisition_data = next((acq for acq in self.acquisitions if acq['id'] == acquisition_id), None)
 
             if acquisition_data:
-                dialog = AcquisitionDetailsDialog(acquisition_data, self.widget)
+                dialog = AcquisitionDetailsDialog(acquisition_data, self.widget,
+                                                  figure_renderer=self.figure_renderer)
                 dialog.exec_()
             else:
                 QMessageBox.warning(self.widget, "Erreur", f"Impossible de trouver les données pour l'acquisition #{acquisition_id}.")
@@ -2999,12 +3150,14 @@ class Step3Acquisition(StepFrame):
 
             # copie the analised log file to the results folder
             if self.results_folder_var:
-                from zymosoft_assistant.scripts.processAcquisitionLog import getLogFile, analyzeLogFile
+                from zymosoft_assistant.scripts.processAcquisitionLog import getLogFile
 
                 step2_data = self.main_window.session_data.get("step2_checks", {})
-                log_file_path = None
+                # Fichier de log déjà localisé lors de l'analyse
+                log_file_path = self.log_file_path
                 zymosoft_path = step2_data.get("zymosoft_path")
-                if zymosoft_path and os.path.isdir(os.path.join(zymosoft_path, '..', 'Diag', 'Temp')):
+                if not log_file_path and zymosoft_path and \
+                        os.path.isdir(os.path.join(zymosoft_path, '..', 'Diag', 'Temp')):
                     default_log_path = os.path.join(zymosoft_path, '..', 'Diag', 'Temp')
                     log_file_path = getLogFile(default_log_path)
 
@@ -3126,6 +3279,9 @@ class Step3Acquisition(StepFrame):
                 QMessageBox.critical(self.widget, "Erreur", "Aucun résultat d'analyse disponible.")
                 return
 
+            if self.results_folder_var:
+                self.figure_renderer.wait(os.path.join(self.results_folder_var, "validation_results"))
+
             report_generator = ReportGenerator()
 
             # Construire le dictionnaire de données pour le rapport
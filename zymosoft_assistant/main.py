@@ -8,6 +8,7 @@ Point d'entrée de l'application
 import sys
 import os
 import logging
+import multiprocessing
 import subprocess
 
 import matplotlib
@@ -135,6 +136,8 @@ def main():
         return 1
 
 if __name__ == "__main__":
+    # Nécessaire aux pools de processus de l'analyse des logs dans l'exécutable PyInstaller
+    multiprocessing.freeze_support()
     sys.exit(main())
 
 
@@ -12,11 +12,14 @@ from shutil import copyfile
 
 import cv2
 from zymosoft_assistant.scripts.home_made_tools_v3   import *
+from zymosoft_assistant.scripts.getDatasFromWellResults import parseEnzymoSections, readWellResultsSheets
+from zymosoft_assistant.scripts.figureSpecs import FigureSpec, FigureQueue, publishFigures, renderFigures
 from math import sqrt
 from math import log
 from math import isnan
 import statistics
 import os
+from concurrent.futures import ProcessPoolExecutor
 from scipy import stats
 
 # Helper function to safely create directories (including parent directories)
@@ -32,7 +35,189 @@ def safe_mkdir(directory_path):
 # =============================================================================
 #  fonctions de la validation        
 # =============================================================================
-def repeta_sans_ref_v1(directory_source,nom_plaque,nom_reconstruction,directory_racine_output,CV_repeta_threshold):
+def statistiques_repeta(data_all_iteration):
+    # moyennes, écart-types et CV (en %) sur la dernière dimension (les itérations) d'un array (métrique, ligne, colonne, itération)
+    # les nan sont ignorés ; un puits de moyenne nulle donne un CV nan ou inf
+    mean_for_this_plate = np.nanmean(data_all_iteration, axis=-1)
+    std_for_this_plate = np.nanstd(data_all_iteration, axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        CV_for_this_plate = std_for_this_plate / mean_for_this_plate * 100
+    return mean_for_this_plate, std_for_this_plate, CV_for_this_plate
+
+def ecrire_data_raw(chemin_csv, geometrie, titres, data_all_iteration):
+    # csv des data brutes : une ligne par puits, puis les métriques de chaque itération à la suite, itération par itération
+    # (titres : une colonne par itération et par métrique, dans cet ordre)
+    nb_metriques, nb_iteration = data_all_iteration.shape[0], data_all_iteration.shape[-1]
+    valeurs = np.moveaxis(data_all_iteration, 0, -1).reshape(geometrie.nb_puits, nb_iteration * nb_metriques)
+    # chaque ligne se termine par ';' comme dans le format historique (colonne vide en dernier)
+    df_out = pandas.DataFrame(valeurs, index=pandas.Index(geometrie.noms_puits(), name='well'), columns=titres)
+    df_out[''] = ''
+    df_out.to_csv(chemin_csv, sep=';', na_rep='nan')
+
+def differences_plaques(valeurs_instrument_1, valeurs_instrument_2):
+    # différences entre deux matrices de plaque selon le schéma 1 - 2, l'instrument 2 étant la référence pour les relatives
+    # prise en compte du cas pathologique où on doit diviser par 0 : différence relative et ratio à nan
+    Matrix_difference = valeurs_instrument_1 - valeurs_instrument_2
+    reference_nulle = valeurs_instrument_2 == 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Matrix_difference_relative = np.where(reference_nulle, np.nan, Matrix_difference / valeurs_instrument_2 * 100)
+        Matrix_ratio = np.where(reference_nulle, np.nan, valeurs_instrument_1 / valeurs_instrument_2)
+    return Matrix_difference, Matrix_difference_relative, Matrix_ratio
+
+def noyau_comparaison(valeurs_instrument_1, valeurs_instrument_2, tolerance_relative_fit, tolerance=20):
+    # =============================================================================
+    # comparaison d'une métrique (volume, épaisseur...) entre deux matrices de plaque (lignes x colonnes), sans lecture,
+    # écriture ni figure :
+    #       différences, différences relatives et ratios (1 - 2, 2 la référence)
+    #       masque des outliers évidents (différence relative > tolerance %, ou nan) exclus du fit
+    #       FIT linéaire instrument 1 = f(instrument 2), écart data - fit et masque des puits à plus de tolerance_relative_fit %
+    # retourne un dictionnaire avec les matrices, les vecteurs (puits rangés comme matrice.ravel()), les masques, le fit,
+    # nb_puits_trop_loins, nb_puits_loin_fit et la moyenne / CV des différences relatives
+    # =============================================================================
+    Matrix_difference, Matrix_difference_relative, Matrix_ratio = differences_plaques(valeurs_instrument_1, valeurs_instrument_2)
+
+    # mise sous forme de vecteur pour fiter
+    vecteur_instrument_1 = np.ravel(valeurs_instrument_1).astype(float)
+    vecteur_instrument_2 = np.ravel(valeurs_instrument_2).astype(float)
+    vecteur_ratio = Matrix_difference_relative.ravel()
+
+    # filtre très grossier pour ne pas prendre les outliers dans le calcul du fit
+    mask_nan = np.isnan(vecteur_ratio)
+    with np.errstate(invalid='ignore'):
+        mask_eloignes = (np.abs(vecteur_ratio) > tolerance) | mask_nan
+    mask_proches = ~mask_eloignes
+    # nb de puits exclus du fit (hors puits sans référence)
+    nb_puits_trop_loins = np.sum(mask_eloignes) - np.sum(mask_nan)
+
+    # calcul du fit, sur tous les puits si aucun n'est proche
+    if mask_proches.any():
+        slope_fit, intercept_fit, r_value_fit, p_value_fit, std_err_fit = stats.linregress(vecteur_instrument_2[mask_proches], vecteur_instrument_1[mask_proches])
+    else:
+        slope_fit, intercept_fit, r_value_fit, p_value_fit, std_err_fit = stats.linregress(vecteur_instrument_2, vecteur_instrument_1)
+    data_fit = slope_fit*vecteur_instrument_2+intercept_fit
+
+    # écart data - fit et masque en fct du seuillage de l'écart tolérable (écart nul si l'instrument 1 vaut 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ecart_au_fit = np.where(vecteur_instrument_1 != 0, 100 * np.abs(data_fit - vecteur_instrument_1) / vecteur_instrument_1, 0)
+        mask_eloignes_fit = ecart_au_fit > tolerance_relative_fit
+    # indicateur de la qualité des data vs fit
+    nb_puits_loin_fit = np.sum(mask_eloignes_fit)
+
+    # moyenne et CV des différences relatives
+    difference_relative_mean = np.nanmean(Matrix_difference_relative)
+    difference_relative_CV = 100*np.nanstd(Matrix_difference_relative)/difference_relative_mean
+
+    return {
+        'Matrix_difference': Matrix_difference,
+        'Matrix_difference_relative': Matrix_difference_relative,
+        'Matrix_ratio': Matrix_ratio,
+        'vecteur_instrument_1': vecteur_instrument_1,
+        'vecteur_instrument_2': vecteur_instrument_2,
+        'vecteur_ratio': vecteur_ratio,
+        'mask_proches': mask_proches,
+        'mask_eloignes': mask_eloignes,
+        'mask_nan': mask_nan,
+        'nb_puits_trop_loins': nb_puits_trop_loins,
+        'slope_fit': slope_fit,
+        'intercept_fit': intercept_fit,
+        'r_value_fit': r_value_fit,
+        'data_fit': data_fit,
+        'ecart_au_fit': ecart_au_fit,
+        'mask_eloignes_fit': mask_eloignes_fit,
+        'nb_puits_loin_fit': nb_puits_loin_fit,
+        'difference_relative_mean': difference_relative_mean,
+        'difference_relative_CV': difference_relative_CV,
+    }
+
+def specs_comparaison(comparaison, directory_plaque_to_save, name_dossier_to_save, name_dossier_instrument_1, type_intrument_1, type_intrument_2, grandeur, label_axe, nom_fichier, tolerance_relative_fit):
+    # figures d'une comparaison calculée par noyau_comparaison : data vs bissectrice, fit, points loin du fit
+    # grandeur : 'volumes', 'épaisseur' pour les titres, label_axe : 'V issu stat µm^3  '..., nom_fichier : début du nom des jpg
+    # retourne les FigureSpec, dessinées par publishFigures
+    vecteur_instrument_1 = comparaison['vecteur_instrument_1']
+    vecteur_instrument_2 = comparaison['vecteur_instrument_2']
+    mask_proches = comparaison['mask_proches']
+    mask_eloignes = comparaison['mask_eloignes']
+    mask_eloignes_fit = comparaison['mask_eloignes_fit']
+    slope_fit, intercept_fit, r_value_fit = comparaison['slope_fit'], comparaison['intercept_fit'], comparaison['r_value_fit']
+    label_fit = 'slope='+str(round(slope_fit,2))+'\nord='+str(round(intercept_fit,2))+'\nR²'+str(round(r_value_fit,4))
+    bissectrice = np.arange(np.nanmin(vecteur_instrument_2),np.nanmax(vecteur_instrument_2))
+    chemin_figure = directory_plaque_to_save+'\\'+name_dossier_to_save+' '+nom_fichier+' par puits'
+
+    spec_data = FigureSpec(chemin_figure+'.jpg',figsize=(12,6))
+    spec_data.add('figure.suptitle',name_dossier_instrument_1+' '+grandeur+' par puits '+type_intrument_2+' vs '+type_intrument_1 +'\n ')
+    spec_data.add('plot',vecteur_instrument_2[mask_proches],vecteur_instrument_1[mask_proches],'o',color='blue',label='data utile au fit')
+    spec_data.add('plot',vecteur_instrument_2[mask_eloignes],vecteur_instrument_1[mask_eloignes],'rx',label='outlier')
+    spec_data.add('plot',bissectrice,bissectrice,label='bissectrice = target',color='k')
+
+    spec_fit = FigureSpec(chemin_figure+'_FIT.jpg',figsize=(12,6))
+    spec_fit.add('figure.suptitle',name_dossier_instrument_1+' FIT\n'+grandeur+' par puits '+type_intrument_1+' vs '+type_intrument_2 +'\n '+str(comparaison['nb_puits_trop_loins'])+' puits exclus pour le calcul du fit')
+    spec_fit.add('plot',vecteur_instrument_2[mask_proches],vecteur_instrument_1[mask_proches],'+',color='blue',label='data utile pour fit')
+    spec_fit.add('plot',vecteur_instrument_2[mask_eloignes],vecteur_instrument_1[mask_eloignes],'rx',label='data exclue pour fit')
+    spec_fit.add('plot',vecteur_instrument_2,comparaison['data_fit'],color='#000080',linestyle = '-',label=label_fit)
+
+    spec_loin_fit = FigureSpec(chemin_figure+'_fit.jpg',figsize=(12,6))
+    spec_loin_fit.add('figure.suptitle',name_dossier_instrument_1+' '+grandeur+' par puits '+type_intrument_2+' vs '+type_intrument_1 +'\n nb puits loin du fit ='+str(comparaison['nb_puits_loin_fit'])+' tolerance ='+str(tolerance_relative_fit))
+    spec_loin_fit.add('plot',vecteur_instrument_2,vecteur_instrument_1,'v',color='green',label='data proche fit')
+    spec_loin_fit.add('plot',vecteur_instrument_2[mask_eloignes_fit],vecteur_instrument_1[mask_eloignes_fit],'rx',label='data loin fit')
+    spec_loin_fit.add('plot',vecteur_instrument_2,comparaison['data_fit'],color='k',linestyle = '-',label=label_fit)
+
+    specs = [spec_data, spec_fit, spec_loin_fit]
+    for spec in specs:
+        spec.add('set_xlabel',label_axe+type_intrument_2)
+        spec.add('set_ylabel',label_axe+type_intrument_1)
+        spec.add('legend')
+    return specs
+
+def spec_CV_vs_moyenne(chemin_figure, titre, mean_for_this_plate, CV_for_this_plate, marqueur, color_letter, geometrie, seuil, x_min, x_max, label_x, label_y):
+    # figure de répéta : CV en fonction de la moyenne des puits, une couleur par lettre de la plaque, et seuil de CV
+    spec = FigureSpec(chemin_figure)
+    spec.add('set_title',titre)
+    for j_letter in range(geometrie.nb_lignes):
+        spec.add('plot',mean_for_this_plate[j_letter,:],CV_for_this_plate[j_letter,:],marqueur,color = color_letter[j_letter], label = geometrie.lettres[j_letter])
+    spec.add('axhline',y = seuil,xmin=x_min, xmax=x_max, ls='--' , color = 'k', label = str(seuil)+'%')
+    spec.add('set_xlabel',label_x)
+    spec.add('set_ylabel',label_y)
+    spec.add('legend')
+    return spec
+
+def spec_colormap(chemin_figure, considered_matrice, name, colormap_choosen, v_min, v_max, geometrie):
+    # colormap d'une métrique par puits, comme affiche_colormap_etude_general_v2 mais pour toute géométrie de plaque
+    # si v_min = v_max l'échelle de couleur va du min au max de la matrice
+    if v_min == v_max:
+        v_min = np.nanmin(considered_matrice)
+        v_max = np.nanmax(considered_matrice)
+    considered_moyen = np.nanmean(considered_matrice)
+    considered_std = np.nanstd(considered_matrice)
+    etendue_relative = ((np.nanmax(considered_matrice) - np.nanmin(considered_matrice))/considered_moyen)* 100
+    spec = FigureSpec(chemin_figure,figsize=(10,7),colorbar=True,constrained_layout=True)
+    spec.add('imshow',considered_matrice, cmap=colormap_choosen, vmin = v_min, vmax = v_max,alpha=0.8)
+    spec.add('set_yticks',np.arange(0, geometrie.nb_lignes, step=1))
+    spec.add('set_yticklabels',geometrie.lettres, weight = 'bold')
+    spec.add('set_xticks',np.arange(0, geometrie.nb_colonnes, step=1))
+    spec.add('xaxis.set_ticks_position','top')
+    spec.add('set_xticklabels',[str(colonne) for colonne in range(1, geometrie.nb_colonnes + 1)], weight = 'bold')
+
+    if considered_moyen==0:
+        spec.add('set_title',name, weight = 'heavy')
+    else:
+        spec.add('figure.suptitle',name+'\n valeur moyenne = '+"{:.2f}".format(considered_moyen)+' ecart-type = '+"{:.2f}".format(considered_std)+'->'+str(int(considered_std/considered_moyen*100))+'%\n'+
+                 'min = '+str(round(np.nanmin(considered_matrice),1))+' max = '+str(round(np.nanmax(considered_matrice),1))+
+                 ' soit étendue relative de '+str(round(etendue_relative,1))+' %', weight = 'heavy')
+    for i, j in np.ndindex(geometrie.shape):
+        if np.isnan(considered_matrice[i][j]):
+            spec.add('text',j, i, 'nan', ha="center", va="center", color="r", size = 'x-large', weight = 'heavy')
+        else:
+            spec.add('text',j, i, "{:.1f}".format(considered_matrice[i][j]), ha="center", va="center", color="k", size = 'x-large', weight = 'bold')
+    return spec
+
+def ecrire_data_comparative(chemin_csv, geometrie, colonnes):
+    # csv des data comparées : une ligne par puits, colonnes = liste de (titre, matrice de plaque)
+    # chaque ligne se termine par ';' comme dans le format historique (colonne vide en dernier)
+    df_out = pandas.DataFrame({titre: np.ravel(matrice) for titre, matrice in colonnes}, index=pandas.Index(geometrie.noms_puits(), name='weel'))
+    df_out[''] = ''
+    df_out.to_csv(chemin_csv, sep=';', na_rep='nan')
+
+def repeta_sans_ref_v1(directory_source,nom_plaque,nom_reconstruction,directory_racine_output,CV_repeta_threshold,figure_queue=None):
     # =============================================================================
     # le but de cette fonction et de rassembler les données de répéta de l'imagerie d'une même plaque 
         # =============================================================================
@@ -56,42 +241,10 @@ def repeta_sans_ref_v1(directory_source,nom_plaque,nom_reconstruction,directory_
     #           creation du csv avec les data brutes agglomérées 
     #       -> retourne les valeurs des indicateurs et les array intéressants
     #            nb_iteration , nb_well_over_threshold , CV_max_volume, CV_min_volume, CV_mean_volume, CV_max_diametre, CV_min_diametre, CV_mean_diametre ,volume_mean_for_this_plate , volume_CV_for_this_plate , diametre_mean_for_this_plate , diametre_CV_for_this_plate 
+    #       -> figure_queue (optionnel) : FigureQueue où déposer les figures, dessinées plus tard à la demande ;
+    #            sans file les figures sont dessinées avant le retour de la fonction
     # =============================================================================
     liste_dossier_present = os.listdir(directory_source)
-#    géométrie des plaques 96 puits
-    number_of_letters_max = 8
-    number_of_colonne_number_max = 12
-#    génération de dégradés de couleurs du même nombre que le nombre de lettres
-    color_letter =gen_color(cmap="viridis",n=number_of_letters_max)
-    color_letter_bis =gen_color(cmap="autumn",n=number_of_letters_max)
-#    génération des array qui vont contenir les métriques 
-    volume_mean_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    volume_std_mean_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    diametre_mean_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    diametre_std_mean_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    nb_dot_detecte_mean_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    n_dot_keep_now_mean_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    n_cycle_mean_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    porcent_dot_utile_mean_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-
-    volume_std_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    volume_std_std_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    diametre_std_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    diametre_std_std_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    nb_dot_detecte_std_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    n_dot_keep_now_std_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    n_cycle_std_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    porcent_dot_utile_std_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-
-    volume_CV_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    volume_CV_std_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    diametre_CV_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    diametre_CV_std_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    nb_dot_detecte_CV_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    n_dot_keep_now_CV_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    n_cycle_CV_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    porcent_dot_utile_CV_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-
 #    cherche le nombre d'itérations de l'imagerie et retient les noms de dossiers concernés
     liste_dossier_plaque = []
     nb_iteration = 0
@@ -106,110 +259,46 @@ def repeta_sans_ref_v1(directory_source,nom_plaque,nom_reconstruction,directory_
     if os.path.exists(directory_out_this_plate) == False:
         os.mkdir(directory_out_this_plate)
 
-#    array qui vont récoltés toutes les entrées des itérations
-    volume_plaque_all_iteration = np.zeros((number_of_letters_max,number_of_colonne_number_max,nb_iteration)) 
-    volume_std_plaque_all_iteration = np.zeros((number_of_letters_max,number_of_colonne_number_max,nb_iteration)) 
-    diametre_plaque_all_iteration = np.zeros((number_of_letters_max,number_of_colonne_number_max,nb_iteration)) 
-    diametre_std_plaque_all_iteration = np.zeros((number_of_letters_max,number_of_colonne_number_max,nb_iteration)) 
-    nb_dot_detecte_plaque_all_iteration = np.zeros((number_of_letters_max,number_of_colonne_number_max,nb_iteration)) 
-    n_dot_keep_now_plaque_all_iteration = np.zeros((number_of_letters_max,number_of_colonne_number_max,nb_iteration)) 
-    n_cycle_plaque_all_iteration = np.zeros((number_of_letters_max,number_of_colonne_number_max,nb_iteration)) 
-    porcent_dot_utile_plaque_all_iteration = np.zeros((number_of_letters_max,number_of_colonne_number_max,nb_iteration)) 
-
-#    par itération de l'acquisition, on va chercher synthese_interferometric_data.csv et on agglomère les data dans les array ci dessus 
-#    ecriture dans un fichier csv de sortie les data utilisées
-    string_title_csv_out = 'well;'
-    j_iteration = 0
-    while j_iteration<nb_iteration:
-
-        dossier_now = directory_source + '\\' + liste_dossier_plaque[j_iteration]
-        dossier_reconstruction =  dossier_now+ '\\'  + nom_reconstruction
-        file = dossier_reconstruction + '\\synthese_interferometric_data.csv'
-#        lecture de synthese_interferometric_data.csv issu de Zyminterne
-        volume_now, volume_std_now, diametre_now, diametre_std_now, N_dot_detected_now, N_dot_keep_now, N_cycle_now, porcent_dot_keep_now =  import_data_from_csv_synthese_zymintern(file)
-#
+#    lecture des csv synthese de toutes les itérations : la géométrie de la plaque (96, 384, 1536 puits) est celle des fichiers
+    plaques = []
+    for dossier_plaque in liste_dossier_plaque:
+        file = directory_source + '\\' + dossier_plaque + '\\' + nom_reconstruction + '\\synthese_interferometric_data.csv'
+        plaques.append(import_data_from_csv_synthese_zymintern(file))
+        if plaques[-1].geometrie != plaques[0].geometrie:
+            raise ValueError(f"{file} : plaque {plaques[-1].geometrie} différente de la première itération {plaques[0].geometrie}")
+    if not plaques:
+        raise ValueError(f"Aucun dossier contenant {nom_plaque} dans {directory_source}")
+    geometrie = plaques[0].geometrie
+    number_of_letters_max = geometrie.nb_lignes
+    number_of_colonne_number_max = geometrie.nb_colonnes
+#    génération de dégradés de couleurs du même nombre que le nombre de lettres
+    color_letter =gen_color(cmap="viridis",n=number_of_letters_max)
+    color_letter_bis =gen_color(cmap="autumn",n=number_of_letters_max)
+
+#    toutes les itérations dans un seul array (métrique, ligne, colonne, itération)
+    data_all_iteration = np.stack([plaque.data for plaque in plaques], axis=-1)
+
+#    par itération : copie des dotmaps et titres des colonnes du csv de sortie
+#    NB: le nom du dossier considéré est renseigné dans la 1ere colonne de la plaque (Volume)
+    titres_csv_out = []
+    for j_iteration, dossier_plaque in enumerate(liste_dossier_plaque):
+        dossier_reconstruction = directory_source + '\\' + dossier_plaque + '\\' + nom_reconstruction
         #        copie des dotmaps pour un suivi  de l'allure des dots
-        # copyfile(dossier_reconstruction+'\\dot_map_730.png',directory_out_this_plate+'\\dot_map_730_'+liste_dossier_plaque[j_iteration]+'.png')
-        # copyfile(dossier_reconstruction+'\\dot_map_contour_730.png',directory_out_this_plate+'\\dot_map_contour_730'+liste_dossier_plaque[j_iteration]+'.png')
-        # copyfile(dossier_reconstruction+'\\dot_map_cycle_730.png',directory_out_this_plate+'\\dot_map_cycle_730'+liste_dossier_plaque[j_iteration]+'.png')
-
-        volume_plaque_all_iteration[:,:,j_iteration] = np.copy(volume_now[:,:])
-        volume_std_plaque_all_iteration[:,:,j_iteration] = np.copy(volume_std_now[:,:])
-        diametre_plaque_all_iteration[:,:,j_iteration] = np.copy(diametre_now[:,:])
-        diametre_std_plaque_all_iteration[:,:,j_iteration] = np.copy(diametre_std_now[:,:])
-        nb_dot_detecte_plaque_all_iteration[:,:,j_iteration] = np.copy(N_dot_detected_now[:,:])
-        n_dot_keep_now_plaque_all_iteration[:,:,j_iteration] = np.copy(N_dot_keep_now[:,:])
-        n_cycle_plaque_all_iteration[:,:,j_iteration] = np.copy(N_cycle_now[:,:])
-        porcent_dot_utile_plaque_all_iteration[:,:,j_iteration] = np.copy(porcent_dot_keep_now[:,:])            
-#        incrément de la string de titre du csv de sortie 
-#        NB: le nom du dossier considéré est renseigné dans la 1ere colonne de la plaque (Volume)
-        string_title_csv_out += 'Volume_' + liste_dossier_plaque[j_iteration] + ';'
-        string_title_csv_out += 'Volume_std_' + str(j_iteration) + ';'
-        string_title_csv_out += 'Diametre_' + str(j_iteration) + ';'
-        string_title_csv_out += 'Diametre_std' + str(j_iteration) + ';'
-        string_title_csv_out += 'N_dot_detected_' + str(j_iteration) + ';'
-        string_title_csv_out += 'N_dot_keep_now' + str(j_iteration) + ';'
-        string_title_csv_out += 'N_cycle_now' + str(j_iteration) + ';'
-        string_title_csv_out += 'porcent_dot_keep_now' + str(j_iteration) + ';'
-
-        j_iteration += 1
+        # copyfile(dossier_reconstruction+'\\dot_map_730.png',directory_out_this_plate+'\\dot_map_730_'+dossier_plaque+'.png')
+        # copyfile(dossier_reconstruction+'\\dot_map_contour_730.png',directory_out_this_plate+'\\dot_map_contour_730'+dossier_plaque+'.png')
+        # copyfile(dossier_reconstruction+'\\dot_map_cycle_730.png',directory_out_this_plate+'\\dot_map_cycle_730'+dossier_plaque+'.png')
+        titres_csv_out += ['Volume_' + dossier_plaque, 'Volume_std_' + str(j_iteration), 'Diametre_' + str(j_iteration),
+                           'Diametre_std' + str(j_iteration), 'N_dot_detected_' + str(j_iteration), 'N_dot_keep_now' + str(j_iteration),
+                           'N_cycle_now' + str(j_iteration), 'porcent_dot_keep_now' + str(j_iteration)]
 
 # calcul des moyennes des différentes métriques sauvées pour toutes les itérations et des écart-types et leur CV
 #        attention puisque des métriques de base sont des écarts-types, on a ici des écart types d'écarts types
+    mean_for_this_plate, std_for_this_plate, CV_for_this_plate = statistiques_repeta(data_all_iteration)
+    volume_mean_for_this_plate, volume_std_mean_for_this_plate, diametre_mean_for_this_plate, diametre_std_mean_for_this_plate, nb_dot_detecte_mean_for_this_plate, n_dot_keep_now_mean_for_this_plate, n_cycle_mean_for_this_plate, porcent_dot_utile_mean_for_this_plate = mean_for_this_plate
+    volume_std_for_this_plate, volume_std_std_for_this_plate, diametre_std_for_this_plate, diametre_std_std_for_this_plate, nb_dot_detecte_std_for_this_plate, n_dot_keep_now_std_for_this_plate, n_cycle_std_for_this_plate, porcent_dot_utile_std_for_this_plate = std_for_this_plate
+    volume_CV_for_this_plate, volume_CV_std_for_this_plate, diametre_CV_for_this_plate, diametre_CV_std_for_this_plate, nb_dot_detecte_CV_for_this_plate, n_dot_keep_now_CV_for_this_plate, n_cycle_CV_for_this_plate, porcent_dot_utile_CV_for_this_plate = CV_for_this_plate
 
-
-    csv_out_this_plate = open(directory_out_this_plate+'\\data_raw.csv','w')
-
-    csv_out_this_plate.write(string_title_csv_out+'\n')
-
-    j_letter = 0
-    while j_letter<number_of_letters_max:
-        j_col = 0
-        while j_col<number_of_colonne_number_max:
-#            calcul des moyennes
-            volume_mean_for_this_plate[j_letter,j_col]= np.nanmean(volume_plaque_all_iteration[j_letter,j_col,:])
-            volume_std_mean_for_this_plate[j_letter,j_col]= np.nanmean(volume_std_plaque_all_iteration[j_letter,j_col,:])
-            diametre_mean_for_this_plate[j_letter,j_col]= np.nanmean(diametre_plaque_all_iteration[j_letter,j_col,:])
-            diametre_std_mean_for_this_plate[j_letter,j_col]= np.nanmean(diametre_std_plaque_all_iteration[j_letter,j_col,:])
-            nb_dot_detecte_mean_for_this_plate[j_letter,j_col]= np.nanmean(nb_dot_detecte_plaque_all_iteration[j_letter,j_col,:])
-            n_dot_keep_now_mean_for_this_plate[j_letter,j_col]= np.nanmean(n_dot_keep_now_plaque_all_iteration[j_letter,j_col,:])
-            n_cycle_mean_for_this_plate[j_letter,j_col]= np.nanmean(n_cycle_plaque_all_iteration[j_letter,j_col,:])
-            porcent_dot_utile_mean_for_this_plate[j_letter,j_col]= np.nanmean(porcent_dot_utile_plaque_all_iteration[j_letter,j_col,:])
-#            calcul des ecarts types
-            volume_std_for_this_plate[j_letter,j_col]= np.nanstd(volume_plaque_all_iteration[j_letter,j_col,:])
-            volume_std_std_for_this_plate[j_letter,j_col]= np.nanstd(volume_std_plaque_all_iteration[j_letter,j_col,:])
-            diametre_std_for_this_plate[j_letter,j_col]= np.nanstd(diametre_plaque_all_iteration[j_letter,j_col,:])
-            diametre_std_std_for_this_plate[j_letter,j_col]= np.nanstd(diametre_std_plaque_all_iteration[j_letter,j_col,:])
-            nb_dot_detecte_std_for_this_plate[j_letter,j_col]= np.nanstd(nb_dot_detecte_plaque_all_iteration[j_letter,j_col,:])
-            n_dot_keep_now_std_for_this_plate[j_letter,j_col]= np.nanstd(n_dot_keep_now_plaque_all_iteration[j_letter,j_col,:])
-            n_cycle_std_for_this_plate[j_letter,j_col]= np.nanstd(n_cycle_plaque_all_iteration[j_letter,j_col,:])
-            porcent_dot_utile_std_for_this_plate[j_letter,j_col]= np.nanstd(porcent_dot_utile_plaque_all_iteration[j_letter,j_col,:])
-#            calcul des CV
-            volume_CV_for_this_plate[j_letter,j_col]= np.copy(volume_std_for_this_plate[j_letter,j_col]/volume_mean_for_this_plate[j_letter,j_col]*100)
-            volume_CV_std_for_this_plate[j_letter,j_col]= np.copy(volume_std_std_for_this_plate[j_letter,j_col]/volume_std_mean_for_this_plate[j_letter,j_col]*100)
-            diametre_CV_for_this_plate[j_letter,j_col]= np.copy(diametre_std_for_this_plate[j_letter,j_col]/diametre_mean_for_this_plate[j_letter,j_col]*100)
-            diametre_CV_std_for_this_plate[j_letter,j_col]= np.copy(diametre_std_std_for_this_plate[j_letter,j_col]/diametre_std_mean_for_this_plate[j_letter,j_col]*100)
-            nb_dot_detecte_CV_for_this_plate[j_letter,j_col]= np.copy(nb_dot_detecte_std_for_this_plate[j_letter,j_col]/nb_dot_detecte_mean_for_this_plate[j_letter,j_col]*100)
-            n_dot_keep_now_CV_for_this_plate[j_letter,j_col]= np.copy(n_dot_keep_now_std_for_this_plate[j_letter,j_col]/n_dot_keep_now_mean_for_this_plate[j_letter,j_col]*100)
-            n_cycle_CV_for_this_plate[j_letter,j_col]= np.copy(n_cycle_std_for_this_plate[j_letter,j_col]/n_cycle_mean_for_this_plate[j_letter,j_col]*100)
-            porcent_dot_utile_CV_for_this_plate[j_letter,j_col]= np.copy(porcent_dot_utile_std_for_this_plate[j_letter,j_col]/porcent_dot_utile_mean_for_this_plate[j_letter,j_col]*100)
-            line_csv_out = ''
-            line_csv_out += alphabet_majuscule[j_letter] + str(j_col+1) + ';'
-
-            j_iteration = 0
-            while j_iteration<nb_iteration:
-                line_csv_out += str(volume_plaque_all_iteration[j_letter,j_col,j_iteration])+';'+str(volume_std_plaque_all_iteration[j_letter,j_col,j_iteration])+';'
-                line_csv_out += str(diametre_plaque_all_iteration[j_letter,j_col,j_iteration])+';'+str(diametre_std_plaque_all_iteration[j_letter,j_col,j_iteration])+';'
-                line_csv_out += str(nb_dot_detecte_plaque_all_iteration[j_letter,j_col,j_iteration])+';'+str(n_dot_keep_now_plaque_all_iteration[j_letter,j_col,j_iteration])+';'
-                line_csv_out += str(n_cycle_plaque_all_iteration[j_letter,j_col,j_iteration])+';'+str(porcent_dot_utile_plaque_all_iteration[j_letter,j_col,j_iteration])+';'
-
-                j_iteration += 1
-
-            csv_out_this_plate.write(line_csv_out+'\n')    
-            j_col += 1
-        j_letter += 1
-
-    csv_out_this_plate.close()
+    ecrire_data_raw(directory_out_this_plate+'\\data_raw.csv', geometrie, titres_csv_out, data_all_iteration)
 
     #affiche_colormap_etude_general_v2(volume_mean_for_this_plate,nom_plaque+'volume_mean_for_this_plate on all iteration','jet',0,500)
     #plt.savefig(directory_out_this_plate+'\\'+nom_plaque+'volume_mean_for_this_plate.jpg')
@@ -251,35 +340,17 @@ def repeta_sans_ref_v1(directory_source,nom_plaque,nom_reconstruction,directory_
     v_max_mean = np.nanmax(volume_mean_for_this_plate)
 
 
-    plt.close('all')
-    plt.figure(1)
-    plt.title(nom_plaque+' sur ' + str(nb_iteration)+ 'runs\n'+str(nb_well_over_threshold)+ ' puits au dessus de '+str(CV_repeta_threshold)+'% de CV sur le volumes')
-    j_letter = 0
-    while j_letter<number_of_letters_max:
-        plt.plot(volume_mean_for_this_plate[j_letter,:],volume_CV_for_this_plate[j_letter,:],'o',color = color_letter[j_letter], label = alphabet_majuscule[j_letter])        
-        j_letter += 1
-    plt.axhline(y = CV_repeta_threshold,xmin=v_min_mean, xmax=v_max_mean, ls='--' , color = 'k', label = str(CV_repeta_threshold)+'%')
-    plt.xlabel('V_mean µm^3')
-    plt.ylabel('CV %')
-    plt.legend()
-    plt.savefig(directory_out_this_plate+'\\'+nom_plaque+'_CV_on_V_vs_V_mean.jpg')
-
-    plt.figure(2)
-    plt.title(nom_plaque+' sur ' + str(nb_iteration)+ 'runs')
-    j_letter = 0
-    while j_letter<number_of_letters_max:
-        plt.plot(diametre_mean_for_this_plate[j_letter,:],diametre_CV_for_this_plate[j_letter,:],'v',color = color_letter[j_letter], label = alphabet_majuscule[j_letter])        
-        j_letter += 1
-    plt.axhline(y = 5,xmin=v_min_mean, xmax=v_max_mean, ls='--' , color = 'k', label = '5%')
-    plt.xlabel('D_mean µm')
-    plt.ylabel('CV on D%')
-    plt.legend()
-    plt.savefig(directory_out_this_plate+'\\'+nom_plaque+'_CV_on_D_vs_D_mean.jpg')
-    plt.close('all')
+    specs = [spec_CV_vs_moyenne(directory_out_this_plate+'\\'+nom_plaque+'_CV_on_V_vs_V_mean.jpg',
+                                nom_plaque+' sur ' + str(nb_iteration)+ 'runs\n'+str(nb_well_over_threshold)+ ' puits au dessus de '+str(CV_repeta_threshold)+'% de CV sur le volumes',
+                                volume_mean_for_this_plate, volume_CV_for_this_plate, 'o', color_letter, geometrie, CV_repeta_threshold, v_min_mean, v_max_mean, 'V_mean µm^3', 'CV %'),
+             spec_CV_vs_moyenne(directory_out_this_plate+'\\'+nom_plaque+'_CV_on_D_vs_D_mean.jpg',
+                                nom_plaque+' sur ' + str(nb_iteration)+ 'runs',
+                                diametre_mean_for_this_plate, diametre_CV_for_this_plate, 'v', color_letter, geometrie, 5, v_min_mean, v_max_mean, 'D_mean µm', 'CV on D%')]
+    publishFigures(specs, figure_queue)
 
     return  nb_iteration , nb_well_over_threshold , CV_max_volume, CV_min_volume, CV_mean_volume, CV_max_diametre, CV_min_diametre, CV_mean_diametre ,volume_mean_for_this_plate , volume_CV_for_this_plate , diametre_mean_for_this_plate , diametre_CV_for_this_plate 
 
-def repeta_sans_ref_v1_nanofilm(directory_source,nom_plaque,nom_reconstruction,directory_racine_output,CV_repeta_threshold):
+def repeta_sans_ref_v1_nanofilm(directory_source,nom_plaque,nom_reconstruction,directory_racine_output,CV_repeta_threshold,figure_queue=None):
     # =============================================================================
     # le but de cette fonction et de rassembler les données de répéta de l'imagerie d'une même plaque 
         # =============================================================================
@@ -303,36 +374,10 @@ def repeta_sans_ref_v1_nanofilm(directory_source,nom_plaque,nom_reconstruction,d
     #           creation du csv avec les data brutes agglomérées 
     #       -> retourne les valeurs des indicateurs et les array intéressants
     #            nb_iteration , nb_well_over_threshold , CV_max_volume, CV_min_volume, CV_mean_volume, CV_max_diametre, CV_min_diametre, CV_mean_diametre ,volume_mean_for_this_plate , volume_CV_for_this_plate , diametre_mean_for_this_plate , diametre_CV_for_this_plate 
+    #       -> figure_queue (optionnel) : FigureQueue où déposer les figures, dessinées plus tard à la demande ;
+    #            sans file les figures sont dessinées avant le retour de la fonction
     # =============================================================================
     liste_dossier_present = os.listdir(directory_source)
-#    géométrie des plaques 96 puits
-    number_of_letters_max = 8
-    number_of_colonne_number_max = 12
-#    génération de dégradés de couleurs du même nombre que le nombre de lettres
-    color_letter =gen_color(cmap="viridis",n=number_of_letters_max)
-    color_letter_bis =gen_color(cmap="autumn",n=number_of_letters_max)
-#    génération des array qui vont contenir les métriques 
-    thickness_mean_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max))  
-    intensity_455_mean_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    intensity_730_mean_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    nb_area_before_mean_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    nb_area_after_mean_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    porcent_area_utile_mean_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-
-    thickness_std_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max))  
-    intensity_455_std_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    intensity_730_std_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    nb_area_before_std_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    nb_area_after_std_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    porcent_area_utile_std_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-
-    thickness_CV_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max))  
-    intensity_455_CV_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    intensity_730_CV_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    nb_area_before_CV_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    nb_area_after_CV_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    porcent_area_utile_CV_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max))
-
 #    cherche le nombre d'itérations de l'imagerie et retient les noms de dossiers concernés
     liste_dossier_plaque = []
     nb_iteration = 0
@@ -347,123 +392,55 @@ def repeta_sans_ref_v1_nanofilm(directory_source,nom_plaque,nom_reconstruction,d
     if os.path.exists(directory_out_this_plate) == False:
         os.mkdir(directory_out_this_plate)
 
-#    array qui vont récoltés toutes les entrées des itérations
-    thickness_plaque_all_iteration = np.zeros((number_of_letters_max,number_of_colonne_number_max,nb_iteration)) 
-    thickness_std_plaque_all_iteration = np.zeros((number_of_letters_max,number_of_colonne_number_max,nb_iteration)) 
-    intensite_455_plaque_all_iteration = np.zeros((number_of_letters_max,number_of_colonne_number_max,nb_iteration)) 
-    intensite_730_plaque_all_iteration = np.zeros((number_of_letters_max,number_of_colonne_number_max,nb_iteration)) 
-    nb_area_before_plaque_all_iteration = np.zeros((number_of_letters_max,number_of_colonne_number_max,nb_iteration)) 
-    n_area_after_now_plaque_all_iteration = np.zeros((number_of_letters_max,number_of_colonne_number_max,nb_iteration)) 
-    porcent_area_utile_plaque_all_iteration = np.zeros((number_of_letters_max,number_of_colonne_number_max,nb_iteration))  
-
-#    par itération de l'acquisition, on va chercher synthese_interferometric_data.csv et on agglomère les data dans les array ci dessus 
-#    ecriture dans un fichier csv de sortie les data utilisées
-    string_title_csv_out = 'well;'
-    j_iteration = 0
-    while j_iteration<nb_iteration:
-
-        dossier_now = directory_source + '\\' + liste_dossier_plaque[j_iteration]
-        dossier_reconstruction =  dossier_now+ '\\'  + nom_reconstruction
-        file = dossier_reconstruction + '\\synthese_interferometric_data.csv'
-#        lecture de synthese_interferometric_data.csv issu de Zyminterne
-        thickness_now, thickness_std_now, intensite_455_now, intensite_730_now, N_area_before_now, N_area_after_now, porcent_area_now =  import_data_from_csv_synthese_zymintern_nanofilm(file)
-#        copie des dotmaps pour un suivi  de l'allure des dots
-        # copyfile(dossier_reconstruction+'\\intensity_455_map.png',directory_out_this_plate+'\\intensity_455_'+liste_dossier_plaque[j_iteration]+'.png')
-        # copyfile(dossier_reconstruction+'\\intensity_730_map.png',directory_out_this_plate+'\\intensity_730_'+liste_dossier_plaque[j_iteration]+'.png')
-        # copyfile(dossier_reconstruction+'\\stat_litteral_intensity_455_colormap.png',directory_out_this_plate+'\\intensity_455_colormap'+liste_dossier_plaque[j_iteration]+'.png')
-        # copyfile(dossier_reconstruction+'\\stat_litteral_intensity_730_colormap.png',directory_out_this_plate+'\\intensity_730_colormap'+liste_dossier_plaque[j_iteration]+'.png')
-        # copyfile(dossier_reconstruction+'\\stat_litteral_thicknesses_colormap.png',directory_out_this_plate+'\\thicknesses'+liste_dossier_plaque[j_iteration]+'.png')
-
-        thickness_plaque_all_iteration[:,:,j_iteration] = np.copy(thickness_now[:,:])
-        thickness_std_plaque_all_iteration[:,:,j_iteration] = np.copy(thickness_std_now[:,:])
-        intensite_455_plaque_all_iteration[:,:,j_iteration] = np.copy(intensite_455_now[:,:])
-        intensite_730_plaque_all_iteration[:,:,j_iteration] = np.copy(intensite_730_now[:,:])
-        nb_area_before_plaque_all_iteration[:,:,j_iteration] = np.copy(N_area_before_now[:,:])
-        n_area_after_now_plaque_all_iteration[:,:,j_iteration] = np.copy(N_area_after_now[:,:])
-        porcent_area_utile_plaque_all_iteration[:,:,j_iteration] = np.copy(porcent_area_now[:,:])            
-#        incrément de la string de titre du csv de sortie 
-#        NB: le nom du dossier considéré est renseigné dans la 1ere colonne de la plaque (Volume)
-        string_title_csv_out += 'épaisseur_' + liste_dossier_plaque[j_iteration] + ';'
-        string_title_csv_out += 'écart-type_épaisseur_' + str(j_iteration) + ';'
-        string_title_csv_out += 'intensité_455' + str(j_iteration) + ';'
-        string_title_csv_out += 'intensité_730' + str(j_iteration) + ';'
-        string_title_csv_out += 'N_zones_avant' + str(j_iteration) + ';'
-        string_title_csv_out += 'N_zones_après' + str(j_iteration) + ';'
-        string_title_csv_out += 'pourcentage_zones_utiles' + str(j_iteration) + ';'
-
-        j_iteration += 1
+#    lecture des csv synthese de toutes les itérations : la géométrie de la plaque (96, 384, 1536 puits) est celle des fichiers
+    plaques = []
+    for dossier_plaque in liste_dossier_plaque:
+        file = directory_source + '\\' + dossier_plaque + '\\' + nom_reconstruction + '\\synthese_interferometric_data.csv'
+        plaques.append(import_data_from_csv_synthese_zymintern_nanofilm(file))
+        if plaques[-1].geometrie != plaques[0].geometrie:
+            raise ValueError(f"{file} : plaque {plaques[-1].geometrie} différente de la première itération {plaques[0].geometrie}")
+    if not plaques:
+        raise ValueError(f"Aucun dossier contenant {nom_plaque} dans {directory_source}")
+    geometrie = plaques[0].geometrie
+    number_of_letters_max = geometrie.nb_lignes
+    number_of_colonne_number_max = geometrie.nb_colonnes
+#    génération de dégradés de couleurs du même nombre que le nombre de lettres
+    color_letter =gen_color(cmap="viridis",n=number_of_letters_max)
+    color_letter_bis =gen_color(cmap="autumn",n=number_of_letters_max)
+
+#    toutes les itérations dans un seul array (métrique, ligne, colonne, itération)
+    data_all_iteration = np.stack([plaque.data for plaque in plaques], axis=-1)
+
+#    par itération : copie des cartes d'intensité et titres des colonnes du csv de sortie
+#    NB: le nom du dossier considéré est renseigné dans la 1ere colonne de la plaque (épaisseur)
+    titres_csv_out = []
+    for j_iteration, dossier_plaque in enumerate(liste_dossier_plaque):
+        dossier_reconstruction = directory_source + '\\' + dossier_plaque + '\\' + nom_reconstruction
+        # copyfile(dossier_reconstruction+'\\intensity_455_map.png',directory_out_this_plate+'\\intensity_455_'+dossier_plaque+'.png')
+        # copyfile(dossier_reconstruction+'\\intensity_730_map.png',directory_out_this_plate+'\\intensity_730_'+dossier_plaque+'.png')
+        # copyfile(dossier_reconstruction+'\\stat_litteral_intensity_455_colormap.png',directory_out_this_plate+'\\intensity_455_colormap'+dossier_plaque+'.png')
+        # copyfile(dossier_reconstruction+'\\stat_litteral_intensity_730_colormap.png',directory_out_this_plate+'\\intensity_730_colormap'+dossier_plaque+'.png')
+        # copyfile(dossier_reconstruction+'\\stat_litteral_thicknesses_colormap.png',directory_out_this_plate+'\\thicknesses'+dossier_plaque+'.png')
+        titres_csv_out += ['épaisseur_' + dossier_plaque, 'écart-type_épaisseur_' + str(j_iteration), 'intensité_455' + str(j_iteration),
+                           'intensité_730' + str(j_iteration), 'N_zones_avant' + str(j_iteration), 'N_zones_après' + str(j_iteration),
+                           'pourcentage_zones_utiles' + str(j_iteration)]
 
 # calcul des moyennes des différentes métriques sauvées pour toutes les itérations et des écart-types et leur CV
 #        attention puisque des métriques de base sont des écarts-types, on a ici des écart types d'écarts types
+    mean_for_this_plate, std_for_this_plate, CV_for_this_plate = statistiques_repeta(data_all_iteration)
+    thickness_mean_for_this_plate, thickness_std_mean_for_this_plate, intensity_455_mean_for_this_plate, intensity_730_mean_for_this_plate, nb_area_before_mean_for_this_plate, nb_area_after_mean_for_this_plate, porcent_area_utile_mean_for_this_plate = mean_for_this_plate
+    thickness_std_for_this_plate, thickness_std_std_for_this_plate, intensity_455_std_for_this_plate, intensity_730_std_for_this_plate, nb_area_before_std_for_this_plate, nb_area_after_std_for_this_plate, porcent_area_utile_std_for_this_plate = std_for_this_plate
+    thickness_CV_for_this_plate, thickness_CV_std_for_this_plate, intensity_455_CV_for_this_plate, intensity_730_CV_for_this_plate, nb_area_before_CV_for_this_plate, nb_area_after_CV_for_this_plate, porcent_area_utile_CV_for_this_plate = CV_for_this_plate
 
+    ecrire_data_raw(directory_out_this_plate+'\\data_raw.csv', geometrie, titres_csv_out, data_all_iteration)
 
-    csv_out_this_plate = open(directory_out_this_plate+'\\data_raw.csv','w')
-
-    csv_out_this_plate.write(string_title_csv_out+'\n')
-
-    j_letter = 0
-    while j_letter<number_of_letters_max:
-        j_col = 0
-        while j_col<number_of_colonne_number_max:
-#            calcul des moyennes
-            thickness_mean_for_this_plate[j_letter,j_col]= np.nanmean(thickness_plaque_all_iteration[j_letter,j_col,:])
-            intensity_455_mean_for_this_plate[j_letter,j_col]= np.nanmean(intensite_455_plaque_all_iteration[j_letter,j_col,:])
-            intensity_730_mean_for_this_plate[j_letter,j_col]= np.nanmean(intensite_730_plaque_all_iteration[j_letter,j_col,:])
-            nb_area_before_mean_for_this_plate[j_letter,j_col]= np.nanmean(nb_area_before_plaque_all_iteration[j_letter,j_col,:])
-            nb_area_after_mean_for_this_plate[j_letter,j_col]= np.nanmean(n_area_after_now_plaque_all_iteration[j_letter,j_col,:])
-            porcent_area_utile_mean_for_this_plate[j_letter,j_col]= np.nanmean(porcent_area_utile_plaque_all_iteration[j_letter,j_col,:])
-
-#            calcul des ecarts types
-            thickness_std_for_this_plate[j_letter,j_col]= np.nanstd(thickness_plaque_all_iteration[j_letter,j_col,:])
-            intensity_455_std_for_this_plate[j_letter,j_col]= np.nanstd(intensite_455_plaque_all_iteration[j_letter,j_col,:])
-            intensity_730_std_for_this_plate[j_letter,j_col]= np.nanstd(intensite_730_plaque_all_iteration[j_letter,j_col,:])
-            nb_area_before_std_for_this_plate[j_letter,j_col]= np.nanstd(nb_area_before_plaque_all_iteration[j_letter,j_col,:])
-            nb_area_after_std_for_this_plate[j_letter,j_col]= np.nanstd(n_area_after_now_plaque_all_iteration[j_letter,j_col,:])
-            porcent_area_utile_std_for_this_plate[j_letter,j_col]= np.nanstd(porcent_area_utile_plaque_all_iteration[j_letter,j_col,:])
-
-#            calcul des CV
-            thickness_CV_for_this_plate[j_letter,j_col]= np.copy(thickness_std_for_this_plate[j_letter,j_col]/thickness_mean_for_this_plate[j_letter,j_col]*100)
-            intensity_455_CV_for_this_plate[j_letter,j_col]= np.copy(intensity_455_std_for_this_plate[j_letter,j_col]/intensity_455_mean_for_this_plate[j_letter,j_col]*100)
-            intensity_730_CV_for_this_plate[j_letter,j_col]= np.copy(intensity_730_std_for_this_plate[j_letter,j_col]/intensity_730_mean_for_this_plate[j_letter,j_col]*100)
-            nb_area_before_CV_for_this_plate[j_letter,j_col]= np.copy(nb_area_before_std_for_this_plate[j_letter,j_col]/nb_area_before_mean_for_this_plate[j_letter,j_col]*100)
-            nb_area_after_CV_for_this_plate[j_letter,j_col]= np.copy(nb_area_after_std_for_this_plate[j_letter,j_col]/nb_area_after_mean_for_this_plate[j_letter,j_col]*100)
-            porcent_area_utile_CV_for_this_plate[j_letter,j_col]= np.copy(porcent_area_utile_std_for_this_plate[j_letter,j_col]/porcent_area_utile_mean_for_this_plate[j_letter,j_col]*100)
-
-            line_csv_out = ''
-            line_csv_out += alphabet_majuscule[j_letter] + str(j_col+1) + ';'
-
-            j_iteration = 0
-            while j_iteration<nb_iteration:
-                line_csv_out += str(thickness_plaque_all_iteration[j_letter,j_col,j_iteration])+';_;'
-                # line_csv_out += str(intensity_455_mean_for_this_plate[j_letter,j_col,j_iteration])+';_;'
-                # line_csv_out += str(intensity_730_mean_for_this_plate[j_letter,j_col,j_iteration])+';_;'
-                # line_csv_out += str(porcent_area_utile_mean_for_this_plate[j_letter,j_col,j_iteration])+';_;'
-
-                j_iteration += 1
-
-            csv_out_this_plate.write(line_csv_out+'\n')    
-            j_col += 1
-        j_letter += 1
-
-    csv_out_this_plate.close()
-
-    affiche_colormap_etude_general_v2(thickness_mean_for_this_plate,nom_plaque+'thickness_mean_for_this_plate on all iteration','jet',0,500)
-    plt.savefig(directory_out_this_plate+'\\'+nom_plaque+'thickness_mean_for_this_plate.jpg')
-
-    affiche_colormap_etude_general_v2(intensity_455_mean_for_this_plate,nom_plaque+'intensity_455_for_this_plate on all iteration','jet',0,0)
-    plt.savefig(directory_out_this_plate+'\\'+nom_plaque+'intensity_455_for_this_plate.jpg')
-
-    affiche_colormap_etude_general_v2(intensity_730_mean_for_this_plate,nom_plaque+'intensity_730_for_this_plate on all iteration','Reds',0,10)
-    plt.savefig(directory_out_this_plate+'\\'+nom_plaque+'intensity_730_for_this_plate.jpg')
-
-    affiche_colormap_etude_general_v2(nb_area_before_mean_for_this_plate,nom_plaque+'nb_area_before_mean_for_this_plate on all iteration','jet',0,0)
-    plt.savefig(directory_out_this_plate+'\\'+nom_plaque+'nb_area_before_mean_for_this_plate.jpg')
-
-    affiche_colormap_etude_general_v2(nb_area_after_mean_for_this_plate,nom_plaque+'nb_area_after_mean_for_this_plate on all iteration','jet',0,0)
-    plt.savefig(directory_out_this_plate+'\\'+nom_plaque+'nb_area_after_mean_for_this_plate.jpg')
-
-    affiche_colormap_etude_general_v2(porcent_area_utile_mean_for_this_plate,nom_plaque+'porcent_area_utile_for_this_plate on all iteration','jet',0,0)
-    plt.savefig(directory_out_this_plate+'\\'+nom_plaque+'porcent_area_utile_for_this_plate.jpg')
+    specs = []
+    specs.append(spec_colormap(directory_out_this_plate+'\\'+nom_plaque+'thickness_mean_for_this_plate.jpg',thickness_mean_for_this_plate,nom_plaque+'thickness_mean_for_this_plate on all iteration','jet',0,500,geometrie))
+    specs.append(spec_colormap(directory_out_this_plate+'\\'+nom_plaque+'intensity_455_for_this_plate.jpg',intensity_455_mean_for_this_plate,nom_plaque+'intensity_455_for_this_plate on all iteration','jet',0,0,geometrie))
+    specs.append(spec_colormap(directory_out_this_plate+'\\'+nom_plaque+'intensity_730_for_this_plate.jpg',intensity_730_mean_for_this_plate,nom_plaque+'intensity_730_for_this_plate on all iteration','Reds',0,10,geometrie))
+    specs.append(spec_colormap(directory_out_this_plate+'\\'+nom_plaque+'nb_area_before_mean_for_this_plate.jpg',nb_area_before_mean_for_this_plate,nom_plaque+'nb_area_before_mean_for_this_plate on all iteration','jet',0,0,geometrie))
+    specs.append(spec_colormap(directory_out_this_plate+'\\'+nom_plaque+'nb_area_after_mean_for_this_plate.jpg',nb_area_after_mean_for_this_plate,nom_plaque+'nb_area_after_mean_for_this_plate on all iteration','jet',0,0,geometrie))
+    specs.append(spec_colormap(directory_out_this_plate+'\\'+nom_plaque+'porcent_area_utile_for_this_plate.jpg',porcent_area_utile_mean_for_this_plate,nom_plaque+'porcent_area_utile_for_this_plate on all iteration','jet',0,0,geometrie))
 
     mask_under_threshold = thickness_mean_for_this_plate < CV_repeta_threshold
     nb_well_under_threshold = np.nansum(mask_under_threshold)
@@ -487,35 +464,17 @@ def repeta_sans_ref_v1_nanofilm(directory_source,nom_plaque,nom_reconstruction,d
     t_max_mean = np.nanmax(thickness_mean_for_this_plate)
 
 
-    plt.close('all')
-    plt.figure(1)
-    plt.title(nom_plaque+' sur ' + str(nb_iteration)+ 'runs\n'+str(nb_well_over_threshold)+ ' puits au dessus de '+str(CV_repeta_threshold)+'% de CV sur l\'épaisseur')
-    j_letter = 0
-    while j_letter<number_of_letters_max:
-        plt.plot(thickness_mean_for_this_plate[j_letter,:],thickness_CV_for_this_plate[j_letter,:],'o',color = color_letter[j_letter], label = alphabet_majuscule[j_letter])        
-        j_letter += 1
-    plt.axhline(y = CV_repeta_threshold,xmin=t_min_mean, xmax=t_max_mean, ls='--' , color = 'k', label = str(CV_repeta_threshold)+'%')
-    plt.xlabel('T_mean µm^3')
-    plt.ylabel('CV %')
-    plt.legend()
-    plt.savefig(directory_out_this_plate+'\\'+nom_plaque+'_CV_on_T_vs_T_mean.jpg')
-
-    plt.figure(2)
-    plt.title(nom_plaque+' sur ' + str(nb_iteration)+ 'runs')
-    j_letter = 0
-    while j_letter<number_of_letters_max:
-        plt.plot(intensity_455_mean_for_this_plate[j_letter,:],intensity_455_CV_for_this_plate[j_letter,:],'v',color = color_letter[j_letter], label = alphabet_majuscule[j_letter])        
-        j_letter += 1
-    plt.axhline(y = 5,xmin=t_min_mean, xmax=t_max_mean, ls='--' , color = 'k', label = '5%')
-    plt.xlabel('Intensity_455_mean')
-    plt.ylabel('CV on Intensity%')
-    plt.legend()
-    plt.savefig(directory_out_this_plate+'\\'+nom_plaque+'_CV_on_I_vs_I_455_mean.jpg')
-    plt.close('all')
+    specs += [spec_CV_vs_moyenne(directory_out_this_plate+'\\'+nom_plaque+'_CV_on_T_vs_T_mean.jpg',
+                                 nom_plaque+' sur ' + str(nb_iteration)+ 'runs\n'+str(nb_well_over_threshold)+ ' puits au dessus de '+str(CV_repeta_threshold)+'% de CV sur l\'épaisseur',
+                                 thickness_mean_for_this_plate, thickness_CV_for_this_plate, 'o', color_letter, geometrie, CV_repeta_threshold, t_min_mean, t_max_mean, 'T_mean µm^3', 'CV %'),
+              spec_CV_vs_moyenne(directory_out_this_plate+'\\'+nom_plaque+'_CV_on_I_vs_I_455_mean.jpg',
+                                 nom_plaque+' sur ' + str(nb_iteration)+ 'runs',
+                                 intensity_455_mean_for_this_plate, intensity_455_CV_for_this_plate, 'v', color_letter, geometrie, 5, t_min_mean, t_max_mean, 'Intensity_455_mean', 'CV on Intensity%')]
+    publishFigures(specs, figure_queue)
 
     return  nb_iteration , nb_well_over_threshold , CV_max_thickness, CV_min_thickness, CV_mean_thickness, CV_max_I4, CV_min_I4, CV_mean_I4 ,CV_max_I7, CV_min_I7, CV_mean_I7, thickness_mean_for_this_plate , thickness_CV_for_this_plate , intensity_455_mean_for_this_plate , intensity_455_CV_for_this_plate , intensity_730_mean_for_this_plate , intensity_730_CV_for_this_plate
 
-def comparaison_ZC_to_ref_v1(nom_gp,chemin_intrument_1,type_intrument_1,chemin_intrument_2,type_intrument_2,directory_racine_to_save,name_dossier_to_save,tolerance_relative_fit):    
+def comparaison_ZC_to_ref_v1(nom_gp,chemin_intrument_1,type_intrument_1,chemin_intrument_2,type_intrument_2,directory_racine_to_save,name_dossier_to_save,tolerance_relative_fit,reference_store=None,figures=True,figure_queue=None):    
 # =============================================================================
 #     le but de cette fonction est de comparer les data en volumes d'un lecteur à un autre
 #    la 1ere appli est de confronter les data ZC 3 - 4 au proto (mais ça peut servir dans d'autres config ZC to ZC...)
@@ -550,6 +509,11 @@ def comparaison_ZC_to_ref_v1(nom_gp,chemin_intrument_1,type_intrument_1,chemin_i
     #                   kpi
     #       -> retourne les valeurs des indicateurs et les array intéressants
     #            name_dossier_to_save, slope_fit_inverse, intercept_fit_inverse, r_value_fit_inverse, nb_puits_loin_fit, vecteur_volume_instrument_1, vecteur_volume_instrument_2
+    #       -> reference_store (optionnel) : ReferenceStore dans lequel relire les données déjà importées
+    #            de l'instrument 2 (la référence) au lieu de relire son csv synthese
+    #       -> figures=False : pas de figures, seulement les calculs (noyau_comparaison) et les csv
+    #       -> figure_queue (optionnel) : FigureQueue où déposer les figures, dessinées plus tard à la demande ;
+    #            sans file les figures sont dessinées avant le retour de la fonction
     # =============================================================================
 # =============================================================================
 
@@ -563,8 +527,6 @@ def comparaison_ZC_to_ref_v1(nom_gp,chemin_intrument_1,type_intrument_1,chemin_i
     print('name_dossier_to_save:',name_dossier_to_save)
     print('tolerance_relative_fit:',tolerance_relative_fit)
 
-    number_of_letters_max = 8
-    number_of_colonne_number_max = 12
     # =============================================================================
     # # import des données du instrument_1
     # =============================================================================
@@ -573,7 +535,8 @@ def comparaison_ZC_to_ref_v1(nom_gp,chemin_intrument_1,type_intrument_1,chemin_i
     file_data_instrument_1 = directory_source_synthese_instrument_1+'\\synthese_interferometric_data.csv'
 
     # IMPORT DES DATA CONTENUES DANS LE CSV SYNTHESE 
-    volume_instrument_1, volume_std_instrument_1, diametre_instrument_1, diametre_std_instrument_1, N_dot_detected_instrument_1, N_dot_keep_instrument_1, N_cycle_instrument_1, porcent_dot_keep_instrument_1 = import_data_from_csv_synthese_zymintern(file_data_instrument_1)
+    plaque_instrument_1 = import_data_from_csv_synthese_zymintern(file_data_instrument_1)
+    volume_instrument_1, volume_std_instrument_1, diametre_instrument_1, diametre_std_instrument_1, N_dot_detected_instrument_1, N_dot_keep_instrument_1, N_cycle_instrument_1, porcent_dot_keep_instrument_1 = plaque_instrument_1
     #volume_instrument_1, volume_std_instrument_1, diametre_instrument_1, diametre_std_instrument_1, N_dot_detected_instrument_1, N_dot_keep_instrument_1, N_cycle_instrument_1, porcent_dot_keep_instrument_1 = import_data_from_csv_synthese(file_data_instrument_1)
 
     # =============================================================================
@@ -582,8 +545,17 @@ def comparaison_ZC_to_ref_v1(nom_gp,chemin_intrument_1,type_intrument_1,chemin_i
     directory_source_synthese_instrument_2 = chemin_intrument_2+''
     file_data_instrument_2 = directory_source_synthese_instrument_2+'\\synthese_interferometric_data.csv'
 
-    # IMPORT DES DATA CONTENUES DANS LE CSV SYNTHESE 
-    volume_instrument_2, volume_std_instrument_2, diametre_instrument_2, diametre_std_instrument_2, N_dot_detected_instrument_2, N_dot_keep_instrument_2, N_cycle_instrument_2, porcent_dot_keep_instrument_2 = import_data_from_csv_synthese_zymintern(file_data_instrument_2)
+    # IMPORT DES DATA CONTENUES DANS LE CSV SYNTHESE (déjà importées si la référence est dans le stock)
+    if reference_store is not None:
+        plaque_instrument_2 = reference_store.syntheseData(file_data_instrument_2)
+    else:
+        plaque_instrument_2 = import_data_from_csv_synthese_zymintern(file_data_instrument_2)
+    volume_instrument_2, volume_std_instrument_2, diametre_instrument_2, diametre_std_instrument_2, N_dot_detected_instrument_2, N_dot_keep_instrument_2, N_cycle_instrument_2, porcent_dot_keep_instrument_2 = plaque_instrument_2
+
+    # les deux lectures doivent porter sur le même format de plaque (96, 384, 1536 puits)
+    geometrie = plaque_instrument_1.geometrie
+    if plaque_instrument_2.geometrie != geometrie:
+        raise ValueError(f"Plaques de formats différents : {type_intrument_1} {geometrie}, {type_intrument_2} {plaque_instrument_2.geometrie}")
     # =============================================================================
     # endroit ou stocker la comparaison
     # =============================================================================
@@ -595,211 +567,74 @@ def comparaison_ZC_to_ref_v1(nom_gp,chemin_intrument_1,type_intrument_1,chemin_i
     # =============================================================================
     # la comparaison
     # =============================================================================
-    plt.close('all')   
-    Matrix_volume_difference = np.zeros((number_of_letters_max,number_of_colonne_number_max))    
-    Matrix_volume_difference_relative = np.zeros((number_of_letters_max,number_of_colonne_number_max))        
-    Matrix_volume_ratio = np.zeros((number_of_letters_max,number_of_colonne_number_max))    
-    Matrix_diametre_difference = np.zeros((number_of_letters_max,number_of_colonne_number_max))    
-    Matrix_diametre_difference_relative = np.zeros((number_of_letters_max,number_of_colonne_number_max))    
-
-    Matrix_nb_dot_utile_pourcent_difference = np.zeros((number_of_letters_max,number_of_colonne_number_max))    
+    # volumes : différences, outliers, fit et écart au fit ; diamètres : différences seulement
+    comparaison_volumes = noyau_comparaison(volume_instrument_1, volume_instrument_2, tolerance_relative_fit)
+    Matrix_volume_difference, Matrix_volume_difference_relative, Matrix_volume_ratio = (comparaison_volumes[nom] for nom in ('Matrix_difference', 'Matrix_difference_relative', 'Matrix_ratio'))
+    Matrix_diametre_difference, Matrix_diametre_difference_relative, Matrix_diametre_ratio = differences_plaques(diametre_instrument_1, diametre_instrument_2)
 
 #    fichier de sortie des data raw
-    fichier_save = open(directory_plaque_to_save+'\\data_comparative'+type_intrument_1+'_'+type_intrument_2+'.csv','w')
-    fichier_save.write('weel;V_instrument_1;D_instrument_1;V_instrument_2;D_instrument_2;\n')
-
-    # calcul des différences selon le schéma: 1 - 2 par défaut et 2 la référence pour les relatives
-    j_letter = 0
-    while j_letter<number_of_letters_max:
-        j_col = 0
-        while j_col<number_of_colonne_number_max:
-            Matrix_volume_difference[j_letter,j_col] = np.copy(volume_instrument_1[j_letter,j_col] - volume_instrument_2[j_letter,j_col])
-#            prise en compte du cas patholoque ou on doit diviser par 0
-            if volume_instrument_2[j_letter,j_col] != 0:
-                Matrix_volume_difference_relative[j_letter,j_col] = np.copy((volume_instrument_1[j_letter,j_col] - volume_instrument_2[j_letter,j_col])/volume_instrument_2[j_letter,j_col] *100)
-                Matrix_volume_ratio[j_letter,j_col] =np.copy(volume_instrument_1[j_letter,j_col] / volume_instrument_2[j_letter,j_col])
-            else:
-                Matrix_volume_difference_relative[j_letter,j_col] = np.nan
-                Matrix_volume_ratio[j_letter,j_col] = np.nan
-
-            Matrix_diametre_difference[j_letter,j_col] = np.copy(diametre_instrument_1[j_letter,j_col] - diametre_instrument_2[j_letter,j_col] )
-            if diametre_instrument_2[j_letter,j_col] != 0:
-               Matrix_diametre_difference_relative[j_letter,j_col]  = np.copy((diametre_instrument_1[j_letter,j_col] - diametre_instrument_2[j_letter,j_col] ) / diametre_instrument_2[j_letter,j_col] *100)
-            else:
-                Matrix_diametre_difference_relative[j_letter,j_col] = np.nan
+    ecrire_data_comparative(directory_plaque_to_save+'\\data_comparative'+type_intrument_1+'_'+type_intrument_2+'.csv', geometrie,
+                            [('V_instrument_1', volume_instrument_1), ('D_instrument_1', diametre_instrument_1),
+                             ('V_instrument_2', volume_instrument_2), ('D_instrument_2', diametre_instrument_2)])
 
-            Matrix_nb_dot_utile_pourcent_difference[j_letter,j_col] = np.copy(porcent_dot_keep_instrument_1[j_letter,j_col] - porcent_dot_keep_instrument_2[j_letter,j_col]) 
-            fichier_save.write(alphabet_majuscule[j_letter]+str(j_col+1)+';'+str(volume_instrument_1[j_letter,j_col])+';'+str(diametre_instrument_1[j_letter,j_col])+';'+str(volume_instrument_2[j_letter,j_col])+';'+str(diametre_instrument_2[j_letter,j_col])+';\n')
-            j_col += 1
-        j_letter += 1
-    fichier_save.close()
+    if figures:
+        publishFigures(specs_comparaison(comparaison_volumes, directory_plaque_to_save, name_dossier_to_save, name_dossier_instrument_1, type_intrument_1, type_intrument_2,
+                                         'volumes', 'V issu stat µm^3  ', 'volumes', tolerance_relative_fit), figure_queue)
 
 # présentation des différences calculées selon des colormaps    
-    #affiche_colormap_etude_general(Matrix_volume_difference,name_dossier_instrument_1+'\n'+type_intrument_1+' vs '+type_intrument_2+'\nMatrix_volume_difference','RdGy',np.nanmin(Matrix_volume_difference),np.nanmax(Matrix_volume_difference))
-    #plt.savefig(directory_plaque_to_save+'\\'+name_dossier_to_save+'Matrix_volume_difference.jpg')
-
-    #affiche_colormap_etude_general(Matrix_volume_difference_relative,name_dossier_instrument_1+'\n'+type_intrument_1+' vs '+type_intrument_2+'\nMatrix_volume_difference en %','PuOr',-100,100)
-    #plt.savefig(directory_plaque_to_save+'\\'+name_dossier_to_save+'Matrix_volume_difference_relative.jpg')
-
-    #affiche_colormap_etude_general(Matrix_volume_ratio,name_dossier_instrument_1+'\n'+type_intrument_1+' vs '+type_intrument_2+'\nMatrix_volume_ratio','Greens',np.nanmin(Matrix_volume_ratio),np.nanmax(Matrix_volume_ratio))
-    #plt.savefig(directory_plaque_to_save+'\\'+name_dossier_to_save+'Matrix_volume_ratio.jpg')
-
-    #affiche_colormap_etude_general(Matrix_diametre_difference,name_dossier_instrument_1+'\n'+type_intrument_1+' vs '+type_intrument_2+'\n Matrix_diametre_difference','autumn',np.nanmin(Matrix_diametre_difference),np.nanmax(Matrix_diametre_difference))
-    #plt.savefig(directory_plaque_to_save+'\\'+name_dossier_to_save+'Matrix_diametre_difference.jpg')
-
-    #affiche_colormap_etude_general(Matrix_diametre_difference_relative,name_dossier_instrument_1+'\n'+type_intrument_1+' vs '+type_intrument_2+'\n Matrix_diametre_difference_relative','cool',np.nanmin(Matrix_diametre_difference_relative),np.nanmax(Matrix_diametre_difference_relative))
-    #plt.savefig(directory_plaque_to_save+'\\'+name_dossier_to_save+'Matrix_diametre_difference_relative.jpg')
-
-# mise sous forme de vecteur des volumes et diamètres pour fiter     
-
-    vecteur_volume_instrument_1 = np.zeros(96)
-    vecteur_volume_instrument_2 = np.zeros(96)
-    vecteur_ratio = np.zeros(96)
-    vecteur_diametre_instrument_1 = np.zeros(96)
-    vecteur_diametre_instrument_2 = np.zeros(96)
-
-    # initialisation du masque à tous les puits = true
-    mask_volumes_proches = vecteur_ratio <1 
-    mask_volumes_eloignes = vecteur_ratio>1
-    mask_nan =  vecteur_ratio>1
-
-    j_letter = 0
-    while j_letter<number_of_letters_max:
-        j_col = 0
-        while j_col<number_of_colonne_number_max:
-            index_inside_vector = int(12*(j_letter)+(j_col))
-            vecteur_volume_instrument_1[index_inside_vector] = np.copy(volume_instrument_1[j_letter,j_col]) 
-            vecteur_volume_instrument_2[index_inside_vector] = np.copy(volume_instrument_2[j_letter,j_col]) 
-            vecteur_ratio[index_inside_vector] = np.copy(Matrix_volume_difference_relative[j_letter,j_col])
-            vecteur_diametre_instrument_1[index_inside_vector] = np.copy(diametre_instrument_1[j_letter,j_col]) 
-            vecteur_diametre_instrument_2[index_inside_vector] = np.copy(diametre_instrument_2[j_letter,j_col]) 
-            j_col += 1
-        j_letter += 1
-
-# filtre très grossier pour ne pas prendre les outliers dans le calcul du fit    
-    tolerance = 20    
-    j_pos = 0
-    while j_pos<96:
-        if np.abs(vecteur_ratio[j_pos])>tolerance:
-            mask_volumes_proches[j_pos] = False
-            mask_volumes_eloignes[j_pos] = True
-        if np.isnan(vecteur_ratio[j_pos]):
-            mask_volumes_proches[j_pos] = False
-            mask_volumes_eloignes[j_pos] = True
-            mask_nan[j_pos] = True
-        j_pos +=1
-
-#    nb de puits utiles pour le fit
-    nb_puits_trop_loins = np.sum(mask_volumes_eloignes) - np.sum(mask_nan)
-    # To keep
-    plt.close(10)
-    plt.figure(10,figsize=(12,6))
-    plt.suptitle(name_dossier_instrument_1+' volumes par puits '+type_intrument_2+' vs '+type_intrument_1 +'\n ')#\n'
-    plt.plot(vecteur_volume_instrument_2[mask_volumes_proches],vecteur_volume_instrument_1[mask_volumes_proches],'o',color='blue',label='data utile au fit')
-    plt.plot(vecteur_volume_instrument_2[mask_volumes_eloignes],vecteur_volume_instrument_1[mask_volumes_eloignes],'rx',label='outlier')
-    plt.plot(np.arange(np.nanmin(vecteur_volume_instrument_2),np.nanmax(vecteur_volume_instrument_2)),np.arange(np.nanmin(vecteur_volume_instrument_2),np.nanmax(vecteur_volume_instrument_2)),label='bissectrice = target',color='k')
-    plt.xlabel('V issu stat µm^3  '+type_intrument_2)
-    plt.ylabel('V issu stat µm^3  '+type_intrument_1)
-    plt.legend()
-    plt.savefig(directory_plaque_to_save+'\\'+name_dossier_to_save+' volumes par puits.jpg')
-
-    mask_volumes_eloignes_fit = vecteur_volume_instrument_2 >0 
-#calcul du fit sur les volumes 
-    if True in mask_volumes_proches:
-        x_considere_fit_lin_inverse = vecteur_volume_instrument_2[mask_volumes_proches]
-        y_considere_fit_lin_inverse = vecteur_volume_instrument_1[mask_volumes_proches]
-        slope_fit_inverse, intercept_fit_inverse, r_value_fit_inverse, p_value_fit_inverse, std_err_fit_inverse = stats.linregress(x_considere_fit_lin_inverse,y_considere_fit_lin_inverse)
-        representation_x = np.arange(np.nanmin(vecteur_volume_instrument_2),np.nanmax(vecteur_volume_instrument_2),(np.nanmax(vecteur_volume_instrument_2)-np.nanmin(vecteur_volume_instrument_2))/50)
-
-        # To keep
-        data_fit = slope_fit_inverse*vecteur_volume_instrument_2+intercept_fit_inverse
-    # représentation graphique du fit    
-        plt.close(15)
-        plt.figure(15,figsize=(12,6))
-        plt.suptitle(name_dossier_instrument_1+' FIT\nvolumes par puits '+type_intrument_1+' vs '+type_intrument_2 +'\n '+str(nb_puits_trop_loins)+' puits exclus pour le calcul du fit')#\n'
-        plt.plot(vecteur_volume_instrument_2[mask_volumes_proches],vecteur_volume_instrument_1[mask_volumes_proches],'+',color='blue',label='data utile pour fit')
-        plt.plot(vecteur_volume_instrument_2[mask_volumes_eloignes],vecteur_volume_instrument_1[mask_volumes_eloignes],'rx',label='data exclue pour fit')
-        plt.plot(vecteur_volume_instrument_2,slope_fit_inverse*vecteur_volume_instrument_2+intercept_fit_inverse,color='#000080',linestyle = '-',label='slope='+str(round(slope_fit_inverse,2))+'\nord='+str(round(intercept_fit_inverse,2))+'\nR²'+str(round(r_value_fit_inverse,4)))
-        plt.xlabel('V issu stat µm^3  '+type_intrument_2)
-        plt.ylabel('V issu stat µm^3  '+type_intrument_1)
-        plt.legend()    
-        plt.savefig(directory_plaque_to_save+'\\'+name_dossier_to_save+' volumes par puits_FIT.jpg')
-    else:
-        slope_fit_inverse, intercept_fit_inverse, r_value_fit_inverse, p_value_fit_inverse, std_err_fit_inverse = stats.linregress(vecteur_volume_instrument_2,vecteur_volume_instrument_1)
-        data_fit = slope_fit_inverse*vecteur_volume_instrument_2+intercept_fit_inverse
-    # représentation graphique du fit    
-        plt.close(15)
-        plt.figure(15,figsize=(12,6))
-        plt.suptitle(name_dossier_instrument_1+' FIT\nvolumes par puits '+type_intrument_1+' vs '+type_intrument_2 +'\n '+str(nb_puits_trop_loins)+' puits exclus pour le calcul du fit')#\n'
-        plt.plot(vecteur_volume_instrument_2[mask_volumes_proches],vecteur_volume_instrument_1[mask_volumes_proches],'+',color='blue',label='data utile pour fit')
-        plt.plot(vecteur_volume_instrument_2[mask_volumes_eloignes],vecteur_volume_instrument_1[mask_volumes_eloignes],'rx',label='data exclue pour fit')
-        plt.plot(vecteur_volume_instrument_2,slope_fit_inverse*vecteur_volume_instrument_2+intercept_fit_inverse,color='#000080',linestyle = '-',label='slope='+str(round(slope_fit_inverse,2))+'\nord='+str(round(intercept_fit_inverse,2))+'\nR²'+str(round(r_value_fit_inverse,4)))
-        plt.xlabel('V issu stat µm^3  '+type_intrument_2)
-        plt.ylabel('V issu stat µm^3  '+type_intrument_1)
-        plt.legend()    
-        plt.savefig(directory_plaque_to_save+'\\'+name_dossier_to_save+' volumes par puits_FIT.jpg')
-# calcul de l'écart data - fit et mask en fct du seuillage de l'écart tolérable
-    j_pos = 0
-    while j_pos<96:
-        if vecteur_volume_instrument_1[j_pos] != 0:
-            ecart_au_fit = 100 * np.abs(data_fit[j_pos] - vecteur_volume_instrument_1[j_pos])/vecteur_volume_instrument_1[j_pos]
-        else:
-            ecart_au_fit = 0     
-        if ecart_au_fit>tolerance_relative_fit:
-            mask_volumes_eloignes_fit[j_pos] = True
-        else:
-            mask_volumes_eloignes_fit[j_pos] = False
-        j_pos +=1
-
-# indicateur de la qualité des data vs fit       
-    nb_puits_loin_fit = np.sum(mask_volumes_eloignes_fit)
-
-#  figure avec représentation des points ok ko vis à vis du fit    
-    plt.close(10)
-    plt.figure(10,figsize=(12,6))
-    plt.suptitle(name_dossier_instrument_1+' volumes par puits '+type_intrument_2+' vs '+type_intrument_1 +'\n nb puits loin du fit ='+str(nb_puits_loin_fit)+' tolerance ='+str(tolerance_relative_fit))#\n'
-    plt.plot(vecteur_volume_instrument_2,vecteur_volume_instrument_1,'v',color='green',label='data proche fit')
-    plt.plot(vecteur_volume_instrument_2[mask_volumes_eloignes_fit],vecteur_volume_instrument_1[mask_volumes_eloignes_fit],'rx',label='data loin fit')
-    plt.plot(vecteur_volume_instrument_2,slope_fit_inverse*vecteur_volume_instrument_2+intercept_fit_inverse,color='k',linestyle = '-',label='slope='+str(round(slope_fit_inverse,2))+'\nord='+str(round(intercept_fit_inverse,2))+'\nR²'+str(round(r_value_fit_inverse,4)))
-    plt.xlabel('V issu stat µm^3  '+type_intrument_2)
-    plt.ylabel('V issu stat µm^3  '+type_intrument_1)
-    plt.legend()
-    plt.savefig(directory_plaque_to_save+'\\'+name_dossier_to_save+' volumes par puits_fit.jpg')
+        #affiche_colormap_etude_general(Matrix_volume_difference,name_dossier_instrument_1+'\n'+type_intrument_1+' vs '+type_intrument_2+'\nMatrix_volume_difference','RdGy',np.nanmin(Matrix_volume_difference),np.nanmax(Matrix_volume_difference))
+        #plt.savefig(directory_plaque_to_save+'\\'+name_dossier_to_save+'Matrix_volume_difference.jpg')
+
+        #affiche_colormap_etude_general(Matrix_volume_difference_relative,name_dossier_instrument_1+'\n'+type_intrument_1+' vs '+type_intrument_2+'\nMatrix_volume_difference en %','PuOr',-100,100)
+        #plt.savefig(directory_plaque_to_save+'\\'+name_dossier_to_save+'Matrix_volume_difference_relative.jpg')
+
+        #affiche_colormap_etude_general(Matrix_volume_ratio,name_dossier_instrument_1+'\n'+type_intrument_1+' vs '+type_intrument_2+'\nMatrix_volume_ratio','Greens',np.nanmin(Matrix_volume_ratio),np.nanmax(Matrix_volume_ratio))
+        #plt.savefig(directory_plaque_to_save+'\\'+name_dossier_to_save+'Matrix_volume_ratio.jpg')
+
+        #affiche_colormap_etude_general(Matrix_diametre_difference,name_dossier_instrument_1+'\n'+type_intrument_1+' vs '+type_intrument_2+'\n Matrix_diametre_difference','autumn',np.nanmin(Matrix_diametre_difference),np.nanmax(Matrix_diametre_difference))
+        #plt.savefig(directory_plaque_to_save+'\\'+name_dossier_to_save+'Matrix_diametre_difference.jpg')
+
+        #affiche_colormap_etude_general(Matrix_diametre_difference_relative,name_dossier_instrument_1+'\n'+type_intrument_1+' vs '+type_intrument_2+'\n Matrix_diametre_difference_relative','cool',np.nanmin(Matrix_diametre_difference_relative),np.nanmax(Matrix_diametre_difference_relative))
+        #plt.savefig(directory_plaque_to_save+'\\'+name_dossier_to_save+'Matrix_diametre_difference_relative.jpg')
 
 #    assemblage des figures de dotmaps et colormaps
-    # merge_two_figure([directory_source_synthese_instrument_1,directory_source_synthese_instrument_2],name_dossier_instrument_1,['dot_map_730.png','dot_map_730.png'],directory_plaque_to_save)
-    # merge_two_figure([directory_source_synthese_instrument_1,directory_source_synthese_instrument_2],name_dossier_instrument_1,['dot_map_contour_730.png','dot_map_contour_730.png'],directory_plaque_to_save)
-    # merge_two_figure([directory_source_synthese_instrument_1,directory_source_synthese_instrument_2],name_dossier_instrument_1,['dot_map_cycle_730.png','dot_map_cycle_730.png'],directory_plaque_to_save)
+        # merge_two_figure([directory_source_synthese_instrument_1,directory_source_synthese_instrument_2],name_dossier_instrument_1,['dot_map_730.png','dot_map_730.png'],directory_plaque_to_save)
+        # merge_two_figure([directory_source_synthese_instrument_1,directory_source_synthese_instrument_2],name_dossier_instrument_1,['dot_map_contour_730.png','dot_map_contour_730.png'],directory_plaque_to_save)
+        # merge_two_figure([directory_source_synthese_instrument_1,directory_source_synthese_instrument_2],name_dossier_instrument_1,['dot_map_cycle_730.png','dot_map_cycle_730.png'],directory_plaque_to_save)
 
 #    regénération des colormaps volumes et diamètres
-    #affiche_colormap_etude_general(volume_instrument_1,'volumes_'+type_intrument_1,'jet',0,500)
-    # plt.savefig(directory_plaque_to_save+'\\volumes_'+type_intrument_1+'.jpg')
+        #affiche_colormap_etude_general(volume_instrument_1,'volumes_'+type_intrument_1,'jet',0,500)
+        # plt.savefig(directory_plaque_to_save+'\\volumes_'+type_intrument_1+'.jpg')
 
-    #affiche_colormap_etude_general(volume_instrument_2,'volumes_'+type_intrument_2,'jet',0,500)
-    # plt.savefig(directory_plaque_to_save+'\\volumes_'+type_intrument_2+'.jpg')
+        #affiche_colormap_etude_general(volume_instrument_2,'volumes_'+type_intrument_2,'jet',0,500)
+        # plt.savefig(directory_plaque_to_save+'\\volumes_'+type_intrument_2+'.jpg')
 
-    #affiche_colormap_etude_general(diametre_instrument_1,'diametres_'+type_intrument_1,'jet',15,50)
-    # plt.savefig(directory_plaque_to_save+'\\diametres_'+type_intrument_1+'.jpg')
+        #affiche_colormap_etude_general(diametre_instrument_1,'diametres_'+type_intrument_1,'jet',15,50)
+        # plt.savefig(directory_plaque_to_save+'\\diametres_'+type_intrument_1+'.jpg')
 
-    #affiche_colormap_etude_general(diametre_instrument_2,'diametres_'+type_intrument_2,'jet',15,50)
-    # plt.savefig(directory_plaque_to_save+'\\diametres_'+type_intrument_2+'.jpg')
+        #affiche_colormap_etude_general(diametre_instrument_2,'diametres_'+type_intrument_2,'jet',15,50)
+        # plt.savefig(directory_plaque_to_save+'\\diametres_'+type_intrument_2+'.jpg')
 
-    # merge_two_figure([directory_plaque_to_save,directory_plaque_to_save],name_dossier_instrument_1,['diametres_'+type_intrument_1+'.jpg','diametres_'+type_intrument_2+'.jpg'],directory_plaque_to_save)
-    # merge_two_figure([directory_plaque_to_save,directory_plaque_to_save],name_dossier_instrument_1,['volumes_'+type_intrument_1+'.jpg','volumes_'+type_intrument_2+'.jpg'],directory_plaque_to_save)
+        # merge_two_figure([directory_plaque_to_save,directory_plaque_to_save],name_dossier_instrument_1,['diametres_'+type_intrument_1+'.jpg','diametres_'+type_intrument_2+'.jpg'],directory_plaque_to_save)
+        # merge_two_figure([directory_plaque_to_save,directory_plaque_to_save],name_dossier_instrument_1,['volumes_'+type_intrument_1+'.jpg','volumes_'+type_intrument_2+'.jpg'],directory_plaque_to_save)
 
 #    copier coller des dotmaps
-    # copyfile(directory_source_synthese_instrument_1+'\\dot_map_730.png',directory_plaque_to_save+'\\dot_map_730_'+type_intrument_1+'.png')
-    # copyfile(directory_source_synthese_instrument_2+'\\dot_map_730.png',directory_plaque_to_save+'\\dot_map_730_'+type_intrument_2+'.png')
-
-    # copyfile(directory_source_synthese_instrument_1+'\\dot_map_contour_730.png',directory_plaque_to_save+'\\dot_map_contour_730'+type_intrument_1+'.png')
-    # copyfile(directory_source_synthese_instrument_2+'\\dot_map_contour_730.png',directory_plaque_to_save+'\\dot_map_contour_730'+type_intrument_2+'.png')
-
-    # copyfile(directory_source_synthese_instrument_1+'\\dot_map_cycle_730.png',directory_plaque_to_save+'\\dot_map_cycle_730'+type_intrument_1+'.png')
-    # copyfile(directory_source_synthese_instrument_2+'\\dot_map_cycle_730.png',directory_plaque_to_save+'\\dot_map_cycle_730'+type_intrument_2+'.png')
-#   calcul de moyenneset ecarts types des différences en volumes et diametres
-    Matrix_volume_difference_relative_mean = np.nanmean(Matrix_volume_difference_relative)
-    Matrix_volume_difference_relative_std = np.nanstd(Matrix_volume_difference_relative)    
-    Matrix_volume_difference_relative_CV = np.copy(100*Matrix_volume_difference_relative_std/Matrix_volume_difference_relative_mean)
+        # copyfile(directory_source_synthese_instrument_1+'\\dot_map_730.png',directory_plaque_to_save+'\\dot_map_730_'+type_intrument_1+'.png')
+        # copyfile(directory_source_synthese_instrument_2+'\\dot_map_730.png',directory_plaque_to_save+'\\dot_map_730_'+type_intrument_2+'.png')
+
+        # copyfile(directory_source_synthese_instrument_1+'\\dot_map_contour_730.png',directory_plaque_to_save+'\\dot_map_contour_730'+type_intrument_1+'.png')
+        # copyfile(directory_source_synthese_instrument_2+'\\dot_map_contour_730.png',directory_plaque_to_save+'\\dot_map_contour_730'+type_intrument_2+'.png')
+
+        # copyfile(directory_source_synthese_instrument_1+'\\dot_map_cycle_730.png',directory_plaque_to_save+'\\dot_map_cycle_730'+type_intrument_1+'.png')
+        # copyfile(directory_source_synthese_instrument_2+'\\dot_map_cycle_730.png',directory_plaque_to_save+'\\dot_map_cycle_730'+type_intrument_2+'.png')
+
+    nb_puits_trop_loins = comparaison_volumes['nb_puits_trop_loins']
+    slope_fit_inverse, intercept_fit_inverse, r_value_fit_inverse = comparaison_volumes['slope_fit'], comparaison_volumes['intercept_fit'], comparaison_volumes['r_value_fit']
+    nb_puits_loin_fit = comparaison_volumes['nb_puits_loin_fit']
+    vecteur_volume_instrument_1, vecteur_volume_instrument_2 = comparaison_volumes['vecteur_instrument_1'], comparaison_volumes['vecteur_instrument_2']
+#   moyennes et CV des différences en volumes et diametres
+    Matrix_volume_difference_relative_mean = comparaison_volumes['difference_relative_mean']
+    Matrix_volume_difference_relative_CV = comparaison_volumes['difference_relative_CV']
     Matrix_diametre_difference_relative_mean =np.nanmean(Matrix_diametre_difference_relative)
     Matrix_diametre_difference_relative_std =np.nanstd(Matrix_diametre_difference_relative)
     Matrix_diametre_difference_relative_CV = np.copy(100*Matrix_diametre_difference_relative_std/Matrix_diametre_difference_relative_mean)
@@ -811,7 +646,7 @@ def comparaison_ZC_to_ref_v1(nom_gp,chemin_intrument_1,type_intrument_1,chemin_i
 
     return name_dossier_to_save, slope_fit_inverse, intercept_fit_inverse, r_value_fit_inverse, nb_puits_loin_fit, Matrix_volume_difference_relative_mean , Matrix_volume_difference_relative_CV , Matrix_diametre_difference_relative_mean , Matrix_diametre_difference_relative_CV , vecteur_volume_instrument_1, vecteur_volume_instrument_2
 
-def comparaison_ZC_to_ref_v1_nanofilm(nom_gp,chemin_intrument_1,type_intrument_1,chemin_intrument_2,type_intrument_2,directory_racine_to_save,name_dossier_to_save,tolerance_relative_fit):    
+def comparaison_ZC_to_ref_v1_nanofilm(nom_gp,chemin_intrument_1,type_intrument_1,chemin_intrument_2,type_intrument_2,directory_racine_to_save,name_dossier_to_save,tolerance_relative_fit,figures=True,figure_queue=None):    
 # =============================================================================
 #     le but de cette fonction est de comparer les data en volumes d'un lecteur à un autre
 #    la 1ere appli est de confronter les data ZC 3 - 4 au proto (mais ça peut servir dans d'autres config ZC to ZC...)
@@ -846,10 +681,10 @@ def comparaison_ZC_to_ref_v1_nanofilm(nom_gp,chemin_intrument_1,type_intrument_1
     #                   kpi
     #       -> retourne les valeurs des indicateurs et les array intéressants
     #            name_dossier_to_save, slope_fit_inverse, intercept_fit_inverse, r_value_fit_inverse, nb_puits_loin_fit, vecteur_volume_instrument_1, vecteur_volume_instrument_2
+    #       -> figure_queue (optionnel) : FigureQueue où déposer les figures, dessinées plus tard à la demande ;
+    #            sans file les figures sont dessinées avant le retour de la fonction
     # =============================================================================
 # =============================================================================
-    number_of_letters_max = 8
-    number_of_colonne_number_max = 12
     # =============================================================================
     # # import des données du instrument_1
     # =============================================================================
@@ -857,7 +692,8 @@ def comparaison_ZC_to_ref_v1_nanofilm(nom_gp,chemin_intrument_1,type_intrument_1
     file_data_instrument_1 = directory_source_synthese_instrument_1+'\\synthese_interferometric_data.csv'
 
     # IMPORT DES DATA CONTENUES DANS LE CSV SYNTHESE 
-    thickness_instrument_1, thickness_std_instrument_1, intensite_455_instrument_1, intensite_730_instrument_1, N_area_before_instrument_1, N_area_after_instrument_1, porcent_area_instrument_1 = import_data_from_csv_synthese_zymintern_nanofilm(file_data_instrument_1)
+    plaque_instrument_1 = import_data_from_csv_synthese_zymintern_nanofilm(file_data_instrument_1)
+    thickness_instrument_1, thickness_std_instrument_1, intensite_455_instrument_1, intensite_730_instrument_1, N_area_before_instrument_1, N_area_after_instrument_1, porcent_area_instrument_1 = plaque_instrument_1
     #volume_instrument_1, volume_std_instrument_1, diametre_instrument_1, diametre_std_instrument_1, N_dot_detected_instrument_1, N_dot_keep_instrument_1, N_cycle_instrument_1, porcent_dot_keep_instrument_1 = import_data_from_csv_synthese(file_data_instrument_1)
 
     # =============================================================================
@@ -867,7 +703,13 @@ def comparaison_ZC_to_ref_v1_nanofilm(nom_gp,chemin_intrument_1,type_intrument_1
     file_data_instrument_2 = directory_source_synthese_instrument_2+'\\synthese_interferometric_data.csv'
 
     # IMPORT DES DATA CONTENUES DANS LE CSV SYNTHESE 
-    thickness_instrument_2, thickness_std_instrument_2, intensite_455_instrument_2, intensite_730_instrument_2, N_area_before_instrument_2, N_area_after_instrument_2, porcent_area_instrument_2 = import_data_from_csv_synthese_zymintern_nanofilm(file_data_instrument_2)
+    plaque_instrument_2 = import_data_from_csv_synthese_zymintern_nanofilm(file_data_instrument_2)
+    thickness_instrument_2, thickness_std_instrument_2, intensite_455_instrument_2, intensite_730_instrument_2, N_area_before_instrument_2, N_area_after_instrument_2, porcent_area_instrument_2 = plaque_instrument_2
+
+    # les deux lectures doivent porter sur le même format de plaque (96, 384, 1536 puits)
+    geometrie = plaque_instrument_1.geometrie
+    if plaque_instrument_2.geometrie != geometrie:
+        raise ValueError(f"Plaques de formats différents : {type_intrument_1} {geometrie}, {type_intrument_2} {plaque_instrument_2.geometrie}")
     # =============================================================================
     # endroit ou stocker la comparaison
     # =============================================================================
@@ -879,194 +721,58 @@ def comparaison_ZC_to_ref_v1_nanofilm(nom_gp,chemin_intrument_1,type_intrument_1
     # =============================================================================
     # la comparaison
     # =============================================================================
-    plt.close('all')   
-    Matrix_thickness_difference = np.zeros((number_of_letters_max,number_of_colonne_number_max))    
-    Matrix_thickness_difference_relative = np.zeros((number_of_letters_max,number_of_colonne_number_max))        
-    Matrix_thickness_ratio = np.zeros((number_of_letters_max,number_of_colonne_number_max))    
-    Matrix_intensite_455_difference = np.zeros((number_of_letters_max,number_of_colonne_number_max))    
-    Matrix_intensite_455_difference_relative = np.zeros((number_of_letters_max,number_of_colonne_number_max))  
-    Matrix_intensite_730_difference = np.zeros((number_of_letters_max,number_of_colonne_number_max))    
-    Matrix_intensite_730_difference_relative = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-
-    Matrix_nb_pourcent_area_difference = np.zeros((number_of_letters_max,number_of_colonne_number_max))    
-
-#    fichier de sortie des data raw ( to keep )
-    fichier_save = open(directory_plaque_to_save+'\\data_comparative'+type_intrument_1+'_'+type_intrument_2+'.csv','w')
-    fichier_save.write('weel;T_instrument_1;I_455_instrument_1;I_730_instrument_1;T_instrument_2;I_455_instrument_2;I_730_instrument_2;\n')
-
-    # calcul des différences selon le schéma: 1 - 2 par défaut et 2 la référence pour les relatives
-    j_letter = 0
-    while j_letter<number_of_letters_max:
-        j_col = 0
-        while j_col<number_of_colonne_number_max:
-            Matrix_thickness_difference[j_letter,j_col] = np.copy(thickness_instrument_1[j_letter,j_col] - thickness_instrument_2[j_letter,j_col])
-#            prise en compte du cas patholoque ou on doit diviser par 0
-            if thickness_instrument_2[j_letter,j_col] != 0:
-                Matrix_thickness_difference_relative[j_letter,j_col] = np.copy((thickness_instrument_1[j_letter,j_col] - thickness_instrument_2[j_letter,j_col])/thickness_instrument_2[j_letter,j_col] *100)
-                Matrix_thickness_ratio[j_letter,j_col] =np.copy(thickness_instrument_1[j_letter,j_col] / thickness_instrument_2[j_letter,j_col])
-            else:
-                Matrix_thickness_difference_relative[j_letter,j_col] = np.nan
-                Matrix_thickness_ratio[j_letter,j_col] = np.nan
+    comparaison_thickness = noyau_comparaison(thickness_instrument_1, thickness_instrument_2, tolerance_relative_fit)
+    Matrix_thickness_difference, Matrix_thickness_difference_relative, Matrix_thickness_ratio = (comparaison_thickness[nom] for nom in ('Matrix_difference', 'Matrix_difference_relative', 'Matrix_ratio'))
 
-            Matrix_nb_pourcent_area_difference[j_letter,j_col] = np.copy(porcent_area_instrument_1[j_letter,j_col] - porcent_area_instrument_2[j_letter,j_col]) 
-            fichier_save.write(alphabet_majuscule[j_letter]+str(j_col+1)+';'+str(thickness_instrument_1[j_letter,j_col])+';'+str(intensite_455_instrument_1[j_letter,j_col])+';'+str(intensite_730_instrument_1[j_letter,j_col])+';'+str(thickness_instrument_2[j_letter,j_col])+';'+str(intensite_455_instrument_2[j_letter,j_col])+';'+str(intensite_730_instrument_2[j_letter,j_col])+';\n')
-            j_col += 1
-        j_letter += 1
-    fichier_save.close()
+#    fichier de sortie des data raw
+    ecrire_data_comparative(directory_plaque_to_save+'\\data_comparative'+type_intrument_1+'_'+type_intrument_2+'.csv', geometrie,
+                            [('T_instrument_1', thickness_instrument_1), ('I_455_instrument_1', intensite_455_instrument_1), ('I_730_instrument_1', intensite_730_instrument_1),
+                             ('T_instrument_2', thickness_instrument_2), ('I_455_instrument_2', intensite_455_instrument_2), ('I_730_instrument_2', intensite_730_instrument_2)])
 
-# présentation des différences calculées selon des colormaps    
-    #affiche_colormap_etude_general(Matrix_thickness_difference,name_dossier_instrument_1+'\n'+type_intrument_1+' vs '+type_intrument_2+'\nMatrix_thickness_difference','RdGy',np.nanmin(Matrix_thickness_difference),np.nanmax(Matrix_thickness_difference))
-    #plt.savefig(directory_plaque_to_save+'\\'+name_dossier_to_save+'Matrix_thickness_difference.jpg')
-
-    #affiche_colormap_etude_general(Matrix_thickness_difference_relative,name_dossier_instrument_1+'\n'+type_intrument_1+' vs '+type_intrument_2+'\nMatrix_thickness_difference en %','PuOr',-100,100)
-    #plt.savefig(directory_plaque_to_save+'\\'+name_dossier_to_save+'Matrix_thickness_difference_relative.jpg')
-
-    #affiche_colormap_etude_general(Matrix_thickness_ratio,name_dossier_instrument_1+'\n'+type_intrument_1+' vs '+type_intrument_2+'\nMatrix_thickness_ratio','Greens',np.nanmin(Matrix_thickness_ratio),np.nanmax(Matrix_thickness_ratio))
-    #plt.savefig(directory_plaque_to_save+'\\'+name_dossier_to_save+'Matrix_thicknesse_ratio.jpg')
-
-# mise sous forme de vecteur des volumes et diamètres pour fiter     
-
-    vecteur_thickness_instrument_1 = np.zeros(96)
-    vecteur_thickness_instrument_2 = np.zeros(96)
-    vecteur_ratio = np.zeros(96)
-
-    # initialisation du masque à tous les puits = true
-    mask_thickness_proches = vecteur_ratio <1 
-    mask_thickness_eloignes = vecteur_ratio>1
-    mask_nan =  vecteur_ratio>1
-
-    j_letter = 0
-    while j_letter<number_of_letters_max:
-        j_col = 0
-        while j_col<number_of_colonne_number_max:
-            index_inside_vector = int(12*(j_letter)+(j_col))
-            vecteur_thickness_instrument_1[index_inside_vector] = np.copy(thickness_instrument_1[j_letter,j_col]) 
-            vecteur_thickness_instrument_2[index_inside_vector] = np.copy(thickness_instrument_2[j_letter,j_col]) 
-            vecteur_ratio[index_inside_vector] = np.copy(Matrix_thickness_difference_relative[j_letter,j_col])
-            j_col += 1
-        j_letter += 1
-
-# filtre très grossier pour ne pas prendre les outliers dans le calcul du fit    
-    tolerance = 20    
-    j_pos = 0
-    while j_pos<96:
-        if np.abs(vecteur_ratio[j_pos])>tolerance:
-            mask_thickness_proches[j_pos] = False
-            mask_thickness_eloignes[j_pos] = True
-        if np.isnan(vecteur_ratio[j_pos]):
-            mask_thickness_proches[j_pos] = False
-            mask_thickness_eloignes[j_pos] = True
-            mask_nan[j_pos] = True
-        j_pos +=1
-
-#    nb de puits utiles pour le fit
-    nb_puits_trop_loins = np.sum(mask_thickness_eloignes) - np.sum(mask_nan)
-
-    # le type instrument est le nom du dossier de la plaque ( c'est à dire le dernier dossier du chemin)
-    name_dossier_instrument_1 = os.path.basename(os.path.normpath(chemin_intrument_1))
-
-    plt.close(10)
-    plt.figure(10,figsize=(12,6))
-    plt.suptitle(type_intrument_1+' épaisseur par puits '+type_intrument_2+' vs '+type_intrument_1 +'\n ')#\n'
-    plt.plot(vecteur_thickness_instrument_2[mask_thickness_proches],vecteur_thickness_instrument_1[mask_thickness_proches],'o',color='blue',label='data utile au fit')
-    plt.plot(vecteur_thickness_instrument_2[mask_thickness_eloignes],vecteur_thickness_instrument_1[mask_thickness_eloignes],'rx',label='outlier')
-    plt.plot(np.arange(np.nanmin(vecteur_thickness_instrument_2),np.nanmax(vecteur_thickness_instrument_2)),np.arange(np.nanmin(vecteur_thickness_instrument_2),np.nanmax(vecteur_thickness_instrument_2)),label='bissectrice = target',color='k')
-    plt.xlabel('T issu stat nm  '+type_intrument_2)
-    plt.ylabel('T issu stat nm  '+type_intrument_1)
-    plt.legend()
-    plt.savefig(directory_plaque_to_save+'\\'+name_dossier_to_save+' epaisseur par puits.jpg')
-
-    mask_thickness_eloignes_fit = vecteur_thickness_instrument_2 >0 
-#calcul du fit sur les volumes 
-    if True in mask_thickness_proches:
-        x_considere_fit_lin_inverse = vecteur_thickness_instrument_2[mask_thickness_proches]
-        y_considere_fit_lin_inverse = vecteur_thickness_instrument_1[mask_thickness_proches]
-        slope_fit_inverse, intercept_fit_inverse, r_value_fit_inverse, p_value_fit_inverse, std_err_fit_inverse = stats.linregress(x_considere_fit_lin_inverse,y_considere_fit_lin_inverse)
-        representation_x = np.arange(np.nanmin(vecteur_thickness_instrument_2),np.nanmax(vecteur_thickness_instrument_2),(np.nanmax(vecteur_thickness_instrument_2)-np.nanmin(vecteur_thickness_instrument_2))/50)
-
-        data_fit = slope_fit_inverse*vecteur_thickness_instrument_2+intercept_fit_inverse
-    # représentation graphique du fit    
-        plt.close(15)
-        plt.figure(15,figsize=(12,6))
-        plt.suptitle(name_dossier_instrument_1+' FIT\népaisseur par puits '+type_intrument_1+' vs '+type_intrument_2 +'\n '+str(nb_puits_trop_loins)+' puits exclus pour le calcul du fit')#\n'
-        plt.plot(vecteur_thickness_instrument_2[mask_thickness_proches],vecteur_thickness_instrument_1[mask_thickness_proches],'+',color='blue',label='data utile pour fit')
-        plt.plot(vecteur_thickness_instrument_2[mask_thickness_eloignes],vecteur_thickness_instrument_1[mask_thickness_eloignes],'rx',label='data exclue pour fit')
-        plt.plot(vecteur_thickness_instrument_2,slope_fit_inverse*vecteur_thickness_instrument_2+intercept_fit_inverse,color='#000080',linestyle = '-',label='slope='+str(round(slope_fit_inverse,2))+'\nord='+str(round(intercept_fit_inverse,2))+'\nR²'+str(round(r_value_fit_inverse,4)))
-        plt.xlabel('T issu stat µm^3  '+type_intrument_2)
-        plt.ylabel('T issu stat µm^3  '+type_intrument_1)
-        plt.legend()    
-        plt.savefig(directory_plaque_to_save+'\\'+name_dossier_to_save+' epaisseur par puits_FIT.jpg')
-    else:
-        slope_fit_inverse, intercept_fit_inverse, r_value_fit_inverse, p_value_fit_inverse, std_err_fit_inverse = stats.linregress(vecteur_thickness_instrument_2,vecteur_thickness_instrument_1)
-        data_fit = slope_fit_inverse*vecteur_thickness_instrument_2+intercept_fit_inverse
-    # représentation graphique du fit    
-        plt.close(15)
-        plt.figure(15,figsize=(12,6))
-        plt.suptitle(name_dossier_instrument_1+' FIT\népaisseur par puits '+type_intrument_1+' vs '+type_intrument_2 +'\n '+str(nb_puits_trop_loins)+' puits exclus pour le calcul du fit')#\n'
-        plt.plot(vecteur_thickness_instrument_2[mask_thickness_proches],vecteur_thickness_instrument_1[mask_thickness_proches],'+',color='blue',label='data utile pour fit')
-        plt.plot(vecteur_thickness_instrument_2[mask_thickness_eloignes],vecteur_thickness_instrument_1[mask_thickness_eloignes],'rx',label='data exclue pour fit')
-        plt.plot(vecteur_thickness_instrument_2,slope_fit_inverse*vecteur_thickness_instrument_2+intercept_fit_inverse,color='#000080',linestyle = '-',label='slope='+str(round(slope_fit_inverse,2))+'\nord='+str(round(intercept_fit_inverse,2))+'\nR²'+str(round(r_value_fit_inverse,4)))
-        plt.xlabel('T issu stat µm^3  '+type_intrument_2)
-        plt.ylabel('T issu stat µm^3  '+type_intrument_1)
-        plt.legend()    
-        plt.savefig(directory_plaque_to_save+'\\'+name_dossier_to_save+' epaisseur par puits_FIT.jpg')
-# calcul de l'écart data - fit et mask en fct du seuillage de l'écart tolérable
-    j_pos = 0
-    while j_pos<96:
-        if vecteur_thickness_instrument_1[j_pos] != 0:
-            ecart_au_fit = 100 * np.abs(data_fit[j_pos] - vecteur_thickness_instrument_1[j_pos])/vecteur_thickness_instrument_1[j_pos]
-        else:
-            ecart_au_fit = 0     
-        if ecart_au_fit>tolerance_relative_fit:
-            mask_thickness_eloignes_fit[j_pos] = True
-        else:
-            mask_thickness_eloignes_fit[j_pos] = False
-        j_pos +=1
-
-# indicateur de la qualité des data vs fit       
-    nb_puits_loin_fit = np.sum(mask_thickness_eloignes_fit)
-
-#  figure avec représentation des points ok ko vis à vis du fit    
-    plt.close(10)
-    plt.figure(10,figsize=(12,6))
-    plt.suptitle(name_dossier_instrument_1+' épaisseur par puits '+type_intrument_2+' vs '+type_intrument_1 +'\n nb puits loin du fit ='+str(nb_puits_loin_fit)+' tolerance ='+str(tolerance_relative_fit))#\n'
-    plt.plot(vecteur_thickness_instrument_2,vecteur_thickness_instrument_1,'v',color='green',label='data proche fit')
-    plt.plot(vecteur_thickness_instrument_2[mask_thickness_eloignes_fit],vecteur_thickness_instrument_1[mask_thickness_eloignes_fit],'rx',label='data loin fit')
-    plt.plot(vecteur_thickness_instrument_2,slope_fit_inverse*vecteur_thickness_instrument_2+intercept_fit_inverse,color='k',linestyle = '-',label='slope='+str(round(slope_fit_inverse,2))+'\nord='+str(round(intercept_fit_inverse,2))+'\nR²'+str(round(r_value_fit_inverse,4)))
-    plt.xlabel('T issu stat µm^3  '+type_intrument_2)
-    plt.ylabel('T issu stat µm^3  '+type_intrument_1)
-    plt.legend()
-    plt.savefig(directory_plaque_to_save+'\\'+name_dossier_to_save+' epaisseur par puits_fit.jpg')
+    if figures:
+        name_dossier_instrument_1 = os.path.basename(os.path.normpath(chemin_intrument_1))
+        publishFigures(specs_comparaison(comparaison_thickness, directory_plaque_to_save, name_dossier_to_save, name_dossier_instrument_1, type_intrument_1, type_intrument_2,
+                                         'épaisseur', 'T issu stat nm  ', 'epaisseur', tolerance_relative_fit), figure_queue)
 
-#    assemblage des figures de dotmaps et colormaps
-    # merge_two_figure([directory_source_synthese_instrument_1,directory_source_synthese_instrument_2],name_dossier_instrument_1,['stat_litteral_thicknesses_colormap.png','stat_litteral_thicknesses_colormap.png'],directory_plaque_to_save)
-    # merge_two_figure([directory_source_synthese_instrument_1,directory_source_synthese_instrument_2],name_dossier_instrument_1,['stat_litteral_intensity_455_colormap.png','stat_litteral_intensity_455_colormap.png'],directory_plaque_to_save)
-    # merge_two_figure([directory_source_synthese_instrument_1,directory_source_synthese_instrument_2],name_dossier_instrument_1,['stat_litteral_intensity_730_colormap.png','stat_litteral_intensity_730_colormap.png'],directory_plaque_to_save)
+        #affiche_colormap_etude_general(Matrix_thickness_difference,name_dossier_instrument_1+'\n'+type_intrument_1+' vs '+type_intrument_2+'\nMatrix_thickness_difference','RdGy',np.nanmin(Matrix_thickness_difference),np.nanmax(Matrix_thickness_difference))
+        #plt.savefig(directory_plaque_to_save+'\\'+name_dossier_to_save+'Matrix_thickness_difference.jpg')
+
+        #affiche_colormap_etude_general(Matrix_thickness_difference_relative,name_dossier_instrument_1+'\n'+type_intrument_1+' vs '+type_intrument_2+'\nMatrix_thickness_difference en %','PuOr',-100,100)
+        #plt.savefig(directory_plaque_to_save+'\\'+name_dossier_to_save+'Matrix_thickness_difference_relative.jpg')
+
+        #affiche_colormap_etude_general(Matrix_thickness_ratio,name_dossier_instrument_1+'\n'+type_intrument_1+' vs '+type_intrument_2+'\nMatrix_thickness_ratio','Greens',np.nanmin(Matrix_thickness_ratio),np.nanmax(Matrix_thickness_ratio))
+        #plt.savefig(directory_plaque_to_save+'\\'+name_dossier_to_save+'Matrix_thicknesse_ratio.jpg')
+
+        # merge_two_figure([directory_source_synthese_instrument_1,directory_source_synthese_instrument_2],name_dossier_instrument_1,['stat_litteral_thicknesses_colormap.png','stat_litteral_thicknesses_colormap.png'],directory_plaque_to_save)
+        # merge_two_figure([directory_source_synthese_instrument_1,directory_source_synthese_instrument_2],name_dossier_instrument_1,['stat_litteral_intensity_455_colormap.png','stat_litteral_intensity_455_colormap.png'],directory_plaque_to_save)
+        # merge_two_figure([directory_source_synthese_instrument_1,directory_source_synthese_instrument_2],name_dossier_instrument_1,['stat_litteral_intensity_730_colormap.png','stat_litteral_intensity_730_colormap.png'],directory_plaque_to_save)
 
 #    regénération des colormaps volumes et diamètres
-    #affiche_colormap_etude_general(thickness_instrument_1,'épaisseur_'+type_intrument_1,'jet',0,200)
-    # plt.savefig(directory_plaque_to_save+'\\epaisseur_'+type_intrument_1+'.jpg')
+        #affiche_colormap_etude_general(thickness_instrument_1,'épaisseur_'+type_intrument_1,'jet',0,200)
+        # plt.savefig(directory_plaque_to_save+'\\epaisseur_'+type_intrument_1+'.jpg')
 
-    #affiche_colormap_etude_general(thickness_instrument_2,'épaisseur_'+type_intrument_2,'jet',0,200)
-    # plt.savefig(directory_plaque_to_save+'\\epaisseur_'+type_intrument_2+'.jpg')
+        #affiche_colormap_etude_general(thickness_instrument_2,'épaisseur_'+type_intrument_2,'jet',0,200)
+        # plt.savefig(directory_plaque_to_save+'\\epaisseur_'+type_intrument_2+'.jpg')
 
-    # merge_two_figure([directory_plaque_to_save,directory_plaque_to_save],name_dossier_instrument_1,['epaisseur_'+type_intrument_1+'.jpg','epaisseur_'+type_intrument_2+'.jpg'],directory_plaque_to_save)
+        # merge_two_figure([directory_plaque_to_save,directory_plaque_to_save],name_dossier_instrument_1,['epaisseur_'+type_intrument_1+'.jpg','epaisseur_'+type_intrument_2+'.jpg'],directory_plaque_to_save)
 
 #    copier coller des dotmaps
-    # copyfile(directory_source_synthese_instrument_1+'\\stat_litteral_thicknesses_colormap.png',directory_plaque_to_save+'\\thicknesses_'+type_intrument_1+'.png')
-    # copyfile(directory_source_synthese_instrument_2+'\\stat_litteral_thicknesses_colormap.png',directory_plaque_to_save+'\\thicknesses_'+type_intrument_2+'.png')
+        # copyfile(directory_source_synthese_instrument_1+'\\stat_litteral_thicknesses_colormap.png',directory_plaque_to_save+'\\thicknesses_'+type_intrument_1+'.png')
+        # copyfile(directory_source_synthese_instrument_2+'\\stat_litteral_thicknesses_colormap.png',directory_plaque_to_save+'\\thicknesses_'+type_intrument_2+'.png')
+
+        # copyfile(directory_source_synthese_instrument_1+'\\stat_litteral_intensity_455_colormap.png',directory_plaque_to_save+'\\intensity_455'+type_intrument_1+'.png')
+        # copyfile(directory_source_synthese_instrument_2+'\\stat_litteral_intensity_455_colormap.png',directory_plaque_to_save+'\\intensity_455'+type_intrument_2+'.png')
 
-    # copyfile(directory_source_synthese_instrument_1+'\\stat_litteral_intensity_455_colormap.png',directory_plaque_to_save+'\\intensity_455'+type_intrument_1+'.png')
-    # copyfile(directory_source_synthese_instrument_2+'\\stat_litteral_intensity_455_colormap.png',directory_plaque_to_save+'\\intensity_455'+type_intrument_2+'.png')
+        # copyfile(directory_source_synthese_instrument_1+'\\stat_litteral_intensity_730_colormap.png',directory_plaque_to_save+'\\intensity_730'+type_intrument_1+'.png')
+        # copyfile(directory_source_synthese_instrument_2+'\\stat_litteral_intensity_730_colormap.png',directory_plaque_to_save+'\\intensity_730'+type_intrument_2+'.png')
 
-    # copyfile(directory_source_synthese_instrument_1+'\\stat_litteral_intensity_730_colormap.png',directory_plaque_to_save+'\\intensity_730'+type_intrument_1+'.png')
-    # copyfile(directory_source_synthese_instrument_2+'\\stat_litteral_intensity_730_colormap.png',directory_plaque_to_save+'\\intensity_730'+type_intrument_2+'.png')
-#   calcul de moyenneset ecarts types des différences en volumes et diametres
-    Matrix_thickness_difference_relative_mean = np.nanmean(Matrix_thickness_difference_relative)
-    Matrix_thickness_difference_relative_std = np.nanstd(Matrix_thickness_difference_relative)    
-    Matrix_thickness_difference_relative_CV = np.copy(100*Matrix_thickness_difference_relative_std/Matrix_thickness_difference_relative_mean)
+    nb_puits_trop_loins = comparaison_thickness['nb_puits_trop_loins']
+    slope_fit_inverse, intercept_fit_inverse, r_value_fit_inverse = comparaison_thickness['slope_fit'], comparaison_thickness['intercept_fit'], comparaison_thickness['r_value_fit']
+    nb_puits_loin_fit = comparaison_thickness['nb_puits_loin_fit']
+    vecteur_thickness_instrument_1, vecteur_thickness_instrument_2 = comparaison_thickness['vecteur_instrument_1'], comparaison_thickness['vecteur_instrument_2']
+    Matrix_thickness_difference_relative_mean = comparaison_thickness['difference_relative_mean']
+    Matrix_thickness_difference_relative_CV = comparaison_thickness['difference_relative_CV']
 
-#   fichier de sortie avec les KPI 
     fichier_out = open(directory_plaque_to_save+'\\data_extraite_KPI_'+type_intrument_1+'_'+type_intrument_2+'.csv','w')
     fichier_out.write('name_plate;nb_puits_utiles_pour_fit;fit lineaire_x=;y=;slope;intercept;R²;nb_puits_loin_du_fit;tolerance vis a vis du fit;Matrix_thickness_difference_relative_mean;Matrix_thickness_difference_relative_CV;\n')
     fichier_out.write(name_dossier_to_save+';'+str(nb_puits_trop_loins)+';'+type_intrument_1+';'+type_intrument_2+';'+str(slope_fit_inverse)+';'+str(intercept_fit_inverse)+';'+str(r_value_fit_inverse)+';'+str(nb_puits_loin_fit)+';'+str(tolerance_relative_fit)+';'+str(Matrix_thickness_difference_relative_mean)+';'+str(Matrix_thickness_difference_relative_CV)+'\n')    
@@ -1075,7 +781,68 @@ def comparaison_ZC_to_ref_v1_nanofilm(nom_gp,chemin_intrument_1,type_intrument_1
     return name_dossier_to_save, slope_fit_inverse, intercept_fit_inverse, r_value_fit_inverse, nb_puits_loin_fit, Matrix_thickness_difference_relative_mean , Matrix_thickness_difference_relative_CV , vecteur_thickness_instrument_1, vecteur_thickness_instrument_2
 
 
-def compare_enzymo_2_ref(directory_source_instrument_1,type_instrument_1,acquisition_name_instrument_1,onglet,directory_source_instrument_2,type_instrument_2,acquisition_name_instrument_2,directory_to_save):        
+def compare_enzymo_2_ref_onglet(args,kwargs,dessiner=False):
+    # exécute compare_enzymo_2_ref pour un onglet ; l'erreur éventuelle est retournée au lieu d'être levée
+    # pour ne pas interrompre les autres onglets.
+    # dessiner : True pour dessiner les figures de l'onglet ici (dans le processus du pool qui traite l'onglet,
+    # avec Agg), False pour les retourner sans les dessiner (FigureSpec).
+    # retourne (résultat ou None, figures non dessinées, exception ou None).
+    figure_queue = FigureQueue()
+    try:
+        data,erreur = compare_enzymo_2_ref(*args,figure_queue=figure_queue,**kwargs),None
+    except Exception as e:
+        data,erreur = None,e
+    if dessiner:
+        renderFigures(figure_queue.pending())
+        return data,[],erreur
+    return data,figure_queue.pending(),erreur
+
+
+def compare_enzymo_2_ref_onglets(directory_source_instrument_1,type_instrument_1,acquisition_name_instrument_1,onglets,directory_source_instrument_2,type_instrument_2,acquisition_name_instrument_2,directory_to_save,sections_instrument_1=None,sections_instrument_2=None,workers=1,figure_queue=None):
+    # =============================================================================
+    # compare_enzymo_2_ref pour plusieurs onglets d'une même paire d'acquisitions.
+    # Une fois les fichiers WellResults lus, les onglets sont indépendants : avec workers > 1
+    # ils sont répartis entre les processus d'un pool, et chaque processus dessine aussi les figures
+    # de ses onglets. Avec une figure_queue, les figures ne sont pas dessinées mais mises en file
+    # pour être rendues à la demande.
+    #
+    # onglets : liste des onglets à comparer.
+    # sections_instrument_1, sections_instrument_2 : dictionnaires onglet -> EnzymoSections
+    # retournés par readEnzymoSections (None ou onglet absent : l'onglet est lu par compare_enzymo_2_ref).
+    # workers : nombre de processus (1 pour comparer les onglets dans le processus courant).
+    # figure_queue : FigureQueue où déposer les figures pour les dessiner à la demande (None pour les dessiner
+    # pendant la comparaison de chaque onglet).
+    #
+    # retourne la liste des (onglet, (data_R, data_V) ou None, exception ou None), dans l'ordre des onglets.
+    # =============================================================================
+    dessiner = figure_queue is None
+    taches = []
+    for onglet in onglets:
+        args = (directory_source_instrument_1,type_instrument_1,acquisition_name_instrument_1,onglet,directory_source_instrument_2,type_instrument_2,acquisition_name_instrument_2,directory_to_save)
+        kwargs = {'sections_instrument_1': (sections_instrument_1 or {}).get(onglet),
+                  'sections_instrument_2': (sections_instrument_2 or {}).get(onglet)}
+        taches.append((args,kwargs,dessiner))
+
+    if workers > 1 and len(taches) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers,len(taches))) as executor:
+            resultats = list(executor.map(compare_enzymo_2_ref_onglet,*zip(*taches)))
+    else:
+        resultats = [compare_enzymo_2_ref_onglet(*tache) for tache in taches]
+
+    if figure_queue is not None:
+        figure_queue.add(spec for data,specs,erreur in resultats for spec in specs)
+
+    return [(onglet,data,erreur) for onglet,(data,specs,erreur) in zip(onglets,resultats)]
+
+
+def read_enzymo_sheet(chemin_well_result,onglet):
+    # lit un seul onglet d'un fichier WellResults et le découpe en sections
+    # (utilisé quand compare_enzymo_2_ref ne reçoit pas les sections déjà lues par readEnzymoSections)
+    df = readWellResultsSheets(chemin_well_result,[onglet])[onglet]
+    return parseEnzymoSections(df,onglet)
+
+
+def compare_enzymo_2_ref(directory_source_instrument_1,type_instrument_1,acquisition_name_instrument_1,onglet,directory_source_instrument_2,type_instrument_2,acquisition_name_instrument_2,directory_to_save,sections_instrument_1=None,sections_instrument_2=None,figure_queue=None):        
 
     # =============================================================================
     ''' BUT '''
@@ -1112,6 +879,13 @@ def compare_enzymo_2_ref(directory_source_instrument_1,type_instrument_1,acquisi
     # directory_to_save : dossier où seront sauvegardés tous les résultats de comparaison.
     # organisé en sous-dossier par acquisition à la machine 2 (à valider).
     #
+    # sections_instrument_1, sections_instrument_2 : sections (EnzymoSections) de l'onglet
+    # déjà lues par readEnzymoSections pour chaque machine, afin de ne lire chaque
+    # fichier WellResults qu'une fois pour tous les onglets. Si None, l'onglet est lu ici.
+    #
+    # figure_queue : FigureQueue où déposer les figures pour les dessiner à la demande.
+    # Si None, les figures sont dessinées ici.
+    #
     ''' SORTIES '''
     # enregistre dans le répertoire directory_to_save les figures de comparaison du taux 
     # de dégradation de la machine 2 en fonction de la machine 1
@@ -1174,131 +948,21 @@ def compare_enzymo_2_ref(directory_source_instrument_1,type_instrument_1,acquisi
     #     results_Reference = list(file_read)
     # WellResultsReference.close()    
 
-    df = pandas.read_excel(chemin_well_result_reference,sheet_name=onglet)
-    results_Reference = df.values.tolist()
-
-    if results_Reference[-1] == [] or results_Reference[-1] == [';;;;;;;;;'] or results_Reference[-1] == [np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan]:
-        print(results_Reference[-1])
-        results_Reference.pop()
-
-    if results_Reference[0][0] == 'Plate Reference': # le premier onglet à un paragraphe de plus que les suivants (qui comporte les info date, heure, référence plaque, ce qui correspond à l'en-tête)
-        start_stop = []
-        j_1 = 0
-        while len(start_stop) < 7 and j_1 < len(results_Reference):
-            # On cherche les lignes vides ou les lignes qui contiennent uniquement des séparateurs
-            if results_Reference[j_1] == []  or results_Reference[j_1] == [';;;;;;;;;'] or results_Reference[j_1] == [np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan]:
-                start_stop.append(j_1)
-            j_1 += 1
-
-        ## Extraction des information du CSV WellResults de l'acquisition de référence :
-            # Entete_Reference contient la date, l'heure, le nom de la palque, les paramères de fit a, b et R²
-            # Blank_Reference contient les ZU des puits tampons et les exclusions des tampons
-            # Gamme_Reference contient les ZU et les activités théoriques des points de gamme et leurs exclusions
-            # Sample_Reference contient les activité non diluées des échantillons et leur RSD
-            # SampleDetail_Reference contient les ZU et activité mesurée de tous les points échantillons et leurs exclusions
-
-        Entete_Reference = []
-        Blank_Reference = []
-        Gamme_Reference = []
-        Sample_Reference = []
-        SampleDetail_Reference = []
-
-        # for k in range(start_stop[0]-3):
-        #     Entete_Reference.append(results_Reference[k+3])
-        # for k in range(start_stop[1] - start_stop[0] - 3):
-        #     Blank_Reference.append(results_Reference[k+start_stop[0]+3])
-        # for k in range(start_stop[2] - start_stop[1] - 3):
-        #     Gamme_Reference.append(results_Reference[k+start_stop[1]+3])
-        # for k in range(start_stop[3] - start_stop[2] - 3):
-        #     Sample_Reference.append(results_Reference[k+start_stop[2]+3])
-        # for k in range(len(results_Reference) - start_stop[3] - 3):
-        #     SampleDetail_Reference.append(results_Reference[k+start_stop[3]+3])
-
-        for k in range(start_stop[1]-3):
-            Entete_Reference.append(results_Reference[k+3])
-        for k in range(start_stop[2] - start_stop[1] - 3):
-            Blank_Reference.append(results_Reference[k+start_stop[1]+3])
-        for k in range(start_stop[4] - start_stop[3] - 3):
-            Gamme_Reference.append(results_Reference[k+start_stop[3]+3])
-        for k in range(start_stop[5] - start_stop[4] - 3):
-            Sample_Reference.append(results_Reference[k+start_stop[4]+3])
-        for k in range(len(results_Reference) - start_stop[6] - 3):
-            SampleDetail_Reference.append(results_Reference[k+start_stop[6]+3])
-    else:
-        start_stop = []
-        j_1 = 0
-        while len(start_stop) < 6 and j_1 < len(results_Reference):
-
-            # On cherche les lignes vides ou les lignes qui contiennent uniquement des séparateurs
-            if results_Reference[j_1] == []  or results_Reference[j_1] == [';;;;;;;;;'] or results_Reference[j_1] == [np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan]:
-                start_stop.append(j_1)
-            j_1 += 1
-
-        ## Extraction des information du CSV WellResults de l'acquisition de référence :
-            # Entete_Reference contient la date, l'heure, le nom de la palque, les paramères de fit a, b et R²
-            # Blank_Reference contient les ZU des puits tampons et les exclusions des tampons
-            # Gamme_Reference contient les ZU et les activités théoriques des points de gamme et leurs exclusions
-            # Sample_Reference contient les activité non diluées des échantillons et leur RSD
-            # SampleDetail_Reference contient les ZU et activité mesurée de tous les points échantillons et leurs exclusions
-
-        Entete_Reference = []
-        Blank_Reference = []
-        Gamme_Reference = []
-        Sample_Reference = []
-        SampleDetail_Reference = []
-
-        # for k in range(start_stop[0]-3):
-        #     Entete_Reference.append(results_Reference[k+3])
-        # for k in range(start_stop[1] - start_stop[0] - 3):
-        #     Blank_Reference.append(results_Reference[k+start_stop[0]+3])
-        # for k in range(start_stop[2] - start_stop[1] - 3):
-        #     Gamme_Reference.append(results_Reference[k+start_stop[1]+3])
-        # for k in range(start_stop[3] - start_stop[2] - 3):
-        #     Sample_Reference.append(results_Reference[k+start_stop[2]+3])
-        # for k in range(len(results_Reference) - start_stop[3] - 3):
-        #     SampleDetail_Reference.append(results_Reference[k+start_stop[3]+3])
-
-        for k in range(start_stop[0]):
-            Entete_Reference.append(results_Reference[k])
-        for k in range(start_stop[1] - start_stop[0] - 3):
-            Blank_Reference.append(results_Reference[k+start_stop[0]+3])
-        for k in range(start_stop[3] - start_stop[2] - 3):
-            Gamme_Reference.append(results_Reference[k+start_stop[2]+3])
-        for k in range(start_stop[4] - start_stop[3] - 3):
-            Sample_Reference.append(results_Reference[k+start_stop[3]+3])
-        for k in range(len(results_Reference) - start_stop[5] - 3):
-            SampleDetail_Reference.append(results_Reference[k+start_stop[5]+3])
-
-    ## Ces listes sont des tableaux 1D, chaque ligne n'est pas encore séparée
-
-    Entete_R = []
-    Blank_R = []
-    Gamme_R = []
-    Sample_R = []
-    SampleDetail_R = []
-
-    # for k in range(len(Entete_Reference)):
-    #     Entete_R.append(re.split(';',Entete_Reference[k][0]))
-    # for k in range(len(Blank_Reference)):
-    #     Blank_R.append(re.split(';',Blank_Reference[k][0]))
-    # for k in range(len(Gamme_Reference)):
-    #     Gamme_R.append(re.split(';',Gamme_Reference[k][0]))
-    # for k in range(len(Sample_Reference)):
-    #     Sample_R.append(re.split(';',Sample_Reference[k][0]))
-    # for k in range(len(SampleDetail_Reference)):
-    #     SampleDetail_R.append(re.split(';',SampleDetail_Reference[k][0]))
-
-    Entete_R = Entete_Reference
-    Blank_R = Blank_Reference
-    Gamme_R = Gamme_Reference
-    Sample_R = Sample_Reference
-    SampleDetail_R = SampleDetail_Reference
-
-    # print('En-tête R : \n',Entete_R)
-    # print('Blank R : \n',Blank_R)
-    # print('Gamme_R : \n',Gamme_R)
-    # print('Sample_R : \n',Sample_R)
-    # print('SampleDetail_R : \n',SampleDetail_R)
+    ## Extraction des information du WellResults de l'acquisition de référence :
+        # Entete_R contient la date, l'heure, le nom de la palque, les paramères de fit a, b et R²
+        # Blank_R contient les ZU des puits tampons et les exclusions des tampons
+        # Gamme_R contient les ZU et les activités théoriques des points de gamme et leurs exclusions
+        # Sample_R contient les activité non diluées des échantillons et leur RSD
+        # SampleDetail_R contient les ZU et activité mesurée de tous les points échantillons et leurs exclusions
+    # Sections déjà découpées par readEnzymoSections, sinon lues ici
+    if sections_instrument_1 is None:
+        sections_instrument_1 = read_enzymo_sheet(chemin_well_result_reference, onglet)
+
+    Entete_R = sections_instrument_1.entete.values
+    Blank_R = sections_instrument_1.blank.values
+    Gamme_R = sections_instrument_1.gamme.values
+    Sample_R = sections_instrument_1.sample.values
+    SampleDetail_R = sections_instrument_1.sample_detail.values
 
     ## les listes sont maintenant des tableaux 2D dont chaque ligne a été divisée en autant
     ## de colonne qu'il y avait de ";" 
@@ -1597,133 +1261,16 @@ def compare_enzymo_2_ref(directory_source_instrument_1,type_instrument_1,acquisi
     #     results_Validation = list(file_read)
     # WellResultsValidation.close()
 
-    df = pandas.read_excel(chemin_well_result_validation,sheet_name=onglet)
-    results_Validation = df.values.tolist()
-
-    if results_Validation[-1] == [] or results_Validation[-1] == [';;;;;;;;;'] or results_Validation[-1] == [np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan]:
-        results_Validation.pop()
+    # Sections du WellResults de la machine à valider : déjà découpées par readEnzymoSections, sinon lues ici
+    if sections_instrument_2 is None:
+        sections_instrument_2 = read_enzymo_sheet(chemin_well_result_validation, onglet)
 
-    '''
-    start_stop = []
-    j_1 = 0
-    while len(start_stop) < 4 and j_1 < len(results_Validation):
-        if results_Validation[j_1] == []:
-            start_stop.append(j_1)
-        j_1 += 1
-    '''
-
-    # print('\n\n\nresultReference à vérifier :\n\n',results_Validation)
-
-
-    if results_Validation[0][0] == 'Plate Reference': #le premier onglet à un paragraphe de plus que les suivants (qui comporte les info date, heure, référence plaque, ce qui correspond à l'en-tête)
-        start_stop = []
-        j_1 = 0
-        while len(start_stop) < 7 and j_1 < len(results_Validation):
-            if results_Validation[j_1] == [] or results_Validation[j_1] == [';;;;;;;;;'] or results_Validation[j_1] == [np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan]:
-                start_stop.append(j_1)
-            j_1 += 1
-
-        ## Extraction des information du CSV WellResults
-
-        Entete_Validation = []
-        Blank_Validation = []
-        Gamme_Validation = []
-        Sample_Validation = []
-        SampleDetail_Validation = []
-        '''
-        for k in range(start_stop[0]):
-            Entete_Validation.append(results_Validation[k])
-        for k in range(start_stop[1] - start_stop[0] - 3):
-            Blank_Validation.append(results_Validation[k+start_stop[0]+3])
-        for k in range(start_stop[2] - start_stop[1] - 3):
-            Gamme_Validation.append(results_Validation[k+start_stop[1]+3])
-        for k in range(start_stop[3] - start_stop[2] - 3):
-            Sample_Validation.append(results_Validation[k+start_stop[2]+3])
-        for k in range(len(results_Validation) - start_stop[3] - 3):
-            SampleDetail_Validation.append(results_Validation[k+start_stop[3]+3])
-        '''   
-        for k in range(start_stop[1]-3):
-            Entete_Validation.append(results_Validation[k+3])
-        for k in range(start_stop[2] - start_stop[1] - 3):
-            Blank_Validation.append(results_Validation[k+start_stop[1]+3])
-        for k in range(start_stop[4] - start_stop[3] - 3):
-            Gamme_Validation.append(results_Validation[k+start_stop[3]+3])
-        for k in range(start_stop[5] - start_stop[4] - 3):
-            Sample_Validation.append(results_Validation[k+start_stop[4]+3])
-    #    for k in range(len(results_Validation) - start_stop[4] - 3):
-        for k in range(len(results_Validation) - start_stop[6] - 4):
-            SampleDetail_Validation.append(results_Validation[k+start_stop[6]+3])
-    else:
-        start_stop = []
-        j_1 = 0
-        while len(start_stop) < 6 and j_1 < len(results_Validation):
-            if results_Validation[j_1] == [] or results_Validation[j_1] == [';;;;;;;;;'] or results_Validation[j_1] == [np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan]:
-                start_stop.append(j_1)
-            j_1 += 1
-
-        ## Extraction des information du CSV WellResults
-
-        Entete_Validation = []
-        Blank_Validation = []
-        Gamme_Validation = []
-        Sample_Validation = []
-        SampleDetail_Validation = []
-        '''
-        for k in range(start_stop[0]):
-            Entete_Validation.append(results_Validation[k])
-        for k in range(start_stop[1] - start_stop[0] - 3):
-            Blank_Validation.append(results_Validation[k+start_stop[0]+3])
-        for k in range(start_stop[2] - start_stop[1] - 3):
-            Gamme_Validation.append(results_Validation[k+start_stop[1]+3])
-        for k in range(start_stop[3] - start_stop[2] - 3):
-            Sample_Validation.append(results_Validation[k+start_stop[2]+3])
-        for k in range(len(results_Validation) - start_stop[3] - 3):
-            SampleDetail_Validation.append(results_Validation[k+start_stop[3]+3])
-        '''   
-        for k in range(start_stop[0]):
-            Entete_Validation.append(results_Validation[k])
-        for k in range(start_stop[1] - start_stop[0] - 3):
-            Blank_Validation.append(results_Validation[k+start_stop[0]+3])
-        for k in range(start_stop[3] - start_stop[2] - 3):
-            Gamme_Validation.append(results_Validation[k+start_stop[2]+3])
-        for k in range(start_stop[4] - start_stop[3] - 3):
-            Sample_Validation.append(results_Validation[k+start_stop[3]+3])
-    #    for k in range(len(results_Validation) - start_stop[4] - 3):
-        for k in range(len(results_Validation) - start_stop[5] - 4):
-            SampleDetail_Validation.append(results_Validation[k+start_stop[5]+3])
-
-    Entete_V = []
-    Blank_V = []
-    Gamme_V = []
-    Sample_V = []
-    SampleDetail_V = []
-
-    # for k in range(len(Entete_Validation)):
-    #     #Entete_V.append(re.split(';',Entete_Validation[k][0]))
-    #     if Entete_Validation[k] == []:
-    #         Entete_V.append(Entete_Validation[k])
-    #     else:
-    #         Entete_V.append(re.split(';',Entete_Validation[k][0]))
-    # for k in range(len(Blank_Validation)):
-    #     Blank_V.append(re.split(';',Blank_Validation[k][0]))
-    # for k in range(len(Gamme_Validation)):
-    #     Gamme_V.append(re.split(';',Gamme_Validation[k][0]))
-    # for k in range(len(Sample_Validation)):
-    #     Sample_V.append(re.split(';',Sample_Validation[k][0]))
-    # for k in range(len(SampleDetail_Validation)):
-    #     SampleDetail_V.append(re.split(';',SampleDetail_Validation[k][0]))
-
-    Entete_V = Entete_Validation
-    Blank_V = Blank_Validation
-    Gamme_V = Gamme_Validation
-    Sample_V = Sample_Validation
-    SampleDetail_V = SampleDetail_Validation
-
-    # print('En-tête V : \n',Entete_V)
-    # print('Blank V : \n',Blank_V)
-    # print('Gamme_V : \n',Gamme_V)
-    # print('Sample_V : \n',Sample_V)
-    # print('SampleDetail_V : \n',SampleDetail_V)
+    Entete_V = sections_instrument_2.entete.values
+    Blank_V = sections_instrument_2.blank.values
+    Gamme_V = sections_instrument_2.gamme.values
+    Sample_V = sections_instrument_2.sample.values
+    # la dernière ligne de SampleDetail n'est pas reprise pour la machine à valider
+    SampleDetail_V = sections_instrument_2.sample_detail.values[:-1]
 
     ## LOD LOQ
 
@@ -1913,20 +1460,13 @@ def compare_enzymo_2_ref(directory_source_instrument_1,type_instrument_1,acquisi
         # print('\n\n\ndeg_REF : \n\n',deg_REF)
         # print('\n\n\ndeg_VALID : \n\n',deg_VALID)
 
-        plt.close('all')
-        plt.figure(figsize=(8, 6))
-        # plt.close(26)
-        # plt.clf()
-        # fig26 = plt.figure(26)
-        plt.suptitle('Comparaison des taux de dégradation\npour les gammes au ' + type_instrument_1 + ' et au ' + type_instrument_2 + '\n' + acquisition_name_instrument_2 + ' ' + onglet)
-        plt.plot(deg_REF,deg_VALID,'o',color='blue')
-        plt.plot(np.arange(np.nanmin(deg_REF),np.nanmax(deg_REF)),np.arange(np.nanmin(deg_REF),np.nanmax(deg_REF)),label='bissectrice = target',color='k')
-        plt.xlabel('% de dégradation au ' + type_instrument_1)
-        plt.ylabel('% de dégradation au ' + type_instrument_2)
-        plt.legend()
-        plt.savefig(directory_to_save + '\\' + acquisition_name_instrument_2 + '_' + onglet + '_taux_degradation')
-        # plt.close(26)
-        plt.close()
+        spec_degradation = FigureSpec(directory_to_save + '\\' + acquisition_name_instrument_2 + '_' + onglet + '_taux_degradation.png',figsize=(8, 6))
+        spec_degradation.add('figure.suptitle','Comparaison des taux de dégradation\npour les gammes au ' + type_instrument_1 + ' et au ' + type_instrument_2 + '\n' + acquisition_name_instrument_2 + ' ' + onglet)
+        spec_degradation.add('plot',deg_REF,deg_VALID,'o',color='blue')
+        spec_degradation.add('plot',np.arange(np.nanmin(deg_REF),np.nanmax(deg_REF)),np.arange(np.nanmin(deg_REF),np.nanmax(deg_REF)),label='bissectrice = target',color='k')
+        spec_degradation.add('set_xlabel','% de dégradation au ' + type_instrument_1)
+        spec_degradation.add('set_ylabel','% de dégradation au ' + type_instrument_2)
+        spec_degradation.add('legend')
 
         ## tout ce qui est noté P dans la suite est équivalent à R (R pour référence
         ## et avant le Proto était la référence)
@@ -1999,25 +1539,22 @@ def compare_enzymo_2_ref(directory_source_instrument_1,type_instrument_1,acquisi
                 Y_Error_P.append(gamme_moyenne_P[k][-1])
                 Y_Error_Z.append(gamme_moyenne_P[k][-1])
 
-        # plt.close('all')
-        plt.close(27)
-        fig27 = plt.figure(27)
-        plt.title('Gammes comparées de ' + type_instrument_1 + ', la référence et de\n' + type_instrument_2 + ', la machine à valider\n' + acquisition_name_instrument_2 + ' ' + onglet)
+        spec_gammes = FigureSpec(directory_to_save + '\\' + acquisition_name_instrument_2 + '_' + onglet + '_Gammes.png')
+        spec_gammes.add('set_title','Gammes comparées de ' + type_instrument_1 + ', la référence et de\n' + type_instrument_2 + ', la machine à valider\n' + acquisition_name_instrument_2 + ' ' + onglet)
 
         # print('\n\n\nY_Gamme_P : \n\n',Y_Gamme_P)
         # print('\n\n\nY_Gamme_Z : \n\n',Y_Gamme_Z)
 
-        plt.plot(Abscisses_Gamme,Y_Gamme_P,'o',color = 'red', label = type_instrument_1)        
-        plt.errorbar(Abscisses_Gamme,Y_Gamme_P,yerr = Y_Error_P,fmt = 'none', capsize = 6, ecolor = 'red', zorder = 1)
-        plt.plot(Abscisses_Gamme,Y_Gamme_Z,'o',color = 'blue', label = type_instrument_2)        
-        plt.errorbar(Abscisses_Gamme,Y_Gamme_Z,yerr = Y_Error_Z,fmt = 'none', capsize = 6, ecolor = 'blue', zorder = 1)
+        spec_gammes.add('plot',Abscisses_Gamme,Y_Gamme_P,'o',color = 'red', label = type_instrument_1)
+        spec_gammes.add('errorbar',Abscisses_Gamme,Y_Gamme_P,yerr = Y_Error_P,fmt = 'none', capsize = 6, ecolor = 'red', zorder = 1)
+        spec_gammes.add('plot',Abscisses_Gamme,Y_Gamme_Z,'o',color = 'blue', label = type_instrument_2)
+        spec_gammes.add('errorbar',Abscisses_Gamme,Y_Gamme_Z,yerr = Y_Error_Z,fmt = 'none', capsize = 6, ecolor = 'blue', zorder = 1)
 
-        plt.xlabel('Activité des points de gamme (U/mL)')
-        plt.ylabel('Z.U.')
-        plt.legend()
+        spec_gammes.add('set_xlabel','Activité des points de gamme (U/mL)')
+        spec_gammes.add('set_ylabel','Z.U.')
+        spec_gammes.add('legend')
 
-        plt.savefig(directory_to_save + '\\' + acquisition_name_instrument_2 + '_' + onglet + '_Gammes')
-        plt.close(27)
+        publishFigures([spec_degradation, spec_gammes], figure_queue)
 
     data_R = [acquisition_name_instrument_1,type_instrument_1,onglet,lod_R,loq_R,sensibilite_R,cv_357_R[0],cv_357_R[1],cv_357_R[2]]
     for k in range(len(Sample_R)):
@@ -0,0 +1,299 @@
+import hashlib
+import logging
+import os
+import shutil
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import matplotlib
+import matplotlib.style
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+logger = logging.getLogger(__name__)
+
+# Version du rendu des FigureSpec : une image en cache d'une autre version est redessinée
+FIGURE_CACHE_VERSION = 1
+# Dossier du cache des figures, à côté du dossier validation_results d'une acquisition
+FIGURE_CACHE_DIRNAME = "figure_cache"
+
+
+class FigureSpec:
+    """
+    Description déclarative d'une figure à un seul axe : chemin de sortie, taille, et suite d'appels (layers)
+    appliqués à l'axe dans l'ordre. Une FigureSpec ne contient que des données (tableaux, chaînes, nombres) :
+    elle peut être construite sans matplotlib.pyplot et transmise aux processus d'un pool pour le rendu.
+    """
+
+    def __init__(self, path: str, figsize: Optional[Tuple[float, float]] = None, dpi: Optional[float] = None,
+                 colorbar: bool = False, constrained_layout: bool = False, style: Optional[str] = None,
+                 bbox_inches: Optional[str] = None):
+        """
+        :param path: Chemin de l'image ; l'extension donne le format.
+        :param figsize: Taille de la figure en pouces (None pour la taille par défaut de matplotlib).
+        :param dpi: Résolution de l'image (None pour la résolution par défaut de matplotlib).
+        :param colorbar: Ajoute la barre de couleur de la première image (imshow) de l'axe.
+        :param constrained_layout: Mise en page contrainte de la figure.
+        :param style: Style matplotlib appliqué à cette figure seulement (ex. 'seaborn-v0_8-whitegrid').
+        :param bbox_inches: Cadrage de l'image enregistrée (ex. 'tight').
+        """
+        self.path = path
+        self.figsize = figsize
+        self.dpi = dpi
+        self.colorbar = colorbar
+        self.constrained_layout = constrained_layout
+        self.style = style
+        self.bbox_inches = bbox_inches
+        self.layers = []
+
+    def add(self, method: str, *args, **kwargs) -> 'FigureSpec':
+        """
+        Ajoute un appel à la figure.
+
+        :param method: Méthode de l'axe ('plot', 'errorbar', 'set_xlabel', 'legend'...), éventuellement
+                       pointée pour atteindre un attribut de l'axe ('xaxis.set_ticks_position', 'figure.suptitle').
+        :return: La FigureSpec, pour enchaîner les appels.
+        """
+        self.layers.append((method, args, kwargs))
+        return self
+
+    def fingerprint(self) -> str:
+        """
+        Empreinte du contenu de la figure : hash SHA-1 des données tracées, des paramètres de chaque appel,
+        de la mise en page et du format de l'image (le chemin n'en fait pas partie). Deux FigureSpec de même
+        empreinte donnent la même image.
+
+        :return: Empreinte hexadécimale.
+        """
+        digest = hashlib.sha1()
+        _hashValue(digest, (FIGURE_CACHE_VERSION, matplotlib.__version__, os.path.splitext(self.path)[1].lower(),
+                            self.figsize, self.dpi, self.colorbar, self.constrained_layout, self.style,
+                            self.bbox_inches, self.layers))
+        return digest.hexdigest()
+
+
+def _hashValue(digest, value: Any):
+    # Ajoute une valeur au hash : les tableaux par leur type, leur forme et leurs octets, les conteneurs
+    # élément par élément, les autres valeurs par leur repr
+    if isinstance(value, (np.ndarray, np.generic)):
+        array = np.ascontiguousarray(value)
+        digest.update(f"ndarray:{array.dtype.str}:{array.shape}:".encode())
+        if array.dtype == object:
+            _hashValue(digest, array.tolist())
+        else:
+            digest.update(array.tobytes())
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}:{len(value)}:".encode())
+        for item in value:
+            _hashValue(digest, item)
+    elif isinstance(value, dict):
+        digest.update(f"dict:{len(value)}:".encode())
+        for key in sorted(value, key=repr):
+            _hashValue(digest, key)
+            _hashValue(digest, value[key])
+    else:
+        digest.update(f"{type(value).__name__}:{value!r};".encode())
+
+
+def renderFigure(spec: FigureSpec) -> str:
+    """
+    Dessine une FigureSpec avec l'API objet de matplotlib (Figure + FigureCanvasAgg), sans passer par
+    l'état global de pyplot : plusieurs figures peuvent être rendues en même temps.
+
+    :param spec: Figure à dessiner.
+    :return: Chemin de l'image écrite.
+    """
+    with matplotlib.style.context(spec.style or {}):
+        figure = Figure(figsize=spec.figsize, constrained_layout=spec.constrained_layout)
+        FigureCanvasAgg(figure)
+        ax = figure.add_subplot(111)
+        for method, args, kwargs in spec.layers:
+            target = ax
+            for name in method.split('.'):
+                target = getattr(target, name)
+            target(*args, **kwargs)
+        if spec.colorbar and ax.images:
+            figure.colorbar(ax.images[0], ax=ax)
+        figure.savefig(spec.path, dpi=spec.dpi, bbox_inches=spec.bbox_inches)
+    return spec.path
+
+
+class FigureCache:
+    """
+    Cache des images indexé par l'empreinte des FigureSpec (FigureSpec.fingerprint) : une figure dont les
+    données et les paramètres n'ont pas changé est recopiée depuis le cache au lieu d'être redessinée.
+    """
+
+    def __init__(self, cache_dir: str):
+        """
+        :param cache_dir: Dossier du cache, créé au premier enregistrement.
+        """
+        self.cache_dir = cache_dir
+
+    def _cachedPath(self, spec: FigureSpec) -> str:
+        extension = os.path.splitext(spec.path)[1].lower() or '.png'
+        return os.path.join(self.cache_dir, spec.fingerprint() + extension)
+
+    def fetch(self, spec: FigureSpec) -> bool:
+        """
+        Écrit l'image de la figure depuis le cache.
+
+        :param spec: Figure demandée.
+        :return: True si l'image était en cache et a été copiée au chemin de la figure.
+        """
+        cached_path = self._cachedPath(spec)
+        if not os.path.isfile(cached_path):
+            return False
+        try:
+            shutil.copyfile(cached_path, spec.path)
+            return True
+        except OSError as e:
+            logger.warning(f"Impossible de recopier {cached_path} depuis le cache des figures: {e}")
+            return False
+
+    def store(self, spec: FigureSpec):
+        """
+        Met en cache l'image dessinée pour cette figure. Un échec est journalisé sans être levé.
+
+        :param spec: Figure déjà dessinée à son chemin.
+        """
+        cached_path = self._cachedPath(spec)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            shutil.copyfile(spec.path, cached_path + '.tmp')
+            os.replace(cached_path + '.tmp', cached_path)
+        except OSError as e:
+            logger.warning(f"Impossible de mettre {spec.path} dans le cache des figures: {e}")
+
+
+def _renderFigureSafely(spec: FigureSpec) -> Tuple[str, Optional[str]]:
+    # Rendu dans un processus du pool : l'erreur est retournée pour être journalisée par le processus appelant
+    try:
+        return renderFigure(spec), None
+    except Exception as e:
+        return spec.path, str(e)
+
+
+def renderFigures(specs: Iterable[FigureSpec], workers: int = 1, figure_cache: Optional[FigureCache] = None) -> List[str]:
+    """
+    Dessine plusieurs FigureSpec, réparties entre les processus d'un pool si workers > 1.
+    Une figure en erreur est journalisée sans interrompre les autres.
+
+    :param specs: Figures à dessiner.
+    :param workers: Nombre de processus (1 pour dessiner dans le processus courant).
+    :param figure_cache: Cache des images : les figures en cache sont recopiées sans être dessinées,
+                         les autres y sont ajoutées une fois dessinées.
+    :return: Chemins des images écrites, dans l'ordre des figures.
+    """
+    specs = list(specs)
+    written = {}
+    if figure_cache is not None:
+        for index, spec in enumerate(specs):
+            if figure_cache.fetch(spec):
+                written[index] = spec.path
+        if written:
+            logger.info(f"{len(written)}/{len(specs)} figures reprises du cache {figure_cache.cache_dir}")
+
+    to_render = [index for index in range(len(specs)) if index not in written]
+    if workers > 1 and len(to_render) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(to_render))) as executor:
+            resultats = list(executor.map(_renderFigureSafely, [specs[index] for index in to_render]))
+    else:
+        resultats = [_renderFigureSafely(specs[index]) for index in to_render]
+
+    for index, (path, error) in zip(to_render, resultats):
+        if error is None:
+            written[index] = path
+            if figure_cache is not None:
+                figure_cache.store(specs[index])
+        else:
+            logger.error(f"Erreur lors du rendu de la figure {path}: {error}")
+    return [written[index] for index in sorted(written)]
+
+
+class FigureQueue:
+    """
+    File des figures décrites par les routines de validation mais pas encore dessinées. Les figures sont
+    rendues à la demande (render, renderAll), typiquement quand l'interface affiche les images ou qu'un
+    rapport les inclut ; une figure que personne ne regarde n'est jamais dessinée. Utilisable depuis
+    plusieurs threads.
+    """
+
+    def __init__(self):
+        self._specs: Dict[str, FigureSpec] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normpath(path)
+
+    def add(self, specs: Iterable[FigureSpec]):
+        """
+        Ajoute des figures à la file ; une figure de même chemin qu'une figure en attente la remplace.
+
+        :param specs: Figures à ajouter.
+        """
+        with self._lock:
+            for spec in specs:
+                self._specs[self._key(spec.path)] = spec
+
+    def _matching(self, folder: Optional[str]) -> List[str]:
+        if folder is None:
+            return list(self._specs)
+        prefix = os.path.join(self._key(folder), '')
+        return [key for key in self._specs if key.startswith(prefix)]
+
+    def pending(self, folder: Optional[str] = None) -> List[FigureSpec]:
+        """
+        :param folder: Dossier dont on veut les figures (sous-dossiers compris), None pour toutes les figures.
+        :return: Les figures en attente de rendu.
+        """
+        with self._lock:
+            return [self._specs[key] for key in self._matching(folder)]
+
+    def render(self, path: str, figure_cache: Optional[FigureCache] = None) -> bool:
+        """
+        Dessine la figure en attente pour ce chemin.
+
+        :param path: Chemin de l'image.
+        :param figure_cache: Cache des images, ou None.
+        :return: True si une figure était en attente et a été dessinée (ou reprise du cache).
+        """
+        with self._lock:
+            spec = self._specs.pop(self._key(path), None)
+        if spec is None:
+            return False
+        return bool(renderFigures([spec], figure_cache=figure_cache))
+
+    def renderAll(self, folder: Optional[str] = None, workers: int = 1,
+                  figure_cache: Optional[FigureCache] = None) -> List[str]:
+        """
+        Dessine et retire de la file les figures en attente.
+
+        :param folder: Dossier dont on veut les figures (sous-dossiers compris), None pour toutes les figures.
+        :param workers: Nombre de processus pour le rendu.
+        :param figure_cache: Cache des images, ou None.
+        :return: Chemins des images écrites.
+        """
+        with self._lock:
+            specs = [self._specs.pop(key) for key in self._matching(folder)]
+        return renderFigures(specs, workers, figure_cache)
+
+
+def publishFigures(specs: Iterable[FigureSpec], figure_queue: Optional[FigureQueue] = None, workers: int = 1,
+                   figure_cache: Optional[FigureCache] = None) -> List[str]:
+    """
+    Met des figures dans la file de rendu si elle est fournie, sinon les dessine immédiatement.
+
+    :param specs: Figures décrites par une routine.
+    :param figure_queue: File de rendu à la demande, ou None.
+    :param workers: Nombre de processus pour un rendu immédiat.
+    :param figure_cache: Cache des images pour un rendu immédiat, ou None.
+    :return: Chemins des images écrites (vide si les figures sont mises en file).
+    """
+    if figure_queue is not None:
+        figure_queue.add(specs)
+        return []
+    return renderFigures(specs, workers, figure_cache)
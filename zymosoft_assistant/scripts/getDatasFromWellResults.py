@@ -1,7 +1,16 @@
+import logging
 import os
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
 from math import sqrt
+from pandas.io.parsers import TextParser
+
+logger = logging.getLogger(__name__)
+
+# Valeurs des cellules en erreur dans un classeur Excel, lues comme NaN par pd.read_excel
+_EXCEL_ERROR_CODES = ('#NULL!', '#DIV/0!', '#VALUE!', '#REF!', '#NAME?', '#NUM!', '#N/A')
 
 
 def getWellResultFile(folder_path):
@@ -24,217 +33,426 @@ def getWellResultFile(folder_path):
     raise FileNotFoundError(f"Aucun fichier Excel WellResults trouvé dans {folder_path}")
 
 
-def getNumberOfAreasInWellResultFile(file_path):
+def _convertCell(value):
     """
-    Cette fonction récupère le nombre d'areas dans un fichier de résultats de puits.
-    Elle compte simplement le nombre de feuilles dans le xlsx
-    :param file_path: Chemin vers le fichier de résultats de puits.
+    Convertit la valeur d'une cellule openpyxl comme le lecteur openpyxl de pd.read_excel : cellule vide -> "",
+    erreur Excel -> NaN, nombre entier (1.0) -> int, les autres valeurs (booléens, textes, dates) inchangées.
     """
-    try:
-        with pd.ExcelFile(file_path) as xls:  # Utilisation du gestionnaire de contexte
-            return len(xls.sheet_names)
-    except Exception as e:
-        raise ValueError(f"Erreur lors de la lecture du fichier de résultats de puits: {e}")
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        try:
+            integer = int(value)
+        except (OverflowError, ValueError):
+            return float(value)
+        return integer if integer == value else float(value)
+    if isinstance(value, str) and value in _EXCEL_ERROR_CODES:
+        return np.nan
+    return value
 
 
-def getDataForAreaInWellResultFile(file_path, area_index):
+def _sheetRows(worksheet):
     """
-    Cette fonction récupère les données pour une area spécifique du tableau WellCalibrationResult.
+    Lit les valeurs d'une feuille openpyxl en lecture seule (valeurs seulement, sans objets cellule), sans les
+    lignes vides finales ni les cellules vides en fin de ligne ; les lignes sont complétées à la même largeur.
+    """
+    worksheet.reset_dimensions()  # Les dimensions enregistrées dans le fichier ne sont pas fiables
+    rows = []
+    last_row_with_data = -1
+    for row in worksheet.iter_rows(values_only=True):
+        converted_row = [_convertCell(value) for value in row]
+        while converted_row and converted_row[-1] == "":
+            converted_row.pop()
+        if converted_row:
+            last_row_with_data = len(rows)
+        rows.append(converted_row)
+    rows = rows[:last_row_with_data + 1]
+    if rows:
+        width = max(len(row) for row in rows)
+        rows = [row + [""] * (width - len(row)) for row in rows]
+    return rows
+
+
+def _sheetFrame(rows):
+    """
+    Construit le DataFrame d'une feuille à partir de ses lignes avec l'analyseur de pd.read_excel (TextParser,
+    première ligne en en-tête) : cellules vides à NaN et types des colonnes déduits comme par pd.read_excel,
+    y compris la conversion des colonnes mêlant booléens et nombres.
+    """
+    if not rows:
+        return pd.DataFrame()
+    return TextParser(rows, header=0, skip_blank_lines=False).read()
+
+
+def readWellResultsSheets(file_path, sheet_names=None):
+    """
+    Lit toutes les feuilles d'un fichier de résultats de puits.
+    Le classeur est parcouru une fois en mode lecture seule d'openpyxl (valeurs seulement, sans objets cellule)
+    et chaque feuille est analysée comme par pd.read_excel, pour des DataFrame identiques ; pd.read_excel
+    n'est utilisé que si openpyxl ne peut pas lire le fichier.
 
     :param file_path: Chemin vers le fichier de résultats de puits.
-    :param area_index: Index de l'area (basé sur 0).
-    :return: Dictionnaire avec les listes 'activity' et 'values'.
+    :param sheet_names: Noms des feuilles à lire ; toutes les feuilles si None.
+    :return: Dictionnaire {nom de feuille: DataFrame}, dans l'ordre des feuilles, comme pd.read_excel(sheet_name=None).
     """
     try:
-        with pd.ExcelFile(file_path) as xls:  # Utilisation du gestionnaire de contexte
-            sheet_names = xls.sheet_names
-
-            if area_index >= len(sheet_names):
-                raise IndexError(f"L'index d'area {area_index} est hors limites. Areas disponibles: {len(sheet_names)}")
-
-            # Lire la feuille spécifique
-            sheet_name = sheet_names[area_index]
-            df = pd.read_excel(xls, sheet_name=sheet_name)
-
-            # Trouver la section WellCalibrationResult
-            calibration_start_row = None
-            for idx, row in df.iterrows():
-                if any(str(cell).startswith('WellCalibrationResult') for cell in row if pd.notna(cell)):
-                    calibration_start_row = idx
-                    break
-
-            if calibration_start_row is None:
-                raise ValueError(f"Section WellCalibrationResult non trouvée dans {sheet_name}")
-
-            # Chercher la ligne avec les en-têtes de colonnes (Activity, etc.)
-            header_row = None
-            for idx in range(calibration_start_row + 1, len(df)):
-                row = df.iloc[idx]
-                if 'Activity' in str(row.iloc[0]) or any('Activity' in str(cell) for cell in row if pd.notna(cell)):
-                    header_row = idx
-                    break
-
-            if header_row is None:
-                raise ValueError(f"En-tête de colonne Activity non trouvé dans {sheet_name}")
-
-            # Extraire les données à partir de la ligne après les en-têtes
-            data_start_row = header_row + 1
-
-            # Extraire l'activité et les valeurs (4ème colonne = écart type)
-            activities = []
-            values = []
-
-            for idx in range(data_start_row, len(df)):
-                row = df.iloc[idx]
-
-                # Arrêter si on rencontre une ligne vide ou une autre section
-                if pd.isna(row.iloc[0]) or str(row.iloc[0]).strip() == '':
-                    break
-
-                # Vérifier si cela ressemble à une ligne de données (première colonne doit être une activité numérique)
-                try:
-                    activity = float(str(row.iloc[0]).replace(',', '.'))  # Gérer le séparateur décimal virgule
-                    if len(row) >= 4 and pd.notna(row.iloc[3]):  # 4ème colonne (index 3)
-                        value = float(str(row.iloc[3]).replace(',', '.'))  # Gérer le séparateur décimal virgule
-                        activities.append(activity)
-                        values.append(value)
-                except (ValueError, IndexError):
-                    # Ignorer les lignes qui ne contiennent pas de données numériques
-                    continue
+        import openpyxl
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+    except Exception as e:
+        logger.debug("Lecture de %s par pandas (%s)", file_path, e)
+        return pd.read_excel(file_path, sheet_name=None if sheet_names is None else list(sheet_names))
+    try:
+        if sheet_names is None:
+            worksheets = workbook.worksheets
+        else:
+            worksheets = [workbook[sheet_name] for sheet_name in sheet_names]
+        return {worksheet.title: _sheetFrame(_sheetRows(worksheet)) for worksheet in worksheets}
+    finally:
+        workbook.close()
 
-            return {
-                'activity': activities,
-                'values': values
-            }
 
-    except Exception as e:
-        raise ValueError(f"Erreur lors de la lecture de l'area {area_index} depuis {file_path}: {e}")
+# Sections des feuilles WellResults : nom -> (marqueur de début de section, mot-clé de la ligne d'en-tête)
+WELL_RESULTS_SECTIONS = {
+    'Calibration': ('WellCalibrationResult', 'Activity'),
+    'Blank': ('WellBlankResult', 'Well'),
+    'Samples': ('WellSampleResult', 'Sample'),
+    'SampleDetail': ('WellSampleDetailResult', 'Well'),
+}
 
 
-def getBlankDataForAreaInWellResultFile(file_path, area_index):
+def _sheetText(df):
     """
-    Cette fonction récupère les données des blancs pour une area spécifique du tableau WellBlankResult.
+    Retourne le texte des cellules d'une feuille sous forme de tableau de chaînes NumPy
+    (chaîne vide pour les cellules vides), pour les recherches vectorisées.
+    """
+    cells = df.to_numpy(dtype=object)
+    if not cells.size:
+        return np.empty(cells.shape, dtype=str)
+    return np.where(pd.isna(cells), '', cells.astype(str))
 
-    :param file_path: Chemin vers le fichier de résultats de puits.
-    :param area_index: Index de l'area (basé sur 0).
-    :return: Liste des valeurs de dégradation des blancs non exclus.
+
+def indexSections(df, sheet_name, sections=WELL_RESULTS_SECTIONS):
     """
-    try:
-        with pd.ExcelFile(file_path) as xls:  # Utilisation du gestionnaire de contexte
-            sheet_names = xls.sheet_names
+    Extrait toutes les sections d'une feuille WellResults en un seul parcours vectorisé du texte de la feuille.
+    Une section commence à la première cellule commençant par son marqueur ; ses lignes de données suivent
+    la première ligne d'en-tête contenant le mot-clé et s'arrêtent à la première ligne dont la première cellule est vide.
+
+    :param df: DataFrame de la feuille.
+    :param sheet_name: Nom de la feuille (pour les messages d'erreur).
+    :param sections: Dictionnaire nom -> (marqueur de début de section, mot-clé de la ligne d'en-tête).
+    :return: Tuple (dictionnaire nom -> DataFrame des lignes de données, avec les cellules de la ligne d'en-tête
+             comme noms de colonnes ; dictionnaire nom -> message d'erreur pour les sections introuvables).
+    """
+    text = _sheetText(df)
+    found = {}
+    errors = {}
+    first_cell_empty = None
+    for name, (marker, header_keyword) in sections.items():
+        # Trouver la ligne de titre de la section
+        marker_rows = np.flatnonzero(np.char.startswith(text, marker).any(axis=1))
+        if not len(marker_rows):
+            errors[name] = f"Section {marker} non trouvée dans {sheet_name}"
+            continue
+        start_row = marker_rows[0]
+
+        # Chercher la ligne avec les en-têtes de colonnes
+        header_rows = np.flatnonzero((np.char.find(text[start_row + 1:], header_keyword) >= 0).any(axis=1))
+        if not len(header_rows):
+            errors[name] = f"En-tête de colonne {header_keyword} non trouvé dans {sheet_name}"
+            continue
+        header_row = start_row + 1 + header_rows[0]
+
+        # La section s'arrête à la première ligne vide ou à une autre section
+        if first_cell_empty is None:
+            first_cell_empty = np.char.strip(text[:, 0]) == ''
+        end_rows = np.flatnonzero(first_cell_empty[header_row + 1:])
+        data_end_row = header_row + 1 + end_rows[0] if len(end_rows) else len(df)
+
+        section = df.iloc[header_row + 1:data_end_row].reset_index(drop=True)
+        section.columns = text[header_row].tolist()
+        found[name] = section
+    return found, errors
+
+
+def _toNumbers(column):
+    """
+    Convertit une colonne en nombres en une seule passe, en gérant le séparateur décimal virgule.
+    Les cellules non numériques donnent NaN.
+    """
+    return pd.to_numeric(column.astype(str).str.replace(',', '.', regex=False), errors='coerce')
+
+
+class WellResultsWorkbook:
+    """
+    Contenu d'un fichier WellResults.xlsx, lu une seule fois : une feuille par area.
+    Les sections (Calibration, Blank, Samples, SampleDetail) d'une area sont toutes extraites à la première demande
+    et conservées, si bien que chaque area n'est analysée qu'une fois quel que soit le nombre de calculs.
+    """
+
+    def __init__(self, file_path):
+        """
+        :param file_path: Chemin vers le fichier de résultats de puits.
+        """
+        self.file_path = file_path
+        try:
+            # Une seule lecture du classeur pour toutes les feuilles
+            self.sheets = readWellResultsSheets(file_path)
+            self.sheet_names = list(self.sheets)
+        except Exception as e:
+            raise ValueError(f"Erreur lors de la lecture du fichier de résultats de puits: {e}")
+        self._sections = {}
+
+    @classmethod
+    def fromFolder(cls, folder_path):
+        """
+        Lit le fichier WellResults d'un dossier d'acquisition.
+
+        :param folder_path: Chemin vers le dossier contenant le fichier de résultats de puits.
+        :return: WellResultsWorkbook du fichier trouvé.
+        """
+        return cls(getWellResultFile(folder_path))
+
+    @property
+    def number_of_areas(self):
+        return len(self.sheet_names)
+
+    def sheet(self, area_index):
+        """
+        Retourne le nom et le contenu de la feuille d'une area.
+
+        :param area_index: Index de l'area (basé sur 0).
+        :return: Tuple (nom de la feuille, DataFrame).
+        """
+        if area_index >= len(self.sheet_names):
+            raise IndexError(f"L'index d'area {area_index} est hors limites. Areas disponibles: {len(self.sheet_names)}")
+        sheet_name = self.sheet_names[area_index]
+        return sheet_name, self.sheets[sheet_name]
+
+    def _indexedSections(self, area_index):
+        if area_index not in self._sections:
+            sheet_name, df = self.sheet(area_index)
+            self._sections[area_index] = indexSections(df, sheet_name)
+        return self._sections[area_index]
+
+    def indexAreas(self, workers=1):
+        """
+        Extrait les sections de toutes les areas qui ne l'ont pas encore été.
+        Les areas sont indépendantes une fois le classeur lu : avec workers > 1, les feuilles sont
+        réparties entre les processus d'un pool et les résultats sont rangés par area.
+
+        :param workers: Nombre de processus (1 pour analyser sans pool).
+        """
+        pending = [area_index for area_index in range(self.number_of_areas) if area_index not in self._sections]
+        if workers > 1 and len(pending) > 1:
+            sheet_names = [self.sheet_names[area_index] for area_index in pending]
+            with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as executor:
+                indexed = executor.map(indexSections, [self.sheets[name] for name in sheet_names], sheet_names)
+                for area_index, sections in zip(pending, indexed):
+                    self._sections[area_index] = sections
+        else:
+            for area_index in pending:
+                self._indexedSections(area_index)
+
+    def sections(self, area_index):
+        """
+        Retourne toutes les sections trouvées dans la feuille d'une area.
+
+        :param area_index: Index de l'area (basé sur 0).
+        :return: Dictionnaire nom de section -> DataFrame des lignes de données.
+        """
+        return self._indexedSections(area_index)[0]
+
+    def section(self, area_index, section_name):
+        """
+        Retourne les lignes de données d'une section d'une area (voir WELL_RESULTS_SECTIONS).
+
+        :param area_index: Index de l'area (basé sur 0).
+        :param section_name: Nom de la section : 'Calibration', 'Blank', 'Samples' ou 'SampleDetail'.
+        :return: DataFrame des lignes de données de la section.
+        """
+        found, errors = self._indexedSections(area_index)
+        if section_name in errors:
+            raise ValueError(errors[section_name])
+        return found[section_name]
+
+    def calibrationData(self, area_index):
+        """
+        Récupère les données du tableau WellCalibrationResult d'une area.
+
+        :param area_index: Index de l'area (basé sur 0).
+        :return: Dictionnaire avec les listes 'activity' et 'values' (4ème colonne = écart type).
+        """
+        try:
+            return self._parseCalibration(area_index)
+        except Exception as e:
+            raise ValueError(f"Erreur lors de la lecture de l'area {area_index} depuis {self.file_path}: {e}")
 
-            if area_index >= len(sheet_names):
-                raise IndexError(f"L'index d'area {area_index} est hors limites. Areas disponibles: {len(sheet_names)}")
+    def _parseCalibration(self, area_index):
+        section = self.section(area_index, 'Calibration')
+        if section.shape[1] < 4:
+            return {'activity': [], 'values': []}
 
-            # Lire la feuille spécifique
-            sheet_name = sheet_names[area_index]
-            df = pd.read_excel(xls, sheet_name=sheet_name)
+        # Lignes de données : activité numérique (1ère colonne) et écart type numérique (4ème colonne)
+        activities = _toNumbers(section.iloc[:, 0])
+        values = _toNumbers(section.iloc[:, 3])
+        valid = activities.notna() & values.notna()
 
-            # Trouver la section WellBlankResult
-            blank_start_row = None
-            for idx, row in df.iterrows():
-                if any(str(cell).startswith('WellBlankResult') for cell in row if pd.notna(cell)):
-                    blank_start_row = idx
-                    break
+        return {
+            'activity': activities[valid].tolist(),
+            'values': values[valid].tolist()
+        }
 
-            if blank_start_row is None:
-                raise ValueError(f"Section WellBlankResult non trouvée dans {sheet_name}")
+    def activityRange(self, area_index):
+        """
+        Récupère la plage d'activité d'une area.
 
-            # Chercher la ligne avec les en-têtes de colonnes
-            header_row = None
-            for idx in range(blank_start_row + 1, len(df)):
-                row = df.iloc[idx]
-                if 'Well' in str(row.iloc[0]) or any('Well' in str(cell) for cell in row if pd.notna(cell)):
-                    header_row = idx
-                    break
+        :param area_index: Index de l'area (basé sur 0).
+        :return: Liste des valeurs d'activité.
+        """
+        return self.calibrationData(area_index)['activity']
 
-            if header_row is None:
-                raise ValueError(f"En-tête de colonne Well non trouvé dans {sheet_name}")
+    def blankValues(self, area_index):
+        """
+        Récupère les valeurs de dégradation des blancs non exclus du tableau WellBlankResult d'une area.
 
-            # Extraire les données à partir de la ligne après les en-têtes
-            data_start_row = header_row + 1
+        :param area_index: Index de l'area (basé sur 0).
+        :return: Liste des valeurs de dégradation des blancs non exclus.
+        """
+        try:
+            return self._parseBlanks(area_index)
+        except Exception as e:
+            raise ValueError(f"Erreur lors de la lecture des blancs pour l'area {area_index} depuis {self.file_path}: {e}")
+
+    def _parseBlanks(self, area_index):
+        section = self.section(area_index, 'Blank')
+        # Colonnes attendues : Well, Trouble, Zymunit, Exclusion, Exclusion comment
+        if section.shape[1] < 4:
+            return []
+
+        # Blancs non exclus avec une valeur Zymunit numérique
+        zymunit_values = _toNumbers(section.iloc[:, 2])
+        not_excluded = section.iloc[:, 3].astype(str).str.lower() == 'false'
+        return zymunit_values[not_excluded & zymunit_values.notna()].tolist()
+
+    def lodLoq(self, area_index):
+        """
+        Calcule la LOD et LOQ d'une area à partir des blancs.
+
+        :param area_index: Index de l'area (basé sur 0).
+        :return: Dictionnaire avec les valeurs LOD et LOQ.
+        """
+        try:
+            # Récupérer les données des blancs
+            blank_values = self.blankValues(area_index)
 
-            blank_values = []
+            if not blank_values:
+                raise ValueError(f"Aucune donnée de blanc valide trouvée pour l'area {area_index + 1}")
 
-            for idx in range(data_start_row, len(df)):
-                row = df.iloc[idx]
+            if len(blank_values) < 2:
+                raise ValueError(f"Nombre insuffisant de blancs pour l'area {area_index + 1} (minimum 2 requis)")
 
-                # Arrêter si on rencontre une ligne vide ou une autre section
-                if pd.isna(row.iloc[0]) or str(row.iloc[0]).strip() == '':
-                    break
+            # Calculer la moyenne des blancs
+            mean_blank = np.mean(blank_values)
 
-                # Vérifier si la ligne contient des données de blancs
-                try:
-                    # Colonnes attendues : Well, Trouble, Zymunit, Exclusion, Exclusion comment
-                    well = str(row.iloc[0]).strip()
-                    if len(row) >= 4:
-                        zymunit_value = row.iloc[2]  # Colonne Zymunit (index 2)
-                        exclusion = row.iloc[3]  # Colonne Exclusion (index 3)
+            # Calculer l'écart-type des blancs
+            std_blank = np.std(blank_values, ddof=0)  # ddof=0 pour la population complète
 
-                        # Vérifier que l'exclusion est False et que la valeur Zymunit est valide
-                        if (str(exclusion).lower() == 'false' and
-                                pd.notna(zymunit_value) and
-                                str(zymunit_value).strip() != ''):
-                            zymunit_float = float(str(zymunit_value).replace(',', '.'))
-                            blank_values.append(zymunit_float)
+            # Calculer LOD et LOQ
+            lod = mean_blank + 3 * std_blank
+            loq = mean_blank + 10 * std_blank
 
-                except (ValueError, IndexError):
-                    # Ignorer les lignes qui ne contiennent pas de données numériques valides
-                    continue
+            return {
+                'lod': lod,
+                'loq': loq,
+                'mean_blank': mean_blank,
+                'std_blank': std_blank,
+                'n_blanks': len(blank_values)
+            }
 
-            return blank_values
+        except Exception as e:
+            raise ValueError(f"Erreur lors du calcul LOD/LOQ pour l'area {area_index + 1}: {e}")
 
+
+def _asWorkbook(file_path):
+    return file_path if isinstance(file_path, WellResultsWorkbook) else WellResultsWorkbook(file_path)
+
+
+def _workbookPath(file_path):
+    return file_path.file_path if isinstance(file_path, WellResultsWorkbook) else file_path
+
+
+def getNumberOfAreasInWellResultFile(file_path):
+    """
+    Cette fonction récupère le nombre d'areas dans un fichier de résultats de puits.
+    Elle compte simplement le nombre de feuilles dans le xlsx
+    :param file_path: Chemin vers le fichier de résultats de puits.
+    """
+    if isinstance(file_path, WellResultsWorkbook):
+        return file_path.number_of_areas
+    try:
+        with pd.ExcelFile(file_path) as xls:  # Utilisation du gestionnaire de contexte
+            return len(xls.sheet_names)
     except Exception as e:
-        raise ValueError(f"Erreur lors de la lecture des blancs pour l'area {area_index} depuis {file_path}: {e}")
+        raise ValueError(f"Erreur lors de la lecture du fichier de résultats de puits: {e}")
 
 
-def calculateLODLOQ(file_path, area_index):
+def getDataForAreaInWellResultFile(file_path, area_index):
     """
-    Calcule la LOD et LOQ pour une area spécifique.
+    Cette fonction récupère les données pour une area spécifique du tableau WellCalibrationResult.
+    Pour plusieurs areas d'un même fichier, lire le fichier une fois avec WellResultsWorkbook.
 
-    :param file_path: Chemin vers le fichier de résultats de puits.
+    :param file_path: Chemin vers le fichier de résultats de puits, ou WellResultsWorkbook déjà lu.
     :param area_index: Index de l'area (basé sur 0).
-    :return: Dictionnaire avec les valeurs LOD et LOQ.
+    :return: Dictionnaire avec les listes 'activity' et 'values'.
     """
     try:
-        # Récupérer les données des blancs
-        blank_values = getBlankDataForAreaInWellResultFile(file_path, area_index)
-
-        if not blank_values:
-            raise ValueError(f"Aucune donnée de blanc valide trouvée pour l'area {area_index + 1}")
+        return _asWorkbook(file_path)._parseCalibration(area_index)
+    except Exception as e:
+        raise ValueError(f"Erreur lors de la lecture de l'area {area_index} depuis {_workbookPath(file_path)}: {e}")
 
-        if len(blank_values) < 2:
-            raise ValueError(f"Nombre insuffisant de blancs pour l'area {area_index + 1} (minimum 2 requis)")
 
-        # Calculer la moyenne des blancs
-        mean_blank = np.mean(blank_values)
+def getBlankDataForAreaInWellResultFile(file_path, area_index):
+    """
+    Cette fonction récupère les données des blancs pour une area spécifique du tableau WellBlankResult.
 
-        # Calculer l'écart-type des blancs
-        std_blank = np.std(blank_values, ddof=0)  # ddof=0 pour la population complète
+    :param file_path: Chemin vers le fichier de résultats de puits, ou WellResultsWorkbook déjà lu.
+    :param area_index: Index de l'area (basé sur 0).
+    :return: Liste des valeurs de dégradation des blancs non exclus.
+    """
+    try:
+        return _asWorkbook(file_path)._parseBlanks(area_index)
+    except Exception as e:
+        raise ValueError(
+            f"Erreur lors de la lecture des blancs pour l'area {area_index} depuis {_workbookPath(file_path)}: {e}")
 
-        # Calculer LOD et LOQ
-        lod = mean_blank + 3 * std_blank
-        loq = mean_blank + 10 * std_blank
 
-        return {
-            'lod': lod,
-            'loq': loq,
-            'mean_blank': mean_blank,
-            'std_blank': std_blank,
-            'n_blanks': len(blank_values)
-        }
+def calculateLODLOQ(file_path, area_index):
+    """
+    Calcule la LOD et LOQ pour une area spécifique.
 
-    except Exception as e:
-        raise ValueError(f"Erreur lors du calcul LOD/LOQ pour l'area {area_index + 1}: {e}")
+    :param file_path: Chemin vers le fichier de résultats de puits, ou WellResultsWorkbook déjà lu.
+    :param area_index: Index de l'area (basé sur 0).
+    :return: Dictionnaire avec les valeurs LOD et LOQ.
+    """
+    if not isinstance(file_path, WellResultsWorkbook):
+        try:
+            file_path = WellResultsWorkbook(file_path)
+        except Exception as e:
+            raise ValueError(f"Erreur lors du calcul LOD/LOQ pour l'area {area_index + 1}: {e}")
+    return file_path.lodLoq(area_index)
 
 
-def calculateLODLOQComparison(acquisition_folder, reference_folder):
+def loadWellResultsWorkbooks(acquisition_folder, reference_folder, reference_store=None):
     """
-    Calcule et compare la LOD et LOQ entre les fichiers d'acquisition et de référence.
+    Lit une fois les fichiers de résultats de puits d'acquisition et de référence,
+    pour les passer à compareWellResults et compareLODLOQ.
 
     :param acquisition_folder: Chemin vers le dossier contenant le fichier de résultats de puits d'acquisition.
     :param reference_folder: Chemin vers le dossier contenant le fichier de résultats de puits de référence.
-    :return: DataFrame avec les résultats de comparaison LOD/LOQ.
+    :param reference_store: ReferenceStore dans lequel relire la référence déjà analysée (None pour relire le fichier).
+    :return: Tuple (WellResultsWorkbook d'acquisition, WellResultsWorkbook de référence).
     """
     # Obtenir les chemins des fichiers
     acquisition_file_path = getWellResultFile(acquisition_folder)
@@ -243,72 +461,98 @@ def calculateLODLOQComparison(acquisition_folder, reference_folder):
     if not acquisition_file_path or not reference_file_path:
         raise FileNotFoundError("Fichiers de résultats de puits non trouvés dans les dossiers spécifiés.")
 
-    # Obtenir le nombre d'areas
-    acquisition_number_of_areas = getNumberOfAreasInWellResultFile(acquisition_file_path)
-    reference_number_of_areas = getNumberOfAreasInWellResultFile(reference_file_path)
+    if reference_store is not None:
+        return WellResultsWorkbook(acquisition_file_path), reference_store.wellResults(reference_file_path)
+    return WellResultsWorkbook(acquisition_file_path), WellResultsWorkbook(reference_file_path)
 
-    if acquisition_number_of_areas != reference_number_of_areas:
+
+def _checkNumberOfAreas(acquisition_workbook, reference_workbook):
+    if acquisition_workbook.number_of_areas != reference_workbook.number_of_areas:
         raise ValueError(
             "Le nombre d'areas dans les fichiers de résultats d'acquisition et de référence ne correspondent pas.")
 
-    # Préparer les résultats
-    comparison_results = []
 
-    # Traiter chaque area
-    for area_index in range(acquisition_number_of_areas):
-        try:
-            # Calculer LOD/LOQ pour l'acquisition
-            acq_results = calculateLODLOQ(acquisition_file_path, area_index)
-
-            # Calculer LOD/LOQ pour la référence
-            ref_results = calculateLODLOQ(reference_file_path, area_index)
-
-            # Calculer les différences
-            diff_lod = acq_results['lod'] - ref_results['lod']
-            diff_loq = acq_results['loq'] - ref_results['loq']
-
-            # Vérifier la validité des résultats avec la tolérance acceptable
-            lod_tolerance = calculate_lod_loq_tolerance(ref_results['lod'])
-            loq_tolerance = calculate_lod_loq_tolerance(ref_results['loq'])
-
-            # Vérifier si les différences sont dans la tolérance
-            is_lod_valid = True if diff_lod < 0 else diff_lod <= lod_tolerance
-            is_loq_valid = True if diff_loq < 0 else diff_loq <= loq_tolerance
-
-            print("is_lod_valid:", is_lod_valid, "is_loq_valid:", is_loq_valid)
-
-            comparison_results.append({
-                'Area': area_index + 1,
-                'LOD_Ref': round(ref_results['lod'], 4),
-                'LOD_Acq': round(acq_results['lod'], 4),
-                'LOQ_Ref': round(ref_results['loq'], 4),
-                'LOQ_Acq': round(acq_results['loq'], 4),
-                'Diff_LOD': round(diff_lod, 4),
-                'Diff_LOQ': round(diff_loq, 4),
-                'Lod_Valid': is_lod_valid,
-                'Loq_Valid': is_loq_valid,
-                'N_Blanks_Ref': ref_results['n_blanks'],
-                'N_Blanks_Acq': acq_results['n_blanks']
-            })
+# Colonnes du tableau de comparaison LOD/LOQ
+LOD_LOQ_COLUMNS = [
+    'Area', 'LOD_Ref', 'LOD_Acq', 'LOQ_Ref', 'LOQ_Acq', 'Diff_LOD', 'Diff_LOQ', 'Lod_Valid', 'Loq_Valid',
+    'N_Blanks_Ref', 'N_Blanks_Acq'
+]
+
+
+def calculateLODLOQComparison(acquisition_folder, reference_folder, workers=1, reference_store=None):
+    """
+    Calcule et compare la LOD et LOQ entre les fichiers d'acquisition et de référence.
+
+    :param acquisition_folder: Chemin vers le dossier contenant le fichier de résultats de puits d'acquisition.
+    :param reference_folder: Chemin vers le dossier contenant le fichier de résultats de puits de référence.
+    :param workers: Nombre de processus utilisés pour analyser les areas (1 pour analyser sans pool).
+    :param reference_store: ReferenceStore dans lequel relire la référence déjà analysée (None pour relire le fichier).
+    :return: DataFrame avec les résultats de comparaison LOD/LOQ.
+    """
+    workbooks = loadWellResultsWorkbooks(acquisition_folder, reference_folder, reference_store)
+    return compareLODLOQ(*workbooks, workers=workers)
 
+
+def compareLODLOQ(acquisition_workbook, reference_workbook, workers=1):
+    """
+    Calcule et compare la LOD et LOQ de chaque area entre deux fichiers de résultats de puits déjà lus.
+
+    :param acquisition_workbook: WellResultsWorkbook de l'acquisition.
+    :param reference_workbook: WellResultsWorkbook de la référence.
+    :param workers: Nombre de processus utilisés pour analyser les areas (1 pour analyser sans pool).
+    :return: DataFrame avec les résultats de comparaison LOD/LOQ.
+    """
+    _checkNumberOfAreas(acquisition_workbook, reference_workbook)
+    for workbook in (acquisition_workbook, reference_workbook):
+        workbook.indexAreas(workers)
+
+    # Calculer LOD/LOQ de chaque area pour l'acquisition et la référence
+    area_numbers = []
+    acquisition_results = []
+    reference_results = []
+    error_rows = []
+    for area_index in range(acquisition_workbook.number_of_areas):
+        try:
+            acq_results = acquisition_workbook.lodLoq(area_index)
+            ref_results = reference_workbook.lodLoq(area_index)
         except Exception as e:
-            print(f"Erreur lors du traitement de l'area {area_index + 1}: {e}")
-            comparison_results.append({
-                'Area': area_index + 1,
-                'LOD_Ref': 'ERROR',
-                'LOD_Acq': 'ERROR',
-                'LOQ_Ref': 'ERROR',
-                'LOQ_Acq': 'ERROR',
-                'Diff_LOD': 'ERROR',
-                'Diff_LOQ': 'ERROR',
-                'Lod_Valid': 'ERROR',
-                'Loq_Valid': 'ERROR',
-                'N_Blanks_Ref': 'ERROR',
-                'N_Blanks_Acq': 'ERROR'
-            })
-
-    # Convertir en DataFrame
-    comparison_df = pd.DataFrame(comparison_results)
+            logger.error("Erreur lors du traitement de l'area %d: %s", area_index + 1, e)
+            error_rows.append(dict.fromkeys(LOD_LOQ_COLUMNS, 'ERROR'))
+            error_rows[-1]['Area'] = area_index + 1
+            continue
+        area_numbers.append(area_index + 1)
+        acquisition_results.append(acq_results)
+        reference_results.append(ref_results)
+
+    if not area_numbers:
+        return pd.DataFrame(error_rows)
+
+    def column(results, key):
+        return np.array([result[key] for result in results], dtype=float)
+
+    # Comparer toutes les areas en une fois, avec la tolérance de la référence
+    columns = {'Area': np.array(area_numbers, dtype=np.int64)}
+    for name in ('lod', 'loq'):
+        acquisition_values = column(acquisition_results, name)
+        reference_values = column(reference_results, name)
+        differences = acquisition_values - reference_values
+        is_valid = withinTolerance(differences, calculate_lod_loq_tolerances(reference_values))
+        columns.update({
+            f'{name.upper()}_Ref': reference_values.round(4),
+            f'{name.upper()}_Acq': acquisition_values.round(4),
+            f'Diff_{name.upper()}': differences.round(4),
+            f'{name.capitalize()}_Valid': is_valid,
+        })
+    columns['N_Blanks_Ref'] = np.array([result['n_blanks'] for result in reference_results], dtype=np.int64)
+    columns['N_Blanks_Acq'] = np.array([result['n_blanks'] for result in acquisition_results], dtype=np.int64)
+    comparison_df = pd.DataFrame(columns, columns=LOD_LOQ_COLUMNS)
+    logger.debug("is_lod_valid: %s is_loq_valid: %s", comparison_df['Lod_Valid'].tolist(), comparison_df['Loq_Valid'].tolist())
+
+    if error_rows:
+        # Les areas en erreur gardent leur place, avec 'ERROR' dans toutes les colonnes
+        comparison_df = pd.concat([comparison_df.astype(object), pd.DataFrame(error_rows, columns=LOD_LOQ_COLUMNS)])
+        comparison_df = comparison_df.sort_values('Area', kind='stable').reset_index(drop=True)
+        comparison_df['Area'] = comparison_df['Area'].astype(np.int64)
 
     return comparison_df
 
@@ -317,7 +561,7 @@ def getActivityRangeFromAreaInWellResultFile(file_path, area_index):
     """
     Cette fonction récupère la plage d'activité pour une area spécifique dans un fichier de résultats de puits.
 
-    :param file_path: Chemin vers le fichier de résultats de puits.
+    :param file_path: Chemin vers le fichier de résultats de puits, ou WellResultsWorkbook déjà lu.
     :param area_index: Index de l'area (basé sur 0).
     :return: Liste des valeurs d'activité.
     """
@@ -345,6 +589,45 @@ def compareActivityRanges(acquisition_range, reference_range):
     return np.allclose(acq_array, ref_array, rtol=1e-6)
 
 
+def calculate_tolerances(reference_values):
+    """
+    Calcule la tolérance de chaque valeur de référence, en une seule opération sur le tableau.
+    La courbe est linéaire par morceaux :
+    - Pour les valeurs <= 0, la tolérance est 5.
+    - Pour les valeurs > 0 et <= 5, la tolérance est interpolée linéairement de 5 à 3 (y = 5 - 0.4*x).
+    - Pour les valeurs > 5 et <= 10, la tolérance est interpolée linéairement de 3 à 2 (y = 4 - 0.2*x).
+    - Pour les valeurs > 10 (ou non numériques), la tolérance est toujours 2.
+
+    :param reference_values: Valeurs de référence (liste ou tableau).
+    :return: Tableau NumPy des valeurs de tolérance.
+    """
+    x = np.asarray(reference_values, dtype=float)
+    return np.select([x <= 0, x <= 5, x <= 10], [5, 5 - 0.4 * x, 4 - 0.2 * x], default=2)
+
+
+def calculate_lod_loq_tolerances(reference_values):
+    """
+    Calcule la tolérance LOD/LOQ de chaque valeur de référence (même courbe que calculate_tolerances).
+
+    :param reference_values: Valeurs de référence (liste ou tableau).
+    :return: Tableau NumPy des valeurs de tolérance.
+    """
+    return calculate_tolerances(reference_values)
+
+
+def withinTolerance(differences, tolerances):
+    """
+    Indique pour chaque différence (acquisition - référence) si elle est acceptable :
+    une différence négative est toujours valide, sinon elle doit être inférieure ou égale à la tolérance.
+
+    :param differences: Différences acquisition - référence.
+    :param tolerances: Tolérances correspondantes.
+    :return: Tableau NumPy de booléens.
+    """
+    differences = np.asarray(differences, dtype=float)
+    return (differences < 0) | (differences <= tolerances)
+
+
 def calculate_tolerance(reference_value):
     """
     Calcule la tolérance basée sur la valeur de référence.
@@ -355,19 +638,7 @@ def calculate_tolerance(reference_value):
     :param reference_value: Valeur de référence pour calculer la tolérance.
     :return: Valeur de tolérance.
     """
-    if reference_value <= 0:
-        return 5
-    elif reference_value <= 5:
-        # Interpolation linéaire entre 0 et 5: la tolérance va de 5 à 3
-        # Équation: y = 5 - 0.4*x
-        return 5 - 0.4 * reference_value
-    elif reference_value <= 10:
-        # Interpolation linéaire entre 5 et 10: la tolérance va de 3 à 2
-        # Équation: y = 4 - 0.2*x
-        return 4 - 0.2 * reference_value
-    else:
-        # Pour les valeurs > 10, la tolérance est toujours 2
-        return 2
+    return float(calculate_tolerances(reference_value))
 
 
 def calculate_lod_loq_tolerance(reference_value):
@@ -380,86 +651,204 @@ def calculate_lod_loq_tolerance(reference_value):
     :param reference_value:
     :return: float: Valeur de tolérance calculée.
     """
-    if reference_value <= 0:
-        return 5
-    elif reference_value <= 5:
-        # Interpolation linéaire entre 0 et 5: la tolérance va de 5 à 3
-        # Équation: y = 5 - 0.4*x
-        return 5 - 0.4 * reference_value
-    elif reference_value <= 10:
-        # Interpolation linéaire entre 5 et 10: la tolérance va de 3 à 2
-        # Équation: y = 4 - 0.2*x
-        return 4 - 0.2 * reference_value
-    else:
-        # Pour les valeurs > 10, la tolérance est toujours 2
-        return 2
+    return float(calculate_lod_loq_tolerances(reference_value))
 
 
-def processWellResults(acquisition_folder, reference_folder):
+def processWellResults(acquisition_folder, reference_folder, workers=1, reference_store=None):
     """
     Traite les résultats de puits pour extraire les données pertinentes et créer un tableau de comparaison.
 
     :param acquisition_folder: Chemin vers le dossier contenant le fichier de résultats de puits d'acquisition.
     :param reference_folder: Chemin vers le dossier contenant le fichier de résultats de puits de référence.
+    :param workers: Nombre de processus utilisés pour analyser les areas (1 pour analyser sans pool).
+    :param reference_store: ReferenceStore dans lequel relire la référence déjà analysée (None pour relire le fichier).
     :return: DataFrame avec les résultats de comparaison.
     """
-    # Obtenir les chemins des fichiers
-    acquisition_file_path = getWellResultFile(acquisition_folder)
-    reference_file_path = getWellResultFile(reference_folder)
-
-    if not acquisition_file_path or not reference_file_path:
-        raise FileNotFoundError("Fichiers de résultats de puits non trouvés dans les dossiers spécifiés.")
+    workbooks = loadWellResultsWorkbooks(acquisition_folder, reference_folder, reference_store)
+    return compareWellResults(*workbooks, workers=workers)
 
-    # Obtenir le nombre d'areas
-    acquisition_number_of_areas = getNumberOfAreasInWellResultFile(acquisition_file_path)
-    reference_number_of_areas = getNumberOfAreasInWellResultFile(reference_file_path)
 
-    if acquisition_number_of_areas != reference_number_of_areas:
-        raise ValueError(
-            "Le nombre d'areas dans les fichiers de résultats d'acquisition et de référence ne correspondent pas.")
-
-    # Préparer les résultats finaux
-    final_results = []
+def compareWellResults(acquisition_workbook, reference_workbook, workers=1):
+    """
+    Compare area par area les résultats de calibration de deux fichiers de résultats de puits déjà lus.
 
-    # Traiter chaque area
-    for area_index in range(acquisition_number_of_areas):
-        # Obtenir les plages d'activité
-        acquisition_activities = getActivityRangeFromAreaInWellResultFile(acquisition_file_path, area_index)
-        reference_activities = getActivityRangeFromAreaInWellResultFile(reference_file_path, area_index)
+    :param acquisition_workbook: WellResultsWorkbook de l'acquisition.
+    :param reference_workbook: WellResultsWorkbook de la référence.
+    :param workers: Nombre de processus utilisés pour analyser les areas (1 pour analyser sans pool).
+    :return: DataFrame avec les résultats de comparaison.
+    """
+    _checkNumberOfAreas(acquisition_workbook, reference_workbook)
+    for workbook in (acquisition_workbook, reference_workbook):
+        workbook.indexAreas(workers)
+
+    # Rassembler les données de calibration de toutes les areas
+    activities = []
+    areas = []
+    acquisition_values = []
+    reference_values = []
+    for area_index in range(acquisition_workbook.number_of_areas):
+        # Obtenir les données pour les deux fichiers
+        acquisition_data = acquisition_workbook.calibrationData(area_index)
+        reference_data = reference_workbook.calibrationData(area_index)
 
         # Vérifier que les activités correspondent
-        if not compareActivityRanges(acquisition_activities, reference_activities):
+        if not compareActivityRanges(acquisition_data['activity'], reference_data['activity']):
             raise ValueError(f"Les plages d'activité ne correspondent pas pour l'area {area_index + 1}")
 
-        # Obtenir les données pour les deux fichiers
-        acquisition_data = getDataForAreaInWellResultFile(acquisition_file_path, area_index)
-        reference_data = getDataForAreaInWellResultFile(reference_file_path, area_index)
-
-        # Créer les lignes pour cette area
-        for i, activity in enumerate(acquisition_data['activity']):
-            acquisition_value = acquisition_data['values'][i]
-            reference_value = reference_data['values'][i]
-            diff = acquisition_value - reference_value  # Utiliser la différence absolue pour la validation
-
-            # Calculer la tolérance basée sur la valeur de référence
-            tolerance = calculate_tolerance(reference_value)
-
-            # Déterminer si la différence est dans la tolérance
-            is_valid = True if diff < 0 else diff <= tolerance
-
-            final_results.append({
-                'activité': activity,
-                'area': area_index + 1,  # Indexation basée sur 1 pour l'area
-                'acquisition': acquisition_value,
-                'reference': reference_value,
-                'CV': acquisition_value - reference_value,  # Renommé de diff, garder la différence signée
-                'valid': is_valid
-            })
-
-    # Convertir en DataFrame
-    results_df = pd.DataFrame(final_results)
-
-    return results_df
+        activities.extend(acquisition_data['activity'])
+        areas.extend([area_index + 1] * len(acquisition_data['activity']))  # Indexation basée sur 1 pour l'area
+        acquisition_values.extend(acquisition_data['values'])
+        reference_values.extend(reference_data['values'])
+
+    if not activities:
+        return pd.DataFrame()
+
+    # Comparer toutes les lignes en une fois : différence signée et validité selon la tolérance de la référence
+    acquisition_values = np.array(acquisition_values, dtype=float)
+    reference_values = np.array(reference_values, dtype=float)
+    differences = acquisition_values - reference_values
+
+    return pd.DataFrame({
+        'activité': np.array(activities, dtype=float),
+        'area': np.array(areas, dtype=np.int64),
+        'acquisition': acquisition_values,
+        'reference': reference_values,
+        'CV': differences,
+        'valid': withinTolerance(differences, calculate_tolerances(reference_values))
+    })
+
+
+# Ligne séparatrice des anciens exports CSV de WellResults
+ENZYMO_CSV_SEPARATOR = ';;;;;;;;;'
+
+# Sections des onglets WellResults utilisées par compare_enzymo_2_ref : nom -> (marqueur, mot-clé de l'en-tête).
+# La section des points de gamme n'a pas de marqueur fixe : c'est celle qui suit la section de calibration.
+ENZYMO_SECTIONS = {
+    'Blank': WELL_RESULTS_SECTIONS['Blank'],
+    'Samples': WELL_RESULTS_SECTIONS['Samples'],
+    'SampleDetail': WELL_RESULTS_SECTIONS['SampleDetail'],
+}
+ENZYMO_GAMME_HEADER_KEYWORD = 'Well'
+
+
+class EnzymoSections:
+    """
+    Sections d'un onglet WellResults utilisées par compare_enzymo_2_ref, sous forme de DataFrame
+    (une ligne du fichier par ligne, colonnes numériques en float, cellules vides à NaN).
+    """
+
+    def __init__(self, entete, blank, gamme, sample, sample_detail):
+        """
+        :param entete: Date, heure, nom de la plaque et paramètres de fit.
+        :param blank: Z.U. et exclusions des puits tampons.
+        :param gamme: Z.U., activités théoriques et exclusions des points de gamme.
+        :param sample: Activités non diluées et RSD des échantillons.
+        :param sample_detail: Z.U., activités mesurées et exclusions de tous les points échantillons.
+        """
+        self.entete = entete
+        self.blank = blank
+        self.gamme = gamme
+        self.sample = sample
+        self.sample_detail = sample_detail
+
+
+def _numericColumns(section):
+    """
+    Convertit en float les colonnes d'une section dont toutes les cellules renseignées sont des nombres ;
+    les autres colonnes (noms de puits, exclusions, textes) sont laissées telles quelles.
+    """
+    section = section.copy()
+    for column in range(section.shape[1]):
+        values = section.iloc[:, column]
+        filled = values[values.notna()]
+        if len(filled) and all(isinstance(value, (int, float, np.number)) and not isinstance(value, (bool, np.bool_))
+                               for value in filled):
+            section.isetitem(column, values.astype(float))
+    return section
+
+
+def _enzymoEntete(df, text, first_section_row):
+    """
+    Retourne l'en-tête d'un onglet : le bloc de lignes non vides qui précède la première section
+    (le paragraphe "Plate Reference" du premier onglet, séparé par une ligne vide, n'en fait pas partie).
+    """
+    empty_rows = (np.char.strip(text) == '').all(axis=1)
+    end_row = first_section_row
+    while end_row > 0 and empty_rows[end_row - 1]:
+        end_row -= 1
+    start_row = end_row
+    while start_row > 0 and not empty_rows[start_row - 1]:
+        start_row -= 1
+    return df.iloc[start_row:end_row].reset_index(drop=True)
+
+
+def parseEnzymoSections(df, sheet_name):
+    """
+    Découpe un onglet WellResults en sections à partir de leurs marqueurs (voir indexSections).
+    La section des points de gamme est la première section qui suit celle de calibration.
+
+    :param df: DataFrame de l'onglet, comme retourné par readWellResultsSheets.
+    :param sheet_name: Nom de l'onglet (pour les messages d'erreur).
+    :return: EnzymoSections de l'onglet.
+    """
+    if df.empty:
+        raise ValueError(f"Onglet {sheet_name} vide")
+
+    # Les lignes séparatrices des anciens exports CSV sont traitées comme des lignes vides
+    cells = df.to_numpy(dtype=object)
+    separator_rows = (cells[:, 0] == ENZYMO_CSV_SEPARATOR) & pd.isna(cells[:, 1:]).all(axis=1)
+    if separator_rows.any():
+        df = df.copy()
+        df.iloc[np.flatnonzero(separator_rows), 0] = np.nan
+    text = _sheetText(df)
+
+    # Titre de la section des points de gamme : première cellule non vide après les lignes de calibration
+    sections = dict(ENZYMO_SECTIONS)
+    calibration_marker = WELL_RESULTS_SECTIONS['Calibration'][0]
+    calibration_rows = np.flatnonzero(np.char.startswith(text[:, 0], calibration_marker))
+    if not len(calibration_rows):
+        raise ValueError(f"Structure de l'onglet {sheet_name} non reconnue : "
+                         f"section {calibration_marker} non trouvée")
+    first_cell_empty = np.char.strip(text[:, 0]) == ''
+    calibration_end = calibration_rows[0] + 1 + np.flatnonzero(first_cell_empty[calibration_rows[0] + 1:])
+    gamme_rows = calibration_end[0] + np.flatnonzero(~first_cell_empty[calibration_end[0]:]) \
+        if len(calibration_end) else []
+    if not len(gamme_rows):
+        raise ValueError(f"Structure de l'onglet {sheet_name} non reconnue : "
+                         f"section des points de gamme non trouvée après {calibration_marker}")
+    sections['Gamme'] = (text[gamme_rows[0], 0], ENZYMO_GAMME_HEADER_KEYWORD)
+
+    found, errors = indexSections(df, sheet_name, sections)
+    if errors:
+        raise ValueError(f"Structure de l'onglet {sheet_name} non reconnue : " + ", ".join(errors.values()))
+
+    blank_row = np.flatnonzero(np.char.startswith(text[:, 0], ENZYMO_SECTIONS['Blank'][0]))[0]
+    return EnzymoSections(_enzymoEntete(df, text, blank_row), _numericColumns(found['Blank']),
+                          _numericColumns(found['Gamme']), _numericColumns(found['Samples']),
+                          _numericColumns(found['SampleDetail']))
+
+
+def readEnzymoSections(file_path):
+    """
+    Lit un fichier WellResults une seule fois et découpe chacun de ses onglets en sections.
+
+    :param file_path: Chemin vers le fichier de résultats de puits.
+    :return: Dictionnaire {nom d'onglet: EnzymoSections}, dans l'ordre des onglets ;
+             None pour les onglets dont la structure n'est pas reconnue.
+    """
+    try:
+        sheets = readWellResultsSheets(file_path)
+    except Exception as e:
+        raise ValueError(f"Erreur lors de la lecture du fichier de résultats de puits: {e}")
+
+    sections = {}
+    for sheet_name, df in sheets.items():
+        try:
+            sections[sheet_name] = parseEnzymoSections(df, sheet_name)
+        except ValueError as e:
+            logger.warning("%s (%s)", e, file_path)
+            sections[sheet_name] = None
+    return sections
 
 
 # Exemple d'utilisation
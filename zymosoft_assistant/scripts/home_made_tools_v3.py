@@ -204,75 +204,181 @@ def toc():
         print("Toc: start time not set")
 
 
-def import_data_from_csv_synthese_zymintern(file):
-    number_of_letters_max = 8
-    number_of_colonne_number_max = 12
-    nb_puits = 96
+def lettres_lignes(nb_lignes):
+    # noms des lignes d'une plaque : A..Z puis AA, AB... (plaques 1536 puits : 32 lignes A..AF)
+    lettres = []
+    for j_letter in range(nb_lignes):
+        nom = ''
+        j_letter += 1
+        while j_letter > 0:
+            j_letter, reste = divmod(j_letter - 1, 26)
+            nom = alphabet_majuscule[reste] + nom
+        lettres.append(nom)
+    return lettres
+
+
+class PlateGeometry:
+    """
+    Géométrie d'une plaque : nombre de lignes et de colonnes, noms des puits ('B7') et index des puits.
+
+    Les puits sont rangés ligne par ligne : l'index à plat du puits (j_letter, j_col) est j_letter * nb_colonnes + j_col,
+    ce qui correspond à matrice.ravel().
+    """
+
+    def __init__(self, nb_lignes, nb_colonnes):
+        self.nb_lignes = nb_lignes
+        self.nb_colonnes = nb_colonnes
+        self.nb_puits = nb_lignes * nb_colonnes
+        self.shape = (nb_lignes, nb_colonnes)
+        self.lettres = lettres_lignes(nb_lignes)
+        # une lettre inconnue donne -1 comme alphabet_majuscule.find ; A..Z sont toujours reconnues
+        # pour qu'un puits hors plaque ne soit pas rangé en silence
+        self._index_lettres = {lettre: j_letter for j_letter, lettre in enumerate(lettres_lignes(max(nb_lignes, 26)))}
+
+    def __repr__(self):
+        return f"PlateGeometry({self.nb_lignes}, {self.nb_colonnes})"
+
+    def __eq__(self, other):
+        return isinstance(other, PlateGeometry) and self.shape == other.shape
+
+    def __hash__(self):
+        return hash(self.shape)
+
+    def indices(self, positions):
+        # 'B7' -> (1, 6) pour toutes les positions d'un coup (numéro - 1 pour bien commencer avec un indice nul)
+        positions = pandas.Series(positions, dtype=object).astype(str)
+        parties = positions.str.extract(r'^([A-Za-z]*)(.*)$')
+        j_letter = parties[0].map(self._index_lettres).fillna(-1).to_numpy(dtype=int)
+        j_col = parties[1].astype(int).to_numpy() - 1
+        return j_letter, j_col
+
+    def index(self, positions):
+        # 'B7' -> index à plat du puits
+        j_letter, j_col = self.indices(positions)
+        return j_letter * self.nb_colonnes + j_col
+
+    def noms_puits(self):
+        # noms de tous les puits dans l'ordre des index à plat : A1, A2, ..., A12, B1...
+        return np.char.add(np.repeat(np.array(self.lettres), self.nb_colonnes),
+                           np.tile(np.arange(1, self.nb_colonnes + 1).astype(str), self.nb_lignes))
+
+    def zeros(self, *dimensions):
+        # matrice de la plaque, suivie éventuellement d'autres dimensions (itérations...)
+        return np.zeros(self.shape + dimensions)
+
+
+PLAQUE_96 = PlateGeometry(8, 12)
+PLAQUE_384 = PlateGeometry(16, 24)
+PLAQUE_1536 = PlateGeometry(32, 48)
+GEOMETRIES_PLAQUES = {geometrie.nb_puits: geometrie for geometrie in (PLAQUE_96, PLAQUE_384, PLAQUE_1536)}
+
+
+def geometrie_depuis_nb_puits(nb_puits):
+    # géométrie d'une plaque à partir du nombre de puits d'un fichier synthese (96 puits par défaut, comme avant)
+    return GEOMETRIES_PLAQUES.get(nb_puits, PLAQUE_96)
+
+
+class PlaqueSynthese:
+    """
+    Données d'un fichier synthese de Zymintern rangées par puits : un tableau 3-D (métrique, ligne, colonne).
+
+    plaque['volume'] donne la matrice (lignes x colonnes) d'une métrique, plaque.puits('B7') les métriques d'un puits.
+    La plaque se déballe comme l'ancien tuple de matrices, dans l'ordre des métriques :
+    volume, volume_std, ... = plaque
+    """
+
+    def __init__(self, metriques, data, geometrie=None):
+        self.metriques = list(metriques)
+        self.data = data
+        self.geometrie = geometrie if geometrie is not None else PlateGeometry(*data.shape[1:])
+
+    def __getitem__(self, metrique):
+        return self.data[self.metriques.index(metrique)]
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __len__(self):
+        return len(self.metriques)
+
+    def puits(self, position):
+        # position du type 'B7' -> dictionnaire métrique -> valeur du puits
+        j_letter, j_col = self.geometrie.indices([position])
+        return dict(zip(self.metriques, self.data[:, j_letter[0], j_col[0]].tolist()))
+
+
+def import_plaque_synthese(df_file, colonnes_metriques, geometrie=None):
+    # range les lignes d'un csv synthese dans une plaque :
+    # colonnes_metriques = liste de (nom de la métrique, colonne du csv), plus une métrique à 0 pour chaque nom sans colonne (None)
+    # sans géométrie donnée, elle est déduite du nombre de lignes (96 puits par défaut : seules les 96 premières lignes sont lues)
+    # les puits absents du csv restent à 0
+    if geometrie is None:
+        geometrie = geometrie_depuis_nb_puits(len(df_file))
+    df_puits = df_file.iloc[:geometrie.nb_puits]
+    if len(df_puits) < geometrie.nb_puits:
+        raise ValueError(f"Le fichier synthese contient {len(df_puits)} puits au lieu de {geometrie.nb_puits}")
+    j_letter, j_col = geometrie.indices(df_puits['Position_plaque'])
 
-#    pandas.read_csv(file,sep=';',error_bad_lines=False,index_col=False)
-#    une colonne sans nom met le bordel
-    df_file = pandas.read_csv(file,sep=';',index_col=False,usecols=[0,1,2,3,4,5,6,7,8,9,10])
+    metriques = [nom for nom, colonne in colonnes_metriques]
+    data = np.zeros((len(metriques),) + geometrie.shape)
+    lus = [i for i, (nom, colonne) in enumerate(colonnes_metriques) if colonne is not None]
+    data[np.array(lus)[:, None], j_letter, j_col] = df_puits[[colonnes_metriques[i][1] for i in lus]].to_numpy(dtype=float).T
 
-    volume_raw = np.zeros((number_of_letters_max,number_of_colonne_number_max))
-    volume_std_raw = np.zeros((number_of_letters_max,number_of_colonne_number_max))
-    diametre_raw = np.zeros((number_of_letters_max,number_of_colonne_number_max))
-    diametre_std_raw = np.zeros((number_of_letters_max,number_of_colonne_number_max))
-    N_dot_detected_raw = np.zeros((number_of_letters_max,number_of_colonne_number_max))
-    N_dot_keep_raw = np.zeros((number_of_letters_max,number_of_colonne_number_max))
-    N_cycle_raw = np.zeros((number_of_letters_max,number_of_colonne_number_max))
-    porcent_dot_keep  = np.zeros((number_of_letters_max,number_of_colonne_number_max))
-
-    j_scan = 0
-    while j_scan<nb_puits:
-        name_position = df_file['Position_plaque'][j_scan]
-        letter_now = name_position[0]
-        j_col = int(name_position[1:])-1 # -1 pour bien commencer avec un indice nul
-        j_letter = int(alphabet_majuscule.find(letter_now))
-        volume_raw[j_letter,j_col] = df_file['volume_after_statiscal_filter'][j_scan]
-        volume_std_raw[j_letter,j_col] = df_file['volume_std_after_statiscal_filter'][j_scan]
-        diametre_raw[j_letter,j_col] = df_file['diameter_mean_after_statiscal_filter'][j_scan]
-        diametre_std_raw[j_letter,j_col] = df_file['diameter_std_after_statiscal_filter'][j_scan]
-        N_dot_detected_raw[j_letter,j_col] = df_file['number_of_dot_BEFORE_statiscal_filter'][j_scan]
-        N_dot_keep_raw[j_letter,j_col] = df_file['number_of_dot_after_statiscal_filter'][j_scan]
-        N_cycle_raw[j_letter,j_col] = df_file['Ncycles_mean_after_statiscal_filter'][j_scan]
-        porcent_dot_keep[j_letter,j_col] = N_dot_keep_raw[j_letter,j_col]/ N_dot_detected_raw[j_letter,j_col] *100
-        j_scan += 1
+    puits_lus = np.zeros(geometrie.shape, dtype=bool)
+    puits_lus[j_letter, j_col] = True
+    return PlaqueSynthese(metriques, data, geometrie), puits_lus
 
-    return volume_raw, volume_std_raw, diametre_raw, diametre_std_raw, N_dot_detected_raw, N_dot_keep_raw, N_cycle_raw, porcent_dot_keep
 
-def import_data_from_csv_synthese_zymintern_nanofilm(file): # nouveau (v3 19/02/2025)
-    number_of_letters_max = 8
-    number_of_colonne_number_max = 12
-    nb_puits = 96
+def import_data_from_csv_synthese_zymintern(file, geometrie=None):
+    # retourne une PlaqueSynthese : volume, volume_std, diametre, diametre_std, N_dot_detected, N_dot_keep, N_cycle, porcent_dot_keep
+    # (se déballe comme l'ancien tuple de matrices 8 x 12) ; geometrie : PlateGeometry de la plaque, déduite du fichier si None
 
 #    pandas.read_csv(file,sep=';',error_bad_lines=False,index_col=False)
 #    une colonne sans nom met le bordel
-    df_file = pandas.read_csv(file,sep=';',index_col=False,usecols=[0,1,2,3,4,5,6,7,8,9])
+    df_file = pandas.read_csv(file,sep=';',index_col=False,usecols=[0,1,2,3,4,5,6,7,8,9,10])
 
-    thickness_after_statiscal_filter = np.zeros((number_of_letters_max,number_of_colonne_number_max))
-    thickness_std_after_statiscal_filter = np.zeros((number_of_letters_max,number_of_colonne_number_max))
-    intensity_455 = np.zeros((number_of_letters_max,number_of_colonne_number_max))
-    intensity_730 = np.zeros((number_of_letters_max,number_of_colonne_number_max))
-    number_of_area_BEFORE_statiscal_filter = np.zeros((number_of_letters_max,number_of_colonne_number_max))
-    number_of_area_after_statiscal_filter  = np.zeros((number_of_letters_max,number_of_colonne_number_max))
-    pourcentage_zones_gardees = np.zeros((number_of_letters_max,number_of_colonne_number_max))
+    plaque, puits_lus = import_plaque_synthese(df_file, [
+        ('volume', 'volume_after_statiscal_filter'),
+        ('volume_std', 'volume_std_after_statiscal_filter'),
+        ('diametre', 'diameter_mean_after_statiscal_filter'),
+        ('diametre_std', 'diameter_std_after_statiscal_filter'),
+        ('N_dot_detected', 'number_of_dot_BEFORE_statiscal_filter'),
+        ('N_dot_keep', 'number_of_dot_after_statiscal_filter'),
+        ('N_cycle', 'Ncycles_mean_after_statiscal_filter'),
+        ('porcent_dot_keep', None),
+    ], geometrie)
+    # pourcentage calculé sur les puits lus seulement, 0/0 -> nan comme avant
+    porcent_dot_keep = plaque['porcent_dot_keep']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(plaque['N_dot_keep'], plaque['N_dot_detected'], out=porcent_dot_keep, where=puits_lus)
+    porcent_dot_keep *= 100
+
+    return plaque
+
+def import_data_from_csv_synthese_zymintern_nanofilm(file, geometrie=None): # nouveau (v3 19/02/2025)
+    # retourne une PlaqueSynthese : thickness, thickness_std, intensity_455, intensity_730,
+    # number_of_area_BEFORE, number_of_area_after, pourcentage_zones_gardees (se déballe comme l'ancien tuple de matrices 8 x 12)
+    # geometrie : PlateGeometry de la plaque, déduite du fichier si None
 
-    j_scan = 0
-    while j_scan<nb_puits:
-        name_position = df_file['Position_plaque'][j_scan]
-        letter_now = name_position[0]
-        j_col = int(name_position[1:])-1 # -1 pour bien commencer avec un indice nul
-        j_letter = int(alphabet_majuscule.find(letter_now))
-        thickness_after_statiscal_filter[j_letter,j_col] = df_file['thickness_after_statiscal_filter'][j_scan]
-        thickness_std_after_statiscal_filter[j_letter,j_col] = df_file['thickness_std_after_statiscal_filter'][j_scan]
-        intensity_455[j_letter,j_col] = df_file['455_intensity'][j_scan]
-        intensity_730[j_letter,j_col] = df_file['730_intensity'][j_scan]
-        number_of_area_BEFORE_statiscal_filter[j_letter,j_col] = df_file['number_of_area_BEFORE_statiscal_filter'][j_scan]
-        number_of_area_after_statiscal_filter[j_letter,j_col] = df_file['number_of_area_after_statiscal_filter'][j_scan]
-        pourcentage_zones_gardees[j_letter,j_col] = number_of_area_after_statiscal_filter[j_letter,j_col]*100/number_of_area_BEFORE_statiscal_filter[j_letter,j_col]
-        j_scan += 1
+#    pandas.read_csv(file,sep=';',error_bad_lines=False,index_col=False)
+#    une colonne sans nom met le bordel
+    df_file = pandas.read_csv(file,sep=';',index_col=False,usecols=[0,1,2,3,4,5,6,7,8,9])
 
-    return thickness_after_statiscal_filter, thickness_std_after_statiscal_filter, intensity_455, intensity_730, number_of_area_BEFORE_statiscal_filter, number_of_area_after_statiscal_filter, pourcentage_zones_gardees
+    plaque, puits_lus = import_plaque_synthese(df_file, [
+        ('thickness', 'thickness_after_statiscal_filter'),
+        ('thickness_std', 'thickness_std_after_statiscal_filter'),
+        ('intensity_455', '455_intensity'),
+        ('intensity_730', '730_intensity'),
+        ('number_of_area_BEFORE', 'number_of_area_BEFORE_statiscal_filter'),
+        ('number_of_area_after', 'number_of_area_after_statiscal_filter'),
+        ('pourcentage_zones_gardees', None),
+    ], geometrie)
+    # pourcentage calculé sur les puits lus seulement, 0/0 -> nan comme avant
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(plaque['number_of_area_after'] * 100, plaque['number_of_area_BEFORE'],
+                  out=plaque['pourcentage_zones_gardees'], where=puits_lus)
+
+    return plaque
 
 def import_data_from_xlsx_synthese_zymintern(file): # pas utilisé
     number_of_letters_max = 8
@@ -1,9 +1,81 @@
+import bisect
+import copy
+import hashlib
+import io
+import json
+import logging
+import mmap
 import os
 import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
+# Taille des blocs lus à rebours pour localiser la dernière acquisition
+LOG_BLOCK_SIZE = 1024 * 1024
+
+
+
+class LogPattern:
+    """
+    Pattern de ligne de log compilé une seule fois.
+    Un littéral présent dans toute ligne correspondante est testé avant l'expression régulière,
+    ce qui évite d'exécuter la regex sur la grande majorité des lignes.
+    """
+    __slots__ = ("name", "literal", "regex")
+
+    def __init__(self, name: str, literal: Optional[str], pattern: str):
+        self.name = name
+        self.literal = literal
+        self.regex = re.compile(pattern)
+
+    def search(self, line: str) -> Optional[re.Match]:
+        """
+        Cherche le pattern dans une ligne.
+
+        :param line: Ligne de log à analyser.
+        :return: Objet Match ou None si non trouvé.
+        """
+        if self.literal is not None and self.literal not in line:
+            return None
+        return self.regex.search(line)
+
+
+# Littéral commun à toutes les lignes d'autofocus
+AUTOFOCUS_LITERAL = "[AUTOFOCUS]"
+
+# Patterns des lignes d'autofocus
+DONE_LOOPS_PATTERN = LogPattern("done_loops", "Done after",
+                                r'\[AUTOFOCUS\]\[FOCUS\]\s+Done after\s+(\d+)\s+loop\(s\)')
+TIMEOUT_LOOPS_PATTERN = LogPattern("timeout_loops", "Time out after",
+                                   r'\[AUTOFOCUS\]\[FOCUS\]\s+Time out after\s+(\d+)\s+loop\(s\)')
+MOVE_PATTERN = LogPattern("move", "Adjusting",
+                          r'\[AUTOFOCUS\]\[FOCUS\]\s+Adjusting.*move:\s+(\d+)')
+MAX_RETRY_PATTERN = LogPattern("max_retry", "Focus not reached after",
+                               r'\[AUTOFOCUS\]\[FOCUS\]\s+Focus not reached after\s+(\d+)\s+moves\.\s+Trying alternate commands')
+STILL_NOT_PATTERN = LogPattern("still_not", "Still not", r'\[AUTOFOCUS\]\[FOCUS\]\s+Still not')
+AUTOFOCUS_OFF_DONE_PATTERN = LogPattern("autofocus_off_done", "[AUTOFOCUS][OFF]", r'\[AUTOFOCUS\]\[OFF\]\s+Done')
+
+# Patterns des phases d'alignement et des puits
+AUTO_POSITION_START_PATTERN = LogPattern("auto_position_start", "Starting auto-position of wells:",
+                                         r'Starting auto-position of wells:')
+REFERENCE_ALIGNED_PATTERN = LogPattern("reference_aligned", "Reference wells",
+                                       r'Reference wells\s+.*\s+re-aligned')
+WELL_NAME_PATTERN = LogPattern("well_name", "Going to well", r'Going to well\s+"([^"]+)"')
+TIMESTAMP_PATTERN = LogPattern("timestamp", "/", r'\[(\d{2}/\d{2}/\d{4} \d{2}:\d{2}:\d{2})\]')
+
+LOG_PATTERNS = {
+    pattern.name: pattern for pattern in (
+        DONE_LOOPS_PATTERN, TIMEOUT_LOOPS_PATTERN, MOVE_PATTERN, MAX_RETRY_PATTERN, STILL_NOT_PATTERN,
+        AUTOFOCUS_OFF_DONE_PATTERN, AUTO_POSITION_START_PATTERN, REFERENCE_ALIGNED_PATTERN,
+        WELL_NAME_PATTERN, TIMESTAMP_PATTERN
+    )
+}
 
 def getLogFile(folder_path: str) -> str:
     """
@@ -30,10 +102,9 @@ def identifyAcquisitionType(log_file_path: str) -> str:
     :return: "prior" si le log contient "loop", "custom_focus" sinon.
     """
     try:
-        with open(log_file_path, 'r', encoding='utf-8') as file:
-            content = file.read()
-        if "loop" in content.lower():
-            return "prior"
+        with LogIndex(log_file_path) as index:
+            if index.containsLoop():
+                return "prior"
         return "custom_focus"
     except Exception as e:
         raise ValueError(f"Erreur lors de la lecture du fichier de log: {e}")
@@ -43,23 +114,112 @@ def findLastAcquisition(log_file_path: str) -> Tuple[Optional[str], Optional[int
     """
     Trouve la dernière acquisition dans le fichier de log.
     Cherche soit "Starting acquisition" soit "Reference wells A1 A12 H12 re-aligned."
+    Le log est lu à rebours par blocs (comme findLastAcquisitionOffset) ; seules les fins de ligne
+    qui précèdent l'acquisition trouvée sont ensuite comptées pour donner son numéro de ligne.
 
     :param log_file_path: Chemin vers le fichier de log.
     :return: Tuple contenant la ligne de la dernière acquisition et son numéro de ligne, ou (None, None) si aucune trouvée.
     """
     try:
-        with open(log_file_path, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
+        with open(log_file_path, 'rb') as file:
+            for offset, line in _readLinesReversed(file):
+                if b"Starting" in line and b"acquisition" in line:
+                    return line.decode('utf-8').strip(), _countLines(file, offset)
+        return None, None
+    except Exception as e:
+        raise ValueError(f"Erreur lors de la recherche de la dernière acquisition: {e}")
 
-        last_acquisition_line = None
-        last_acquisition_line_number = None
 
-        for i, line in enumerate(lines):
-            if "Starting" in line and "acquisition" in line:
-                last_acquisition_line = line.strip()
-                last_acquisition_line_number = i
+def _readLinesReversed(file, block_size: int = LOG_BLOCK_SIZE):
+    """
+    Parcourt un fichier binaire de la fin vers le début, par blocs de taille fixe.
 
-        return last_acquisition_line, last_acquisition_line_number
+    :param file: Fichier ouvert en mode binaire.
+    :param block_size: Taille des blocs lus à chaque déplacement.
+    :return: Générateur de tuples (offset en octets du début de la ligne, ligne en octets sans "\n").
+    """
+    position = file.seek(0, os.SEEK_END)
+    carry = b""
+    while position > 0:
+        read_size = min(block_size, position)
+        position -= read_size
+        file.seek(position)
+        lines = (file.read(read_size) + carry).split(b"\n")
+        # La première ligne du bloc peut être incomplète : elle est complétée au bloc suivant
+        carry = lines[0]
+        line_end = position + len(carry)
+        offsets = []
+        for line in lines[1:]:
+            offsets.append(line_end + 1)
+            line_end += 1 + len(line)
+        for offset, line in zip(reversed(offsets), reversed(lines[1:])):
+            yield offset, line
+    yield 0, carry
+
+
+def _countLines(file, end_offset: int, start_offset: int = 0, block_size: int = LOG_BLOCK_SIZE) -> int:
+    """
+    Compte les fins de ligne d'un fichier binaire (ou d'un mmap) entre deux offsets.
+    Depuis le début du fichier, c'est le numéro de la ligne qui commence à end_offset.
+
+    :param file: Fichier ouvert en mode binaire, ou mmap.
+    :param end_offset: Offset en octets où s'arrête le comptage.
+    :param start_offset: Offset en octets où commence le comptage.
+    :param block_size: Taille des blocs lus.
+    :return: Nombre de fins de ligne entre les deux offsets.
+    """
+    file.seek(start_offset)
+    count = 0
+    remaining = end_offset - start_offset
+    while remaining > 0:
+        chunk = file.read(min(block_size, remaining))
+        if not chunk:
+            break
+        count += chunk.count(b"\n")
+        remaining -= len(chunk)
+    return count
+
+
+def _containsLoop(file, end_offset: int, block_size: int = LOG_BLOCK_SIZE) -> bool:
+    """
+    Indique si le début d'un fichier binaire contient "loop", sans tenir compte de la casse.
+
+    :param file: Fichier ouvert en mode binaire, ou mmap.
+    :param end_offset: Offset en octets où s'arrête la recherche.
+    :param block_size: Taille des blocs lus.
+    :return: True si "loop" est trouvé avant l'offset.
+    """
+    file.seek(0)
+    previous_tail = b""
+    remaining = end_offset
+    while remaining > 0:
+        chunk = file.read(min(block_size, remaining))
+        if not chunk:
+            break
+        remaining -= len(chunk)
+        # On garde la fin du bloc précédent pour les occurrences à cheval sur deux blocs
+        chunk = previous_tail + chunk
+        if b"loop" in chunk.lower():
+            return True
+        previous_tail = chunk[-3:]
+    return False
+
+
+def findLastAcquisitionOffset(log_file_path: str, block_size: int = LOG_BLOCK_SIZE) -> Tuple[Optional[str], Optional[int]]:
+    """
+    Trouve la dernière acquisition en lisant le fichier de log à rebours, par blocs.
+    Seuls les derniers blocs sont lus lorsque la dernière acquisition est en fin de fichier.
+
+    :param log_file_path: Chemin vers le fichier de log.
+    :param block_size: Taille des blocs lus à rebours.
+    :return: Tuple contenant la ligne de la dernière acquisition et son offset en octets, ou (None, None) si aucune trouvée.
+    """
+    try:
+        with open(log_file_path, 'rb') as file:
+            for offset, line in _readLinesReversed(file, block_size):
+                if b"Starting" in line and b"acquisition" in line:
+                    return line.decode('utf-8').strip(), offset
+        return None, None
     except Exception as e:
         raise ValueError(f"Erreur lors de la recherche de la dernière acquisition: {e}")
 
@@ -71,10 +231,10 @@ def extractWellName(line: str) -> Optional[str]:
     :param line: Ligne de log à analyser.
     :return: Nom du puits ou None si non trouvé.
     """
-    match = re.search(r'Going to well\s+"([^"]+)"', line)
+    match = WELL_NAME_PATTERN.search(line)
     if match:
         well_name = match.group(1)
-        print(f"[DEBUG] Well name extracted: {well_name}")
+        logger.debug("Well name extracted: %s", well_name)
         return well_name
     return None
 
@@ -86,8 +246,7 @@ def extractTimestamp(line: str) -> Optional[datetime]:
     :param line: Ligne de log à analyser.
     :return: Objet datetime ou None si non trouvé.
     """
-    timestamp_pattern = r'\[(\d{2}/\d{2}/\d{4} \d{2}:\d{2}:\d{2})\]'
-    match = re.search(timestamp_pattern, line)
+    match = TIMESTAMP_PATTERN.search(line)
     if match:
         try:
             return datetime.strptime(match.group(1), '%d/%m/%Y %H:%M:%S')
@@ -96,6 +255,44 @@ def extractTimestamp(line: str) -> Optional[datetime]:
     return None
 
 
+def _buildDurationResult(start_time: Optional[datetime], end_time: Optional[datetime],
+                         start_line: Optional[int], end_line: Optional[int]) -> Dict[str, any]:
+    """
+    Construit le dictionnaire de durée d'acquisition à partir des timestamps de début et de fin.
+
+    :param start_time: Timestamp de la ligne "Starting acquisition".
+    :param end_time: Timestamp de la ligne "Stopping".
+    :param start_line: Numéro de la ligne de début.
+    :param end_line: Numéro de la ligne de fin.
+    :return: Dictionnaire avec les informations de durée.
+    """
+    if start_time and end_time:
+        duration = end_time - start_time
+        duration_seconds = duration.total_seconds()
+        duration_minutes = duration_seconds / 60
+        return {
+            "start_time": start_time,
+            "end_time": end_time,
+            "duration_seconds": round(duration_seconds, 2),
+            "duration_minutes": round(duration_minutes, 2),
+            "duration_formatted": str(duration),
+            "start_line": start_line,
+            "end_line": end_line,
+            "success": True
+        }
+    return {
+        "start_time": start_time,
+        "end_time": end_time,
+        "duration_seconds": 0,
+        "duration_minutes": 0,
+        "duration_formatted": "N/A",
+        "start_line": start_line,
+        "end_line": end_line,
+        "success": False,
+        "error": "Unable to find both start and end timestamps"
+    }
+
+
 def calculateAcquisitionDuration(log_file_path: str) -> Dict[str, any]:
     """
     Calcule la durée d'acquisition entre "Starting acquisition..." et "Stopping".
@@ -104,58 +301,30 @@ def calculateAcquisitionDuration(log_file_path: str) -> Dict[str, any]:
     :return: Dictionnaire avec les informations de durée.
     """
     try:
-        with open(log_file_path, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
-
         start_acquisition_time = None
         end_acquisition_time = None
         start_line = None
         end_line = None
 
-        for i in range(len(lines) - 1, -1, -1):
-            line = lines[i]
-            if "Starting acquisition" in line:
-                timestamp = extractTimestamp(line)
-                if timestamp:
-                    start_acquisition_time = timestamp
-                    start_line = i
-                    break
-
-        if start_acquisition_time:
-            for i in range(len(lines) - 1, start_line, -1):
-                line = lines[i]
-                if "Stopping" in line:
-                    timestamp = extractTimestamp(line)
+        # Lecture à rebours : le dernier "Stopping" rencontré avant le début est le plus tardif
+        end_candidate = None
+        with open(log_file_path, 'rb') as file:
+            for offset, raw_line in _readLinesReversed(file):
+                if b"Starting acquisition" in raw_line:
+                    timestamp = extractTimestamp(raw_line.decode('utf-8'))
                     if timestamp:
-                        end_acquisition_time = timestamp
-                        end_line = i
+                        start_acquisition_time = timestamp
+                        start_line = _countLines(file, offset)
+                        if end_candidate:
+                            end_acquisition_time, end_offset = end_candidate
+                            end_line = start_line + _countLines(file, end_offset, start_offset=offset)
                         break
+                if end_candidate is None and b"Stopping" in raw_line:
+                    timestamp = extractTimestamp(raw_line.decode('utf-8'))
+                    if timestamp:
+                        end_candidate = (timestamp, offset)
 
-        if start_acquisition_time and end_acquisition_time:
-            duration = end_acquisition_time - start_acquisition_time
-            duration_seconds = duration.total_seconds()
-            duration_minutes = duration_seconds / 60
-            return {
-                "start_time": start_acquisition_time,
-                "end_time": end_acquisition_time,
-                "duration_seconds": round(duration_seconds, 2),
-                "duration_minutes": round(duration_minutes, 2),
-                "duration_formatted": str(duration),
-                "start_line": start_line,
-                "end_line": end_line,
-                "success": True
-            }
-        return {
-            "start_time": start_acquisition_time,
-            "end_time": end_acquisition_time,
-            "duration_seconds": 0,
-            "duration_minutes": 0,
-            "duration_formatted": "N/A",
-            "start_line": start_line,
-            "end_line": end_line,
-            "success": False,
-            "error": "Unable to find both start and end timestamps"
-        }
+        return _buildDurationResult(start_acquisition_time, end_acquisition_time, start_line, end_line)
     except Exception as e:
         return {
             "start_time": None,
@@ -179,162 +348,342 @@ def countNumberOfDriftFix(log_file_path: str, last_acquisition_line_number: Opti
     :return: Nombre de drift fixes appliqués.
     """
     try:
-        with open(log_file_path, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
-
-        drift_fix_count = 0
         start_line = 0 if last_acquisition_line_number is None else last_acquisition_line_number
 
-        for line in lines[start_line:]:
-            if "DRIFT FIX:" in line:
-                drift_fix_count += 1
-
-        return drift_fix_count
+        with LogIndex(log_file_path) as index:
+            return sum(1 for offset in index.offsets("drift_fix") if index.lineNumber(offset) >= start_line)
     except Exception as e:
         raise ValueError(f"Erreur lors du comptage des drift fixes: {e}")
 
 
-def calculateAverageLoopsPrior(log_file_path: str, last_acquisition_line_number: Optional[int] = None) -> Dict[
-    str, any]:
+def _mostCommonCount(counts: List[int]) -> int:
     """
-    Calcule le nombre moyen de loops pour un système prior.
-    Détecte automatiquement le nombre de cycles par puits.
-    Exclut les mesures des puits de référence utilisés pour l'alignement.
-    Inclut SEULEMENT les "Done after X loop(s)" dans la moyenne.
-    Les "Time out after X loop(s)" sont comptés comme "Mesures 'Timeout'".
+    Retourne la valeur la plus fréquente d'une liste non vide, en temps linéaire.
+    En cas d'égalité, le départage est celui de max(set(counts), key=counts.count).
 
-    :param log_file_path: Chemin vers le fichier de log.
-    :param last_acquisition_line_number: Numéro de ligne de la dernière acquisition.
-    :return: Dictionnaire avec la moyenne des loops et les données des puits.
+    :param counts: Liste de valeurs entières.
+    :return: Valeur la plus fréquente.
     """
-    try:
-        with open(log_file_path, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
-
-        done_pattern = r'\[AUTOFOCUS\]\[FOCUS\]\s+Done after\s+(\d+)\s+loop\(s\)'
-        timeout_pattern = r'\[AUTOFOCUS\]\[FOCUS\]\s+Time out after\s+(\d+)\s+loop\(s\)'
-        reference_pattern = r'Reference wells\s+.*\s+re-aligned'
-
-        wells_data = {}
-        current_well = "Unknown"
-        all_loops_values = []
-        all_measurements_count = 0
-        timeout_count = 0
-        debug_log = []
-
-        # Variables pour gérer les phases d'alignement
-        alignment_phases = []
-        in_alignment_phase = False
-
-        start_line = 0 if last_acquisition_line_number is None else last_acquisition_line_number
+    occurrences = Counter(counts)
+    return max(set(counts), key=occurrences.__getitem__)
 
-        # Première passe : identifier les phases d'alignement
-        auto_position_start_line = None
-        reference_aligned_line = None
 
-        for i, line in enumerate(lines):
-            if i <= start_line:
-                continue
-
-            if "Starting auto-position of wells:" in line:
-                auto_position_start_line = i
-                debug_log.append(f"[DEBUG] Début alignement détecté à la ligne {i + 1}")
+class PriorFocusParser:
+    """
+    Machine à états calculant les loops d'autofocus d'un système prior, ligne par ligne.
+    Les lignes doivent être fournies à partir de la ligne qui suit le début de l'acquisition.
+    Seules les mesures postérieures à la fin de l'alignement ("Reference wells ... re-aligned")
+    sont comptées.
+    """
 
-            if re.search(reference_pattern, line):
-                reference_aligned_line = i
-                debug_log.append(f"[DEBUG] Fin alignement détectée à la ligne {i + 1}")
-                break  # On prend seulement le premier après "Starting acquisition"
+    def __init__(self):
+        self.wells_data = {}
+        self.current_well = "Unknown"
+        self.loops_values = []
+        self.measurements_count = 0
+        self.timeout_count = 0
+        self.reference_aligned = False
+
+    def feed(self, line: str, line_number: int) -> None:
+        """
+        Traite une ligne de log.
+
+        :param line: Ligne de log.
+        :param line_number: Numéro de la ligne dans le fichier (base 0).
+        """
+        if not self.reference_aligned:
+            # On prend seulement le premier alignement après "Starting acquisition"
+            if REFERENCE_ALIGNED_PATTERN.search(line):
+                self.reference_aligned = True
+                logger.debug("Fin alignement détectée à la ligne %d", line_number + 1)
+            return
+
+        well_name = extractWellName(line)
+        if well_name:
+            self.current_well = well_name
+            if well_name not in self.wells_data:
+                self.wells_data[well_name] = {
+                    "loops": [],
+                    "timeouts": [],
+                    "done_count": 0,
+                    "timeout_count": 0,
+                    "measurements": 0
+                }
+            return
+
+        # Les patterns suivants ne concernent que les lignes d'autofocus
+        if AUTOFOCUS_LITERAL not in line:
+            return
+
+        done_match = DONE_LOOPS_PATTERN.search(line)
+        if done_match:
+            loop_count = int(done_match.group(1))
+            well = self.wells_data[self.current_well]
+            self.measurements_count += 1
+            self.loops_values.append(loop_count)
+            well["loops"].append(loop_count)
+            well["done_count"] += 1
+            well["measurements"] += 1
+            logger.debug("Puits %s: Done après %d loop(s), mesure %d",
+                         self.current_well, loop_count, well["measurements"])
+            return
+
+        timeout_match = TIMEOUT_LOOPS_PATTERN.search(line)
+        if timeout_match:
+            loop_count = int(timeout_match.group(1))
+            well = self.wells_data[self.current_well]
+            self.measurements_count += 1
+            well["timeouts"].append(loop_count)
+            well["timeout_count"] += 1
+            well["measurements"] += 1
+            self.timeout_count += 1
+            logger.debug("Puits %s: Timeout après %d loop(s), mesure %d",
+                         self.current_well, loop_count, well["measurements"])
+
+    def results(self) -> Dict[str, any]:
+        """
+        Calcule les statistiques à partir de l'état courant.
+        Détecte automatiquement le nombre de cycles par puits.
+
+        :return: Dictionnaire avec la moyenne des loops et les données des puits.
+        """
+        # Filtrer les puits sans mesures valides
+        wells_data = {k: v for k, v in self.wells_data.items() if v["loops"] or v["timeouts"]}
 
-        # Deuxième passe : analyser les mesures APRÈS la fin d'alignement
-        acquisition_started = False
-        if reference_aligned_line is not None:
-            acquisition_started = True
-            debug_log.append(f"[DEBUG] Comptage des mesures commence après la ligne {reference_aligned_line + 1}")
+        # Détection automatique du nombre de cycles :
+        # le nombre de mesures le plus fréquent parmi les puits
+        cycles_detected = 0
+        if wells_data:
+            cycles_detected = _mostCommonCount([v["measurements"] for v in wells_data.values()])
+            logger.debug("Cycles détectés automatiquement : %d", cycles_detected)
 
-        for i, line in enumerate(lines):
-            if i <= start_line:
-                continue
+        loops_values = self.loops_values
+        average_loops = 0 if not loops_values else sum(loops_values) / len(loops_values)
 
-            # Ignorer tout ce qui est avant la fin de l'alignement
-            if not acquisition_started or i <= reference_aligned_line:
-                continue
+        logger.debug("Puits analysés : %d, mesures totales théoriques : %d, mesures totales réelles : %d",
+                     len(wells_data), len(wells_data) * cycles_detected, self.measurements_count)
 
-            well_name = extractWellName(line)
-            if well_name:
-                current_well = well_name
-                if current_well not in wells_data:
-                    wells_data[current_well] = {
-                        "loops": [],
-                        "timeouts": [],
-                        "done_count": 0,
-                        "timeout_count": 0,
-                        "measurements": 0
-                    }
-                continue
+        return {
+            "average_loops": round(average_loops, 2),
+            "total_measurements": self.measurements_count,
+            "done_measurements": len(loops_values),
+            "timeout_measurements": self.timeout_count,
+            "total_wells": len(wells_data),
+            "cycles_detected": cycles_detected,
+            "loops_values": list(loops_values),
+            "wells_data": copy.deepcopy(wells_data)
+        }
 
-            done_match = re.search(done_pattern, line)
-            if done_match:
-                loop_count = int(done_match.group(1))
-                all_measurements_count += 1
-                all_loops_values.append(loop_count)
-                wells_data[current_well]["loops"].append(loop_count)
-                wells_data[current_well]["done_count"] += 1
-                wells_data[current_well]["measurements"] += 1
-                debug_log.append(
-                    f"Puits {current_well}: Done après {loop_count} loop(s), mesure {wells_data[current_well]['measurements']}")
-                continue
 
-            timeout_match = re.search(timeout_pattern, line)
-            if timeout_match:
-                loop_count = int(timeout_match.group(1))
-                all_measurements_count += 1
-                wells_data[current_well]["timeouts"].append(loop_count)
-                wells_data[current_well]["timeout_count"] += 1
-                wells_data[current_well]["measurements"] += 1
-                timeout_count += 1
-                debug_log.append(
-                    f"Puits {current_well}: Timeout après {loop_count} loop(s), mesure {wells_data[current_well]['measurements']}")
-                continue
+class _CustomFocusState:
+    """
+    Accumulateurs des moves d'autofocus d'un système custom focus.
+    """
 
-        # Filtrer les puits sans mesures valides
-        wells_data = {k: v for k, v in wells_data.items() if v["loops"] or v["timeouts"]}
+    def __init__(self):
+        self.wells_data = {}
+        self.current_well = "Unknown"
+        self.current_well_moves = []
+        self.last_processed_well = None  # Pour éviter les doublons
+        self.moves_values = []
+        self.timeout_count = 0
+
+    def record(self, final_move: int, timeout: bool) -> None:
+        if self.current_well not in self.wells_data:
+            self.wells_data[self.current_well] = {"moves": [], "timeouts": 0, "done_count": 0}
+        well = self.wells_data[self.current_well]
+        well["moves"].append(final_move)
+        if timeout:
+            well["timeouts"] += 1
+            self.timeout_count += 1
+        else:
+            well["done_count"] += 1
+        self.moves_values.append(final_move)
+
+    def apply(self, well_name: Optional[str], autofocus_event: Optional[str], move: Optional[int]) -> None:
+        """
+        Met à jour les accumulateurs avec le contenu d'une ligne déjà classée.
+
+        :param well_name: Nom du puits de la ligne "Going to well", ou None.
+        :param autofocus_event: Nom du pattern d'autofocus reconnu (voir _classifyAutofocusLine), ou None.
+        :param move: Nombre de moves d'une ligne "Adjusting ... move:", ou None.
+        """
+        if well_name and well_name != self.current_well:
+            # Finaliser le puits précédent
+            if self.current_well_moves and self.current_well != "Unknown":
+                self.record(max(self.current_well_moves), timeout=False)
+            self.current_well = well_name
+            self.current_well_moves = []
+            return
+
+        if autofocus_event == AUTOFOCUS_OFF_DONE_PATTERN.name:
+            if self.current_well != "Unknown" and self.current_well != self.last_processed_well:
+                # Si pas de moves détectés, c'est move = 0 (pas d'ajustement nécessaire)
+                self.record(max(self.current_well_moves) if self.current_well_moves else 0, timeout=False)
+                self.last_processed_well = self.current_well
+            self.current_well_moves = []
+        elif autofocus_event == STILL_NOT_PATTERN.name:
+            if self.current_well_moves and self.current_well != "Unknown":
+                self.record(max(self.current_well_moves), timeout=True)
+            self.current_well_moves = []
+        elif autofocus_event == MAX_RETRY_PATTERN.name:
+            self.current_well_moves = []
+        elif autofocus_event == MOVE_PATTERN.name:
+            self.current_well_moves.append(move)
+
+
+def _classifyAutofocusLine(line: str) -> Tuple[Optional[str], Optional[int]]:
+    """
+    Classe une ligne d'autofocus custom focus selon le premier pattern reconnu,
+    dans l'ordre : fin d'autofocus, "Still not", max retry, move.
 
-        # Détection automatique du nombre de cycles
-        cycles_detected = 0
-        if wells_data:
-            # Prendre le nombre de mesures du premier puits complet (qui a des mesures)
-            first_well_measurements = max([v["measurements"] for v in wells_data.values()]) if wells_data else 0
-            cycles_detected = first_well_measurements
+    :param line: Ligne de log à analyser.
+    :return: Tuple (nom du pattern ou None, nombre de moves pour un move ou None).
+    """
+    # Les patterns suivants ne concernent que les lignes d'autofocus
+    if AUTOFOCUS_LITERAL not in line:
+        return None, None
+    for pattern in (AUTOFOCUS_OFF_DONE_PATTERN, STILL_NOT_PATTERN, MAX_RETRY_PATTERN):
+        if pattern.search(line):
+            return pattern.name, None
+    move_match = MOVE_PATTERN.search(line)
+    if move_match:
+        return MOVE_PATTERN.name, int(move_match.group(1))
+    return None, None
+
+
+class CustomFocusParser:
+    """
+    Machine à états calculant les moves d'autofocus d'un système custom focus, ligne par ligne.
+    Les lignes doivent être fournies à partir de la ligne qui suit le début de l'acquisition.
 
-            # Validation : vérifier que la plupart des puits ont le même nombre de mesures
-            measurement_counts = [v["measurements"] for v in wells_data.values()]
-            most_common_count = max(set(measurement_counts), key=measurement_counts.count)
-            cycles_detected = most_common_count
+    Les mesures faites pendant la dernière phase d'alignement complète
+    ("Starting auto-position of wells:" ... "Reference wells ... re-aligned") sont ignorées.
+    Comme cette phase n'est connue qu'une fois le flux terminé, deux états sont tenus en parallèle :
+    l'un avec toutes les lignes, l'autre sans la dernière phase d'alignement fermée.
+    """
 
-            debug_log.append(f"[DEBUG] Cycles détectés automatiquement : {cycles_detected}")
-            debug_log.append(f"[DEBUG] Distribution des mesures par puits : {sorted(set(measurement_counts))}")
+    def __init__(self):
+        self._state = _CustomFocusState()
+        self._snapshot = None
+        self._aligned_state = None
+        self._in_alignment_phase = False
+        self._alignment_end_line = None
+        self._last_line_number = None
+
+    def feed(self, line: str, line_number: int) -> None:
+        """
+        Traite une ligne de log.
+
+        :param line: Ligne de log.
+        :param line_number: Numéro de la ligne dans le fichier (base 0).
+        """
+        if AUTOFOCUS_LITERAL not in line and WELL_NAME_PATTERN.literal not in line \
+                and AUTO_POSITION_START_PATTERN.literal not in line and REFERENCE_ALIGNED_PATTERN.literal not in line:
+            # Ligne sans intérêt pour l'analyse
+            self._last_line_number = line_number
+            return
+
+        autofocus_event, move = _classifyAutofocusLine(line)
+        self.feedEvent(line_number, AUTO_POSITION_START_PATTERN.search(line) is not None,
+                       REFERENCE_ALIGNED_PATTERN.search(line) is not None, extractWellName(line),
+                       autofocus_event, move)
+
+    def feedEvent(self, line_number: int, auto_position: bool, reference_aligned: bool,
+                  well_name: Optional[str], autofocus_event: Optional[str], move: Optional[int]) -> None:
+        """
+        Traite une ligne de log déjà classée (par exemple issue d'une LogEventTable).
+
+        :param line_number: Numéro de la ligne dans le fichier (base 0).
+        :param auto_position: True pour une ligne "Starting auto-position of wells:".
+        :param reference_aligned: True pour une ligne "Reference wells ... re-aligned".
+        :param well_name: Nom du puits de la ligne "Going to well", ou None.
+        :param autofocus_event: Nom du pattern d'autofocus reconnu, ou None.
+        :param move: Nombre de moves d'une ligne "Adjusting ... move:", ou None.
+        """
+        self._last_line_number = line_number
+
+        if auto_position:
+            self._in_alignment_phase = True
+            self._snapshot = copy.deepcopy(self._state)
+            self._aligned_state = None
+            logger.debug("Début de la phase d'alignement à la ligne %d", line_number + 1)
+        elif self._in_alignment_phase and reference_aligned:
+            self._in_alignment_phase = False
+            self._alignment_end_line = line_number
+            self._state.apply(well_name, autofocus_event, move)
+            # L'état sans alignement reprend là où en était le flux au début de la phase
+            self._aligned_state = self._snapshot
+            self._snapshot = None
+            logger.debug("Fin de la phase d'alignement à la ligne %d", line_number + 1)
+            return
+
+        self._state.apply(well_name, autofocus_event, move)
+        if self._aligned_state is not None:
+            self._aligned_state.apply(well_name, autofocus_event, move)
+
+    def skipTo(self, line_number: int) -> None:
+        """
+        Indique que les lignes jusqu'à line_number ont été sautées car sans intérêt pour l'analyse.
+
+        :param line_number: Numéro de la dernière ligne du flux (base 0).
+        """
+        self._last_line_number = line_number
+
+    def results(self) -> Dict[str, float]:
+        """
+        Calcule les statistiques à partir de l'état courant.
+
+        :return: Dictionnaire avec la moyenne des moves et les données des puits.
+        """
+        if self._aligned_state is not None:
+            state = copy.deepcopy(self._aligned_state)
+            # Si le flux se termine sur la fin d'alignement, le dernier puits n'est pas finalisé
+            in_alignment_phase = self._last_line_number == self._alignment_end_line
+        else:
+            state = copy.deepcopy(self._state)
+            in_alignment_phase = False
 
-        average_loops = 0 if not all_loops_values else sum(all_loops_values) / len(all_loops_values)
+        # Finaliser le dernier puits
+        if state.current_well_moves and state.current_well != "Unknown" and not in_alignment_phase:
+            state.record(max(state.current_well_moves), timeout=False)
 
-        print("\n=== Journal de débogage ===")
-        for entry in debug_log:
-            print(entry)
-        print(f"[DEBUG] Nombre de cycles détectés : {cycles_detected}")
-        print(f"[DEBUG] Puits analysés : {len(wells_data)}")
-        print(
-            f"[DEBUG] Mesures totales théoriques : {len(wells_data)} puits × {cycles_detected} cycles = {len(wells_data) * cycles_detected}")
-        print(f"[DEBUG] Mesures totales réelles : {all_measurements_count}")
+        wells_data = {k: v for k, v in state.wells_data.items() if v["moves"]}
+        moves_values = state.moves_values
+        average_moves = 0 if not moves_values else sum(moves_values) / len(moves_values)
 
         return {
-            "average_loops": round(average_loops, 2),
-            "total_measurements": all_measurements_count,
-            "done_measurements": len(all_loops_values),
-            "timeout_measurements": timeout_count,
+            "average_moves": round(average_moves, 2),
+            "total_measurements": len(moves_values),
+            "done_measurements": len(moves_values) - state.timeout_count,
+            "timeout_measurements": state.timeout_count,
             "total_wells": len(wells_data),
-            "cycles_detected": cycles_detected,
-            "loops_values": all_loops_values,
+            "moves_values": moves_values,
             "wells_data": wells_data
         }
+
+
+def calculateAverageLoopsPrior(log_file_path: str, last_acquisition_line_number: Optional[int] = None) -> Dict[
+    str, any]:
+    """
+    Calcule le nombre moyen de loops pour un système prior.
+    Détecte automatiquement le nombre de cycles par puits.
+    Exclut les mesures des puits de référence utilisés pour l'alignement.
+    Inclut SEULEMENT les "Done after X loop(s)" dans la moyenne.
+    Les "Time out after X loop(s)" sont comptés comme "Mesures 'Timeout'".
+
+    :param log_file_path: Chemin vers le fichier de log.
+    :param last_acquisition_line_number: Numéro de ligne de la dernière acquisition.
+    :return: Dictionnaire avec la moyenne des loops et les données des puits.
+    """
+    try:
+        start_line = 0 if last_acquisition_line_number is None else last_acquisition_line_number
+        parser = PriorFocusParser()
+        with open(log_file_path, 'r', encoding='utf-8') as file:
+            for i, line in enumerate(file):
+                if i > start_line:
+                    parser.feed(line, i)
+        return parser.results()
     except Exception as e:
         raise ValueError(f"Erreur lors du calcul des loops moyens (prior): {e}")
 
@@ -352,211 +701,1090 @@ def calculateAverageMovesCustomFocus(log_file_path: str, last_acquisition_line_n
     :return: Dictionnaire avec la moyenne des moves et les données des puits.
     """
     try:
+        start_line = 0 if last_acquisition_line_number is None else last_acquisition_line_number
+        parser = CustomFocusParser()
         with open(log_file_path, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
+            for i, line in enumerate(file):
+                if i > start_line:
+                    parser.feed(line, i)
+        return parser.results()
+    except Exception as e:
+        raise ValueError(f"Erreur lors du calcul des moves moyens (custom focus): {e}")
 
-        move_pattern = r'\[AUTOFOCUS\]\[FOCUS\]\s+Adjusting.*move:\s+(\d+)'
-        max_retry_pattern = r'\[AUTOFOCUS\]\[FOCUS\]\s+Focus not reached after\s+(\d+)\s+moves\.\s+Trying alternate commands'
-        still_not_pattern = r'\[AUTOFOCUS\]\[FOCUS\]\s+Still not'
-        autofocus_done_pattern = r'\[AUTOFOCUS\]\[OFF\]\s+Done'
 
-        # Patterns pour détecter la phase d'alignement
-        auto_position_start_pattern = r'Starting auto-position of wells:'
-        reference_aligned_pattern = r'Reference wells\s+.*\s+re-aligned'
+def _buildAnalysisResults(acquisition_type: str, last_acquisition: Optional[str], stats: Dict[str, any],
+                          acquisition_duration: Dict[str, any], drift_fix_count: int) -> Dict[str, any]:
+    """
+    Assemble le dictionnaire de résultats d'analyse à partir des statistiques de focus.
+    """
+    if acquisition_type == "prior":
+        analysis_results = {
+            "acquisition_type": acquisition_type,
+            "last_acquisition": last_acquisition,
+            "average_value": stats["average_loops"],
+            "total_measurements": stats["total_measurements"],
+            "done_measurements": stats["done_measurements"],
+            "timeout_measurements": stats["timeout_measurements"],
+            "total_wells": stats["total_wells"],
+            "cycles_detected": stats["cycles_detected"],
+            "values": stats["loops_values"],
+            "wells_data": stats["wells_data"],
+            "acquisition_duration": acquisition_duration
+        }
+    else:  # custom_focus
+        analysis_results = {
+            "acquisition_type": acquisition_type,
+            "last_acquisition": last_acquisition,
+            "average_value": stats["average_moves"],
+            "total_measurements": stats["total_measurements"],
+            "done_measurements": stats["done_measurements"],
+            "timeout_measurements": stats["timeout_measurements"],
+            "total_wells": stats["total_wells"],
+            "values": stats["moves_values"],
+            "wells_data": stats["wells_data"],
+            "acquisition_duration": acquisition_duration
+        }
 
-        wells_data = {}
-        current_well = "Unknown"
-        current_well_moves = []
-        last_processed_well = None  # Pour éviter les doublons
-        all_moves_values = []
-        timeout_count = 0
-        debug_log = []
-
-        # Variables pour gérer la phase d'alignement
-        in_alignment_phase = False
-        alignment_start_line = None
-        alignment_end_line = None
+    analysis_results["drift_fix_count"] = drift_fix_count
+    return analysis_results
 
-        start_line = 0 if last_acquisition_line_number is None else last_acquisition_line_number
 
-        # Première passe : identifier les phases d'alignement
-        for i, line in enumerate(lines):
-            if i <= start_line:
-                continue
+class LogStreamAnalyzer:
+    """
+    Analyse un fichier de log en une seule passe, ligne par ligne, en mémoire bornée.
+
+    Produit le même résultat que l'enchaînement identifyAcquisitionType, findLastAcquisition,
+    calculateAcquisitionDuration, countNumberOfDriftFix et calculateAverageLoopsPrior /
+    calculateAverageMovesCustomFocus : à chaque "Starting ... acquisition" l'état propre à
+    l'acquisition est réinitialisé, de sorte qu'en fin de flux il décrit la dernière acquisition.
+    Le type d'acquisition n'étant connu qu'en fin de flux, les deux analyses de focus sont menées
+    en parallèle.
+    """
 
-            if re.search(auto_position_start_pattern, line):
-                in_alignment_phase = True
-                alignment_start_line = i
-                debug_log.append(f"[DEBUG] Début de la phase d'alignement à la ligne {i + 1}")
-                continue
+    def __init__(self, first_line_number: int = 0):
+        self.line_count = first_line_number
+        self.has_loop = False
+        self.last_acquisition = None
+        self.last_acquisition_line_number = None
+        self.drift_fix_count = 0
+        self._start_line = 0
+        self._duration_start = None
+        self._duration_end = None
+        self._reset_focus_parsers()
+
+    def _reset_focus_parsers(self) -> None:
+        self._prior = PriorFocusParser()
+        self._prior_error = None
+        self._custom = CustomFocusParser()
+
+    def feed(self, line: str, line_number: Optional[int] = None) -> None:
+        """
+        Traite la ligne suivante du fichier de log.
+
+        :param line: Ligne de log.
+        :param line_number: Numéro de la ligne, lorsque les lignes sans intérêt pour l'analyse sont sautées.
+        """
+        i = self.line_count if line_number is None else line_number
+        self.line_count = i + 1
+
+        if not self.has_loop and "loop" in line.lower():
+            self.has_loop = True
+
+        if "Starting" in line and "acquisition" in line:
+            self.last_acquisition = line.strip()
+            self.last_acquisition_line_number = i
+            self._start_line = i
+            self.drift_fix_count = 0
+            self._reset_focus_parsers()
+
+        is_duration_start = False
+        if "Starting acquisition" in line:
+            timestamp = extractTimestamp(line)
+            if timestamp:
+                self._duration_start = (timestamp, i)
+                self._duration_end = None
+                is_duration_start = True
+        if not is_duration_start and self._duration_start and "Stopping" in line:
+            timestamp = extractTimestamp(line)
+            if timestamp:
+                self._duration_end = (timestamp, i)
+
+        if "DRIFT FIX:" in line:
+            self.drift_fix_count += 1
+
+        if i == self._start_line:
+            return
+
+        self._custom.feed(line, i)
+        if self._prior_error is None:
+            try:
+                self._prior.feed(line, i)
+            except Exception as e:
+                # Ne concerne que les logs prior : l'erreur n'est levée que si le type est confirmé
+                self._prior_error = e
+
+    def skipTo(self, line_count: int) -> None:
+        """
+        Indique que le flux compte line_count lignes, les dernières ayant été sautées
+        car sans intérêt pour l'analyse.
+
+        :param line_count: Nombre total de lignes du flux.
+        """
+        last_line_number = line_count - 1
+        if last_line_number < self.line_count:
+            return
+        self.line_count = line_count
+        if last_line_number != self._start_line:
+            self._custom.skipTo(last_line_number)
+
+    def results(self) -> Dict[str, any]:
+        """
+        Construit le dictionnaire d'analyse à partir de l'état courant.
+
+        :return: Dictionnaire avec toutes les informations d'analyse.
+        """
+        acquisition_type = "prior" if self.has_loop else "custom_focus"
+        if acquisition_type == "prior":
+            if self._prior_error is not None:
+                raise ValueError(f"Erreur lors du calcul des loops moyens (prior): {self._prior_error}")
+            stats = self._prior.results()
+        else:
+            stats = self._custom.results()
 
-            if re.search(reference_aligned_pattern, line):
-                if in_alignment_phase:
-                    in_alignment_phase = False
-                    alignment_end_line = i
-                    debug_log.append(f"[DEBUG] Fin de la phase d'alignement à la ligne {i + 1}")
-                continue
+        start_time, start_line = self._duration_start or (None, None)
+        end_time, end_line = self._duration_end or (None, None)
+        acquisition_duration = _buildDurationResult(start_time, end_time, start_line, end_line)
 
-        # Deuxième passe : analyser les moves en ignorant la phase d'alignement
-        in_alignment_phase = False
-        for i, line in enumerate(lines):
-            if i <= start_line:
-                continue
+        return _buildAnalysisResults(acquisition_type, self.last_acquisition, stats,
+                                     acquisition_duration, self.drift_fix_count)
 
-            # Vérifier si on est dans une phase d'alignement
-            if alignment_start_line and alignment_end_line and alignment_start_line <= i <= alignment_end_line:
-                if not in_alignment_phase:
-                    in_alignment_phase = True
-                    debug_log.append(
-                        f"[DEBUG] Ignorage des mesures d'alignement de la ligne {alignment_start_line + 1} à {alignment_end_line + 1}")
-                continue
-            else:
-                in_alignment_phase = False
-
-            well_name = extractWellName(line)
-            if well_name and well_name != current_well:
-                # Finaliser le puits précédent
-                if current_well_moves and current_well != "Unknown" and not in_alignment_phase:
-                    final_move = max(current_well_moves) if current_well_moves else 0
-                    if current_well not in wells_data:
-                        wells_data[current_well] = {"moves": [], "timeouts": 0, "done_count": 0}
-                    wells_data[current_well]["moves"].append(final_move)
-                    wells_data[current_well]["done_count"] += 1
-                    all_moves_values.append(final_move)
-                    debug_log.append(
-                        f"Puits {current_well}: {len(current_well_moves)} tentatives, move final = {final_move} (Done)")
-
-                current_well = well_name
-                current_well_moves = []
-                continue
 
-            # Ignorer les mesures pendant l'alignement
-            if in_alignment_phase:
-                continue
+def analyzeLogFile(log_file_path: str) -> Dict[str, any]:
+    """
+    Analyse complète d'un fichier de log, en une seule lecture du fichier.
+    La dernière acquisition est d'abord localisée en lisant le fichier à rebours :
+    seule la fin du fichier est alors analysée ligne par ligne.
+
+    :param log_file_path: Chemin vers le fichier de log.
+    :return: Dictionnaire avec toutes les informations d'analyse.
+    """
+    try:
+        last_acquisition, offset = findLastAcquisitionOffset(log_file_path)
+
+        # La durée est calculée depuis le dernier "Starting acquisition" horodaté :
+        # si ce n'est pas la dernière acquisition, le fichier est analysé en entier.
+        if last_acquisition is None or "Starting acquisition" not in last_acquisition \
+                or extractTimestamp(last_acquisition) is None:
+            analyzer = LogStreamAnalyzer()
+            with open(log_file_path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    analyzer.feed(line)
+            return analyzer.results()
+
+        with open(log_file_path, 'rb') as file:
+            analyzer = LogStreamAnalyzer(first_line_number=_countLines(file, offset))
+            file.seek(offset)
+            tail = io.TextIOWrapper(file, encoding='utf-8')
+            for line in tail:
+                analyzer.feed(line)
+            tail.detach()
+
+            # Le type d'acquisition dépend de tout le fichier
+            if not analyzer.has_loop:
+                analyzer.has_loop = _containsLoop(file, offset)
+        return analyzer.results()
+    except Exception as e:
+        raise ValueError(f"Erreur lors de l'analyse du fichier de log: {e}")
 
-            if re.search(autofocus_done_pattern, line):
-                if current_well != "Unknown" and current_well != last_processed_well:
-                    # Si pas de moves détectés, c'est move = 0 (pas d'ajustement nécessaire)
-                    final_move = max(current_well_moves) if current_well_moves else 0
-                    if current_well not in wells_data:
-                        wells_data[current_well] = {"moves": [], "timeouts": 0, "done_count": 0}
-                    wells_data[current_well]["moves"].append(final_move)
-                    wells_data[current_well]["done_count"] += 1
-                    all_moves_values.append(final_move)
 
-                    move_info = f"{len(current_well_moves)} tentatives" if current_well_moves else "0 moves (pas d'ajustement)"
-                    debug_log.append(f"Puits {current_well}: {move_info}, move final = {final_move} (fin autofocus)")
+class LogTailer:
+    """
+    Suit un fichier de log pendant une acquisition en cours.
 
-                    last_processed_well = current_well
-                elif current_well == last_processed_well:
-                    debug_log.append(f"[DEBUG] Mesure ignorée pour {current_well} (déjà traitée)")
+    Chaque appel à poll() ne lit que les octets ajoutés depuis l'appel précédent et les fournit,
+    ligne par ligne, à un LogStreamAnalyzer conservé entre les appels : le travail est constant
+    par nouvelle ligne, le fichier n'est jamais relu. Une ligne incomplète en fin de fichier est
+    gardée jusqu'à ce que sa fin de ligne soit écrite.
+    """
 
-                current_well_moves = []
-                continue
+    def __init__(self, log_file_path: str):
+        self.log_file_path = log_file_path
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Repart du début du fichier avec un état d'analyse vierge.
+        """
+        self.offset = 0
+        self._partial_line = b""
+        self.analyzer = LogStreamAnalyzer()
+
+    def poll(self) -> Optional[Dict[str, any]]:
+        """
+        Lit les lignes ajoutées au fichier depuis le dernier appel.
+
+        :return: Progression de l'analyse (voir progress()) si de nouvelles lignes ont été lues, None sinon.
+        """
+        size = os.path.getsize(self.log_file_path)
+        if size < self.offset:
+            # Fichier tronqué ou remplacé : l'état courant ne correspond plus au fichier
+            logger.info("Fichier de log %s tronqué, reprise de l'analyse depuis le début", self.log_file_path)
+            self.reset()
+        if size == self.offset:
+            return None
 
-            if re.search(still_not_pattern, line):
-                if current_well_moves and current_well != "Unknown":
-                    final_move = max(current_well_moves) if current_well_moves else 0
-                    if current_well not in wells_data:
-                        wells_data[current_well] = {"moves": [], "timeouts": 0, "done_count": 0}
-                    wells_data[current_well]["moves"].append(final_move)
-                    wells_data[current_well]["timeouts"] += 1
-                    all_moves_values.append(final_move)
-                    timeout_count += 1
-                    debug_log.append(
-                        f"Puits {current_well}: {len(current_well_moves)} tentatives, move final = {final_move} (Timeout)")
-                current_well_moves = []
-                continue
+        with open(self.log_file_path, 'rb') as file:
+            file.seek(self.offset)
+            data = file.read(size - self.offset)
+        self.offset += len(data)
 
-            max_retry_match = re.search(max_retry_pattern, line)
-            if max_retry_match:
-                current_well_moves = []
-                debug_log.append(f"Puits {current_well}: max retry détecté, moves réinitialisés")
-                continue
+        lines = (self._partial_line + data).split(b"\n")
+        self._partial_line = lines.pop()
+        if not lines:
+            return None
 
-            move_match = re.search(move_pattern, line)
-            if move_match:
-                move_count = int(move_match.group(1))
-                current_well_moves.append(move_count)
-                debug_log.append(f"Puits {current_well}: move détecté, {move_count} moves")
+        for raw_line in lines:
+            if raw_line.endswith(b"\r"):
+                raw_line = raw_line[:-1]
+            # Le fichier est en cours d'écriture : un octet invalide ne doit pas interrompre le suivi
+            self.analyzer.feed(raw_line.decode('utf-8', errors='replace') + "\n")
+        return self.progress()
 
-        # Finaliser le dernier puits
-        if current_well_moves and current_well != "Unknown" and not in_alignment_phase:
-            final_move = max(current_well_moves) if current_well_moves else 0
-            if current_well not in wells_data:
-                wells_data[current_well] = {"moves": [], "timeouts": 0, "done_count": 0}
-            wells_data[current_well]["moves"].append(final_move)
-            wells_data[current_well]["done_count"] += 1
-            all_moves_values.append(final_move)
-            debug_log.append(
-                f"Puits {current_well}: {len(current_well_moves)} tentatives, move final = {final_move} (dernier puits)")
-
-        wells_data = {k: v for k, v in wells_data.items() if v["moves"]}
-        average_moves = 0 if not all_moves_values else sum(all_moves_values) / len(all_moves_values)
-
-        print("\n=== Journal de débogage ===")
-        for entry in debug_log:
-            print(entry)
+    def progress(self) -> Dict[str, any]:
+        """
+        Résumé de l'acquisition en cours : loops ou moves par puits, timeouts et drift fixes.
+
+        :return: Dictionnaire au format de analyzeLogFile, complété par le nombre de lignes et d'octets lus.
+        """
+        progress = self.analyzer.results()
+        progress["lines_read"] = self.analyzer.line_count
+        progress["bytes_read"] = self.offset - len(self._partial_line)
+        return progress
 
+
+class LogIndex:
+    """
+    Index des offsets en octets des lignes-clés d'un fichier de log, lu une seule fois via mmap.
+
+    Les offsets d'un marqueur sont calculés à la première demande puis conservés. L'analyse d'une
+    acquisition ne décode que les lignes indexées de sa plage : les lignes série, moteur, etc.
+    ne sont jamais converties en str. Les fins de ligne "\n" et "\r\n" sont supportées.
+    """
+
+    # Littéraux recherchés pour chaque marqueur
+    MARKERS = {
+        "acquisition": b"acquisition",  # ligne contenant aussi "Starting"
+        "auto_position": b"Starting auto-position of wells:",
+        "reference": b"Reference wells",
+        "well": b"Going to well",
+        "autofocus": AUTOFOCUS_LITERAL.encode(),
+        "drift_fix": b"DRIFT FIX:",
+        "stopping": b"Stopping",
+    }
+
+    def __init__(self, log_file_path: str):
+        self.log_file_path = log_file_path
+        self._file = open(log_file_path, 'rb')
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            # mmap ne supporte pas les fichiers vides
+            self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        except Exception:
+            self._file.close()
+            raise
+        self._offsets = {}
+        # Points de repère (offset, numéro de ligne) pour le calcul des numéros de ligne
+        self._checkpoint_offsets = [0]
+        self._checkpoint_numbers = [0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        """
+        Libère le mmap et le fichier.
+        """
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        self._file.close()
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def offsets(self, marker: str) -> List[int]:
+        """
+        Retourne les offsets de début des lignes contenant le marqueur, dans l'ordre du fichier.
+
+        :param marker: Nom du marqueur (clé de LogIndex.MARKERS).
+        :return: Liste triée des offsets en octets.
+        """
+        if marker not in self._offsets:
+            literal = self.MARKERS[marker]
+            buffer = self._buffer
+            offsets = []
+            position = buffer.find(literal, 0)
+            while position >= 0:
+                line_start = buffer.rfind(b"\n", 0, position) + 1
+                line_end = buffer.find(b"\n", position)
+                if line_end < 0:
+                    line_end = len(buffer)
+                if marker != "acquisition" or buffer.find(b"Starting", line_start, line_end) >= 0:
+                    offsets.append(line_start)
+                position = buffer.find(literal, line_end + 1)
+            self._offsets[marker] = offsets
+        return self._offsets[marker]
+
+    @property
+    def acquisitions(self) -> List[int]:
+        """
+        Offsets des lignes de début d'acquisition ("Starting" et "acquisition").
+        """
+        return self.offsets("acquisition")
+
+    def line(self, offset: int) -> str:
+        """
+        Décode la ligne qui commence à l'offset donné, sans la fin de ligne.
+
+        :param offset: Offset en octets du début de la ligne.
+        :return: Contenu de la ligne.
+        """
+        line_end = self._buffer.find(b"\n", offset)
+        if line_end < 0:
+            line_end = len(self._buffer)
+        raw_line = self._buffer[offset:line_end]
+        if raw_line.endswith(b"\r"):
+            raw_line = raw_line[:-1]
+        return raw_line.decode('utf-8')
+
+    def lineNumber(self, offset: int) -> int:
+        """
+        Retourne le numéro (base 0) de la ligne qui commence à l'offset donné.
+        Les fins de ligne ne sont comptées qu'entre l'offset et le repère connu le plus proche.
+
+        :param offset: Offset en octets du début de la ligne.
+        :return: Numéro de ligne.
+        """
+        index = bisect.bisect_right(self._checkpoint_offsets, offset) - 1
+        checkpoint_offset = self._checkpoint_offsets[index]
+        line_number = self._checkpoint_numbers[index]
+        if checkpoint_offset != offset:
+            line_number += _countLines(self._buffer, offset, start_offset=checkpoint_offset)
+            self._checkpoint_offsets.insert(index + 1, offset)
+            self._checkpoint_numbers.insert(index + 1, line_number)
+        return line_number
+
+    def lineCount(self) -> int:
+        """
+        Retourne le nombre de lignes du fichier, telles que lues en mode texte.
+        """
+        if not self._buffer:
+            return 0
+        line_count = self.lineNumber(len(self._buffer))
+        if self._buffer[-1:] != b"\n":
+            line_count += 1
+        return line_count
+
+    def containsLoop(self) -> bool:
+        """
+        Indique si le fichier contient "loop", sans tenir compte de la casse (système prior).
+        """
+        return bool(self._buffer) and _containsLoop(self._buffer, len(self._buffer))
+
+    def acquisitionRange(self, acquisition_index: int = -1) -> Tuple[int, int]:
+        """
+        Retourne la plage d'octets d'une acquisition : de sa ligne de début
+        jusqu'au début de l'acquisition suivante ou la fin du fichier.
+
+        :param acquisition_index: Index de l'acquisition (négatif pour compter depuis la fin).
+        :return: Tuple (offset de début, offset de fin exclu).
+        """
+        acquisitions = self.acquisitions
+        if not acquisitions:
+            raise ValueError("Aucune acquisition trouvée dans le fichier de log")
+        try:
+            start_offset = acquisitions[acquisition_index]
+        except IndexError:
+            raise ValueError(f"Acquisition {acquisition_index} inexistante ({len(acquisitions)} acquisitions)")
+        position = acquisition_index % len(acquisitions)
+        end_offset = acquisitions[position + 1] if position + 1 < len(acquisitions) else len(self._buffer)
+        return start_offset, end_offset
+
+    def iterLines(self, start_offset: int, end_offset: int):
+        """
+        Parcourt les lignes indexées (tous marqueurs confondus) d'une plage d'octets.
+
+        :param start_offset: Offset de début de la plage.
+        :param end_offset: Offset de fin de la plage (exclu).
+        :return: Générateur de tuples (numéro de ligne, ligne).
+        """
+        offsets = set()
+        for marker in self.MARKERS:
+            marker_offsets = self.offsets(marker)
+            first = bisect.bisect_left(marker_offsets, start_offset)
+            last = bisect.bisect_left(marker_offsets, end_offset)
+            offsets.update(marker_offsets[first:last])
+
+        previous_offset = start_offset
+        line_number = self.lineNumber(start_offset)
+        for offset in sorted(offsets):
+            line_number += _countLines(self._buffer, offset, start_offset=previous_offset)
+            previous_offset = offset
+            yield line_number, self.line(offset)
+
+    def analyzeAcquisition(self, acquisition_index: int = -1) -> Dict[str, any]:
+        """
+        Analyse une acquisition du fichier à partir des seules lignes indexées de sa plage.
+        Le type d'acquisition est déterminé sur tout le fichier ; la durée est mesurée entre
+        la ligne de début de l'acquisition et le dernier "Stopping" de sa plage.
+
+        :param acquisition_index: Index de l'acquisition (par défaut la dernière).
+        :return: Dictionnaire d'analyse, au même format que analyzeLogFile.
+        """
+        start_offset, end_offset = self.acquisitionRange(acquisition_index)
+        analyzer = LogStreamAnalyzer(first_line_number=self.lineNumber(start_offset))
+        for line_number, line in self.iterLines(start_offset, end_offset):
+            analyzer.feed(line, line_number)
+
+        if end_offset < len(self._buffer):
+            analyzer.skipTo(self.lineNumber(end_offset))
+        else:
+            analyzer.skipTo(self.lineCount())
+        analyzer.has_loop = self.containsLoop()
+        return analyzer.results()
+
+
+def analyzeAcquisition(log_file_path: str, acquisition_index: int = -1) -> Dict[str, any]:
+    """
+    Analyse une acquisition quelconque d'un fichier de log via un LogIndex.
+
+    :param log_file_path: Chemin vers le fichier de log.
+    :param acquisition_index: Index de l'acquisition (par défaut la dernière).
+    :return: Dictionnaire avec toutes les informations d'analyse.
+    """
+    try:
+        with LogIndex(log_file_path) as index:
+            return index.analyzeAcquisition(acquisition_index)
+    except Exception as e:
+        raise ValueError(f"Erreur lors de l'analyse de l'acquisition: {e}")
+
+
+def _analyzeSegment(log_file_path: str, start_offset: int, end_offset: int, first_line_number: int,
+                    has_loop: bool) -> Dict[str, any]:
+    """
+    Analyse une plage d'octets du fichier de log correspondant à une acquisition.
+    Fonction de module pour pouvoir être exécutée dans un processus séparé.
+
+    :param log_file_path: Chemin vers le fichier de log.
+    :param start_offset: Offset de la ligne de début de l'acquisition.
+    :param end_offset: Offset de fin de la plage (exclu).
+    :param first_line_number: Numéro de la ligne de début de l'acquisition.
+    :param has_loop: True si le fichier complet contient "loop" (système prior).
+    :return: Dictionnaire d'analyse de l'acquisition.
+    """
+    with open(log_file_path, 'rb') as file:
+        file.seek(start_offset)
+        segment = file.read(end_offset - start_offset)
+
+    analyzer = LogStreamAnalyzer(first_line_number=first_line_number)
+    for line in io.StringIO(segment.decode('utf-8'), newline=None):
+        analyzer.feed(line)
+    analyzer.has_loop = has_loop
+    return analyzer.results()
+
+
+def analyzeAllAcquisitions(log_file_path: str, workers: int = 1) -> List[Dict[str, any]]:
+    """
+    Analyse chacune des acquisitions d'un fichier de log (par exemple les runs d'une répétabilité).
+    Chaque acquisition va de sa ligne "Starting ... acquisition" jusqu'à l'acquisition suivante ;
+    les lignes précédant la première acquisition sont ignorées. Le type d'acquisition est
+    déterminé sur tout le fichier.
+
+    Avec workers = 1, le fichier est découpé en une seule lecture séquentielle. Au-delà, les
+    plages d'octets des acquisitions sont repérées via un LogIndex puis analysées en parallèle
+    dans un pool de processus.
+
+    :param log_file_path: Chemin vers le fichier de log.
+    :param workers: Nombre de processus utilisés pour analyser les acquisitions.
+    :return: Liste des dictionnaires d'analyse, dans l'ordre des acquisitions.
+    """
+    try:
+        if workers > 1:
+            with LogIndex(log_file_path) as index:
+                has_loop = index.containsLoop()
+                segments = []
+                for acquisition_index, start_offset in enumerate(index.acquisitions):
+                    _, end_offset = index.acquisitionRange(acquisition_index)
+                    segments.append((start_offset, end_offset, index.lineNumber(start_offset)))
+
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(_analyzeSegment, log_file_path, start_offset, end_offset, first_line_number,
+                                    has_loop)
+                    for start_offset, end_offset, first_line_number in segments
+                ]
+                return [future.result() for future in futures]
+
+        analyzers = []
+        has_loop = False
+        with open(log_file_path, 'r', encoding='utf-8') as file:
+            for line_number, line in enumerate(file):
+                if not has_loop and "loop" in line.lower():
+                    has_loop = True
+                if "Starting" in line and "acquisition" in line:
+                    analyzers.append(LogStreamAnalyzer(first_line_number=line_number))
+                if analyzers:
+                    analyzers[-1].feed(line)
+
+        results = []
+        for analyzer in analyzers:
+            analyzer.has_loop = has_loop
+            results.append(analyzer.results())
+        return results
+    except Exception as e:
+        raise ValueError(f"Erreur lors de l'analyse des acquisitions: {e}")
+
+
+# Types d'événements de la table d'événements, dans l'ordre d'émission pour une même ligne :
+# cet ordre est aussi la priorité des patterns dans PriorFocusParser et CustomFocusParser.
+EVENT_TYPES = [
+    "acquisition_start",  # "Starting" et "acquisition" (début d'une acquisition)
+    "starting_acquisition",  # "Starting acquisition" (début de la durée d'acquisition)
+    AUTO_POSITION_START_PATTERN.name,
+    REFERENCE_ALIGNED_PATTERN.name,
+    WELL_NAME_PATTERN.name,
+    DONE_LOOPS_PATTERN.name,
+    TIMEOUT_LOOPS_PATTERN.name,
+    AUTOFOCUS_OFF_DONE_PATTERN.name,
+    STILL_NOT_PATTERN.name,
+    MAX_RETRY_PATTERN.name,
+    MOVE_PATTERN.name,
+    "drift_fix",
+    "stopping",
+]
+
+# Événements d'autofocus custom focus, par ordre de priorité
+_CUSTOM_FOCUS_EVENTS = [
+    AUTOFOCUS_OFF_DONE_PATTERN.name, STILL_NOT_PATTERN.name, MAX_RETRY_PATTERN.name, MOVE_PATTERN.name
+]
+
+
+def _lineEvents(line: str) -> List[Tuple[str, Optional[str], Optional[int], Optional[int]]]:
+    """
+    Liste les événements d'une ligne de log, dans l'ordre de EVENT_TYPES.
+
+    :param line: Ligne de log à analyser.
+    :return: Liste de tuples (type d'événement, puits, loops, moves).
+    """
+    events = []
+    if "Starting" in line and "acquisition" in line:
+        events.append(("acquisition_start", None, None, None))
+    if "Starting acquisition" in line:
+        events.append(("starting_acquisition", None, None, None))
+    for pattern in (AUTO_POSITION_START_PATTERN, REFERENCE_ALIGNED_PATTERN):
+        if pattern.search(line):
+            events.append((pattern.name, None, None, None))
+    well_name = WELL_NAME_PATTERN.search(line)
+    if well_name:
+        events.append((WELL_NAME_PATTERN.name, well_name.group(1), None, None))
+    if AUTOFOCUS_LITERAL in line:
+        for pattern in (DONE_LOOPS_PATTERN, TIMEOUT_LOOPS_PATTERN):
+            match = pattern.search(line)
+            if match:
+                events.append((pattern.name, None, int(match.group(1)), None))
+        for pattern in (AUTOFOCUS_OFF_DONE_PATTERN, STILL_NOT_PATTERN, MAX_RETRY_PATTERN):
+            if pattern.search(line):
+                events.append((pattern.name, None, None, None))
+        match = MOVE_PATTERN.search(line)
+        if match:
+            events.append((MOVE_PATTERN.name, None, None, int(match.group(1))))
+    if "DRIFT FIX:" in line:
+        events.append(("drift_fix", None, None, None))
+    if "Stopping" in line:
+        events.append(("stopping", None, None, None))
+    return events
+
+
+class LogEventTable:
+    """
+    Table des événements d'un fichier de log, en colonnes typées (une ligne par événement) :
+    line_number, offset (en octets), timestamp, event, well, loops et moves.
+
+    Les statistiques sont calculées sur la table et non plus ligne à ligne : regroupements
+    vectorisés pour les loops prior, les drift fixes et les durées, rejeu des seuls événements
+    pour la machine à états custom focus. Les résultats ont le format de analyzeLogFile.
+    """
+
+    def __init__(self, events: pd.DataFrame, acquisition_lines: List[str], has_loop: bool, line_count: int,
+                 size: int = 0, resume_offset: int = 0, resume_line_number: int = 0):
+        self.events = events
+        self.acquisition_lines = acquisition_lines
+        self.has_loop = has_loop
+        self.line_count = line_count
+        # Octets lus, et position de la première ligne non terminée (ou de la fin du fichier)
+        # à partir de laquelle une lecture incrémentale peut reprendre
+        self.size = size
+        self.resume_offset = resume_offset
+        self.resume_line_number = resume_line_number
+
+    def append(self, tail: "LogEventTable") -> "LogEventTable":
+        """
+        Complète la table avec les événements lus à partir de resume_offset (voir extractLogEvents).
+        Les événements d'une dernière ligne non terminée sont remplacés par ceux de la relecture.
+
+        :param tail: Table des événements lus à partir de resume_offset / resume_line_number.
+        :return: Nouvelle table couvrant tout le fichier.
+        """
+        kept = self.events["line_number"] < self.resume_line_number
+        dropped_acquisitions = int((self.events["event"][~kept] == "acquisition_start").sum())
+        acquisition_lines = self.acquisition_lines[:len(self.acquisition_lines) - dropped_acquisitions]
+        events = pd.concat([self.events[kept], tail.events], ignore_index=True)
+        return LogEventTable(events, acquisition_lines + tail.acquisition_lines, self.has_loop or tail.has_loop,
+                             tail.line_count, tail.size, tail.resume_offset, tail.resume_line_number)
+
+    def save(self, cache_path: str, metadata: Optional[Dict[str, any]] = None) -> None:
+        """
+        Enregistre la table dans un fichier NumPy .npz (sans objets Python sérialisés).
+
+        :param cache_path: Chemin du fichier .npz.
+        :param metadata: Informations complémentaires enregistrées avec la table (sérialisables en JSON).
+        """
+        events = self.events
+        header = dict(metadata or {}, has_loop=self.has_loop, line_count=self.line_count, size=self.size,
+                      resume_offset=self.resume_offset, resume_line_number=self.resume_line_number)
+        with open(cache_path, 'wb') as file:
+            np.savez(file,
+                     header=np.array(json.dumps(header)),
+                     line_number=events["line_number"].to_numpy(),
+                     offset=events["offset"].to_numpy(),
+                     timestamp=events["timestamp"].to_numpy(dtype="datetime64[ns]"),
+                     event=events["event"].cat.codes.to_numpy(),
+                     well=events["well"].fillna("").to_numpy(dtype=str),
+                     loops=events["loops"].to_numpy(),
+                     moves=events["moves"].to_numpy(),
+                     acquisition_lines=np.array(self.acquisition_lines, dtype=str))
+
+    @classmethod
+    def load(cls, cache_path: str) -> Tuple["LogEventTable", Dict[str, any]]:
+        """
+        Charge une table enregistrée par save().
+
+        :param cache_path: Chemin du fichier .npz.
+        :return: Tuple (table, métadonnées).
+        """
+        with np.load(cache_path, allow_pickle=False) as data:
+            header = json.loads(str(data["header"]))
+            wells = data["well"].astype(object)
+            wells[wells == ""] = None
+            events = pd.DataFrame({
+                "line_number": data["line_number"].astype(np.int64),
+                "offset": data["offset"].astype(np.int64),
+                "timestamp": pd.Series(data["timestamp"]),
+                "event": pd.Categorical.from_codes(data["event"], categories=EVENT_TYPES),
+                "well": pd.Series(wells, dtype=object),
+                "loops": data["loops"],
+                "moves": data["moves"],
+            })
+            acquisition_lines = data["acquisition_lines"].tolist()
+        table = cls(events, acquisition_lines, header["has_loop"], header["line_count"], header["size"],
+                    header["resume_offset"], header["resume_line_number"])
+        return table, header
+
+    @property
+    def acquisition_type(self) -> str:
+        return "prior" if self.has_loop else "custom_focus"
+
+    def acquisitionLineNumbers(self) -> np.ndarray:
+        """
+        Retourne les numéros des lignes de début d'acquisition.
+        """
+        events = self.events
+        return events["line_number"].to_numpy()[(events["event"] == "acquisition_start").to_numpy()]
+
+    def _rows(self, first_line: int, end_line: Optional[int] = None) -> pd.DataFrame:
+        line_numbers = self.events["line_number"]
+        mask = line_numbers >= first_line
+        if end_line is not None:
+            mask &= line_numbers < end_line
+        return self.events[mask]
+
+    def priorStats(self, start_line: int, end_line: Optional[int] = None) -> Dict[str, any]:
+        """
+        Calcule les statistiques prior des lignes qui suivent start_line, comme calculateAverageLoopsPrior.
+
+        :param start_line: Numéro de la ligne de début de l'acquisition.
+        :param end_line: Numéro de la ligne de fin de plage (exclue), par défaut la fin du fichier.
+        :return: Dictionnaire avec la moyenne des loops et les données des puits.
+        """
+        rows = self._rows(start_line + 1, end_line)
+        references = rows["line_number"][rows["event"] == REFERENCE_ALIGNED_PATTERN.name]
+        if references.empty:
+            measures = rows.iloc[0:0]
+        else:
+            # Seules les mesures après le premier alignement sont comptées
+            rows = rows[rows["line_number"] > references.iloc[0]]
+            rows = rows[rows["event"].isin([WELL_NAME_PATTERN.name, DONE_LOOPS_PATTERN.name,
+                                            TIMEOUT_LOOPS_PATTERN.name])]
+            # Une seule action par ligne : puits, puis "Done", puis "Time out"
+            rows = rows.drop_duplicates("line_number", keep="first")
+            is_well = rows["event"] == WELL_NAME_PATTERN.name
+            current_well = rows["well"].where(is_well).ffill()
+            measures = rows[~is_well].assign(well=current_well[~is_well])
+            if measures["well"].isna().any():
+                raise KeyError("Unknown")
+
+        is_done = measures["event"] == DONE_LOOPS_PATTERN.name
+        done_loops = measures[is_done].groupby("well", sort=False)["loops"].agg(list).to_dict()
+        timeout_loops = measures[~is_done].groupby("well", sort=False)["loops"].agg(list).to_dict()
+
+        # Puits dans l'ordre de leur première apparition, sans les puits sans mesures
+        wells_data = {}
+        well_order = [] if references.empty else pd.unique(rows["well"][rows["event"] == WELL_NAME_PATTERN.name])
+        for well in well_order:
+            well_loops = [int(value) for value in done_loops.get(well, [])]
+            well_timeouts = [int(value) for value in timeout_loops.get(well, [])]
+            if not well_loops and not well_timeouts:
+                continue
+            wells_data[well] = {
+                "loops": well_loops,
+                "timeouts": well_timeouts,
+                "done_count": len(well_loops),
+                "timeout_count": len(well_timeouts),
+                "measurements": len(well_loops) + len(well_timeouts)
+            }
+
+        cycles_detected = 0
+        if wells_data:
+            cycles_detected = _mostCommonCount([v["measurements"] for v in wells_data.values()])
+
+        loops_values = [int(value) for value in measures["loops"][is_done]]
+        average_loops = 0 if not loops_values else sum(loops_values) / len(loops_values)
         return {
-            "average_moves": round(average_moves, 2),
-            "total_measurements": len(all_moves_values),
-            "done_measurements": len(all_moves_values) - timeout_count,
-            "timeout_measurements": timeout_count,
+            "average_loops": round(average_loops, 2),
+            "total_measurements": len(measures),
+            "done_measurements": len(loops_values),
+            "timeout_measurements": len(measures) - len(loops_values),
             "total_wells": len(wells_data),
-            "moves_values": all_moves_values,
+            "cycles_detected": cycles_detected,
+            "loops_values": loops_values,
             "wells_data": wells_data
         }
+
+    def customFocusStats(self, start_line: int, end_line: Optional[int] = None) -> Dict[str, float]:
+        """
+        Calcule les statistiques custom focus des lignes qui suivent start_line,
+        comme calculateAverageMovesCustomFocus, en rejouant les seuls événements de la table.
+
+        :param start_line: Numéro de la ligne de début de l'acquisition.
+        :param end_line: Numéro de la ligne de fin de plage (exclue), par défaut la fin du fichier.
+        :return: Dictionnaire avec la moyenne des moves et les données des puits.
+        """
+        parser = CustomFocusParser()
+        rows = self._rows(start_line + 1, end_line)
+        line_events = {}
+        current_line = None
+        for line_number, event, well, move in zip(rows["line_number"], rows["event"], rows["well"], rows["moves"]):
+            if line_number != current_line:
+                if current_line is not None:
+                    self._feedCustomFocusLine(parser, current_line, line_events)
+                current_line = line_number
+                line_events = {}
+            line_events.setdefault(event, (well, move))
+        if current_line is not None:
+            self._feedCustomFocusLine(parser, current_line, line_events)
+
+        last_line = (self.line_count if end_line is None else end_line) - 1
+        if last_line > start_line:
+            parser.skipTo(last_line)
+        return parser.results()
+
+    @staticmethod
+    def _feedCustomFocusLine(parser: CustomFocusParser, line_number: int, line_events: Dict[str, tuple]) -> None:
+        autofocus_event, move = None, None
+        for event in _CUSTOM_FOCUS_EVENTS:
+            if event in line_events:
+                autofocus_event = event
+                if event == MOVE_PATTERN.name:
+                    move = int(line_events[event][1])
+                break
+        well_name = line_events[WELL_NAME_PATTERN.name][0] if WELL_NAME_PATTERN.name in line_events else None
+        parser.feedEvent(line_number, AUTO_POSITION_START_PATTERN.name in line_events,
+                         REFERENCE_ALIGNED_PATTERN.name in line_events, well_name, autofocus_event, move)
+
+    def duration(self, first_line: int = 0, end_line: Optional[int] = None) -> Dict[str, any]:
+        """
+        Calcule la durée entre le dernier "Starting acquisition" horodaté de la plage
+        et le dernier "Stopping" horodaté qui le suit.
+
+        :param first_line: Première ligne de la plage.
+        :param end_line: Ligne de fin de plage (exclue), par défaut la fin du fichier.
+        :return: Dictionnaire avec les informations de durée.
+        """
+        rows = self._rows(first_line, end_line)
+        rows = rows[rows["timestamp"].notna()]
+        starts = rows[rows["event"] == "starting_acquisition"]
+        if starts.empty:
+            return _buildDurationResult(None, None, None, None)
+        start = starts.iloc[-1]
+        stops = rows[(rows["event"] == "stopping") & (rows["line_number"] > start["line_number"])]
+        if stops.empty:
+            return _buildDurationResult(start["timestamp"].to_pydatetime(), None, int(start["line_number"]), None)
+        stop = stops.iloc[-1]
+        return _buildDurationResult(start["timestamp"].to_pydatetime(), stop["timestamp"].to_pydatetime(),
+                                    int(start["line_number"]), int(stop["line_number"]))
+
+    def driftFixCount(self, first_line: int = 0, end_line: Optional[int] = None) -> int:
+        """
+        Compte les drift fixes d'une plage de lignes.
+        """
+        rows = self._rows(first_line, end_line)
+        return int((rows["event"] == "drift_fix").sum())
+
+    def analyze(self, acquisition_index: Optional[int] = None) -> Dict[str, any]:
+        """
+        Analyse une acquisition à partir de la table d'événements.
+
+        :param acquisition_index: None pour la dernière acquisition avec la sémantique de analyzeLogFile,
+                                  sinon l'index de l'acquisition avec la sémantique de analyzeAllAcquisitions.
+        :return: Dictionnaire avec toutes les informations d'analyse.
+        """
+        acquisition_lines = self.acquisitionLineNumbers()
+        if acquisition_index is None:
+            start_line = int(acquisition_lines[-1]) if len(acquisition_lines) else 0
+            last_acquisition = self.acquisition_lines[-1] if self.acquisition_lines else None
+            end_line = None
+            acquisition_duration = self.duration()
+        else:
+            if not len(acquisition_lines):
+                raise ValueError("Aucune acquisition trouvée dans le fichier de log")
+            try:
+                start_line = int(acquisition_lines[acquisition_index])
+                last_acquisition = self.acquisition_lines[acquisition_index]
+            except IndexError:
+                raise ValueError(f"Acquisition {acquisition_index} inexistante ({len(acquisition_lines)} acquisitions)")
+            position = acquisition_index % len(acquisition_lines)
+            end_line = int(acquisition_lines[position + 1]) if position + 1 < len(acquisition_lines) else None
+            acquisition_duration = self.duration(start_line, end_line)
+
+        if self.acquisition_type == "prior":
+            try:
+                stats = self.priorStats(start_line, end_line)
+            except Exception as e:
+                raise ValueError(f"Erreur lors du calcul des loops moyens (prior): {e}")
+        else:
+            stats = self.customFocusStats(start_line, end_line)
+
+        return _buildAnalysisResults(self.acquisition_type, last_acquisition, stats, acquisition_duration,
+                                     self.driftFixCount(start_line, end_line))
+
+    def wellStatistics(self, acquisition_index: Optional[int] = None) -> pd.DataFrame:
+        """
+        Construit la table des statistiques par puits d'une acquisition, pour les rapports.
+
+        :param acquisition_index: Index de l'acquisition (voir analyze()).
+        :return: DataFrame avec une ligne par puits.
+        """
+        analysis = self.analyze(acquisition_index)
+        rows = []
+        for well, data in analysis["wells_data"].items():
+            values = data["loops"] if analysis["acquisition_type"] == "prior" else data["moves"]
+            timeouts = data["timeout_count"] if analysis["acquisition_type"] == "prior" else data["timeouts"]
+            rows.append({
+                "Puits": well,
+                "Mesures 'Done'": data["done_count"],
+                "Mesures 'Timeout'": timeouts,
+                "Nombre moyen de loops/moves": round(float(np.mean(values)), 2) if values else 0,
+            })
+        return pd.DataFrame(rows, columns=["Puits", "Mesures 'Done'", "Mesures 'Timeout'",
+                                           "Nombre moyen de loops/moves"])
+
+
+def extractLogEvents(log_file_path: str, start_offset: int = 0, first_line_number: int = 0) -> LogEventTable:
+    """
+    Extrait en une lecture les événements d'un fichier de log dans une LogEventTable.
+    Seules les lignes contenant un des littéraux des marqueurs sont décodées.
+
+    :param log_file_path: Chemin vers le fichier de log.
+    :param start_offset: Position (en octets, en début de ligne) à partir de laquelle lire le fichier.
+    :param first_line_number: Numéro de la ligne qui commence à start_offset.
+    :return: Table des événements du fichier.
+    """
+    try:
+        columns = {"line_number": [], "offset": [], "event": [], "well": [], "loops": [], "moves": []}
+        timestamps = []
+        acquisition_lines = []
+        has_loop = False
+        line_count = first_line_number
+        offset = start_offset
+        line_offset = start_offset
+        raw_line = b""
+        with open(log_file_path, 'rb') as file:
+            file.seek(start_offset)
+            for line_number, raw_line in enumerate(file, first_line_number):
+                line_offset = offset
+                offset += len(raw_line)
+                line_count = line_number + 1
+                if not has_loop and b"loop" in raw_line.lower():
+                    has_loop = True
+                if not (b"[AUTOFOCUS]" in raw_line or b"Going to well" in raw_line or b"acquisition" in raw_line
+                        or b"Reference wells" in raw_line or b"Starting auto-position" in raw_line
+                        or b"DRIFT FIX:" in raw_line or b"Stopping" in raw_line):
+                    continue
+
+                line = raw_line.decode('utf-8')
+                events = _lineEvents(line)
+                if not events:
+                    continue
+                timestamp = TIMESTAMP_PATTERN.search(line)
+                for event, well, loops, moves in events:
+                    columns["line_number"].append(line_number)
+                    columns["offset"].append(line_offset)
+                    columns["event"].append(event)
+                    columns["well"].append(well)
+                    columns["loops"].append(loops)
+                    columns["moves"].append(moves)
+                    timestamps.append(timestamp.group(1) if timestamp else None)
+                    if event == "acquisition_start":
+                        acquisition_lines.append(line.strip())
+
+        events = pd.DataFrame({
+            "line_number": np.array(columns["line_number"], dtype=np.int64),
+            "offset": np.array(columns["offset"], dtype=np.int64),
+            "timestamp": pd.to_datetime(pd.Series(timestamps, dtype=object), format='%d/%m/%Y %H:%M:%S',
+                                        errors='coerce').astype("datetime64[ns]"),
+            "event": pd.Categorical(columns["event"], categories=EVENT_TYPES),
+            "well": pd.Series(columns["well"], dtype=object),
+            "loops": np.array(columns["loops"], dtype=np.float64),
+            "moves": np.array(columns["moves"], dtype=np.float64),
+        })
+        if raw_line.endswith(b"\n") or not raw_line:
+            resume_offset, resume_line_number = offset, line_count
+        else:
+            # Dernière ligne en cours d'écriture : elle sera relue par la lecture incrémentale suivante
+            resume_offset, resume_line_number = line_offset, line_count - 1
+        return LogEventTable(events, acquisition_lines, has_loop, line_count, offset, resume_offset,
+                             resume_line_number)
     except Exception as e:
-        raise ValueError(f"Erreur lors du calcul des moves moyens (custom focus): {e}")
+        raise ValueError(f"Erreur lors de l'extraction des événements du fichier de log: {e}")
 
-def analyzeLogFile(log_file_path: str) -> Dict[str, any]:
+
+# Version du format du cache des tables d'événements (à incrémenter si EVENT_TYPES ou les colonnes changent)
+LOG_CACHE_VERSION = 1
+# Taille des blocs de début et de fin de fichier utilisés pour l'empreinte d'un log
+LOG_FINGERPRINT_BLOCK_SIZE = 64 * 1024
+
+
+def _hashRange(file, start: int, end: int) -> str:
+    file.seek(start)
+    return hashlib.sha1(file.read(end - start)).hexdigest()
+
+
+def _logFingerprint(file, size: int) -> Dict[str, any]:
+    """
+    Calcule l'empreinte des size premiers octets d'un log : hash du bloc de début et du bloc de fin.
+    """
+    return {
+        "size": size,
+        "head_hash": _hashRange(file, 0, min(size, LOG_FINGERPRINT_BLOCK_SIZE)),
+        "tail_hash": _hashRange(file, max(0, size - LOG_FINGERPRINT_BLOCK_SIZE), size),
+    }
+
+
+def loadLogEvents(log_file_path: str, cache_dir: str) -> LogEventTable:
     """
-    Analyse complète d'un fichier de log.
+    Charge la table des événements d'un fichier de log en passant par un cache .npz.
+
+    Le cache est indexé par le chemin du log et validé par sa taille, sa date de modification
+    et le hash de ses blocs de début et de fin. Si le log a seulement grandi depuis la mise en cache,
+    seule la fin ajoutée est lue. Le cache est mis à jour après chaque lecture.
 
     :param log_file_path: Chemin vers le fichier de log.
-    :return: Dictionnaire avec toutes les informations d'analyse.
+    :param cache_dir: Dossier du cache.
+    :return: Table des événements du fichier.
     """
+    log_file_path = os.path.abspath(log_file_path)
+    cache_path = os.path.join(cache_dir, hashlib.sha1(log_file_path.encode("utf-8")).hexdigest() + ".npz")
+
+    table, cached = None, None
+    if os.path.exists(cache_path):
+        try:
+            table, cached = LogEventTable.load(cache_path)
+            if cached.get("version") != LOG_CACHE_VERSION or cached.get("path") != log_file_path:
+                table = None
+        except Exception as e:
+            logger.warning("Cache de log illisible %s: %s", cache_path, e)
+            table = None
+
     try:
-        acquisition_type = identifyAcquisitionType(log_file_path)
-        last_acquisition, last_acquisition_line_number = findLastAcquisition(log_file_path)
-        acquisition_duration = calculateAcquisitionDuration(log_file_path)
-        drift_fix_count = countNumberOfDriftFix(log_file_path, last_acquisition_line_number)
+        stat = os.stat(log_file_path)
+        with open(log_file_path, 'rb') as file:
+            if table is not None and stat.st_size >= cached["size"]:
+                unchanged_prefix = _logFingerprint(file, cached["size"]) == {
+                    key: cached[key] for key in ("size", "head_hash", "tail_hash")}
+                if stat.st_size == cached["size"] and stat.st_mtime_ns == cached["mtime_ns"] and unchanged_prefix:
+                    return table
+                if stat.st_size == cached["size"] or not unchanged_prefix:
+                    # Fichier réécrit : pas de lecture incrémentale possible
+                    table = None
+            else:
+                table = None
+            fingerprint = _logFingerprint(file, stat.st_size)
+    except Exception as e:
+        raise ValueError(f"Erreur lors de la lecture du fichier de log: {e}")
 
-        if acquisition_type == "prior":
-            stats = calculateAverageLoopsPrior(log_file_path, last_acquisition_line_number)
-            analysis_results = {
-                "acquisition_type": acquisition_type,
-                "last_acquisition": last_acquisition,
-                "average_value": stats["average_loops"],
-                "total_measurements": stats["total_measurements"],
-                "done_measurements": stats["done_measurements"],
-                "timeout_measurements": stats["timeout_measurements"],
-                "total_wells": stats["total_wells"],
-                "cycles_detected": stats["cycles_detected"],
-                "values": stats["loops_values"],
-                "wells_data": stats["wells_data"],
-                "acquisition_duration": acquisition_duration
-            }
-        else:  # custom_focus
-            stats = calculateAverageMovesCustomFocus(log_file_path, last_acquisition_line_number)
-            analysis_results = {
-                "acquisition_type": acquisition_type,
-                "last_acquisition": last_acquisition,
-                "average_value": stats["average_moves"],
-                "total_measurements": stats["total_measurements"],
-                "done_measurements": stats["done_measurements"],
-                "timeout_measurements": stats["timeout_measurements"],
-                "total_wells": stats["total_wells"],
-                "values": stats["moves_values"],
-                "wells_data": stats["wells_data"],
-                "acquisition_duration": acquisition_duration
-            }
+    if table is None:
+        table = extractLogEvents(log_file_path)
+    else:
+        logger.debug("Lecture incrémentale de %s à partir de l'octet %d", log_file_path, table.resume_offset)
+        table = table.append(extractLogEvents(log_file_path, table.resume_offset, table.resume_line_number))
 
-        analysis_results["drift_fix_count"] = drift_fix_count
-        return analysis_results
+    # Le fichier a pu grandir pendant la lecture : l'empreinte porte sur les octets effectivement lus
+    if table.size != stat.st_size:
+        with open(log_file_path, 'rb') as file:
+            fingerprint = _logFingerprint(file, table.size)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        temporary_path = cache_path + ".tmp"
+        table.save(temporary_path, dict(fingerprint, version=LOG_CACHE_VERSION, path=log_file_path,
+                                        mtime_ns=stat.st_mtime_ns))
+        os.replace(temporary_path, cache_path)
     except Exception as e:
-        raise ValueError(f"Erreur lors de l'analyse du fichier de log: {e}")
+        logger.warning("Impossible d'écrire le cache de log %s: %s", cache_path, e)
+    return table
+
+
+# Colonnes des rapports d'analyse de log
+LOG_REPORT_COLUMNS = [
+    "Type d'acquisition",
+    "Durée d'acquisition (minutes)",
+    "Nombre moyen de loops/moves",
+    "Nombre total de mesures",
+    "Nombre total de puits",
+    "Mesures 'Done'",
+    "Mesures 'Timeout'",
+    "Nombre de Drift Fix",
+]
+
+
+def _buildReportRow(analysis: Dict[str, any]) -> Dict[str, any]:
+    """
+    Construit une ligne de rapport à partir d'un dictionnaire d'analyse.
+
+    :param analysis: Dictionnaire d'analyse (voir analyzeLogFile).
+    :return: Dictionnaire colonne -> valeur, dans l'ordre de LOG_REPORT_COLUMNS.
+    """
+    return dict(zip(LOG_REPORT_COLUMNS, [
+        analysis["acquisition_type"],
+        analysis["acquisition_duration"]["duration_minutes"],
+        analysis["average_value"],
+        analysis["total_measurements"],
+        analysis["total_wells"],
+        analysis["done_measurements"],
+        analysis["timeout_measurements"],
+        analysis["drift_fix_count"],
+    ]))
 
 
 def generateLogAnalysisReport(folder_path: str) -> pd.DataFrame:
@@ -570,22 +1798,111 @@ def generateLogAnalysisReport(folder_path: str) -> pd.DataFrame:
         log_file_path = getLogFile(folder_path)
         analysis = analyzeLogFile(log_file_path)
 
-        report_data = {
-            "Type d'acquisition": [analysis["acquisition_type"]],
-            "Durée d'acquisition (minutes)": [analysis["acquisition_duration"]["duration_minutes"]],
-            "Nombre moyen de loops/moves": [analysis["average_value"]],
-            "Nombre total de mesures": [analysis["total_measurements"]],
-            "Nombre total de puits": [analysis["total_wells"]],
-            "Mesures 'Done'": [analysis["done_measurements"]],
-            "Mesures 'Timeout'": [analysis["timeout_measurements"]],
-            "Nombre de Drift Fix": [analysis["drift_fix_count"]],
-        }
-
-        return pd.DataFrame(report_data)
+        return pd.DataFrame([_buildReportRow(analysis)])
     except Exception as e:
         raise ValueError(f"Erreur lors de la génération du rapport d'analyse: {e}")
 
 
+def generateAcquisitionsReport(folder_path: str, workers: int = 1) -> pd.DataFrame:
+    """
+    Génère un rapport d'analyse avec une ligne par acquisition du fichier de log du dossier.
+
+    :param folder_path: Chemin vers le dossier contenant le fichier de log.
+    :param workers: Nombre de processus utilisés pour analyser les acquisitions.
+    :return: DataFrame avec les résultats d'analyse de chaque acquisition.
+    """
+    try:
+        log_file_path = getLogFile(folder_path)
+        rows = []
+        for acquisition_index, analysis in enumerate(analyzeAllAcquisitions(log_file_path, workers)):
+            row = {"Acquisition": acquisition_index + 1, "Début": analysis["last_acquisition"]}
+            row.update(_buildReportRow(analysis))
+            rows.append(row)
+        return pd.DataFrame(rows)
+    except Exception as e:
+        raise ValueError(f"Erreur lors de la génération du rapport par acquisition: {e}")
+
+
+def findLogFiles(root_folder: str) -> List[str]:
+    """
+    Recherche récursivement les fichiers de log sous un dossier racine.
+    Comme getLogFile, un seul fichier .log est retenu par dossier.
+
+    :param root_folder: Dossier racine (par exemple un dossier regroupant plusieurs installations).
+    :return: Liste des chemins des fichiers de log, triée.
+    """
+    if not os.path.exists(root_folder):
+        raise FileNotFoundError(f"Le dossier {root_folder} n'existe pas.")
+
+    log_files = []
+    for folder_path, _, file_names in os.walk(root_folder):
+        if any(file_name.endswith('.log') for file_name in file_names):
+            log_files.append(getLogFile(folder_path))
+    return sorted(log_files)
+
+
+def _analyzeLogForBatch(log_file_path: str) -> Dict[str, any]:
+    """
+    Analyse un fichier de log et retourne sa ligne de rapport de lot.
+    Une erreur d'analyse est reportée dans la colonne "Erreur" au lieu d'interrompre le lot.
+
+    :param log_file_path: Chemin vers le fichier de log.
+    :return: Dictionnaire colonne -> valeur.
+    """
+    row = {"Dossier": os.path.dirname(log_file_path), "Fichier de log": os.path.basename(log_file_path)}
+    try:
+        row.update(_buildReportRow(analyzeLogFile(log_file_path)))
+        row["Erreur"] = ""
+    except Exception as e:
+        row.update(dict.fromkeys(LOG_REPORT_COLUMNS))
+        row["Erreur"] = str(e)
+    return row
+
+
+def generateBatchLogReport(root_folder: str, workers: Optional[int] = None, output_csv: Optional[str] = None,
+                           progress_callback=None) -> pd.DataFrame:
+    """
+    Analyse en parallèle tous les fichiers de log trouvés sous un dossier racine.
+
+    Les lignes sont écrites dans le CSV au fur et à mesure que les analyses se terminent ;
+    le DataFrame retourné suit l'ordre des fichiers.
+
+    :param root_folder: Dossier racine contenant les dossiers de résultats.
+    :param workers: Nombre de processus (par défaut le nombre de processeurs ; 1 pour analyser sans pool).
+    :param output_csv: Chemin du CSV combiné à écrire, optionnel.
+    :param progress_callback: Fonction appelée après chaque fichier avec (nombre traité, nombre total, chemin du log).
+    :return: DataFrame avec une ligne par fichier de log.
+    """
+    try:
+        log_files = findLogFiles(root_folder)
+        rows = [None] * len(log_files)
+        if output_csv and os.path.exists(output_csv):
+            os.remove(output_csv)
+
+        def collect(position: int, row: Dict[str, any], completed: int) -> None:
+            rows[position] = row
+            if output_csv:
+                pd.DataFrame([row]).to_csv(output_csv, mode='a', header=completed == 1, index=False)
+            if progress_callback:
+                progress_callback(completed, len(log_files), log_files[position])
+
+        if workers == 1:
+            for position, log_file_path in enumerate(log_files):
+                collect(position, _analyzeLogForBatch(log_file_path), position + 1)
+        elif log_files:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(_analyzeLogForBatch, log_file_path): position
+                    for position, log_file_path in enumerate(log_files)
+                }
+                for completed, future in enumerate(as_completed(futures), start=1):
+                    collect(futures[future], future.result(), completed)
+
+        return pd.DataFrame(rows)
+    except Exception as e:
+        raise ValueError(f"Erreur lors de l'analyse du lot de fichiers de log: {e}")
+
+
 def generateSummaryReport(folder_path: str) -> Dict[str, any]:
     """
     Génère un résumé complet de l'analyse.
@@ -0,0 +1,209 @@
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+import numpy as np
+
+from zymosoft_assistant.scripts.getDatasFromWellResults import WellResultsWorkbook
+
+logger = logging.getLogger(__name__)
+
+# Version du format des entrées : une entrée d'une autre version est recalculée
+REFERENCE_STORE_VERSION = 2
+FINGERPRINT_BLOCK_SIZE = 1024 * 1024
+
+
+def fileFingerprint(file_path: str) -> Dict[str, Any]:
+    """
+    Calcule l'empreinte d'un fichier : sa taille et le hash SHA-1 de son contenu.
+
+    :param file_path: Chemin du fichier.
+    :return: Dictionnaire {"size", "sha1"}.
+    """
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        for block in iter(lambda: file.read(FINGERPRINT_BLOCK_SIZE), b''):
+            digest.update(block)
+    return {"size": size, "sha1": digest.hexdigest()}
+
+
+class StoredWellResults(WellResultsWorkbook):
+    """
+    Fichier WellResults de référence relu depuis le ReferenceStore : les données de calibration et les blancs
+    de chaque area sont déjà extraits, le classeur n'est pas relu. S'utilise comme un WellResultsWorkbook
+    dans compareWellResults et compareLODLOQ (LOD/LOQ et plages d'activité sont recalculées depuis ces données).
+    """
+
+    def __init__(self, file_path: str, calibrations: List[Union[Dict[str, list], str]],
+                 blanks: List[Union[list, str]]):
+        """
+        :param file_path: Chemin du fichier WellResults d'origine.
+        :param calibrations: Pour chaque area, dictionnaire {'activity', 'values'} ou message de l'erreur de lecture.
+        :param blanks: Pour chaque area, liste des valeurs des blancs non exclus ou message de l'erreur de lecture.
+        """
+        self.file_path = file_path
+        self.sheets = {}
+        self.sheet_names = []
+        self._sections = {}
+        self._calibrations = calibrations
+        self._blanks = blanks
+
+    @property
+    def number_of_areas(self):
+        return len(self._calibrations)
+
+    def indexAreas(self, workers=1):
+        # Les areas ont déjà été analysées lors de la mise en stock
+        pass
+
+    def _storedArea(self, stored, area_index):
+        if area_index >= self.number_of_areas:
+            raise IndexError(f"L'index d'area {area_index} est hors limites. Areas disponibles: {self.number_of_areas}")
+        if isinstance(stored[area_index], str):
+            raise ValueError(stored[area_index])
+        return stored[area_index]
+
+    def _parseCalibration(self, area_index):
+        calibration = self._storedArea(self._calibrations, area_index)
+        return {'activity': list(calibration['activity']), 'values': list(calibration['values'])}
+
+    def _parseBlanks(self, area_index):
+        return list(self._storedArea(self._blanks, area_index))
+
+
+def _packAreas(values: List[Union[list, str]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Range des listes par area dans un seul tableau, avec les bornes de chaque area et les messages d'erreur
+    ("" pour une area lue sans erreur).
+    """
+    errors = [value if isinstance(value, str) else "" for value in values]
+    lists = [[] if isinstance(value, str) else value for value in values]
+    offsets = np.cumsum([0] + [len(area_values) for area_values in lists], dtype=np.int64)
+    flat = np.array([value for area_values in lists for value in area_values], dtype=float)
+    return flat, offsets, np.array(errors, dtype=str)
+
+
+def _unpackAreas(flat: np.ndarray, offsets: np.ndarray, errors: np.ndarray) -> List[Union[list, str]]:
+    return [str(error) if error else flat[start:end].tolist()
+            for start, end, error in zip(offsets[:-1], offsets[1:], errors)]
+
+
+def _readWellResults(file_path: str) -> Dict[str, np.ndarray]:
+    """
+    Extrait les données de calibration et les blancs de chaque area d'un fichier WellResults.
+    """
+    workbook = WellResultsWorkbook(file_path)
+    workbook.indexAreas()
+    activities, values, blanks = [], [], []
+    for area_index in range(workbook.number_of_areas):
+        try:
+            calibration = workbook._parseCalibration(area_index)
+            activities.append(calibration['activity'])
+            values.append(calibration['values'])
+        except Exception as e:
+            activities.append(str(e) or repr(e))
+            values.append(str(e) or repr(e))
+        try:
+            blanks.append(workbook._parseBlanks(area_index))
+        except Exception as e:
+            blanks.append(str(e) or repr(e))
+
+    arrays = {}
+    for name, area_values in (("activity", activities), ("values", values), ("blanks", blanks)):
+        arrays[name], arrays[f"{name}_offsets"], arrays[f"{name}_errors"] = _packAreas(area_values)
+    return arrays
+
+
+def _readSynthese(file_path: str) -> Dict[str, np.ndarray]:
+    """
+    Lit la plaque d'un fichier synthese_interferometric_data.csv : noms des métriques et tableau (métrique, ligne, colonne).
+    """
+    from zymosoft_assistant.scripts.home_made_tools_v3 import import_data_from_csv_synthese_zymintern
+    plaque = import_data_from_csv_synthese_zymintern(file_path)
+    return {"metriques": np.array(plaque.metriques, dtype=str), "data": plaque.data}
+
+
+class ReferenceStore:
+    """
+    Stock local des données des acquisitions de référence déjà analysées, pour ne pas relire et réanalyser
+    les mêmes fichiers de référence à chaque validation.
+
+    Chaque entrée est un fichier NumPy .npz (sans objets Python sérialisés) indexé par le chemin du fichier
+    de référence et validé par l'empreinte de son contenu : une référence modifiée est réanalysée.
+    Une entrée illisible ou impossible à écrire n'empêche pas l'analyse.
+    """
+
+    def __init__(self, store_dir: str):
+        """
+        :param store_dir: Dossier du stock.
+        """
+        self.store_dir = store_dir
+
+    def _entry(self, file_path: str, kind: str, compute: Callable[[str], Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+        """
+        Retourne les tableaux stockés pour un fichier de référence, ou les calcule avec compute(file_path)
+        et les enregistre.
+
+        :param file_path: Chemin du fichier de référence.
+        :param kind: Type de données ("well_results", "synthese").
+        :param compute: Fonction d'analyse du fichier, retournant un dictionnaire nom -> tableau.
+        :return: Dictionnaire nom -> tableau.
+        """
+        file_path = os.path.abspath(file_path)
+        header = dict(fileFingerprint(file_path), version=REFERENCE_STORE_VERSION, kind=kind, path=file_path)
+        entry_path = os.path.join(self.store_dir,
+                                  f"{kind}_{hashlib.sha1(file_path.encode('utf-8')).hexdigest()}.npz")
+
+        if os.path.exists(entry_path):
+            try:
+                with np.load(entry_path, allow_pickle=False) as data:
+                    if json.loads(str(data["header"])) == header:
+                        return {name: data[name] for name in data.files if name != "header"}
+            except Exception as e:
+                logger.warning("Entrée du stock de référence illisible %s: %s", entry_path, e)
+
+        arrays = compute(file_path)
+        try:
+            os.makedirs(self.store_dir, exist_ok=True)
+            temporary_path = entry_path + ".tmp"
+            with open(temporary_path, 'wb') as file:
+                np.savez(file, header=np.array(json.dumps(header)), **arrays)
+            os.replace(temporary_path, entry_path)
+        except OSError as e:
+            logger.warning("Impossible d'enregistrer %s dans le stock de référence: %s", file_path, e)
+        return arrays
+
+    def wellResults(self, file_path: str) -> StoredWellResults:
+        """
+        Retourne les données d'un fichier WellResults de référence, analysé une seule fois par version du fichier.
+
+        :param file_path: Chemin du fichier WellResults.
+        :return: StoredWellResults utilisable à la place d'un WellResultsWorkbook.
+        """
+        try:
+            arrays = self._entry(file_path, "well_results", _readWellResults)
+        except ValueError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Erreur lors de la lecture du fichier de résultats de puits: {e}")
+        activities, values, blanks = (_unpackAreas(arrays[name], arrays[f"{name}_offsets"], arrays[f"{name}_errors"])
+                                      for name in ("activity", "values", "blanks"))
+        calibrations = [activity if isinstance(activity, str) else {'activity': activity, 'values': area_values}
+                        for activity, area_values in zip(activities, values)]
+        return StoredWellResults(os.path.abspath(file_path), calibrations, blanks)
+
+    def syntheseData(self, file_path: str):
+        """
+        Retourne la plaque d'un fichier synthese_interferometric_data.csv de référence,
+        comme import_data_from_csv_synthese_zymintern.
+
+        :param file_path: Chemin du fichier synthese_interferometric_data.csv.
+        :return: PlaqueSynthese (se déballe en matrices lignes × colonnes volume, volume_std, diametre, diametre_std,
+                 N_dot_detected, N_dot_keep, N_cycle, porcent_dot_keep).
+        """
+        from zymosoft_assistant.scripts.home_made_tools_v3 import PlaqueSynthese
+        arrays = self._entry(file_path, "synthese", _readSynthese)
+        return PlaqueSynthese(arrays["metriques"].tolist(), arrays["data"])
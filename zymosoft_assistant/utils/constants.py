@@ -33,6 +33,8 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
 REPORTS_DIR = os.path.join(BASE_DIR, "reports")
 TEMP_DIR = os.path.join(BASE_DIR, "temp")
+LOG_CACHE_DIR = os.path.join(TEMP_DIR, "log_cache")
+REFERENCE_STORE_DIR = os.path.join(TEMP_DIR, "reference_store")
 
 # Chemin de base de l'installation ZymoSoft
 ZYMOSOFT_BASE_PATH = "C:/Users/Public/Zymoptiq"